@@ -0,0 +1,73 @@
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict
+from pathlib import Path
+
+from lib.interfaces import RadioPadPlayerConfig, RadioPadStation
+
+logger = logging.getLogger("CONFIG")
+
+
+class ConfigCache:
+    """Keep the last good registry documents and player configuration on disk.
+
+    Documents are stored with the ETag the registry sent, so a refresh can ask
+    for changes only. The resolved player configuration lets a restart begin
+    playback before the registry answers.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def _path(self, kind, key):
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return self.directory / f"{kind}-{digest}.json"
+
+    def _read(self, path):
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache file %s: %s", path, e)
+            return None
+
+    def _write(self, path, record):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(f".{path.name}.tmp")
+            temp_path.write_text(json.dumps(record), encoding="utf-8")
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning("Failed writing cache file %s: %s", path, e)
+
+    def get_document(self, url):
+        """Return the cached (data, etag) pair for a URL, or None."""
+        record = self._read(self._path("document", url))
+        if not isinstance(record, dict) or record.get("url") != url or "data" not in record:
+            return None
+        return record["data"], record.get("etag")
+
+    def put_document(self, url, data, etag):
+        self._write(self._path("document", url), {"url": url, "etag": etag, "data": data})
+
+    def get_config(self, key):
+        """Return the last player configuration saved under key, or None."""
+        record = self._read(self._path("config", key))
+        if not isinstance(record, dict) or record.get("key") != key:
+            return None
+        try:
+            data = record["config"]
+            return RadioPadPlayerConfig(
+                radio_dial_url=data["radio_dial_url"],
+                stations=[RadioPadStation(**station) for station in data["stations"]],
+                switchboard_url=data.get("switchboard_url"),
+            )
+        except (KeyError, TypeError) as e:
+            logger.warning("Ignoring malformed cached configuration: %s", e)
+            return None
+
+    def put_config(self, key, player_config):
+        self._write(self._path("config", key), {"key": key, "config": asdict(player_config)})
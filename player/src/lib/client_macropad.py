@@ -202,17 +202,25 @@ class MacropadClient(RadioPadClient):
                 continue
             await self._send(json.dumps({"event": "player_status", "data": status}))
 
-    async def _handle_station_menu_request(self, event):
+    async def config_changed(self, previous):
         config = self.player.config
-        if config is None:
-            await self.resend_status("radio_dial")
-            return
+        if config is not None and config.stations != previous.stations:
+            await self._send_station_menu(config)
 
+    async def _send_station_menu(self, config):
         await self.broadcast(
             "station_menu",
             data=[station.call_sign for station in config.stations],
             limit_to_self=True,
         )
+
+    async def _handle_station_menu_request(self, event):
+        config = self.player.config
+        if config is None:
+            await self.resend_status("radio_dial")
+            return
+
+        await self._send_station_menu(config)
         await asyncio.sleep(0.1)  # Handle backpressure
         await self.broadcast("playback_state", limit_to_self=True)
         await asyncio.sleep(0.1)
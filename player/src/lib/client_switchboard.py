@@ -91,6 +91,12 @@ class SwitchboardClient(RadioPadClient):
                     if not self._closing:
                         await self._report_status("warning", "Switchboard down")
 
+    async def config_changed(self, previous):
+        config = self.player.config
+        if config is not None and config.radio_dial_url != previous.radio_dial_url:
+            # Sent on the next reconnect; the switchboard URL itself only changes on restart.
+            self.http_headers = http_client_headers({"RadioPad-Radio-Dial-Url": config.radio_dial_url})
+
     async def _send(self, message):
         """Send a message to the macropad or switchboard."""
         if self.ws:
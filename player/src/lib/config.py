@@ -1,4 +1,5 @@
 import asyncio
+import json
 import logging
 from urllib.parse import urlsplit, urlunsplit
 
@@ -42,42 +43,99 @@ def http_client_headers(custom_headers=None):
     return {**defaults, **custom_headers}
 
 
-async def fetch_json_url(url, timeout=12, retries=3):
-    """Fetch JSON from URL with retries"""
-    headers = http_client_headers({"Accept": "application/json"})
-    async with httpx2.AsyncClient(timeout=timeout, headers=headers, follow_redirects=True) as client:
-        for attempt in range(retries):
-            try:
-                response = await client.get(url)
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    logger.warning(
-                        "Failed to fetch JSON: %s from %s",
-                        response.status_code,
-                        url,
-                    )
-            except Exception as e:
-                logger.warning("Attempt %s failed for %s: %s", attempt + 1, url, e)
-            if attempt < retries - 1:
-                logger.info("Retrying in %s seconds...", 2**attempt)
-                await asyncio.sleep(2**attempt)
+_http_client = None
+_http_client_loop = None
+
+
+def http_client():
+    """Return the shared registry HTTP client, keeping connections alive between requests."""
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx2.AsyncClient(
+            headers=http_client_headers({"Accept": "application/json"}),
+            follow_redirects=True,
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared registry HTTP client, if one is open."""
+    global _http_client, _http_client_loop
+    client, _http_client, _http_client_loop = _http_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+async def fetch_json_url(url, timeout=12, retries=3, cache=None):
+    """Fetch JSON from URL with retries, revalidating any cached copy by ETag"""
+    cached = cache.get_document(url) if cache else None
+    headers = {}
+    if cached and cached[1]:
+        headers["If-None-Match"] = cached[1]
+    client = http_client()
+    for attempt in range(retries):
+        try:
+            response = await client.get(url, headers=headers, timeout=timeout)
+            if response.status_code == 304 and cached:
+                logger.debug("%s not modified; using cached copy", url)
+                return cached[0]
+            if response.status_code == 200:
+                data = response.json()
+                if cache:
+                    cache.put_document(url, data, response.headers.get("etag"))
+                return data
+            else:
+                logger.warning(
+                    "Failed to fetch JSON: %s from %s",
+                    response.status_code,
+                    url,
+                )
+        except Exception as e:
+            logger.warning("Attempt %s failed for %s: %s", attempt + 1, url, e)
+        if attempt < retries - 1:
+            logger.info("Retrying in %s seconds...", 2**attempt)
+            await asyncio.sleep(2**attempt)
     return None
 
 
+def _cache_key(player, registry_url, radio_dial_url, switchboard_url, enable_discovery):
+    return json.dumps([player, registry_url, radio_dial_url, switchboard_url, enable_discovery])
+
+
+def load_cached(
+    player,
+    registry_url,
+    radio_dial_url=None,
+    switchboard_url=None,
+    enable_discovery=True,
+    cache=None,
+):
+    """Return the last configuration made with these settings, or None when nothing is cached."""
+    if cache is None:
+        return None
+    return cache.get_config(_cache_key(player, registry_url, radio_dial_url, switchboard_url, enable_discovery))
+
+
 async def make(
     player,
     registry_url,
     radio_dial_url=None,
     switchboard_url=None,
     enable_discovery=True,
+    cache=None,
 ):
     """
     Create a RadioPadPlayerConfig object with the provided parameters.
     If enable_discovery is True, attempt to discover missing configuration from the registry.
+    When a cache is given, registry documents are revalidated by ETag and the result is saved for load_cached.
     """
+    cache_key = _cache_key(player, registry_url, radio_dial_url, switchboard_url, enable_discovery)
     if enable_discovery:
-        radio_dial_url, switchboard_url = await discover_config(player, registry_url, radio_dial_url, switchboard_url)
+        radio_dial_url, switchboard_url = await discover_config(
+            player, registry_url, radio_dial_url, switchboard_url, cache=cache
+        )
 
     if not radio_dial_url:
         raise ConfigError(
@@ -88,7 +146,7 @@ async def make(
     logger.info("Using RadioDial URL: %s", radio_dial_url)
     logger.info("Using switchboard URL: %s", switchboard_url)
 
-    radio_dial = await fetch_json_url(radio_dial_url)
+    radio_dial = await fetch_json_url(radio_dial_url, cache=cache)
     if not radio_dial:
         raise ConfigError("Failed fetching RadioDial", status_summary="RadioDial unavailable")
     stations = radio_dial.get("stations") if isinstance(radio_dial, dict) else None
@@ -110,7 +168,7 @@ async def make(
             status_summary="RadioDial config error",
         )
 
-    return RadioPadPlayerConfig(
+    player_config = RadioPadPlayerConfig(
         stations=[
             RadioPadStation(
                 call_sign=station["call_sign"],
@@ -121,9 +179,12 @@ async def make(
         radio_dial_url=radio_dial_url,
         switchboard_url=switchboard_url,
     )
+    if cache:
+        cache.put_config(cache_key, player_config)
+    return player_config
 
 
-async def discover_config(player, registry_url, radio_dial_url=None, switchboard_url=None):
+async def discover_config(player, registry_url, radio_dial_url=None, switchboard_url=None, cache=None):
     """Discover missing player configuration from the registry."""
 
     if radio_dial_url and switchboard_url:
@@ -141,7 +202,7 @@ async def discover_config(player, registry_url, radio_dial_url=None, switchboard
     url = f"{registry_url.rstrip('/')}/accounts/{account_id}/players/{player_id}"
     logger.info("Discovering configuration from %s ...", url)
     logger.info("  To skip, set RADIOPAD_ENABLE_DISCOVERY=false")
-    data = await fetch_json_url(url)
+    data = await fetch_json_url(url, cache=cache)
 
     if data:
         if not radio_dial_url and data.get("radio_dial"):
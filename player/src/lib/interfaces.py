@@ -43,7 +43,10 @@ class RadioPadPlayer(abc.ABC):
         self._playback_worker: asyncio.Task[None] | None = None
         self._playback_changed = asyncio.Event()
         self._broadcast_lock = asyncio.Lock()
+        self._config_reload: asyncio.Task[None] | None = None
+        self._config_reload_pending = False
         self.status_reporter: Callable[[str, str | None], Awaitable[None]] | None = None
+        self.config_loader: Callable[[], Awaitable[RadioPadPlayerConfig]] | None = None
 
     @property
     def config(self) -> RadioPadPlayerConfig | None:
@@ -54,6 +57,45 @@ class RadioPadPlayer(abc.ABC):
         """Replace the player configuration after discovery succeeds."""
         self._config = config
 
+    async def apply_config(self, config: RadioPadPlayerConfig):
+        """Swap in a configuration and tell clients about it; playback continues uninterrupted."""
+        previous = self._config
+        self.update_config(config)
+        if previous is None or previous == config:
+            return
+        for client in self.clients:
+            try:
+                await client.config_changed(previous)
+            except Exception as e:
+                logger.error("Config change notification failed for %s: %s", client, e)
+
+    def request_config_reload(self):
+        """Reload the configuration in the background, coalescing requests made while a reload runs."""
+        if self.config_loader is None:
+            logger.warning("Ignoring config reload request; no config loader is set")
+            return
+        self._config_reload_pending = True
+        if self._config_reload is None or self._config_reload.done():
+            self._config_reload = asyncio.create_task(self._reload_config(), name="RadioPadPlayer.reload_config")
+
+    async def cancel_config_reload(self):
+        """Cancel any configuration reload that is still running."""
+        self._config_reload_pending = False
+        if self._config_reload is not None:
+            self._config_reload.cancel()
+            await asyncio.gather(self._config_reload, return_exceptions=True)
+            self._config_reload = None
+
+    async def _reload_config(self):
+        while self._config_reload_pending and self.config_loader is not None:
+            self._config_reload_pending = False
+            try:
+                config = await self.config_loader()
+            except Exception as e:
+                logger.error("Config reload failed: %s", e)
+                continue
+            await self.apply_config(config)
+
     @property
     def station(self) -> RadioPadStation | None:
         """Get or set the station with confirmed playback."""
@@ -253,6 +295,7 @@ class RadioPadClient(abc.ABC):
         self.register_event("playback_stop", self._handle_playback_stop)
         self.register_event("volume_up", self._handle_volume_up)
         self.register_event("volume_down", self._handle_volume_down)
+        self.register_event("radio_dial_updated", self._handle_radio_dial_updated)
         # Ignored events
         for ignored in (
             "playback_state",
@@ -323,6 +366,13 @@ class RadioPadClient(abc.ABC):
     async def _handle_playback_stop(self, event):
         await self.player.request_stop()
 
+    async def _handle_radio_dial_updated(self, event):
+        logger.info("RadioDial updated; reloading configuration")
+        self.player.request_config_reload()
+
+    async def config_changed(self, previous: RadioPadPlayerConfig):
+        """Called after the player swaps in a new configuration."""
+
     async def _handle_ignored(self, event):
         pass  # Ignore these events
 
@@ -11,6 +11,7 @@ import sys
 from functools import partial
 
 import lib.config as config
+from lib.cache import ConfigCache
 from lib.client_macropad import MacropadClient
 from lib.client_switchboard import SwitchboardClient
 from lib.exceptions import ConfigError
@@ -26,6 +27,7 @@ CONFIG_RETRY_SECONDS = 10
 async def cleanup(player):
     logger.info("Cleaning up before exit...")
     player.status_reporter = None
+    await player.cancel_config_reload()
     await player.request_stop()
     await player.wait_for_playback_idle()
     for client in player.clients:
@@ -35,19 +37,31 @@ async def cleanup(player):
             logger.error("Error closing client %s: %s", client.__class__.__name__, e)
 
 
-async def _load_config_with_retry(player, macropad_client, settings, shutdown_event):
+async def _load_config_with_retry(player, macropad_client, settings, shutdown_event, revalidating=False):
+    """Load the configuration from the registry, retrying until it succeeds or shutdown.
+
+    While revalidating a cached configuration that is already playing, failures are
+    only logged; the macropad keeps its "ok" status instead of warning.
+    """
     while not shutdown_event.is_set():
         try:
             player_config = await config.make(**settings)
-            player.update_config(player_config)
+            await player.apply_config(player_config)
             await macropad_client.publish_status("radio_dial", "ok", None)
             return player_config
         except ConfigError as e:
-            logger.error("Configuration error: %s", e)
-            await macropad_client.publish_status("radio_dial", "warning", e.status_summary)
+            if revalidating:
+                logger.info("could not revalidate cached configuration: %s", e)
+            else:
+                logger.error("Configuration error: %s", e)
+                await macropad_client.publish_status("radio_dial", "warning", e.status_summary)
         except Exception as e:
-            logger.error("Unexpected configuration error: %s", e, exc_info=True)
-            await macropad_client.publish_status("radio_dial", "warning", "Registry unavailable")
+            if revalidating:
+                logger.info("could not revalidate cached configuration: %s", e)
+                logger.debug("revalidation failure", exc_info=True)
+            else:
+                logger.error("Unexpected configuration error: %s", e, exc_info=True)
+                await macropad_client.publish_status("radio_dial", "warning", "Registry unavailable")
         logger.info("retrying player configuration in %ss...", CONFIG_RETRY_SECONDS)
         try:
             await asyncio.wait_for(shutdown_event.wait(), timeout=CONFIG_RETRY_SECONDS)
@@ -57,6 +71,17 @@ async def _load_config_with_retry(player, macropad_client, settings, shutdown_ev
     return None
 
 
+async def _revalidate_config(player, macropad_client, settings, shutdown_event):
+    """Refresh a configuration started from cache once the registry answers."""
+    cached_config = player.config
+    player_config = await _load_config_with_retry(player, macropad_client, settings, shutdown_event, revalidating=True)
+    if player_config and cached_config and player_config.switchboard_url != cached_config.switchboard_url:
+        logger.warning(
+            "switchboard URL changed to %s; restart the player to connect to it",
+            player_config.switchboard_url,
+        )
+
+
 def _install_sigterm_handler(shutdown_event):
     loop = asyncio.get_running_loop()
 
@@ -73,14 +98,30 @@ def _install_sigterm_handler(shutdown_event):
         return False
 
 
-async def main(player, macropad_client, settings, health_path):
-    """Runs the main event loop for the radio-pad player."""
+async def main(player, macropad_client, settings, health_path, instant_start=False):
+    """Runs the main event loop for the radio-pad player.
+
+    With instant_start, a configuration cached by an earlier run is used right away
+    and revalidated against the registry in the background.
+    """
     tasks = [asyncio.create_task(macropad_client.run(), name="MacropadClient.run")]
+    revalidate_task = None
     shutdown_event = asyncio.Event()
     sigterm_handler_installed = _install_sigterm_handler(shutdown_event)
+    player.config_loader = partial(config.make, **settings)
     try:
         await macropad_client.publish_status("radio_dial", "loading", None)
-        player_config = await _load_config_with_retry(player, macropad_client, settings, shutdown_event)
+        player_config = config.load_cached(**settings) if instant_start else None
+        if player_config:
+            logger.info("starting from cached configuration for %s", player_config.radio_dial_url)
+            player.update_config(player_config)
+            await macropad_client.publish_status("radio_dial", "ok", None)
+            revalidate_task = asyncio.create_task(
+                _revalidate_config(player, macropad_client, settings, shutdown_event),
+                name="config.revalidate",
+            )
+        else:
+            player_config = await _load_config_with_retry(player, macropad_client, settings, shutdown_event)
         if shutdown_event.is_set() or not player_config:
             return
 
@@ -120,10 +161,13 @@ async def main(player, macropad_client, settings, health_path):
     finally:
         if shutdown_event.is_set():
             logger.info("exiting...")
+        if revalidate_task:
+            tasks.append(revalidate_task)
         for task in tasks:
             task.cancel()
         await asyncio.gather(*tasks, return_exceptions=True)
         await cleanup(player)
+        await config.close_http_client()
         if sigterm_handler_installed:
             asyncio.get_running_loop().remove_signal_handler(signal.SIGTERM)
 
@@ -142,13 +186,16 @@ if __name__ == "__main__":
     try:
         player_id = os.getenv("RADIOPAD_PLAYER", "briceburg/living-room")
         registry_url = os.getenv("RADIOPAD_REGISTRY_URL", "https://registry.radiopad.dev/api")
+        cache_dir = os.getenv("RADIOPAD_CACHE_DIR", "tmp/cache")
         settings = {
             "player": player_id,
             "registry_url": registry_url,
             "radio_dial_url": os.getenv("RADIOPAD_RADIO_DIAL_URL", None),
             "switchboard_url": os.getenv("RADIOPAD_SWITCHBOARD_URL", None),
             "enable_discovery": os.getenv("RADIOPAD_ENABLE_DISCOVERY", "true").lower() == "true",
+            "cache": ConfigCache(cache_dir) if cache_dir else None,
         }
+        instant_start = os.getenv("RADIOPAD_INSTANT_START", "true").lower() == "true"
 
         # Initialize player and clients
         player = MpvPlayer(
@@ -167,7 +214,7 @@ if __name__ == "__main__":
         player.register_client(macropad_client)
 
         # Run the main event loop
-        asyncio.run(main(player, macropad_client, settings, health_path))
+        asyncio.run(main(player, macropad_client, settings, health_path, instant_start))
 
     except (KeyboardInterrupt, EOFError):
         logger.info("Application terminated gracefully.")
@@ -216,3 +216,22 @@ def test_send_drops_lost_macropad_connection_without_raising():
     assert writer.closed
     assert client.writer is None
     assert client.reader is None
+
+
+def test_radio_dial_update_reloads_config_and_pushes_station_menu():
+    player, client, writer = client_with_writer(register=True)
+    player.station = player.kgut
+    wwoz = RadioPadStation("WWOZ", "https://example.test/wwoz")
+    reloaded = RadioPadPlayerConfig(radio_dial_url="https://example.test/radio-dial", stations=[player.kgut, wwoz])
+    player.config_loader = AsyncMock(return_value=reloaded)
+
+    async def update():
+        await client.handle_message('{"event":"radio_dial_updated","data":{"radio_dial":"community/briceburg"}}')
+        await client.handle_message('{"event":"radio_dial_updated","data":{"radio_dial":"community/briceburg"}}')
+        await player._config_reload
+
+    asyncio.run(update())
+
+    assert player.config is reloaded
+    assert player.station is player.kgut
+    assert written_events(writer) == [event("station_menu", ["KGUT", "WWOZ"])]
@@ -0,0 +1,100 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import httpx2
+
+import lib.config as config
+import player as player_main
+from lib.cache import ConfigCache
+from lib.exceptions import ConfigError
+
+RADIO_DIAL_URL = "https://registry.example.test/api/accounts/community/radio-dials/briceburg"
+RADIO_DIAL = {"stations": [{"call_sign": "KEXP", "stream_url": "https://example.test/kexp"}]}
+SETTINGS = {
+    "player": "briceburg/living-room",
+    "registry_url": "https://registry.example.test/api",
+    "radio_dial_url": RADIO_DIAL_URL,
+    "switchboard_url": "wss://registry.example.test/switchboard/briceburg/living-room",
+    "enable_discovery": False,
+}
+
+
+def run_with_registry(coro_factory, requests):
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx2.Response(304)
+        return httpx2.Response(200, json=RADIO_DIAL, headers={"ETag": '"v1"'})
+
+    async def run():
+        client = httpx2.AsyncClient(transport=httpx2.MockTransport(handler))
+        with patch("lib.config.http_client", return_value=client):
+            try:
+                return await coro_factory()
+            finally:
+                await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_refresh_revalidates_cached_radio_dial_by_etag(tmp_path):
+    cache = ConfigCache(tmp_path)
+    requests: list[httpx2.Request] = []
+
+    first = run_with_registry(lambda: config.fetch_json_url(RADIO_DIAL_URL, cache=cache), requests)
+    second = run_with_registry(lambda: config.fetch_json_url(RADIO_DIAL_URL, cache=cache), requests)
+
+    assert first == second == RADIO_DIAL
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+
+
+def test_make_saves_configuration_for_instant_start(tmp_path):
+    cache = ConfigCache(tmp_path)
+    assert config.load_cached(**SETTINGS, cache=cache) is None
+
+    made = run_with_registry(lambda: config.make(**SETTINGS, cache=cache), [])
+
+    assert config.load_cached(**SETTINGS, cache=ConfigCache(tmp_path)) == made
+    assert config.load_cached(**{**SETTINGS, "player": "briceburg/kitchen"}, cache=cache) is None
+
+
+def _flaky_registry(config_after_failure):
+    calls = []
+
+    async def make(**settings):
+        calls.append(settings)
+        if len(calls) == 1:
+            raise ConfigError("registry down")
+        return config_after_failure
+
+    return make
+
+
+def _load_config(revalidating):
+    player = SimpleNamespace(config=object(), apply_config=AsyncMock())
+    macropad_client = SimpleNamespace(publish_status=AsyncMock())
+    loaded = object()
+    with (
+        patch("lib.config.make", _flaky_registry(loaded)),
+        patch("player.CONFIG_RETRY_SECONDS", 0),
+    ):
+        result = asyncio.run(
+            player_main._load_config_with_retry(
+                player, macropad_client, SETTINGS, asyncio.Event(), revalidating=revalidating
+            )
+        )
+    assert result is loaded
+    return [call.args for call in macropad_client.publish_status.await_args_list]
+
+
+def test_failed_revalidation_of_a_cached_configuration_is_not_a_warning():
+    assert _load_config(revalidating=True) == [("radio_dial", "ok", None)]
+
+
+def test_cold_start_warns_while_the_registry_is_unavailable():
+    assert _load_config(revalidating=False) == [
+        ("radio_dial", "warning", "Registry unavailable"),
+        ("radio_dial", "ok", None),
+    ]
@@ -39,6 +39,11 @@ if [ "$#" -gt 0 ]; then
     exec "$@"
 fi
 
+if [ "${REGISTRY_PROFILES:-}" = "switchboard" ] && [ -n "${REGISTRY_SWITCHBOARD_WORKERS:-}" ]; then
+    echo "starting switchboard supervisor: $REGISTRY_SWITCHBOARD_WORKERS workers" >&2
+    exec python -m switchboard.supervisor
+fi
+
 UVICORN_ARGS="registry:app --host $REGISTRY_BIND_HOST --port $REGISTRY_BIND_PORT --log-level $REGISTRY_LOG_LEVEL"
 
 if [ "${REGISTRY_ENV:-production}" = "development" ]; then
@@ -26,6 +26,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         if not hasattr(app.state, "store"):
             ds = DataStore()
             ds.seed()
+            ds.rebuild_indexes()
             app.state.store = ds  # expose for dependencies
         if not hasattr(app.state, "auth"):
             app.state.auth = AuthServices.from_env()
@@ -38,7 +39,11 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         http_client = httpx2.AsyncClient(timeout=5.0)
         app.state.http_client = http_client
 
-        broadcast = Broadcast()
+        broadcast = Broadcast.from_env()
+    elif "api" in profiles and os.environ.get("REGISTRY_SWITCHBOARD_RELAY"):
+        # Publish-only, so events such as radio_dial_updated reach players on the switchboard processes.
+        broadcast = Broadcast.from_env()
+    if broadcast:
         await broadcast.connect()
         app.state.broadcast = broadcast
 
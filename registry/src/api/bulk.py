@@ -0,0 +1,244 @@
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import NoReturn
+
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+from datastore import DataStore
+from lib.constants import MAX_BATCH_SIZE, MAX_PER_PAGE
+from lib.keys import join_key, split_key
+from models import AccountSpec, PlayerSpec, RadioDialSpec, StationSpec
+from switchboard.broadcast import Broadcast
+from switchboard.switchboard import notify_radio_dial_updated
+
+from .exceptions import NotFoundError
+from .models import (
+    EXPORT_RECORD_ADAPTER,
+    AccountExportRecord,
+    AccountRecord,
+    ImportSummary,
+    PlayerRecord,
+    RadioDialRecord,
+    StationRecord,
+)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Longest NDJSON line an import accepts, enough for a RadioDial listing thousands of Stations.
+MAX_LINE_BYTES = 1024 * 1024
+# An account record and a full batch of each other kind.
+MAX_RECORDS = 1 + 3 * MAX_BATCH_SIZE
+
+
+async def notify_radio_dials(ds: DataStore, broadcast: Broadcast | None, radio_dial_keys: Iterable[str]) -> None:
+    """Tell the players of each RadioDial, once per RadioDial, to reload it."""
+    if broadcast is None:
+        return
+    for key in dict.fromkeys(radio_dial_keys):
+        await notify_radio_dial_updated(broadcast, await ds.aio.players.using_radio_dial(key), key)
+
+
+async def export_account(ds: DataStore, account_id: str) -> AsyncIterator[bytes]:
+    """Yield an account, its Stations, RadioDials, and players as NDJSON lines, one page read at a time."""
+    account = await ds.aio.accounts.get(account_id)
+    if account is None:
+        return
+    yield _line(AccountRecord(spec=_spec(AccountSpec, account)))
+
+    async for station in _each(
+        lambda after: ds.aio.stations.list(account_id, per_page=MAX_PER_PAGE, after=after),
+        key=lambda station: station.call_sign,
+    ):
+        yield _line(StationRecord(id=station.call_sign, spec=_spec(StationSpec, station)))
+
+    path_params = {"account_id": account_id}
+    async for radio_dial in _each(
+        lambda after: ds.aio.radio_dials.list(path_params=path_params, per_page=MAX_PER_PAGE, after=after),
+        key=lambda radio_dial: radio_dial.id,
+    ):
+        yield _line(RadioDialRecord(id=radio_dial.id, spec=_spec(RadioDialSpec, radio_dial)))
+
+    async for player in _each(
+        lambda after: ds.aio.players.list(path_params=path_params, per_page=MAX_PER_PAGE, after=after),
+        key=lambda player: player.id,
+    ):
+        yield _line(PlayerRecord(id=player.id, spec=_spec(PlayerSpec, player)))
+
+
+async def read_records(chunks: AsyncIterator[bytes]) -> list[AccountExportRecord]:
+    """Parse an NDJSON request body into export records; blank lines are ignored.
+
+    The body is rejected as soon as it holds a line longer than MAX_LINE_BYTES, more than
+    MAX_RECORDS lines, or more than MAX_BATCH_SIZE records of one kind, without reading the rest.
+
+    Raises:
+        RequestValidationError: With the 1-based line number in each error location.
+    """
+    records: list[AccountExportRecord] = []
+    errors: list[dict[str, object]] = []
+    kinds: Counter[str] = Counter()
+    line_number = 0
+    nonblank = 0
+    pending = b""
+
+    def reject(message: str) -> NoReturn:
+        raise RequestValidationError([*errors, {**_error(message), "loc": ("body", line_number)}])
+
+    def parse(line: bytes) -> None:
+        nonlocal nonblank
+        if len(line) > MAX_LINE_BYTES:
+            reject(f"Lines can be at most {MAX_LINE_BYTES} bytes long")
+        if not line.strip():
+            return
+        nonblank += 1
+        if nonblank > MAX_RECORDS:
+            reject(f"At most {MAX_RECORDS} records can be imported at once")
+        try:
+            record = EXPORT_RECORD_ADAPTER.validate_json(line)
+        except ValidationError as e:
+            for error in e.errors(include_url=False, include_context=False, include_input=False):
+                errors.append({**error, "loc": ("body", line_number, *error["loc"])})
+            return
+        kinds[record.kind] += 1
+        if kinds[record.kind] > MAX_BATCH_SIZE:
+            reject(f"At most {MAX_BATCH_SIZE} {record.kind} records can be imported at once")
+        records.append(record)
+
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_number += 1
+            parse(line)
+        if len(pending) > MAX_LINE_BYTES:
+            line_number += 1
+            parse(pending)
+    line_number += 1
+    parse(pending)
+
+    if errors:
+        raise RequestValidationError(errors)
+    return records
+
+
+@dataclass
+class _Import:
+    account: AccountSpec | None = None
+    stations: dict[str, StationSpec] = field(default_factory=dict)
+    radio_dials: dict[str, RadioDialSpec] = field(default_factory=dict)
+    players: dict[str, PlayerSpec] = field(default_factory=dict)
+
+
+async def import_account(
+    ds: DataStore, account_id: str, records: list[AccountExportRecord], broadcast: Broadcast | None
+) -> ImportSummary:
+    """Write an account's records with one write per document, as one commit where the backend supports it.
+
+    Every reference is checked before anything is written: RadioDials may list Stations from
+    the import or already stored, and players may use RadioDials from the import or already stored.
+    """
+    imported = _collect(records)
+    station_keys = {join_key(account_id, call_sign) for call_sign in imported.stations}
+    external_stations = [
+        key for spec in imported.radio_dials.values() for key in spec.stations if key not in station_keys
+    ]
+    _, missing = await ds.aio.stations.resolve(list(dict.fromkeys(external_stations)))
+    if missing:
+        raise NotFoundError("RadioDial references a missing station", details={"station_key": missing[0]})
+
+    radio_dial_keys = {join_key(account_id, radio_dial_id) for radio_dial_id in imported.radio_dials}
+    for spec in imported.players.values():
+        if spec.radio_dial is None or spec.radio_dial in radio_dial_keys:
+            continue
+        radio_dial_account_id, radio_dial_id = split_key(spec.radio_dial)
+        if await ds.aio.radio_dials.version(radio_dial_id, path_params={"account_id": radio_dial_account_id}) is None:
+            raise NotFoundError("RadioDial not found", details={"radio_dial": spec.radio_dial})
+
+    await asyncio.to_thread(_write, ds, account_id, imported)
+
+    if broadcast is not None:
+        using_stations = await asyncio.to_thread(
+            lambda: [key for station_key in sorted(station_keys) for key in ds.radio_dials.using_station(station_key)]
+        )
+        await notify_radio_dials(ds, broadcast, [*sorted(radio_dial_keys), *using_stations])
+        for player_id, spec in imported.players.items():
+            if spec.radio_dial is not None:
+                await notify_radio_dial_updated(broadcast, [join_key(account_id, player_id)], spec.radio_dial)
+
+    return ImportSummary(
+        accounts=int(imported.account is not None),
+        stations=len(imported.stations),
+        radio_dials=len(imported.radio_dials),
+        players=len(imported.players),
+    )
+
+
+def _collect(records: Iterable[AccountExportRecord]) -> _Import:
+    imported = _Import()
+    errors: list[dict[str, object]] = []
+    for record in records:
+        match record:
+            case AccountRecord():
+                duplicate = imported.account is not None and "account"
+                imported.account = record.spec
+            case StationRecord():
+                duplicate = record.id in imported.stations and record.id
+                imported.stations[record.id] = record.spec
+            case RadioDialRecord():
+                duplicate = record.id in imported.radio_dials and record.id
+                imported.radio_dials[record.id] = record.spec
+            case PlayerRecord():
+                duplicate = record.id in imported.players and record.id
+                imported.players[record.id] = record.spec
+        if duplicate:
+            errors.append(_error(f"Duplicate {record.kind} record: {duplicate}"))
+    for kind, count in (
+        ("station", len(imported.stations)),
+        ("radio_dial", len(imported.radio_dials)),
+        ("player", len(imported.players)),
+    ):
+        if count > MAX_BATCH_SIZE:
+            errors.append(_error(f"At most {MAX_BATCH_SIZE} {kind} records can be imported at once"))
+    if errors:
+        raise RequestValidationError(errors)
+    return imported
+
+
+def _write(ds: DataStore, account_id: str, imported: _Import) -> None:
+    path_params = {"account_id": account_id}
+    with ds.transaction():
+        if imported.account is not None:
+            ds.accounts.upsert(account_id, imported.account)
+        elif not ds.accounts.exists(account_id):
+            ds.accounts.upsert(account_id, AccountSpec(name=account_id))
+        if imported.stations:
+            ds.stations.upsert_many(account_id, imported.stations)
+        for radio_dial_id, radio_dial_spec in imported.radio_dials.items():
+            ds.radio_dials.upsert(radio_dial_id, radio_dial_spec, path_params=path_params)
+        for player_id, player_spec in imported.players.items():
+            ds.players.upsert(player_id, player_spec, path_params=path_params)
+
+
+def _error(message: str) -> dict[str, object]:
+    return {"type": "value_error", "loc": ("body",), "msg": message}
+
+
+def _spec[S: BaseModel](spec_type: type[S], model: BaseModel) -> S:
+    return spec_type.model_validate(model.model_dump(include=set(spec_type.model_fields)))
+
+
+def _line(record: BaseModel) -> bytes:
+    return record.model_dump_json(exclude_none=True).encode("utf-8") + b"\n"
+
+
+async def _each[T](fetch: Callable[[str | None], Awaitable[list[T]]], key: Callable[[T], str]) -> AsyncIterator[T]:
+    after: str | None = None
+    while True:
+        items = await fetch(after)
+        for item in items:
+            yield item
+        if len(items) < MAX_PER_PAGE:
+            return
+        after = key(items[-1])
@@ -1,7 +1,15 @@
+import bisect
+import hashlib
+from collections.abc import Awaitable, Callable
+
+from fastapi import Response
+from pydantic import BaseModel
+
 from datastore import DataStore
 from models import AccountSpec
 
 from .exceptions import NotFoundError
+from .models import PaginationParams, encode_cursor
 
 
 def get_or_404[T](item: T | None, message: str = "Resource not found", **details: str) -> T:
@@ -10,7 +18,90 @@ def get_or_404[T](item: T | None, message: str = "Resource not found", **details
     return item
 
 
-def ensure_account(ds: DataStore, account_id: str) -> None:
+async def fetch_page[T](
+    paging: PaginationParams,
+    fetch: Callable[[int, int, str | None], Awaitable[list[T]]],
+    key: Callable[[T], str],
+) -> tuple[list[T], str | None]:
+    """Fetch one page through ``fetch(page, per_page, after)`` and the cursor that follows it.
+
+    The returned cursor is None only when nothing follows the page, so ``has_next`` is exact.
+    """
+    if paging.cursor is not None:
+        items = await fetch(1, paging.per_page + 1, paging.after)
+        more = len(items) > paging.per_page
+        items = items[: paging.per_page]
+    else:
+        items = await fetch(paging.page, paging.per_page, None)
+        # Offset pages cannot over-fetch without shifting later pages; probe the next key instead.
+        more = len(items) == paging.per_page and bool(await fetch(1, 1, key(items[-1])))
+    return items, encode_cursor(key(items[-1])) if more else None
+
+
+def keys_page(keys: list[str]) -> Callable[[int, int, str | None], Awaitable[list[str]]]:
+    """Adapt an already sorted key list to the ``fetch`` argument of fetch_page."""
+
+    async def fetch(page: int, per_page: int, after: str | None) -> list[str]:
+        start = bisect.bisect_right(keys, after) if after is not None else max(0, (page - 1) * per_page)
+        return keys[start : start + per_page]
+
+    return fetch
+
+
+async def ensure_account(ds: DataStore, account_id: str) -> None:
     """Create the owning account on its first account-scoped write."""
-    if not ds.accounts.exists(account_id):
-        ds.accounts.upsert(account_id, AccountSpec(name=account_id))
+    if not await ds.aio.accounts.exists(account_id):
+        await ds.aio.accounts.upsert(account_id, AccountSpec(name=account_id))
+
+
+def quote_etag(version: str) -> str:
+    """Render a stored document version as a strong HTTP entity tag.
+
+    S3 versions are entity tags already and keep their quotes rather than gaining a second pair.
+    """
+    return f'"{version.strip('"')}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return True when an If-None-Match header selects ``etag`` (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def client_holds(if_none_match: str | None) -> Callable[[str], bool]:
+    """Predicate for store ``unless=`` arguments: is this stored version the one the client sent?"""
+    return lambda version: etag_matches(if_none_match, quote_etag(version))
+
+
+def conditional_or_404[T](
+    found: tuple[T | None, str | None], response: Response, message: str = "Resource not found", **details: str
+) -> T | Response:
+    """Resolve a store's ``get_with_version`` result into the item, a 304, or a NotFoundError.
+
+    The item is returned with its ETag set on ``response``.
+    """
+    item, version = found
+    if version is None:
+        raise NotFoundError(message, details=details)
+    etag = quote_etag(version)
+    if item is None:
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return item
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def conditional_json(content: BaseModel, if_none_match: str | None, *, exclude_none: bool = False) -> Response:
+    """Serialize ``content`` with an ETag over its body, answering 304 when the client already has it."""
+    body = content.model_dump_json(exclude_none=exclude_none).encode("utf-8")
+    etag = quote_etag(hashlib.sha256(body).hexdigest())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
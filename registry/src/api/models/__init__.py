@@ -1,9 +1,35 @@
+from .bulk import (
+    EXPORT_RECORD_ADAPTER,
+    AccountExportRecord,
+    AccountRecord,
+    ImportSummary,
+    PlayerRecord,
+    RadioDialBatch,
+    RadioDialBatchItem,
+    RadioDialRecord,
+    StationBatch,
+    StationBatchItem,
+    StationRecord,
+)
 from .error import ErrorDetail
-from .pagination import PaginatedList, PaginationLinks, PaginationParams
+from .pagination import PaginatedList, PaginationLinks, PaginationParams, decode_cursor, encode_cursor
 
 __all__ = [
+    "EXPORT_RECORD_ADAPTER",
+    "AccountExportRecord",
+    "AccountRecord",
     "ErrorDetail",
+    "ImportSummary",
     "PaginatedList",
     "PaginationLinks",
     "PaginationParams",
+    "PlayerRecord",
+    "RadioDialBatch",
+    "RadioDialBatchItem",
+    "RadioDialRecord",
+    "StationBatch",
+    "StationBatchItem",
+    "StationRecord",
+    "decode_cursor",
+    "encode_cursor",
 ]
@@ -0,0 +1,109 @@
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
+
+from lib.constants import MAX_BATCH_SIZE
+from lib.types import CallSign, Slug
+from models import AccountSpec, PlayerSpec, RadioDialSpec, StationSpec
+
+
+class StationBatchItem(StationSpec):
+    """A Station specification together with the call sign it is registered under."""
+
+    call_sign: CallSign = Field(..., json_schema_extra={"example": "WWOZ"})
+
+
+class StationBatch(BaseModel):
+    """Stations to register together, with one write per stations shard they fall in."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    stations: list[StationBatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+    @model_validator(mode="after")
+    def _ensure_unique_call_signs(self) -> "StationBatch":
+        _ensure_unique("call sign", [station.call_sign for station in self.stations])
+        return self
+
+
+class RadioDialBatchItem(RadioDialSpec):
+    """A RadioDial specification together with its id."""
+
+    id: Slug = Field(..., json_schema_extra={"example": "briceburg"})
+
+
+class RadioDialBatch(BaseModel):
+    """RadioDials to register together, committed at once where the backend supports it."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    radio_dials: list[RadioDialBatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+    @model_validator(mode="after")
+    def _ensure_unique_ids(self) -> "RadioDialBatch":
+        _ensure_unique("RadioDial id", [radio_dial.id for radio_dial in self.radio_dials])
+        return self
+
+
+class AccountRecord(BaseModel):
+    """NDJSON export line holding the account itself."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    kind: Literal["account"] = "account"
+    spec: AccountSpec
+
+
+class StationRecord(BaseModel):
+    """NDJSON export line holding one Station, keyed by call sign."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    kind: Literal["station"] = "station"
+    id: CallSign
+    spec: StationSpec
+
+
+class RadioDialRecord(BaseModel):
+    """NDJSON export line holding one RadioDial specification."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    kind: Literal["radio_dial"] = "radio_dial"
+    id: Slug
+    spec: RadioDialSpec
+
+
+class PlayerRecord(BaseModel):
+    """NDJSON export line holding one player specification."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    kind: Literal["player"] = "player"
+    id: Slug
+    spec: PlayerSpec
+
+
+type AccountExportRecord = Annotated[
+    AccountRecord | StationRecord | RadioDialRecord | PlayerRecord, Field(discriminator="kind")
+]
+"""One line of an account export, as produced by ``GET /accounts/{id}:export`` and read by ``:import``."""
+
+EXPORT_RECORD_ADAPTER: TypeAdapter[AccountExportRecord] = TypeAdapter(AccountExportRecord)
+
+
+class ImportSummary(BaseModel):
+    """Number of resources of each kind written by an import."""
+
+    accounts: int = 0
+    stations: int = 0
+    radio_dials: int = 0
+    players: int = 0
+
+
+def _ensure_unique(label: str, values: list[str]) -> None:
+    seen: set[str] = set()
+    for value in values:
+        if value in seen:
+            raise ValueError(f"Duplicate {label}: {value}")
+        seen.add(value)
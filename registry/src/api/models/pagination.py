@@ -1,3 +1,5 @@
+import base64
+import binascii
 from typing import TypeVar
 
 from pydantic import BaseModel, Field, model_validator
@@ -5,9 +7,35 @@ from pydantic import BaseModel, Field, model_validator
 T = TypeVar("T")
 
 
+def encode_cursor(key: str) -> str:
+    """Encode the key of the last listed item as an opaque, URL-safe cursor."""
+    return base64.urlsafe_b64encode(key.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Return the key encoded by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor was not produced by encode_cursor.
+    """
+    try:
+        key = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not key or encode_cursor(key) != cursor:
+        raise ValueError("Invalid cursor")
+    return key
+
+
 class PaginationParams(BaseModel):
     page: int = 1
     per_page: int = 10
+    cursor: str | None = None
+
+    @property
+    def after(self) -> str | None:
+        """Key of the last item already seen, when paging by cursor."""
+        return decode_cursor(self.cursor) if self.cursor else None
 
 
 class PaginationLinks(BaseModel):
@@ -20,18 +48,27 @@ class PaginatedList[T](BaseModel):
     page: int
     per_page: int
     links: PaginationLinks | None = None
+    next_cursor: str | None = None
 
     # Derived fields populated post-validation (excluded from serialization)
     has_next: bool = Field(False, exclude=True)
     has_prev: bool = Field(False, exclude=True)
     next_page: int | None = Field(None, exclude=True)
     prev_page: int | None = Field(None, exclude=True)
+    cursor: str | None = Field(None, exclude=True)
 
     @model_validator(mode="after")
     def _compute(self) -> "PaginatedList[T]":
-        # "has_next" is true if the number of items returned is equal to the requested page size.
-        # This is a common heuristic for cursor-style pagination.
-        self.has_next = len(self.items) == self.per_page
+        # "has_next" is exact: routes look one item past the page before setting next_cursor.
+        self.has_next = self.next_cursor is not None
+        if self.cursor is not None:
+            # Cursor pages only link forward; the previous cursor is not known.
+            self.has_prev = False
+            self.next_page = self.prev_page = None
+            nxt = f"?cursor={self.next_cursor}&per_page={self.per_page}" if self.next_cursor else None
+            self.links = PaginationLinks(prev=None, next=nxt)
+            return self
+
         self.has_prev = self.page > 1
         self.next_page = self.page + 1 if self.has_next else None
         self.prev_page = self.page - 1 if self.has_prev else None
@@ -46,5 +83,13 @@ class PaginatedList[T](BaseModel):
         return self
 
     @classmethod
-    def from_paged(cls, items: list[T], page: int, per_page: int) -> "PaginatedList[T]":
-        return cls.model_validate({"items": items, "page": page, "per_page": per_page})
+    def from_paged(cls, items: list[T], paging: PaginationParams, *, next_cursor: str | None) -> "PaginatedList[T]":
+        return cls.model_validate(
+            {
+                "items": items,
+                "page": paging.page,
+                "per_page": paging.per_page,
+                "next_cursor": next_cursor,
+                "cursor": paging.cursor,
+            }
+        )
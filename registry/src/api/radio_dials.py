@@ -1,13 +1,83 @@
+import hashlib
+from dataclasses import dataclass
+
+from cachetools import LRUCache
+
 from datastore import DataStore
-from lib.types import RadioDialKey
+from lib.keys import join_key
+from lib.types import RadioDialKey, StationKey
 from models import RadioDial, RadioDialSpec, RadioDialSummary, Station
 
 from .exceptions import NotFoundError
 
 
-def resolve_station_refs(ds: DataStore, spec: RadioDialSpec) -> list[Station]:
-    """Resolve Station references with one aggregate read per referenced account."""
-    stations, missing = ds.stations.resolve(spec.stations)
+@dataclass(frozen=True, slots=True)
+class RenderedRadioDial:
+    """A materialized RadioDial serialized once, with the stored versions it was built from."""
+
+    body: bytes
+    etag: str
+    radio_dial_version: str
+    station_keys: list[StationKey]
+    station_versions: list[str | None]
+
+
+class RadioDialViews:
+    """Rendered RadioDial responses, reused while the RadioDial and its stations are unchanged.
+
+    A lookup re-reads only the ETags of the stored RadioDial and of each stations shard holding
+    a referenced Station. When they match the entry, the pre-rendered bytes are served without
+    resolving stations or running Pydantic; any write, from this worker or another, changes
+    an ETag and the next lookup renders again.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self._views: LRUCache[RadioDialKey, RenderedRadioDial] = LRUCache(maxsize=max_entries)
+
+    async def get(self, ds: DataStore, account_id: str, radio_dial_id: str) -> RenderedRadioDial:
+        key = join_key(account_id, radio_dial_id)
+        path_params = {"account_id": account_id}
+        version = await ds.aio.radio_dials.version(radio_dial_id, path_params=path_params)
+        if version is None:
+            self._views.pop(key, None)
+            raise NotFoundError(
+                "RadioDial not found",
+                details={"account_id": account_id, "radio_dial_id": radio_dial_id},
+            )
+
+        view = self._views.get(key)
+        if (
+            view is not None
+            and view.radio_dial_version == version
+            and await ds.aio.stations.versions(view.station_keys) == view.station_versions
+        ):
+            return view
+
+        stored = await ds.aio.radio_dials.get(radio_dial_id, path_params=path_params)
+        if stored is None:
+            raise NotFoundError(
+                "RadioDial not found",
+                details={"account_id": account_id, "radio_dial_id": radio_dial_id},
+            )
+        # Versions are read before the stations they describe, so a concurrent write can only
+        # make the entry look older than its content and cause one extra render, never a stale hit.
+        station_versions = await ds.aio.stations.versions(stored.stations)
+        stations = await resolve_station_refs(ds, stored)
+        body = materialize_radio_dial(key, stored, stations).model_dump_json(exclude_none=True).encode("utf-8")
+        view = RenderedRadioDial(
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()}"',
+            radio_dial_version=version,
+            station_keys=stored.stations,
+            station_versions=station_versions,
+        )
+        self._views[key] = view
+        return view
+
+
+async def resolve_station_refs(ds: DataStore, spec: RadioDialSpec) -> list[Station]:
+    """Resolve Station references with one read per stations shard they fall in."""
+    stations, missing = await ds.aio.stations.resolve(spec.stations)
     if missing:
         raise NotFoundError(
             "RadioDial references a missing station",
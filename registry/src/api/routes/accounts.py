@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import StreamingResponse
 
 from models import Account, AccountSpec
 
 from ..auth import require_account_owner
-from ..helpers import get_or_404
-from ..models import PaginatedList
+from ..bulk import NDJSON_MEDIA_TYPE, export_account, import_account, read_records
+from ..helpers import client_holds, conditional_json, conditional_or_404, fetch_page, get_or_404
+from ..models import ImportSummary, PaginatedList
 from ..responses import ERROR_409
-from ..types import DS, AccountId, PageParams
+from ..types import DS, AccountId, IfNoneMatch, PageParams, SwitchboardBroadcast
 
 router = APIRouter(prefix="/accounts")
 
@@ -18,21 +20,63 @@ async def register_account(
     account_spec: AccountSpec,
     _identity: object = Depends(require_account_owner),
 ) -> Account:
-    return ds.accounts.upsert(account_id, account_spec)
+    return await ds.aio.accounts.upsert(account_id, account_spec)
+
+
+# Declared before "/{account_id}", whose path parameter would otherwise swallow the ":export" suffix.
+@router.get(
+    "/{account_id}:export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "One JSON record per line"}},
+)
+async def export_account_records(account_id: AccountId, ds: DS) -> StreamingResponse:
+    """Stream the account, its Stations, RadioDials, and players as NDJSON, in the format `:import` accepts."""
+    get_or_404(await ds.aio.accounts.version(account_id), "Account not found", account_id=account_id)
+    return StreamingResponse(export_account(ds, account_id), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.post(
+    "/{account_id}:import",
+    response_model=ImportSummary,
+    responses=ERROR_409,
+    openapi_extra={"requestBody": {"required": True, "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}}}},
+)
+async def import_account_records(
+    account_id: AccountId,
+    ds: DS,
+    request: Request,
+    broadcast: SwitchboardBroadcast,
+    _identity: object = Depends(require_account_owner),
+) -> ImportSummary:
+    """Create or replace an account's resources from an `:export` stream, with one write per document."""
+    records = await read_records(request.stream())
+    return await import_account(ds, account_id, records, broadcast)
 
 
 @router.get("/{account_id}", response_model=Account)
 async def get_account(
     account_id: AccountId,
     ds: DS,
-) -> Account:
-    return get_or_404(ds.accounts.get(account_id), "Account not found", account_id=account_id)
+    response: Response,
+    if_none_match: IfNoneMatch = None,
+) -> Account | Response:
+    return conditional_or_404(
+        await ds.aio.accounts.get_with_version(account_id, unless=client_holds(if_none_match)),
+        response,
+        "Account not found",
+        account_id=account_id,
+    )
 
 
 @router.get("/", response_model=PaginatedList[Account])
 async def list_accounts(
     ds: DS,
     paging: PageParams,
-) -> PaginatedList[Account]:
-    accounts = ds.accounts.list(page=paging.page, per_page=paging.per_page)
-    return PaginatedList.from_paged(accounts, page=paging.page, per_page=paging.per_page)
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    accounts, next_cursor = await fetch_page(
+        paging,
+        lambda page, per_page, after: ds.aio.accounts.list(page=page, per_page=per_page, after=after),
+        key=lambda account: account.id,
+    )
+    return conditional_json(PaginatedList.from_paged(accounts, paging, next_cursor=next_cursor), if_none_match)
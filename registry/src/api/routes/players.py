@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
-from lib.keys import split_key
+from lib.keys import join_key, split_key
 from models import Player, PlayerSpec, PlayerSummary
+from switchboard.switchboard import notify_radio_dial_updated
 
 from ..auth import require_account_owner
-from ..helpers import ensure_account, get_or_404
+from ..helpers import client_holds, conditional_json, conditional_or_404, ensure_account, fetch_page, get_or_404
 from ..models import PaginatedList
 from ..responses import ERROR_409
-from ..types import DS, AccountId, PageParams, PlayerId
+from ..types import DS, AccountId, IfNoneMatch, PageParams, PlayerId, SwitchboardBroadcast
 
 router = APIRouter(prefix="/accounts/{account_id}/players")
 
@@ -18,17 +19,22 @@ async def register_player(
     player_id: PlayerId,
     ds: DS,
     player_spec: PlayerSpec,
+    broadcast: SwitchboardBroadcast,
     _identity: object = Depends(require_account_owner),
 ) -> Player:
     if player_spec.radio_dial is not None:
         radio_dial_account_id, radio_dial_id = split_key(player_spec.radio_dial)
         get_or_404(
-            ds.radio_dials.get(radio_dial_id, path_params={"account_id": radio_dial_account_id}),
+            await ds.aio.radio_dials.get(radio_dial_id, path_params={"account_id": radio_dial_account_id}),
             "RadioDial not found",
             radio_dial=player_spec.radio_dial,
         )
-    ensure_account(ds, account_id)
-    return ds.players.upsert(player_id, player_spec, path_params={"account_id": account_id})
+    await ensure_account(ds, account_id)
+    player = await ds.aio.players.upsert(player_id, player_spec, path_params={"account_id": account_id})
+    if broadcast is not None and player.radio_dial is not None:
+        # The player may have been moved to another RadioDial; let it reload either way.
+        await notify_radio_dial_updated(broadcast, [join_key(account_id, player_id)], player.radio_dial)
+    return player
 
 
 @router.get("/{player_id}", response_model=Player)
@@ -36,9 +42,14 @@ async def get_player(
     account_id: AccountId,
     player_id: PlayerId,
     ds: DS,
-) -> Player:
-    return get_or_404(
-        ds.players.get(player_id, path_params={"account_id": account_id}),
+    response: Response,
+    if_none_match: IfNoneMatch = None,
+) -> Player | Response:
+    return conditional_or_404(
+        await ds.aio.players.get_with_version(
+            player_id, path_params={"account_id": account_id}, unless=client_holds(if_none_match)
+        ),
+        response,
         "Player not found",
         account_id=account_id,
         player_id=player_id,
@@ -50,11 +61,14 @@ async def list_players(
     account_id: AccountId,
     ds: DS,
     paging: PageParams,
-) -> PaginatedList[PlayerSummary]:
-    players = ds.players.list(
-        path_params={"account_id": account_id},
-        page=paging.page,
-        per_page=paging.per_page,
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    players, next_cursor = await fetch_page(
+        paging,
+        lambda page, per_page, after: ds.aio.players.list(
+            path_params={"account_id": account_id}, page=page, per_page=per_page, after=after
+        ),
+        key=lambda player: player.id,
     )
     summaries = [PlayerSummary.model_validate(player, from_attributes=True) for player in players]
-    return PaginatedList.from_paged(summaries, page=paging.page, per_page=paging.per_page)
+    return conditional_json(PaginatedList.from_paged(summaries, paging, next_cursor=next_cursor), if_none_match)
@@ -1,14 +1,19 @@
-from fastapi import APIRouter, Depends
+import asyncio
 
-from lib.keys import join_key
-from models import RadioDial, RadioDialSpec, RadioDialSummary
+from fastapi import APIRouter, Depends, Response
+
+from lib.keys import join_key, split_key
+from models import PlayerSummary, RadioDial, RadioDialSpec, RadioDialSummary
+from switchboard.switchboard import notify_radio_dial_updated
 
 from ..auth import require_account_owner
-from ..helpers import ensure_account, get_or_404
-from ..models import PaginatedList
+from ..bulk import notify_radio_dials
+from ..exceptions import NotFoundError
+from ..helpers import conditional_json, ensure_account, etag_matches, fetch_page, get_or_404, keys_page, not_modified
+from ..models import PaginatedList, RadioDialBatch
 from ..radio_dials import materialize_radio_dial, resolve_station_refs, summarize_radio_dial
 from ..responses import ERROR_409
-from ..types import DS, AccountId, PageParams, RadioDialId
+from ..types import DS, AccountId, IfNoneMatch, PageParams, RadioDialId, RadioDialViewCache, SwitchboardBroadcast
 
 router = APIRouter(prefix="/accounts/{account_id}/radio-dials")
 
@@ -24,16 +29,59 @@ async def register_radio_dial(
     radio_dial_id: RadioDialId,
     ds: DS,
     radio_dial_spec: RadioDialSpec,
+    broadcast: SwitchboardBroadcast,
     _identity: object = Depends(require_account_owner),
 ) -> RadioDial:
-    stations = resolve_station_refs(ds, radio_dial_spec)
-    ensure_account(ds, account_id)
-    stored = ds.radio_dials.upsert(
+    stations = await resolve_station_refs(ds, radio_dial_spec)
+    await ensure_account(ds, account_id)
+    stored = await ds.aio.radio_dials.upsert(
         radio_dial_id,
         radio_dial_spec,
         path_params={"account_id": account_id},
     )
-    return materialize_radio_dial(join_key(account_id, radio_dial_id), stored, stations)
+    key = join_key(account_id, radio_dial_id)
+    if broadcast is not None:
+        await notify_radio_dial_updated(broadcast, await ds.aio.players.using_radio_dial(key), key)
+    return materialize_radio_dial(key, stored, stations)
+
+
+@router.post(
+    ":batch",
+    response_model=list[RadioDial],
+    response_model_exclude_none=True,
+    responses=ERROR_409,
+)
+async def register_radio_dials(
+    account_id: AccountId,
+    ds: DS,
+    batch: RadioDialBatch,
+    broadcast: SwitchboardBroadcast,
+    _identity: object = Depends(require_account_owner),
+) -> list[RadioDial]:
+    """Register several RadioDials, committed together where the backend supports it."""
+    specs: dict[str, RadioDialSpec] = {item.id: item for item in batch.radio_dials}
+    resolved, missing = await ds.aio.stations.resolve(
+        list(dict.fromkeys(station_key for spec in specs.values() for station_key in spec.stations))
+    )
+    if missing:
+        raise NotFoundError("RadioDial references a missing station", details={"station_key": missing[0]})
+    stations = {station.key: station for station in resolved}
+    await ensure_account(ds, account_id)
+
+    def register() -> list[tuple[str, RadioDialSpec]]:
+        with ds.transaction():
+            return [
+                (radio_dial_id, ds.radio_dials.upsert(radio_dial_id, spec, path_params={"account_id": account_id}))
+                for radio_dial_id, spec in specs.items()
+            ]
+
+    stored = await asyncio.to_thread(register)
+    keys = [join_key(account_id, radio_dial_id) for radio_dial_id, _ in stored]
+    await notify_radio_dials(ds, broadcast, keys)
+    return [
+        materialize_radio_dial(key, spec, [stations[station_key] for station_key in spec.stations])
+        for key, (_, spec) in zip(keys, stored, strict=True)
+    ]
 
 
 @router.get("/{radio_dial_id}", response_model=RadioDial, response_model_exclude_none=True)
@@ -41,15 +89,13 @@ async def get_radio_dial(
     account_id: AccountId,
     radio_dial_id: RadioDialId,
     ds: DS,
-) -> RadioDial:
-    stored = get_or_404(
-        ds.radio_dials.get(radio_dial_id, path_params={"account_id": account_id}),
-        "RadioDial not found",
-        account_id=account_id,
-        radio_dial_id=radio_dial_id,
-    )
-    stations = resolve_station_refs(ds, stored)
-    return materialize_radio_dial(join_key(account_id, radio_dial_id), stored, stations)
+    views: RadioDialViewCache,
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    view = await views.get(ds, account_id, radio_dial_id)
+    if etag_matches(if_none_match, view.etag):
+        return not_modified(view.etag)
+    return Response(content=view.body, media_type="application/json", headers={"ETag": view.etag})
 
 
 @router.get("/", response_model=PaginatedList[RadioDialSummary], response_model_exclude_none=True)
@@ -57,13 +103,45 @@ async def list_radio_dials(
     account_id: AccountId,
     ds: DS,
     paging: PageParams,
-) -> PaginatedList[RadioDialSummary]:
-    stored = ds.radio_dials.list(
-        path_params={"account_id": account_id},
-        page=paging.page,
-        per_page=paging.per_page,
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    stored, next_cursor = await fetch_page(
+        paging,
+        lambda page, per_page, after: ds.aio.radio_dials.list(
+            path_params={"account_id": account_id}, page=page, per_page=per_page, after=after
+        ),
+        key=lambda radio_dial: radio_dial.id,
     )
     summaries = [
         summarize_radio_dial(join_key(radio_dial.account_id, radio_dial.id), radio_dial) for radio_dial in stored
     ]
-    return PaginatedList.from_paged(summaries, page=paging.page, per_page=paging.per_page)
+    return conditional_json(
+        PaginatedList.from_paged(summaries, paging, next_cursor=next_cursor), if_none_match, exclude_none=True
+    )
+
+
+@router.get("/{radio_dial_id}/players", response_model=PaginatedList[PlayerSummary])
+async def list_radio_dial_players(
+    account_id: AccountId,
+    radio_dial_id: RadioDialId,
+    ds: DS,
+    paging: PageParams,
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    """List the players assigned to a RadioDial, across all accounts."""
+    get_or_404(
+        await ds.aio.radio_dials.version(radio_dial_id, path_params={"account_id": account_id}),
+        "RadioDial not found",
+        account_id=account_id,
+        radio_dial_id=radio_dial_id,
+    )
+    keys = await ds.aio.players.using_radio_dial(join_key(account_id, radio_dial_id))
+    page_keys, next_cursor = await fetch_page(paging, keys_page(keys), key=lambda key: key)
+    players = await asyncio.gather(
+        *(
+            ds.aio.players.get(player_id, path_params={"account_id": player_account_id})
+            for player_account_id, player_id in map(split_key, page_keys)
+        )
+    )
+    summaries = [PlayerSummary.model_validate(player, from_attributes=True) for player in players if player]
+    return conditional_json(PaginatedList.from_paged(summaries, paging, next_cursor=next_cursor), if_none_match)
@@ -1,15 +1,28 @@
+import asyncio
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Response
 
+from lib.keys import join_key, split_key
 from lib.types import CallSign
-from models import Station, StationSpec
+from models import RadioDialSummary, Station, StationSpec
+from switchboard.switchboard import notify_radio_dial_updated
 
 from ..auth import require_account_owner
-from ..helpers import ensure_account, get_or_404
-from ..models import PaginatedList
+from ..bulk import notify_radio_dials
+from ..helpers import (
+    client_holds,
+    conditional_json,
+    conditional_or_404,
+    ensure_account,
+    fetch_page,
+    get_or_404,
+    keys_page,
+)
+from ..models import PaginatedList, StationBatch
+from ..radio_dials import summarize_radio_dial
 from ..responses import ERROR_409
-from ..types import DS, AccountId, PageParams
+from ..types import DS, AccountId, IfNoneMatch, PageParams, SwitchboardBroadcast
 
 router = APIRouter(prefix="/accounts/{account_id}/stations")
 
@@ -20,10 +33,38 @@ async def register_station(
     call_sign: Annotated[CallSign, Path(..., description="Canonical station call sign")],
     ds: DS,
     station_spec: StationSpec,
+    broadcast: SwitchboardBroadcast,
     _identity: object = Depends(require_account_owner),
 ) -> Station:
-    ensure_account(ds, account_id)
-    return ds.stations.upsert(account_id, call_sign, station_spec)
+    await ensure_account(ds, account_id)
+    station = await ds.aio.stations.upsert(account_id, call_sign, station_spec)
+    if broadcast is not None:
+        for radio_dial in await ds.aio.radio_dials.using_station(join_key(account_id, station.call_sign)):
+            await notify_radio_dial_updated(broadcast, await ds.aio.players.using_radio_dial(radio_dial), radio_dial)
+    return station
+
+
+@router.post(":batch", response_model=list[Station], responses=ERROR_409)
+async def register_stations(
+    account_id: AccountId,
+    ds: DS,
+    batch: StationBatch,
+    broadcast: SwitchboardBroadcast,
+    _identity: object = Depends(require_account_owner),
+) -> list[Station]:
+    """Register several Stations with one write per stations shard they fall in."""
+    await ensure_account(ds, account_id)
+    stations = await ds.aio.stations.upsert_many(
+        account_id, {item.call_sign: StationSpec(stream_url=item.stream_url) for item in batch.stations}
+    )
+    if broadcast is not None:
+        radio_dials = [
+            radio_dial
+            for station in stations
+            for radio_dial in await ds.aio.radio_dials.using_station(join_key(account_id, station.call_sign))
+        ]
+        await notify_radio_dials(ds, broadcast, radio_dials)
+    return stations
 
 
 @router.get("/{call_sign}", response_model=Station)
@@ -31,9 +72,12 @@ async def get_station(
     account_id: AccountId,
     call_sign: Annotated[CallSign, Path(..., description="Canonical station call sign")],
     ds: DS,
-) -> Station:
-    return get_or_404(
-        ds.stations.get(account_id, call_sign),
+    response: Response,
+    if_none_match: IfNoneMatch = None,
+) -> Station | Response:
+    return conditional_or_404(
+        await ds.aio.stations.get_with_version(account_id, call_sign, unless=client_holds(if_none_match)),
+        response,
         "Station not found",
         account_id=account_id,
         call_sign=call_sign,
@@ -41,6 +85,49 @@ async def get_station(
 
 
 @router.get("/", response_model=PaginatedList[Station])
-async def list_stations(account_id: AccountId, ds: DS, paging: PageParams) -> PaginatedList[Station]:
-    stations = ds.stations.list(account_id, page=paging.page, per_page=paging.per_page)
-    return PaginatedList.from_paged(stations, page=paging.page, per_page=paging.per_page)
+async def list_stations(
+    account_id: AccountId, ds: DS, paging: PageParams, if_none_match: IfNoneMatch = None
+) -> Response:
+    stations, next_cursor = await fetch_page(
+        paging,
+        lambda page, per_page, after: ds.aio.stations.list(account_id, page=page, per_page=per_page, after=after),
+        key=lambda station: station.call_sign,
+    )
+    return conditional_json(PaginatedList.from_paged(stations, paging, next_cursor=next_cursor), if_none_match)
+
+
+@router.get(
+    "/{call_sign}/radio-dials",
+    response_model=PaginatedList[RadioDialSummary],
+    response_model_exclude_none=True,
+)
+async def list_station_radio_dials(
+    account_id: AccountId,
+    call_sign: Annotated[CallSign, Path(..., description="Canonical station call sign")],
+    ds: DS,
+    paging: PageParams,
+    if_none_match: IfNoneMatch = None,
+) -> Response:
+    """List the RadioDials that include a Station, across all accounts."""
+    station = get_or_404(
+        await ds.aio.stations.get(account_id, call_sign),
+        "Station not found",
+        account_id=account_id,
+        call_sign=call_sign,
+    )
+    keys = await ds.aio.radio_dials.using_station(join_key(account_id, station.call_sign))
+    page_keys, next_cursor = await fetch_page(paging, keys_page(keys), key=lambda key: key)
+    radio_dials = await asyncio.gather(
+        *(
+            ds.aio.radio_dials.get(radio_dial_id, path_params={"account_id": radio_dial_account_id})
+            for radio_dial_account_id, radio_dial_id in map(split_key, page_keys)
+        )
+    )
+    summaries = [
+        summarize_radio_dial(join_key(radio_dial.account_id, radio_dial.id), radio_dial)
+        for radio_dial in radio_dials
+        if radio_dial
+    ]
+    return conditional_json(
+        PaginatedList.from_paged(summaries, paging, next_cursor=next_cursor), if_none_match, exclude_none=True
+    )
@@ -1,12 +1,14 @@
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, Path, Query, Request
+from fastapi import Depends, Header, HTTPException, Path, Query, Request
 
 from datastore import DataStore
 from lib.constants import MAX_PER_PAGE
 from lib.types import Slug
+from switchboard.broadcast import Broadcast
 
-from .models import PaginationParams
+from .models import PaginationParams, decode_cursor
+from .radio_dials import RadioDialViews
 
 type PageNumber = Annotated[int, Query(ge=1, description="Page number (>=1)")]
 """1-based page number (>= 1)."""
@@ -19,15 +21,38 @@ def get_store(request: Request) -> DataStore:
     return ds
 
 
+def get_radio_dial_views(request: Request) -> RadioDialViews:
+    views = getattr(request.app.state, "radio_dial_views", None)
+    if views is None:
+        views = request.app.state.radio_dial_views = RadioDialViews()
+    return views
+
+
+def get_broadcast(request: Request) -> Broadcast | None:
+    """Return the switchboard broadcast when this process serves the switchboard or shares its relay."""
+    return getattr(request.app.state, "broadcast", None)
+
+
 def pagination(
     page: PageNumber = 1,
     per_page: int = Query(10, ge=1, le=MAX_PER_PAGE, description="Items per page (1-100)"),
+    cursor: str | None = Query(None, description="Opaque next_cursor from a previous page; replaces page"),
 ) -> PaginationParams:
-    return PaginationParams(page=page, per_page=per_page)
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail="Invalid cursor") from e
+    return PaginationParams(page=page, per_page=per_page, cursor=cursor)
 
 
 DS = Annotated[DataStore, Depends(get_store)]
+SwitchboardBroadcast = Annotated[Broadcast | None, Depends(get_broadcast)]
+RadioDialViewCache = Annotated[RadioDialViews, Depends(get_radio_dial_views)]
 PageParams = Annotated[PaginationParams, Depends(pagination)]
 AccountId = Annotated[Slug, Path(..., description="Account ID (slug)")]
 PlayerId = Annotated[Slug, Path(..., description="Player ID (slug)")]
 RadioDialId = Annotated[Slug, Path(..., description="RadioDial ID (slug)")]
+IfNoneMatch = Annotated[
+    str | None, Header(description="ETag of a copy the client already holds; answered with 304 while it is current")
+]
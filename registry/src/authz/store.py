@@ -47,6 +47,7 @@ class AuthzStore:
             self.seed_path,
             [seedable(self._account_owners), seedable(self._session_revocations)],
             label=AUTHZ_NAMESPACE,
+            backend=self.backend,
         )
 
     def check_backend_access(self) -> None:
@@ -1,5 +1,7 @@
+from .caching import CachingObjectStore
 from .git import GitBackend
 from .local import LocalBackend
 from .s3 import S3Backend
+from .threaded import AsyncBackend
 
-__all__ = ["GitBackend", "LocalBackend", "S3Backend"]
+__all__ = ["AsyncBackend", "CachingObjectStore", "GitBackend", "LocalBackend", "S3Backend"]
@@ -0,0 +1,149 @@
+import copy
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from datastore.core import (
+    CacheStats,
+    ChangeAction,
+    ChangeFeed,
+    ExpiringCache,
+    ObjectStore,
+    backend_transaction,
+    construct_storage_path,
+)
+from datastore.types import JsonDoc, PagedResult, ValueWithETag
+
+
+class CachingObjectStore:
+    """ObjectStore wrapper that serves repeated reads of a document from memory.
+
+    ``get`` results, including misses, are cached per storage key as (data, etag) pairs in
+    a bounded LRU with a TTL. Saves and deletes made through this wrapper invalidate their
+    key, so a process always reads its own writes; writes made by other processes become
+    visible once the entry expires. ``list`` is passed through uncached.
+
+    With a shared ``feed``, writes are also published to it and every ``get`` first drops
+    the keys other processes have written since, so all workers read each other's writes.
+    A ``ttl_seconds`` of 0 caches nothing and only publishes writes to the feed.
+
+    ``transaction()`` wraps the backend's own, and writes made inside it are invalidated
+    again and published to the feed only once the backend has committed them. Anything else,
+    such as ``batch_stats()``, is looked up on the backend.
+    """
+
+    def __init__(
+        self,
+        backend: ObjectStore,
+        *,
+        ttl_seconds: float,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+        feed: ChangeFeed | None = None,
+    ) -> None:
+        self.backend = backend
+        self.feed = feed
+        self._documents: ExpiringCache[str, ValueWithETag[JsonDoc]] = ExpiringCache(
+            ttl_seconds=ttl_seconds, max_entries=max_entries, clock=clock
+        )
+        self._transaction = threading.local()
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "backend":
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._documents.stats()
+
+    def get(self, object_id: str, *path_parts: str) -> ValueWithETag[JsonDoc]:
+        self._catch_up()
+        data, etag = self._documents.get_or_load(
+            self._key(object_id, path_parts), lambda: self.backend.get(object_id, *path_parts)
+        )
+        # Callers are free to mutate what they read; never hand out the cached document itself.
+        return copy.deepcopy(data), etag
+
+    def list(
+        self, *path_parts: str, page: int = 1, per_page: int = 10, after: str | None = None
+    ) -> PagedResult[JsonDoc]:
+        return self.backend.list(*path_parts, page=page, per_page=per_page, after=after)
+
+    def save(
+        self,
+        object_id: str,
+        data: JsonDoc,
+        *path_parts: str,
+        if_match: str | None = None,
+        if_none_match: bool = False,
+    ) -> str:
+        key = self._key(object_id, path_parts)
+        try:
+            version = self.backend.save(object_id, data, *path_parts, if_match=if_match, if_none_match=if_none_match)
+        finally:
+            # Also drop the entry on failure: a ConcurrencyError means the cached version lost a race.
+            self._documents.invalidate(key)
+        self._written("save", key)
+        return version
+
+    def delete(self, object_id: str, *path_parts: str) -> bool:
+        key = self._key(object_id, path_parts)
+        try:
+            deleted = self.backend.delete(object_id, *path_parts)
+        finally:
+            self._documents.invalidate(key)
+        if deleted:
+            self._written("delete", key)
+        return deleted
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run the backend's ``transaction()``, or the block alone for backends that commit each write."""
+        if getattr(self._transaction, "written", None) is not None:
+            yield
+            return
+        written: dict[str, ChangeAction] = {}
+        self._transaction.written = written
+        try:
+            with backend_transaction(self.backend):
+                yield
+        finally:
+            self._transaction.written = None
+            # Entries read meanwhile hold staged writes, or the documents as they were before them.
+            for key in written:
+                self._documents.invalidate(key)
+        if self.feed is not None:
+            for key, action in written.items():
+                self.feed.publish(action, key)
+
+    def close(self) -> None:
+        close = getattr(self.backend, "close", None)
+        if close is not None:
+            close()
+
+    def clear(self) -> None:
+        self._documents.clear()
+
+    def _written(self, action: ChangeAction, key: str) -> None:
+        written: dict[str, ChangeAction] | None = getattr(self._transaction, "written", None)
+        if written is not None:
+            written[key] = action
+        elif self.feed is not None:
+            self.feed.publish(action, key)
+
+    def _catch_up(self) -> None:
+        if self.feed is None:
+            return
+        events = self.feed.poll()
+        if events is None:
+            self._documents.clear()
+            return
+        for event in events:
+            self._documents.invalidate(event.key)
+
+    @staticmethod
+    def _key(object_id: str, path_parts: tuple[str, ...]) -> str:
+        return construct_storage_path(prefix="", path_parts=path_parts, object_id=object_id)
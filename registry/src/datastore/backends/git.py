@@ -1,33 +1,36 @@
 from __future__ import annotations
 
+import bisect
+import builtins
 import fcntl
-import json
 import os
 import shlex
 import subprocess
 import time
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Iterator, Mapping
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from threading import RLock
-from typing import Any, TypeVar, cast
+from threading import Condition, Event, RLock, Thread, get_ident
+from typing import Any, cast
 from urllib.parse import urlsplit, urlunsplit
 
 from datastore.core import (
+    ChangeFeed,
     atomic_write_json_file,
     compute_etag,
     construct_storage_path,
-    extract_object_id_from_path,
+    read_json_file,
     strip_id,
     validate_write_preconditions,
 )
 from datastore.exceptions import ConcurrencyError
 from datastore.types import JsonDoc, PagedResult, ValueWithETag
 from lib.logging import logger
+from lib.serialization import loads
 
-_T = TypeVar("_T")
-_RETRY = object()
+_Change = tuple[str, str]  # (action, repo-relative path)
+_Stage = Callable[[], tuple[Any, _Change | None]]
 
 
 @dataclass(frozen=True)
@@ -37,8 +40,110 @@ class _Remote:
     url: str | None
 
 
+@dataclass(frozen=True)
+class _Snapshot:
+    """Immutable view of the JSON documents in one commit, safe to share between threads."""
+
+    commit: str | None = None
+    blobs: Mapping[str, str] = field(default_factory=dict)  # repo-relative path -> blob id
+    contents: Mapping[str, tuple[bytes, str]] = field(default_factory=dict)  # blob id -> (raw JSON, etag)
+    listings: Mapping[str, tuple[str, ...]] = field(default_factory=dict)  # repo-relative dir -> sorted ids
+
+    def read(self, rel_path: str) -> ValueWithETag[JsonDoc]:
+        blob = self.blobs.get(rel_path)
+        if blob is None:
+            return None, None
+        raw, etag = self.contents[blob]
+        return cast(JsonDoc, loads(raw)), etag
+
+
+@dataclass(frozen=True, slots=True)
+class GitBatchStats:
+    """Outcome of the most recent GitBackend commit batch."""
+
+    writes: int
+    changes: int
+    pushes: int
+    seconds: float
+
+
+@dataclass(frozen=True, slots=True)
+class GitSyncStats:
+    """Point-in-time counters for GitBackend's background remote sync."""
+
+    syncs: int
+    failures: int
+    last_duration_seconds: float | None
+    staleness_seconds: float
+    last_error: str | None
+
+
+@dataclass(eq=False)
+class _GroupedWrite:
+    """A write waiting for the group-commit leader; ``done`` is set once it has an outcome."""
+
+    stage: _Stage
+    done: Event = field(default_factory=Event)
+    result: Any = None
+    error: BaseException | None = None
+
+
+@dataclass(eq=False)
+class _Batch:
+    """Writes staged in the working tree and index, waiting for one commit and push."""
+
+    owner: int
+    started: float = field(default_factory=time.perf_counter)
+    writes: builtins.list[tuple[_Stage, _GroupedWrite | None]] = field(default_factory=builtins.list)
+    changes: builtins.list[_Change] = field(default_factory=builtins.list)
+
+    def stage(self, stage: _Stage, grouped: _GroupedWrite | None = None) -> Any:
+        self.writes.append((stage, grouped))
+        return self._apply(stage, grouped)
+
+    def replay(self) -> None:
+        """Stage every write again, e.g. on a branch refreshed after a rejected push."""
+        self.changes.clear()
+        for stage, grouped in self.writes:
+            self._apply(stage, grouped)
+
+    def _apply(self, stage: _Stage, grouped: _GroupedWrite | None) -> Any:
+        try:
+            result, change = stage()
+        except (ConcurrencyError, ValueError) as exc:
+            # A grouped write's failed precondition is its own; the rest of the group still commits.
+            if grouped is None:
+                raise
+            grouped.result, grouped.error = None, exc
+            return None
+        if grouped is not None:
+            grouped.result, grouped.error = result, None
+        if change is not None:
+            self.changes.append(change)
+        return result
+
+
 class GitBackend:
-    """Git-backed ObjectStore implementation using a working tree checkout."""
+    """Git-backed ObjectStore implementation using a working tree checkout.
+
+    Writes go through the working tree under an exclusive (thread and fcntl) lock. Reads are
+    served from an in-memory snapshot of the branch head, loaded with ``git ls-tree`` and
+    ``git cat-file --batch`` once per commit, so they never wait behind a writer. A reader
+    refreshes the snapshot when the branch ref moves, but only if it can take the lock without
+    blocking; otherwise it keeps serving the current commit.
+
+    With a remote and a positive ``fetch_ttl_seconds``, a background thread fetches every TTL
+    and reads keep serving the last good snapshot, even when a fetch fails. With a zero TTL
+    there is no thread and reads fetch on every call instead.
+
+    Each write is one commit and one push. ``transaction()`` collects a thread's writes into a
+    single commit instead, and ``group_commit_window_seconds`` does the same for writes arriving
+    from different threads within the window (up to ``group_commit_max_writes``). Inside
+    ``transaction()`` the thread reads from the working tree, so it sees its own staged writes.
+
+    With a ``feed``, each fetch that moves the branch publishes the documents it changed, so
+    other processes' caches drop them as they do for writes made through the registry.
+    """
 
     def __init__(
         self,
@@ -51,7 +156,14 @@ class GitBackend:
         author_name: str = "briceburg",
         author_email: str = "briceburg@users.noreply.github.com",
         ssh_key_path: str | None = None,
+        group_commit_window_seconds: float = 0,
+        group_commit_max_writes: int = 50,
+        feed: ChangeFeed | None = None,
     ) -> None:
+        if group_commit_window_seconds < 0:
+            raise ValueError("group_commit_window_seconds must be non-negative")
+        if group_commit_max_writes < 1:
+            raise ValueError("group_commit_max_writes must be positive")
         self.repo_path = Path(repo_path)
         self.prefix = prefix.strip("/")
         self.branch = branch
@@ -60,6 +172,9 @@ class GitBackend:
         self.author_name = author_name
         self.author_email = author_email
         self.ssh_key_path = ssh_key_path
+        self.group_commit_window_seconds = group_commit_window_seconds
+        self.group_commit_max_writes = group_commit_max_writes
+        self.feed = feed
         self._branch_ref = f"refs/heads/{self.branch}"
         self._remote_branch_ref = f"refs/remotes/origin/{self.branch}"
 
@@ -79,6 +194,18 @@ class GitBackend:
         self._lock = RLock()
         self._lock_path = self.repo_path.parent / f".{self.repo_path.name}.lock"
         self._last_fetch_at = 0.0
+        self._snapshot = _Snapshot()
+        self._batch: _Batch | None = None
+        self._last_batch: GitBatchStats | None = None
+        self._group_ready = Condition()
+        self._group_pending: builtins.list[_GroupedWrite] = []
+        self._group_leading = False
+        self._sync_stop = Event()
+        self._sync_thread: Thread | None = None
+        self._syncs = 0
+        self._sync_failures = 0
+        self._last_sync_duration: float | None = None
+        self._last_sync_error: str | None = None
 
         self._validate_branch()
 
@@ -86,6 +213,7 @@ class GitBackend:
             self._ensure_repo_exists()
             self._ensure_branch_symbolic_head()
             self._sync_from_remote(force=True)
+            self._refresh_snapshot()
             remote = self._resolve_remote()
             logger.info(
                 "Git backend ready: repo=%s branch=%s remote=%s lock=%s fetch_ttl=%ss",
@@ -96,26 +224,40 @@ class GitBackend:
                 self.fetch_ttl_seconds,
             )
 
-    def get(self, object_id: str, *path_parts: str) -> ValueWithETag[JsonDoc]:
-        with self._operation_lock():
-            self._sync_from_remote(force=False)
-            return self._read_existing(self._get_fs_path(object_id, *path_parts))
-
-    def list(self, *path_parts: str, page: int = 1, per_page: int = 10) -> PagedResult[JsonDoc]:
-        with self._operation_lock():
-            self._sync_from_remote(force=False)
-            directory = self._get_dir_path(*path_parts)
-            if not directory.exists():
-                return []
-
-            files = sorted([p for p in directory.iterdir() if p.suffix == ".json"], key=lambda p: p.stem)
-            start = max(0, (page - 1) * per_page)
-            page_files = files[start : start + per_page]
+        if remote is not None and self.fetch_ttl_seconds > 0:
+            self._sync_thread = Thread(
+                target=self._background_sync, name=f"git-sync-{self.repo_path.name}", daemon=True
+            )
+            self._sync_thread.start()
 
-            items = [self._read_json_file(file_path) for file_path in page_files]
-            for item, file_path in zip(items, page_files, strict=False):
-                item["id"] = extract_object_id_from_path(file_path.name)
-            return items
+    def get(self, object_id: str, *path_parts: str) -> ValueWithETag[JsonDoc]:
+        rel_path = construct_storage_path(prefix=self.prefix, path_parts=path_parts, object_id=object_id)
+        if self._owns_batch():
+            return self._read_existing(self.repo_path / rel_path)
+        return self._read_snapshot().read(rel_path)
+
+    def list(
+        self, *path_parts: str, page: int = 1, per_page: int = 10, after: str | None = None
+    ) -> PagedResult[JsonDoc]:
+        storage_dir = construct_storage_path(prefix=self.prefix, path_parts=path_parts).rstrip("/")
+        read: Callable[[str], ValueWithETag[JsonDoc]]
+        if self._owns_batch():
+            ids = self._working_tree_ids(storage_dir)
+            read = lambda rel_path: self._read_existing(self.repo_path / rel_path)  # noqa: E731
+        else:
+            snapshot = self._read_snapshot()
+            ids = snapshot.listings.get(storage_dir, ())
+            read = snapshot.read
+        start = bisect.bisect_right(ids, after) if after is not None else max(0, (page - 1) * per_page)
+
+        items: PagedResult[JsonDoc] = []
+        for object_id in ids[start : start + per_page]:
+            item, _ = read(f"{storage_dir}/{object_id}.json" if storage_dir else f"{object_id}.json")
+            if item is None:
+                continue
+            item["id"] = object_id
+            items.append(item)
+        return items
 
     def save(
         self,
@@ -124,15 +266,275 @@ class GitBackend:
         *path_parts: str,
         if_match: str | None = None,
         if_none_match: bool = False,
-    ) -> None:
-        with self._operation_lock():
-            self._with_write_retry(
-                lambda: self._save_once(object_id, strip_id(data), path_parts, if_match, if_none_match)
-            )
+    ) -> str:
+        to_write = strip_id(data)
+        self._write(lambda: self._stage_save(object_id, to_write, path_parts, if_match, if_none_match))
+        return compute_etag(to_write)
 
     def delete(self, object_id: str, *path_parts: str) -> bool:
+        return cast(bool, self._write(lambda: self._stage_delete(object_id, path_parts)))
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Commit and push every save and delete this thread makes inside the block together.
+
+        Preconditions are checked as each write is staged, and again if the push is rejected and
+        the batch is replayed onto the refreshed branch. Nothing is committed if the block raises.
+        """
+        with self._batch_scope():
+            yield
+
+    def batch_stats(self) -> GitBatchStats | None:
+        return self._last_batch
+
+    def sync_stats(self) -> GitSyncStats:
+        return GitSyncStats(
+            syncs=self._syncs,
+            failures=self._sync_failures,
+            last_duration_seconds=self._last_sync_duration,
+            staleness_seconds=time.monotonic() - self._last_fetch_at,
+            last_error=self._last_sync_error,
+        )
+
+    def close(self) -> None:
+        """Stop the background sync thread, if one is running."""
+        self._sync_stop.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join(timeout=self.fetch_ttl_seconds)
+
+    def _owns_batch(self) -> bool:
+        """Whether this thread has a batch open, whose staged writes only the working tree has yet."""
+        batch = self._batch
+        return batch is not None and batch.owner == get_ident()
+
+    def _working_tree_ids(self, storage_dir: str) -> tuple[str, ...]:
+        directory = self.repo_path / storage_dir
+        if not directory.is_dir():
+            return ()
+        return tuple(sorted(path.stem for path in directory.glob("*.json") if path.is_file()))
+
+    def _write(self, stage: _Stage) -> Any:
+        batch = self._batch
+        if batch is not None and batch.owner == get_ident():
+            return batch.stage(stage)
+        if self.group_commit_window_seconds > 0:
+            return self._grouped_write(stage)
+        with self._batch_scope() as batch:
+            return batch.stage(stage)
+
+    def _grouped_write(self, stage: _Stage) -> Any:
+        write = _GroupedWrite(stage)
+        with self._group_ready:
+            self._group_pending.append(write)
+            leader = not self._group_leading
+            self._group_leading = True
+            self._group_ready.notify_all()
+        if leader:
+            self._lead_group()
+        write.done.wait()
+        if write.error is not None:
+            raise write.error
+        return write.result
+
+    def _lead_group(self) -> None:
+        """Wait out the window (or until the group is full), then commit every pending write at once."""
+        deadline = time.monotonic() + self.group_commit_window_seconds
+        with self._group_ready:
+            while len(self._group_pending) < self.group_commit_max_writes:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._group_ready.wait(remaining)
+            writes, self._group_pending = self._group_pending, []
+            self._group_leading = False
+
+        try:
+            with self._batch_scope() as batch:
+                for write in writes:
+                    batch.stage(write.stage, write)
+        except BaseException as exc:
+            for write in writes:
+                if write.error is None:
+                    write.error = exc
+        finally:
+            for write in writes:
+                write.done.set()
+
+    @contextmanager
+    def _batch_scope(self) -> Iterator[_Batch]:
+        batch = self._batch
+        if batch is not None and batch.owner == get_ident():
+            yield batch
+            return
+
         with self._operation_lock():
-            return self._with_write_retry(lambda: self._delete_once(object_id, path_parts))
+            self._sync_from_remote(force=True)
+            base = self._branch_head()
+            batch = _Batch(owner=get_ident())
+            self._batch = batch
+            try:
+                yield batch
+                self._commit_batch(batch)
+            except BaseException:
+                if base is not None:
+                    self._run_git("reset", "--quiet", "--hard", base)
+                raise
+            finally:
+                self._batch = None
+                self._refresh_snapshot()
+
+    def _commit_batch(self, batch: _Batch) -> None:
+        """Commit the batch's staged changes once and push, replaying the batch if the push is rejected."""
+        pushes = 0
+        for attempt in range(2):
+            if attempt:
+                batch.replay()
+            if not batch.changes or self._run_git("diff", "--cached", "--quiet", check=False).returncode == 0:
+                break
+            self._commit_changes(batch.changes)
+            pushes += 1
+            if self._push_branch():
+                break
+        else:
+            raise ConcurrencyError("Push rejected")
+
+        stats = GitBatchStats(
+            writes=len(batch.writes),
+            changes=len(batch.changes),
+            pushes=pushes,
+            seconds=time.perf_counter() - batch.started,
+        )
+        self._last_batch = stats
+        logger.debug(
+            "Git batch committed: writes=%s changes=%s pushes=%s in %.3fs",
+            stats.writes,
+            stats.changes,
+            stats.pushes,
+            stats.seconds,
+        )
+
+    def _read_snapshot(self) -> _Snapshot:
+        """Return the snapshot to read from, refreshing it first when that does not mean waiting."""
+        if self._sync_due() or self._snapshot.commit != self._branch_head():
+            with self._operation_lock(blocking=False) as acquired:
+                if acquired:
+                    if self._sync_thread is None:
+                        self._sync_from_remote(force=False)
+                    self._refresh_snapshot()
+        return self._snapshot
+
+    def _sync_due(self) -> bool:
+        if self.remote_url == "" or self._sync_thread is not None:
+            return False
+        return self.fetch_ttl_seconds <= 0 or time.monotonic() - self._last_fetch_at >= self.fetch_ttl_seconds
+
+    def _background_sync(self) -> None:
+        while True:
+            due_in = self.fetch_ttl_seconds - (time.monotonic() - self._last_fetch_at)
+            if self._sync_stop.wait(max(due_in, 0)):
+                return
+            if time.monotonic() - self._last_fetch_at < self.fetch_ttl_seconds:
+                continue  # a write fetched in the meantime
+            # Back off for a full TTL after a failure instead of retrying immediately.
+            if not self._sync_snapshot() and self._sync_stop.wait(self.fetch_ttl_seconds):
+                return
+
+    def _sync_snapshot(self) -> bool:
+        started = time.perf_counter()
+        try:
+            with self._operation_lock():
+                self._sync_from_remote(force=True)
+                self._refresh_snapshot()
+        except Exception as exc:
+            self._sync_failures += 1
+            self._last_sync_error = str(exc)
+            logger.warning("Git background sync failed; still serving commit %s: %s", self._snapshot.commit, exc)
+            return False
+        self._syncs += 1
+        self._last_sync_duration = time.perf_counter() - started
+        self._last_sync_error = None
+        logger.debug(
+            "Git background sync finished in %.3fs at commit %s", self._last_sync_duration, self._snapshot.commit
+        )
+        return True
+
+    def _branch_head(self) -> str | None:
+        """Read the branch's commit id straight from the ref files, without spawning git."""
+        git_dir = self.repo_path / ".git"
+        try:
+            return (git_dir / self._branch_ref).read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            pass
+        try:
+            packed_refs = (git_dir / "packed-refs").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        for line in packed_refs.splitlines():
+            commit, _, ref = line.partition(" ")
+            if ref == self._branch_ref:
+                return commit
+        return None
+
+    def _refresh_snapshot(self) -> None:
+        """Load the snapshot for the current branch head, reusing blobs already in memory."""
+        commit = self._branch_head()
+        previous = self._snapshot
+        if commit == previous.commit:
+            return
+        if commit is None:
+            self._snapshot = _Snapshot()
+            return
+
+        ls_tree_args = ["ls-tree", "-r", "-z", "--full-tree", commit]
+        if self.prefix:
+            ls_tree_args += ["--", self.prefix]
+        blobs: dict[str, str] = {}
+        listing: dict[str, list[str]] = {}
+        for record in self._run_git(*ls_tree_args).stdout.split("\0"):
+            meta, _, rel_path = record.partition("\t")
+            if not rel_path.endswith(".json") or meta.split(" ")[1:2] != ["blob"]:
+                continue
+            blobs[rel_path] = meta.split(" ")[2]
+            directory, _, name = rel_path.rpartition("/")
+            listing.setdefault(directory, []).append(name.removesuffix(".json"))
+
+        contents = {blob: previous.contents[blob] for blob in set(blobs.values()) if blob in previous.contents}
+        missing = sorted(set(blobs.values()) - contents.keys())
+        for blob, raw in self._read_blobs(missing).items():
+            contents[blob] = (raw, compute_etag(loads(raw)))
+
+        self._snapshot = _Snapshot(
+            commit=commit,
+            blobs=blobs,
+            contents=contents,
+            listings={directory: tuple(sorted(ids)) for directory, ids in listing.items()},
+        )
+        logger.debug("Loaded git snapshot %s: %s documents, %s new blobs", commit, len(blobs), len(missing))
+
+    def _read_blobs(self, blobs: builtins.list[str]) -> dict[str, bytes]:
+        if not blobs:
+            return {}
+        result = subprocess.run(
+            ["git", "cat-file", "--batch"],
+            cwd=self.repo_path,
+            env=self._git_env,
+            input="".join(f"{blob}\n" for blob in blobs).encode("ascii"),
+            capture_output=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Git command 'cat-file' failed with exit status {result.returncode}.")
+        contents: dict[str, bytes] = {}
+        output = result.stdout
+        position = 0
+        for blob in blobs:
+            header_end = output.index(b"\n", position)
+            _, _, size = output[position:header_end].decode("ascii").split(" ")
+            body_start = header_end + 1
+            body_end = body_start + int(size)
+            contents[blob] = output[body_start:body_end]
+            position = body_end + 1  # skip the newline after each object
+        return contents
 
     def _ensure_repo_exists(self) -> None:
         if (self.repo_path / ".git").exists():
@@ -199,13 +601,29 @@ class GitBackend:
             remote=remote,
         )
 
+        previous = self._branch_head()
         self._run_git("symbolic-ref", "HEAD", self._branch_ref)
         self._run_git("reset", "--quiet", "--hard", self._remote_branch_ref)
         target = self._run_git("rev-parse", self._remote_branch_ref).stdout.strip()
         logger.debug("Updated local branch %s to remote target %s", self.branch, target)
+        if previous is not None and previous != target:
+            self._publish_fetched(previous, target)
 
         self._last_fetch_at = now
 
+    def _publish_fetched(self, previous: str, target: str) -> None:
+        """Publish the documents changed between two commits to the feed."""
+        if self.feed is None:
+            return
+        diff_args = ["diff", "--name-status", "-z", "--no-renames", previous, target]
+        if self.prefix:
+            diff_args += ["--", self.prefix]
+        fields = self._run_git(*diff_args).stdout.split("\0")
+        for status, rel_path in zip(fields[0::2], fields[1::2], strict=False):
+            if rel_path.endswith(".json"):
+                key = rel_path.removeprefix(f"{self.prefix}/") if self.prefix else rel_path
+                self.feed.publish("delete" if status == "D" else "save", key)
+
     def _push_branch(self) -> bool:
         remote = self._resolve_remote()
         if remote is None:
@@ -233,56 +651,57 @@ class GitBackend:
         logger.debug("Git push to %s succeeded", remote.label)
         return True
 
-    def _save_once(
+    def _stage_save(
         self,
         object_id: str,
         data: JsonDoc,
         path_parts: tuple[str, ...],
         if_match: str | None,
         if_none_match: bool,
-    ) -> None | object:
+    ) -> tuple[None, _Change | None]:
         file_path = self._get_fs_path(object_id, *path_parts)
         current, current_version = self._read_existing(file_path)
         validate_write_preconditions(if_match, if_none_match, current_version)
 
         if current is not None and compute_etag(data) == current_version:
-            return None
+            return None, None
 
         file_path.parent.mkdir(parents=True, exist_ok=True)
         atomic_write_json_file(file_path, data)
         rel_path = self._relative_repo_path(file_path)
         self._run_git("add", "--", rel_path)
-        self._commit_change("update", rel_path)
-        return None if self._push_branch() else _RETRY
+        return None, ("update", rel_path)
 
-    def _delete_once(self, object_id: str, path_parts: tuple[str, ...]) -> bool | object:
+    def _stage_delete(self, object_id: str, path_parts: tuple[str, ...]) -> tuple[bool, _Change | None]:
         file_path = self._get_fs_path(object_id, *path_parts)
         if not file_path.exists():
-            return False
+            return False, None
 
         rel_path = self._relative_repo_path(file_path)
-        self._run_git("rm", "--quiet", "--", rel_path)
+        self._run_git("rm", "--quiet", "--force", "--", rel_path)
         self._prune_empty_dirs(file_path.parent)
-        self._commit_change("delete", rel_path)
-        return True if self._push_branch() else _RETRY
-
-    def _with_write_retry(self, operation: Callable[[], _T | object]) -> _T:
-        for _ in range(2):
-            self._sync_from_remote(force=True)
-            result = operation()
-            if result is not _RETRY:
-                return cast(_T, result)
-        raise ConcurrencyError("Push rejected")
+        return True, ("delete", rel_path)
 
     @contextmanager
-    def _operation_lock(self) -> Iterator[None]:
-        self._lock_path.parent.mkdir(parents=True, exist_ok=True)
-        with self._lock, self._lock_path.open("a+b") as lock_file:
-            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
-            try:
-                yield
-            finally:
-                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    def _operation_lock(self, *, blocking: bool = True) -> Iterator[bool]:
+        """Hold the process and cross-process lock; yields False if ``blocking=False`` and it is taken."""
+        if not self._lock.acquire(blocking=blocking):
+            yield False
+            return
+        try:
+            self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock_path.open("a+b") as lock_file:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    yield False
+                    return
+                try:
+                    yield True
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._lock.release()
 
     def _read_existing(self, file_path: Path) -> ValueWithETag[JsonDoc]:
         if not file_path.exists():
@@ -291,17 +710,12 @@ class GitBackend:
         return raw, compute_etag(raw)
 
     def _read_json_file(self, file_path: Path) -> dict[str, Any]:
-        with file_path.open("r", encoding="utf-8") as f:
-            return cast(dict[str, Any], json.load(f))
+        return cast(dict[str, Any], read_json_file(file_path))
 
     def _get_fs_path(self, object_id: str, *path_parts: str) -> Path:
         storage_path = construct_storage_path(prefix=self.prefix, path_parts=path_parts, object_id=object_id)
         return self.repo_path / storage_path
 
-    def _get_dir_path(self, *path_parts: str) -> Path:
-        storage_dir = construct_storage_path(prefix=self.prefix, path_parts=path_parts)
-        return self.repo_path / storage_dir
-
     def _relative_repo_path(self, file_path: Path) -> str:
         return file_path.relative_to(self.repo_path).as_posix()
 
@@ -315,14 +729,12 @@ class GitBackend:
                 break
             current = current.parent
 
-    def _commit_change(self, action: str, rel_path: str) -> None:
+    def _commit_changes(self, changes: builtins.list[_Change]) -> None:
         self._run_git(
             "commit",
             "--quiet",
             "--message",
-            self._commit_message(action, rel_path),
-            "--",
-            rel_path,
+            self._commit_message(changes),
             extra_env={
                 "GIT_AUTHOR_NAME": self.author_name,
                 "GIT_AUTHOR_EMAIL": self.author_email,
@@ -331,9 +743,12 @@ class GitBackend:
             },
         )
 
-    def _commit_message(self, action: str, rel_path: str) -> str:
-        summary = f"radio-pad-registry: {action} {self._commit_target(rel_path)}"
-        return f"{summary}\n\nGenerated-by: radio-pad-registry"
+    def _commit_message(self, changes: builtins.list[_Change]) -> str:
+        if len(changes) == 1:
+            action, rel_path = changes[0]
+            return f"radio-pad-registry: {action} {self._commit_target(rel_path)}\n\nGenerated-by: radio-pad-registry"
+        details = "\n".join(f"- {action} {self._commit_target(rel_path)}" for action, rel_path in changes)
+        return f"radio-pad-registry: {len(changes)} changes\n\n{details}\n\nGenerated-by: radio-pad-registry"
 
     def _commit_target(self, rel_path: str) -> str:
         parts = Path(rel_path).parts
@@ -343,6 +758,8 @@ class GitBackend:
             return f"player {parts[1]}/{Path(parts[3]).stem}"
         if len(parts) == 3 and parts[0] == "accounts" and parts[2] == "stations.json":
             return f"stations {parts[1]}"
+        if len(parts) == 4 and parts[0] == "accounts" and parts[2] == "stations":
+            return f"stations {parts[1]}"
         if len(parts) == 4 and parts[0] == "accounts" and parts[2] == "radio-dials":
             return f"radio dial {parts[1]}/{Path(parts[3]).stem}"
         return rel_path
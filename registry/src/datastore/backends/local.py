@@ -1,13 +1,12 @@
-import itertools
-import json
 from pathlib import Path
 from typing import Any
 
 from datastore.core import (
+    DirectoryIndex,
     atomic_write_json_file,
     compute_etag,
     construct_storage_path,
-    extract_object_id_from_path,
+    read_json_file,
     strip_id,
     validate_write_preconditions,
 )
@@ -23,6 +22,8 @@ class LocalBackend:
       This is created by the `construct_storage_path` helper.
     - The physical "filesystem path", which is the absolute path on disk
       (e.g., "/tmp/data/prefix/accounts/acct-123.json").
+
+    Listing reads ids from a DirectoryIndex persisted under "<base_path>/.index".
     """
 
     def __init__(self, base_path: str, prefix: str = "") -> None:
@@ -30,6 +31,7 @@ class LocalBackend:
         self.prefix = prefix.strip("/")
         # Ensure the full root path for this backend exists.
         (self.base_path / self.prefix).mkdir(parents=True, exist_ok=True)
+        self._index = DirectoryIndex(self.base_path, self.base_path / ".index")
 
     def _get_fs_path(self, storage_path: str) -> Path:
         """Translates a logical storage path into a physical filesystem path."""
@@ -43,28 +45,30 @@ class LocalBackend:
         file_path = self._get_fs_path(storage_path)
         if not file_path.exists():
             return None, None
-        with file_path.open("r", encoding="utf-8") as f:
-            raw = json.load(f)
+        raw = read_json_file(file_path)
         return raw, compute_etag(raw)
 
-    def list(self, *path_parts: str, page: int = 1, per_page: int = 10) -> PagedResult[JsonDoc]:
+    def list(
+        self, *path_parts: str, page: int = 1, per_page: int = 10, after: str | None = None
+    ) -> PagedResult[JsonDoc]:
         """
-        Lists JSON objects from a specified path with pagination.
+        Lists JSON objects from a specified path with pagination, sorted by id.
         The 'id' of each object is derived from its filename if not present in the file.
+        When 'after' is given, returns the objects following that id instead of a numbered page.
         """
         storage_dir = construct_storage_path(prefix=self.prefix, path_parts=path_parts)
         directory = self._get_fs_path(storage_dir)
         if not directory.exists():
             return []
 
-        files = sorted([p for p in directory.iterdir() if p.suffix == ".json"], key=lambda p: p.stem)
-
-        start = max(0, (page - 1) * per_page)
-        page_files = itertools.islice(files, start, start + per_page)
+        if after is not None:
+            page_ids = self._index.slice_after(directory, after, per_page)
+        else:
+            start = max(0, (page - 1) * per_page)
+            page_ids = self._index.slice(directory, start, start + per_page)
 
         items: list[dict[str, Any]] = []
-        for p in page_files:
-            obj_id = extract_object_id_from_path(p.name)
+        for obj_id in page_ids:
             data, _ = self.get(obj_id, *path_parts)
             if data is None:
                 continue
@@ -79,9 +83,9 @@ class LocalBackend:
         *path_parts: str,
         if_match: str | None = None,
         if_none_match: bool = False,
-    ) -> None:
+    ) -> str:
         """
-        Saves a JSON object by its ID to a specified path.
+        Saves a JSON object by its ID to a specified path and returns its ETag.
         Keeps any explicit 'id' field provided by caller.
         If if_match is provided and the file exists, enforce optimistic concurrency using ETag.
         """
@@ -91,16 +95,18 @@ class LocalBackend:
         # Concurrency: if_match must match existing ETag when updating; also skip write when unchanged
         current_etag: str | None = None
         if file_path.exists():
-            with file_path.open("r", encoding="utf-8") as f:
-                current = json.load(f)
+            current = read_json_file(file_path)
             current_etag = compute_etag(current)
         validate_write_preconditions(if_match, if_none_match, current_etag)
         # Never persist the 'id' field in the JSON content
         to_write = strip_id(data)
+        etag = compute_etag(to_write)
         # If content hash matches existing, no-op to avoid churn
-        if current_etag is not None and compute_etag(to_write) == current_etag:
-            return
-        atomic_write_json_file(file_path, to_write, overwrite=not if_none_match)
+        if etag == current_etag:
+            return etag
+        with self._index.change(file_path.parent, object_id, present=True):
+            atomic_write_json_file(file_path, to_write, overwrite=not if_none_match)
+        return etag
 
     def delete(self, object_id: str, *path_parts: str) -> bool:
         """
@@ -111,5 +117,6 @@ class LocalBackend:
         file_path = self._get_fs_path(storage_path)
         if not file_path.exists():
             return False
-        file_path.unlink()
+        with self._index.change(file_path.parent, object_id, present=False):
+            file_path.unlink()
         return True
@@ -1,20 +1,35 @@
-import json
+import bisect
+import builtins
+import copy
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Lock
 from typing import Any, cast
 
 import boto3
 from botocore.client import BaseClient
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from cachetools import LRUCache
 
 from datastore.core import (
     compute_etag,
     construct_storage_path,
     deconstruct_storage_path,
-    storage_json,
     strip_id,
     validate_write_preconditions,
 )
 from datastore.exceptions import ConcurrencyError
 from datastore.types import JsonDoc, PagedResult, ValueWithETag
+from lib.logging import logger
+from lib.serialization import canonical_dumps, loads, storage_dumps
+
+_CONFLICT_CODES = {"409", "412", "ConditionalRequestConflict", "PreconditionFailed"}
+_MANIFEST_NAME = ".manifest"
+_GENERATION_NAME = ".generation"
+_CACHED_MANIFESTS = 64
 
 
 class S3Backend:
@@ -24,12 +39,39 @@ class S3Backend:
     - Stores documents under keys like: <prefix>/<path...>/<id>.json
     - Stores a content hash in object metadata as 'rpr-sha256' for cheap identity checks.
     - S3 ETags are opaque optimistic-concurrency tokens and conditional PUT preconditions.
+    - ``list`` fetches a page's documents concurrently on up to ``max_workers`` threads, which
+      share the client's connection pool.
+    - With ``manifest=True`` each collection also keeps every document packed into one
+      "<path...>/.manifest" object, tagged with the token in its "<path...>/.generation"
+      object. Saves and deletes replace that token before and after writing the document,
+      and never touch the manifest, so a page is one small GetObject for the token while
+      the manifest (kept in memory between pages) carries the same one. Otherwise the page
+      is read from the listing and the manifest is rebuilt in the background, once for a
+      whole burst of writes.
     """
 
-    def __init__(self, bucket: str, prefix: str = "", client: BaseClient | None = None) -> None:
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        client: BaseClient | None = None,
+        *,
+        max_workers: int = 16,
+        manifest: bool = False,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
         self.bucket = bucket
         self.prefix = prefix.strip("/")
-        self.client = client or boto3.client("s3")
+        self.client = client or boto3.client("s3", config=Config(max_pool_connections=max_workers))
+        self.max_workers = max_workers
+        self.manifest = manifest
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = Lock()
+        self._manifests: LRUCache[str, tuple[str, dict[str, JsonDoc]]] = LRUCache(maxsize=_CACHED_MANIFESTS)
+        self._manifest_lock = Lock()
+        self._rebuilding: set[str] = set()
+        self._rebuild_executor: ThreadPoolExecutor | None = None
 
     def _handle_s3_error(self, error: ClientError, ignore_codes: set[str]) -> None:
         """Re-raises a ClientError unless its code is in the ignore list."""
@@ -47,49 +89,83 @@ class S3Backend:
 
     def get(self, object_id: str, *path_parts: str) -> ValueWithETag[JsonDoc]:
         storage_path = construct_storage_path(prefix=self.prefix, path_parts=path_parts, object_id=object_id)
+        return self._get_json(storage_path)
+
+    def _get_json(self, key: str) -> ValueWithETag[JsonDoc]:
         try:
-            resp = self.client.get_object(Bucket=self.bucket, Key=storage_path)
+            resp = self.client.get_object(Bucket=self.bucket, Key=key)
         except ClientError as e:
             self._handle_s3_error(e, ignore_codes={"NoSuchKey", "404", "NotFound"})
             return None, None
         body = resp["Body"].read()
-        raw = json.loads(body.decode("utf-8"))
+        raw = loads(body)
         token = cast(str | None, resp.get("ETag"))
         return raw, token
 
-    def list(self, *path_parts: str, page: int = 1, per_page: int = 10) -> PagedResult[JsonDoc]:
+    def list(
+        self, *path_parts: str, page: int = 1, per_page: int = 10, after: str | None = None
+    ) -> PagedResult[JsonDoc]:
+        if self.manifest:
+            items = self._manifest_items(path_parts)
+            if items is not None:
+                return self._page_from_manifest(items, page=page, per_page=per_page, after=after)
+            logger.debug("S3 manifest for %s is missing or stale; reading listed documents", path_parts)
+            self._schedule_manifest_rebuild(path_parts)
+
         storage_dir = construct_storage_path(prefix=self.prefix, path_parts=path_parts)
+        params: dict[str, Any] = {
+            "Bucket": self.bucket,
+            "Prefix": storage_dir,
+            "Delimiter": "/",  # only get direct children, not nested objects
+        }
+        skip = 0
+        if after is not None:
+            # Keyset paging: S3 lists keys in order, so resume directly after the cursor's key.
+            params["StartAfter"] = construct_storage_path(prefix=self.prefix, path_parts=path_parts, object_id=after)
+        else:
+            skip = max(0, (page - 1) * per_page)
 
-        paginator = self.client.get_paginator("list_objects_v2")
-        page_iterator = paginator.paginate(
-            Bucket=self.bucket,
-            Prefix=storage_dir,
-            Delimiter="/",  # only get direct children, not nested objects
-            PaginationConfig={"PageSize": per_page},
-        )
+        return self._read_listed(self._list_json_keys(params, skip=skip, limit=per_page))
 
-        # Get the target page with simple enumeration, filtering for .json files
-        files = []
-        for i, page_content in enumerate(page_iterator, 1):
-            if i == page:
-                files = [
-                    item["Key"] for item in page_content.get("Contents", []) if item.get("Key", "").endswith(".json")
-                ]
-                break
-
-        page_files = [deconstruct_storage_path(key, prefix=self.prefix) for key in files]
-        page_files.sort(key=lambda item: item[0])  # Sort by object_id (index 0), match local backend behavior.
-
-        items: list[dict[str, Any]] = []
-        for obj_id, path_parts_from_key in page_files:
-            data, _ = self.get(obj_id, *path_parts_from_key)
+    def _read_listed(self, keys: builtins.list[str]) -> PagedResult[JsonDoc]:
+        """Fetch the documents behind listed keys concurrently, keeping listing order."""
+        if len(keys) > 1 and self.max_workers > 1:
+            documents = builtins.list(self._thread_pool().map(self._get_json, keys))
+        else:
+            documents = [self._get_json(key) for key in keys]
+
+        items: builtins.list[dict[str, Any]] = []
+        for key, (data, _) in zip(keys, documents, strict=True):
             if data is None:
-                continue
-            data["id"] = obj_id
+                continue  # deleted between listing and reading
+            data["id"] = deconstruct_storage_path(key, prefix=self.prefix)[0]
             items.append(data)
-
         return items
 
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="s3-read")
+            return self._executor
+
+    def _list_json_keys(self, params: dict[str, Any], *, skip: int = 0, limit: int | None = None) -> builtins.list[str]:
+        """Return up to ``limit`` (or all) .json keys in S3 listing order, after skipping ``skip`` of them."""
+        keys: builtins.list[str] = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        page_size = 1000 if limit is None else min(1000, skip + limit)
+        for page_content in paginator.paginate(**params, PaginationConfig={"PageSize": page_size}):
+            for item in page_content.get("Contents", []):
+                key = item.get("Key", "")
+                if not key.endswith(".json"):
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                keys.append(key)
+                if len(keys) == limit:
+                    return keys
+        return keys
+
     def save(
         self,
         object_id: str,
@@ -97,7 +173,7 @@ class S3Backend:
         *path_parts: str,
         if_match: str | None = None,
         if_none_match: bool = False,
-    ) -> None:
+    ) -> str:
         storage_path = construct_storage_path(prefix=self.prefix, path_parts=path_parts, object_id=object_id)
         to_write = strip_id(data)
         new_hash = compute_etag(to_write)
@@ -109,10 +185,10 @@ class S3Backend:
             current_hash = head.get("Metadata", {}).get("rpr-sha256")
             current_etag = cast(str | None, head.get("ETag"))
         validate_write_preconditions(if_match, if_none_match, current_etag)
-        if current_hash == new_hash:
-            return
+        if current_hash == new_hash and current_etag is not None:
+            return current_etag
         # Never persist the 'id' field in the JSON content
-        body = storage_json(to_write).encode("utf-8")
+        body = storage_dumps(to_write)
         request: dict[str, Any] = {
             "Bucket": self.bucket,
             "Key": storage_path,
@@ -123,18 +199,8 @@ class S3Backend:
             request["IfNoneMatch"] = "*"
         if if_match is not None:
             request["IfMatch"] = if_match
-        try:
-            self.client.put_object(**request)
-        except ClientError as error:
-            code = error.response.get("Error", {}).get("Code")
-            if (if_match is not None or if_none_match) and code in {
-                "409",
-                "412",
-                "ConditionalRequestConflict",
-                "PreconditionFailed",
-            }:
-                raise ConcurrencyError("Conditional save failed") from error
-            raise
+        with self._invalidating_manifest(path_parts):
+            return self._put_object(request)
 
     def delete(self, object_id: str, *path_parts: str) -> bool:
         storage_path = construct_storage_path(prefix=self.prefix, path_parts=path_parts, object_id=object_id)
@@ -142,5 +208,118 @@ class S3Backend:
         head = self._get_head(storage_path)
         if head is None:
             return False
-        self.client.delete_object(Bucket=self.bucket, Key=storage_path)
+        with self._invalidating_manifest(path_parts):
+            self.client.delete_object(Bucket=self.bucket, Key=storage_path)
         return True
+
+    def _put_object(self, request: dict[str, Any]) -> str:
+        """Put an object and return its new ETag."""
+        try:
+            response = self.client.put_object(**request)
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code")
+            if ("IfMatch" in request or "IfNoneMatch" in request) and code in _CONFLICT_CODES:
+                raise ConcurrencyError("Conditional save failed") from error
+            raise
+        return cast(str, response["ETag"])
+
+    def _manifest_key(self, path_parts: tuple[str, ...]) -> str:
+        return construct_storage_path(prefix=self.prefix, path_parts=path_parts) + _MANIFEST_NAME
+
+    def _generation_key(self, path_parts: tuple[str, ...]) -> str:
+        return construct_storage_path(prefix=self.prefix, path_parts=path_parts) + _GENERATION_NAME
+
+    def _generation(self, path_parts: tuple[str, ...]) -> str | None:
+        marker, _ = self._get_json(self._generation_key(path_parts))
+        return cast(str | None, (marker or {}).get("generation"))
+
+    def _bump_generation(self, path_parts: tuple[str, ...]) -> str:
+        generation = uuid.uuid4().hex
+        self._put_object(
+            {
+                "Bucket": self.bucket,
+                "Key": self._generation_key(path_parts),
+                "Body": canonical_dumps({"generation": generation}),
+                "ContentType": "application/json",
+            }
+        )
+        return generation
+
+    @contextmanager
+    def _invalidating_manifest(self, path_parts: tuple[str, ...]) -> Iterator[None]:
+        """Replace the collection's generation on both sides of a document write, in manifest mode.
+
+        Before the write, so a writer that stops after it cannot leave the manifest trusted; after
+        it, so neither can a rebuild that read the document as it was.
+        """
+        if not self.manifest:
+            yield
+            return
+        self._bump_generation(path_parts)
+        yield
+        self._bump_generation(path_parts)
+
+    def _manifest_items(self, path_parts: tuple[str, ...]) -> dict[str, JsonDoc] | None:
+        """Return the manifest's documents while it matches the collection's generation, else None."""
+        generation = self._generation(path_parts)
+        if generation is None:
+            return None
+        key = self._manifest_key(path_parts)
+        with self._manifest_lock:
+            cached = self._manifests.get(key)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        packed, _ = self._get_json(key)
+        if packed is None or packed.get("generation") != generation:
+            return None
+        items: dict[str, JsonDoc] = packed.get("items", {})
+        with self._manifest_lock:
+            self._manifests[key] = (generation, items)
+        return items
+
+    def _schedule_manifest_rebuild(self, path_parts: tuple[str, ...]) -> None:
+        key = self._manifest_key(path_parts)
+        with self._manifest_lock:
+            if key in self._rebuilding:
+                return
+            if self._rebuild_executor is None:
+                self._rebuild_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="s3-manifest")
+            self._rebuilding.add(key)
+            future = self._rebuild_executor.submit(self.rebuild_manifest, *path_parts)
+
+        def finished(done: Future[None]) -> None:
+            with self._manifest_lock:
+                self._rebuilding.discard(key)
+            if (error := done.exception()) is not None:
+                logger.warning("Could not rebuild S3 manifest %s: %s", key, error)
+
+        future.add_done_callback(finished)
+
+    def rebuild_manifest(self, *path_parts: str) -> None:
+        """Pack every document in a collection into its manifest, tagged with the current generation."""
+        generation = self._generation(path_parts) or self._bump_generation(path_parts)
+        storage_dir = construct_storage_path(prefix=self.prefix, path_parts=path_parts)
+        keys = self._list_json_keys({"Bucket": self.bucket, "Prefix": storage_dir, "Delimiter": "/"})
+        items = {document.pop("id"): document for document in self._read_listed(keys)}
+        self._put_object(
+            {
+                "Bucket": self.bucket,
+                "Key": self._manifest_key(path_parts),
+                "Body": canonical_dumps({"generation": generation, "items": items}),
+                "ContentType": "application/json",
+            }
+        )
+
+    @staticmethod
+    def _page_from_manifest(
+        documents: dict[str, JsonDoc], *, page: int, per_page: int, after: str | None
+    ) -> PagedResult[JsonDoc]:
+        # Match S3 key order so manifest pages and listed pages agree on cursors.
+        keys = sorted(f"{object_id}.json" for object_id in documents)
+        if after is not None:
+            start = bisect.bisect_right(keys, f"{after}.json")
+        else:
+            start = max(0, (page - 1) * per_page)
+        page_ids = [key.removesuffix(".json") for key in keys[start : start + per_page]]
+        # Manifests are kept in memory between pages; never hand out their documents themselves.
+        return [{**copy.deepcopy(documents[object_id]), "id": object_id} for object_id in page_ids]
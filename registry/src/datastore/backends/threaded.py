@@ -0,0 +1,42 @@
+import asyncio
+
+from datastore.core import ObjectStore
+from datastore.types import JsonDoc, PagedResult, ValueWithETag
+
+
+class AsyncBackend:
+    """AsyncObjectStore implementation that runs a synchronous ObjectStore in worker threads.
+
+    Every backend performs blocking I/O (filesystem reads, boto3 round-trips, git subprocesses).
+    Offloading each call keeps the event loop, and any switchboard sockets sharing it, responsive
+    while the backend works. The wrapped backends are safe to drive from several threads:
+    boto3 clients are thread-safe and GitBackend serializes operations behind its own lock.
+    """
+
+    def __init__(self, backend: ObjectStore) -> None:
+        self.backend = backend
+
+    async def get(self, object_id: str, *path_parts: str) -> ValueWithETag[JsonDoc]:
+        return await asyncio.to_thread(self.backend.get, object_id, *path_parts)
+
+    async def list(
+        self, *path_parts: str, page: int = 1, per_page: int = 10, after: str | None = None
+    ) -> PagedResult[JsonDoc]:
+        return await asyncio.to_thread(
+            lambda: self.backend.list(*path_parts, page=page, per_page=per_page, after=after)
+        )
+
+    async def save(
+        self,
+        object_id: str,
+        data: JsonDoc,
+        *path_parts: str,
+        if_match: str | None = None,
+        if_none_match: bool = False,
+    ) -> str:
+        return await asyncio.to_thread(
+            lambda: self.backend.save(object_id, data, *path_parts, if_match=if_match, if_none_match=if_none_match)
+        )
+
+    async def delete(self, object_id: str, *path_parts: str) -> bool:
+        return await asyncio.to_thread(self.backend.delete, object_id, *path_parts)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import os
+from pathlib import Path
 
 from lib.constants import BASE_DIR
 from lib.logging import logger
 
-from .backends import GitBackend, LocalBackend, S3Backend
-from .core import ObjectStore
+from .backends import CachingObjectStore, GitBackend, LocalBackend, S3Backend
+from .core import ChangeFeed, ObjectStore
 
 _BACKENDS = {"git", "local", "s3"}
 DATA_NAMESPACE = "data"
@@ -18,6 +19,11 @@ def data_backend_from_env() -> ObjectStore:
     return _backend_from_env(DATA_NAMESPACE)
 
 
+def trusted_reads_from_env() -> bool:
+    """Whether stores reuse validated models for unchanged documents (``REGISTRY_DATA_TRUSTED_READS``)."""
+    return os.environ.get("REGISTRY_DATA_TRUSTED_READS", "").lower() in {"1", "true", "yes"}
+
+
 def authz_backend_from_env() -> ObjectStore:
     return _backend_from_env(AUTHZ_NAMESPACE)
 
@@ -42,28 +48,54 @@ def _backend_from_env(namespace: str) -> ObjectStore:
     assert path is not None
     logger.info("%s backend: %s prefix=%s", namespace.title(), backend, namespace)
 
-    if backend == "local":
-        return LocalBackend(base_path=path, prefix=namespace)
+    # Writes are published to the change feed whether or not documents are cached: the reverse
+    # indexes follow it too. The git backend also publishes what it fetches to it.
+    cache_ttl_seconds = float(setting("CACHE_TTL_SECONDS", None) or 0)
+    feed_dir = setting("CHANGE_FEED_DIR", str(BASE_DIR / "tmp" / "changes"))
+    feed = ChangeFeed(Path(feed_dir) / f"{namespace}.jsonl") if feed_dir else None
 
-    if backend == "s3":
+    store: ObjectStore
+    if backend == "local":
+        store = LocalBackend(base_path=path, prefix=namespace)
+    elif backend == "s3":
         bucket = setting("S3_BUCKET", None)
         if not bucket:
             raise ValueError("S3 backend selected but no bucket is configured")
-        return S3Backend(bucket=bucket.lower(), prefix=namespace)
-
-    return GitBackend(
-        repo_path=path,
-        prefix=namespace,
-        branch=os.environ.get("REGISTRY_GIT_BRANCH", "main"),
-        remote_url=setting("GIT_REMOTE_URL", default_git_remote),
-        fetch_ttl_seconds=int(os.environ.get("REGISTRY_GIT_FETCH_TTL_SECONDS", "30")),
-        author_name=os.environ.get("REGISTRY_GIT_AUTHOR_NAME", "briceburg"),
-        author_email=os.environ.get(
-            "REGISTRY_GIT_AUTHOR_EMAIL",
-            "briceburg@users.noreply.github.com",
-        ),
-        ssh_key_path=setting("GIT_SSH_KEY_PATH", None),
+        store = S3Backend(
+            bucket=bucket.lower(),
+            prefix=namespace,
+            max_workers=int(setting("S3_MAX_WORKERS", None) or 16),
+            manifest=(setting("S3_MANIFEST", None) or "").lower() in {"1", "true", "yes"},
+        )
+    else:
+        store = GitBackend(
+            repo_path=path,
+            prefix=namespace,
+            branch=os.environ.get("REGISTRY_GIT_BRANCH", "main"),
+            remote_url=setting("GIT_REMOTE_URL", default_git_remote),
+            fetch_ttl_seconds=int(os.environ.get("REGISTRY_GIT_FETCH_TTL_SECONDS", "30")),
+            author_name=os.environ.get("REGISTRY_GIT_AUTHOR_NAME", "briceburg"),
+            author_email=os.environ.get(
+                "REGISTRY_GIT_AUTHOR_EMAIL",
+                "briceburg@users.noreply.github.com",
+            ),
+            ssh_key_path=setting("GIT_SSH_KEY_PATH", None),
+            group_commit_window_seconds=float(os.environ.get("REGISTRY_GIT_GROUP_COMMIT_WINDOW_SECONDS", "0")),
+            group_commit_max_writes=int(os.environ.get("REGISTRY_GIT_GROUP_COMMIT_MAX_WRITES", "50")),
+            feed=feed,
+        )
+
+    if cache_ttl_seconds <= 0 and feed is None:
+        return store
+    cache_max_entries = int(setting("CACHE_MAX_ENTRIES", None) or 1024)
+    logger.info(
+        "%s document cache: ttl=%ss max_entries=%s change_feed=%s",
+        namespace.title(),
+        cache_ttl_seconds,
+        cache_max_entries,
+        feed.path if feed else "disabled",
     )
+    return CachingObjectStore(store, ttl_seconds=cache_ttl_seconds, max_entries=cache_max_entries, feed=feed)
 
 
 def _selected_backend(variable: str, default: str) -> str:
@@ -1,29 +1,51 @@
-from .cache import ExpiringCache
+from .cache import CacheStats, ExpiringCache
+from .change_feed import ChangeAction, ChangeEvent, ChangeFeed
+from .directory_index import DirectoryIndex
 from .helpers import (
     atomic_write_json_file,
+    backend_transaction,
+    canonical_json,
     compute_etag,
     construct_storage_path,
     deconstruct_storage_path,
     extract_object_id_from_path,
+    list_all,
+    read_json_file,
     storage_json,
     strip_id,
     validate_write_preconditions,
 )
-from .interfaces import ModelWithId, ObjectStore, SeedableStore
-from .model_store import ModelStore
-from .seeding import seed_from_path, seedable
+from .interfaces import AsyncObjectStore, ModelWithId, ObjectStore, SeedableStore
+from .model_store import AsyncModelStore, ModelStore
+from .reference_index import ReferenceIndex, ReferenceRescan, ReferenceScan
+from .seeding import SEED_MANIFEST_PATH, seed_from_path, seedable
 
 __all__ = [
+    "SEED_MANIFEST_PATH",
+    "AsyncModelStore",
+    "AsyncObjectStore",
+    "CacheStats",
+    "ChangeAction",
+    "ChangeEvent",
+    "ChangeFeed",
+    "DirectoryIndex",
     "ExpiringCache",
     "ModelStore",
     "ModelWithId",
     "ObjectStore",
+    "ReferenceIndex",
+    "ReferenceRescan",
+    "ReferenceScan",
     "SeedableStore",
     "atomic_write_json_file",
+    "backend_transaction",
+    "canonical_json",
     "compute_etag",
     "construct_storage_path",
     "deconstruct_storage_path",
     "extract_object_id_from_path",
+    "list_all",
+    "read_json_file",
     "seed_from_path",
     "seedable",
     "storage_json",
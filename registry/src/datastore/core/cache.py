@@ -2,13 +2,27 @@ from __future__ import annotations
 
 import time
 from collections.abc import Callable
-from threading import RLock
+from dataclasses import dataclass
+from threading import Lock, RLock
 
 from cachetools import TTLCache
 
 
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Point-in-time counters for an ExpiringCache."""
+
+    hits: int
+    misses: int
+    entries: int
+
+
 class ExpiringCache[Key, Value]:
-    """Small process-local cache for datastore-backed values."""
+    """Small process-local cache for datastore-backed values.
+
+    Entries expire after ``ttl_seconds`` and the least recently used entry is evicted once
+    ``max_entries`` is reached. Concurrent misses for the same key share a single load.
+    """
 
     def __init__(
         self,
@@ -24,6 +38,10 @@ class ExpiringCache[Key, Value]:
         self._ttl_seconds = ttl_seconds
         self._entries: TTLCache[Key, Value] = TTLCache(maxsize=max_entries, ttl=ttl_seconds, timer=clock)
         self._lock = RLock()
+        self._loading: dict[Key, Lock] = {}
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
 
     def get_or_load(self, key: Key, load: Callable[[], Value]) -> Value:
         if self._ttl_seconds == 0:
@@ -31,16 +49,45 @@ class ExpiringCache[Key, Value]:
 
         with self._lock:
             try:
-                return self._entries[key]
+                value = self._entries[key]
             except KeyError:
+                key_lock = self._loading.setdefault(key, Lock())
+            else:
+                self._hits += 1
+                return value
+
+        with key_lock:
+            with self._lock:
+                try:
+                    value = self._entries[key]
+                except KeyError:
+                    self._misses += 1
+                    generation = self._generation
+                else:
+                    self._hits += 1
+                    return value
+            try:
                 value = load()
-                self._entries[key] = value
+                with self._lock:
+                    # Skip caching a value that was loaded across an invalidation; it may be stale.
+                    if generation == self._generation:
+                        self._entries[key] = value
                 return value
+            finally:
+                with self._lock:
+                    if self._loading.get(key) is key_lock:
+                        del self._loading[key]
 
     def invalidate(self, key: Key) -> None:
         with self._lock:
+            self._generation += 1
             self._entries.pop(key, None)
 
     def clear(self) -> None:
         with self._lock:
+            self._generation += 1
             self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(hits=self._hits, misses=self._misses, entries=len(self._entries))
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import fcntl
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import BinaryIO, Literal
+
+from lib.logging import logger
+from lib.serialization import dumps, loads
+
+type ChangeAction = Literal["save", "delete"]
+
+_HEADER_LIMIT = 64
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeEvent:
+    """One save or delete recorded in a ChangeFeed."""
+
+    sequence: int
+    action: ChangeAction
+    key: str
+
+
+class ChangeFeed:
+    """Append-only log of datastore writes, shared by every process that opens the same file.
+
+    Each process publishes the storage keys it saves or deletes and polls for everyone's
+    events from its own cursor, so per-process caches can drop entries another worker
+    changed. An event's sequence is the byte offset where it ends, which increases
+    monotonically within one log file. Once the log reaches ``max_bytes`` the next
+    publisher starts a fresh file, headed by a ``{"generation": n}`` line one past the
+    previous file's; a reader still on an older generation gets ``None`` from ``poll``
+    and must treat every key as changed. Lines that are not valid events are logged and
+    skipped.
+    """
+
+    def __init__(self, path: str | Path, *, max_bytes: int = 1 << 20) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._lock_path = self.path.with_name(f".{self.path.name}.lock")
+        self._lock = Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+        # Only changes made after this process started matter; its caches begin empty.
+        with self.path.open("rb") as log:
+            self._generation: int | None = _generation(log)
+            self._cursor = os.fstat(log.fileno()).st_size
+
+    def follow(self) -> ChangeFeed:
+        """Return another reader of this log, with its own cursor starting from now."""
+        return ChangeFeed(self.path, max_bytes=self.max_bytes)
+
+    def publish(self, action: ChangeAction, key: str) -> None:
+        record = dumps({"action": action, "key": key}) + b"\n"
+        with self._lock_path.open("a+b") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                try:
+                    with self.path.open("rb") as log:
+                        generation = _generation(log)
+                        size = os.fstat(log.fileno()).st_size
+                except FileNotFoundError:
+                    generation, size = 0, self.max_bytes
+                if size >= self.max_bytes:
+                    fresh = self.path.with_name(f".{self.path.name}.tmp")
+                    fresh.write_bytes(dumps({"generation": generation + 1}) + b"\n")
+                    os.replace(fresh, self.path)
+                with self.path.open("ab") as log:
+                    log.write(record)
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def poll(self) -> list[ChangeEvent] | None:
+        """Return events published since the last poll, or None when some may have been missed."""
+        with self._lock:
+            try:
+                with self.path.open("rb") as log:
+                    generation = _generation(log)
+                    size = os.fstat(log.fileno()).st_size
+                    if generation != self._generation or size < self._cursor:
+                        logger.debug("Change feed %s was rotated; resetting cursor", self.path)
+                        self._generation, self._cursor = generation, size
+                        return None
+                    if size == self._cursor:
+                        return []
+                    log.seek(self._cursor)
+                    chunk = log.read(size - self._cursor)
+            except FileNotFoundError:
+                self._generation, self._cursor = None, 0
+                return None
+
+            # A publisher may be mid-append; leave any trailing partial line for the next poll.
+            complete = chunk[: chunk.rfind(b"\n") + 1]
+            events: list[ChangeEvent] = []
+            for line in complete.splitlines(keepends=True):
+                self._cursor += len(line)
+                try:
+                    record = loads(line)
+                    event = ChangeEvent(sequence=self._cursor, action=record["action"], key=record["key"])
+                except (ValueError, KeyError, TypeError):
+                    logger.warning("Skipping an invalid line in change feed %s: %r", self.path, line[:200])
+                    continue
+                events.append(event)
+            return events
+
+
+def _generation(log: BinaryIO) -> int:
+    """Return the generation named by the log's header line; logs without one are generation 0."""
+    header = log.readline(_HEADER_LIMIT)
+    if header.startswith(b'{"generation"'):
+        try:
+            return int(loads(header)["generation"])
+        except (ValueError, KeyError, TypeError):
+            pass
+    return 0
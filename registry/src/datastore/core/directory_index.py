@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import bisect
+import fcntl
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock, RLock
+
+from lib.logging import logger
+
+from .helpers import atomic_write_json_file, extract_object_id_from_path, read_json_file
+
+_INDEX_FILE = "ids.json"
+# Kernels stamp directory mtimes from a coarse clock, so a change landing in the same tick as a
+# scan can leave the mtime unchanged. Scans this close to the mtime are repeated until they are not.
+_RACY_WINDOW_NS = 20_000_000
+
+
+@dataclass(slots=True)
+class _Entry:
+    mtime_ns: int
+    ids: list[str]
+    racy: bool = False
+    dirty: bool = False
+
+
+class DirectoryIndex:
+    """Sorted object ids per collection directory for filesystem-backed ObjectStores.
+
+    Listing a page slices an in-memory sorted id list instead of scanning and sorting the
+    directory. Each index is keyed by the directory's mtime: backends make their own writes
+    inside ``change`` so the index is patched in place, while files added or removed behind
+    the backend's back (another process, a git reset) change the mtime and trigger a rebuild
+    on the next read. ``change`` holds a thread and cross-process (fcntl) lock, and moves the
+    mtime strictly past its previous value when a write lands in the same clock tick, so
+    every process sharing the directory still sees the write.
+
+    When ``root`` is set, indexes are also persisted beneath it (mirroring each directory's
+    path relative to ``base``) so a restarted process skips the initial directory scan.
+    Patched indexes are written back on the next read, keeping bulk writes linear.
+    """
+
+    def __init__(self, base: Path, root: Path | None = None) -> None:
+        self._base = base
+        self._root = root
+        self._entries: dict[Path, _Entry] = {}
+        self._lock = RLock()
+        self._write_lock = Lock()
+        self._lock_path = (root or base) / ".lock"
+
+    def mtime_ns(self, directory: Path) -> int | None:
+        """Return the directory's current mtime, or None when it does not exist."""
+        try:
+            return directory.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def slice(self, directory: Path, start: int, stop: int) -> list[str]:
+        """Return the ids at sorted positions [start, stop) of the directory."""
+        with self._lock:
+            entry = self._entry(directory)
+            return entry.ids[start:stop] if entry else []
+
+    def slice_after(self, directory: Path, object_id: str, limit: int) -> list[str]:
+        """Return up to ``limit`` ids sorting after ``object_id``."""
+        with self._lock:
+            entry = self._entry(directory)
+            if entry is None:
+                return []
+            start = bisect.bisect_right(entry.ids, object_id)
+            return entry.ids[start : start + limit]
+
+    @contextmanager
+    def change(self, directory: Path, object_id: str, *, present: bool) -> Iterator[None]:
+        """Make a backend's save (``present``) or delete of ``object_id`` in the block, and record it.
+
+        Nothing is recorded when the block raises.
+        """
+        with self._write_lock:
+            self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock_path.open("a+b") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    before = self.mtime_ns(directory)
+                    yield
+                    self._advance_mtime(directory, before)
+                    self.record(directory, object_id, present=present, before=before)
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def record(self, directory: Path, object_id: str, *, present: bool, before: int | None) -> None:
+        """Apply a save (``present``) or delete of ``object_id`` made inside ``change``.
+
+        ``before`` is the directory mtime observed before the write. If the index was not
+        current at that point, it is dropped and rebuilt lazily instead of patched.
+        """
+        with self._lock:
+            entry = self._entries.get(directory)
+            after = self.mtime_ns(directory)
+            if entry is None or entry.mtime_ns != before or after is None or after == before:
+                self._entries.pop(directory, None)
+                return
+            ids = entry.ids
+            position = bisect.bisect_left(ids, object_id)
+            found = position < len(ids) and ids[position] == object_id
+            if present and not found:
+                ids.insert(position, object_id)
+            elif not present and found:
+                del ids[position]
+            entry.mtime_ns = after
+            entry.dirty = True
+
+    def _advance_mtime(self, directory: Path, before: int | None) -> None:
+        """Move the directory mtime past ``before`` when the write left it there, or behind it."""
+        after = self.mtime_ns(directory)
+        if before is None or after is None or after > before:
+            return
+        # Written in the same clock tick as the previous change: other processes' indexes, and the
+        # persisted one, are keyed by this mtime and would never see the write.
+        try:
+            os.utime(directory, ns=(directory.stat().st_atime_ns, before + 1))
+        except OSError as exc:
+            logger.warning("Could not advance the mtime of %s: %s", directory, exc)
+
+    def _entry(self, directory: Path) -> _Entry | None:
+        mtime_ns = self.mtime_ns(directory)
+        if mtime_ns is None:
+            self._entries.pop(directory, None)
+            return None
+        entry = self._entries.get(directory)
+        if entry is None or entry.mtime_ns != mtime_ns or entry.racy:
+            entry = self._load(directory, mtime_ns) or self._scan(directory, mtime_ns)
+            self._entries[directory] = entry
+        if entry.dirty and not entry.racy:
+            self._persist(directory, entry)
+        return entry
+
+    def _scan(self, directory: Path, mtime_ns: int) -> _Entry:
+        ids = sorted(extract_object_id_from_path(p.name) for p in directory.iterdir() if p.suffix == ".json")
+        return _Entry(mtime_ns, ids, racy=time.time_ns() - mtime_ns < _RACY_WINDOW_NS, dirty=True)
+
+    def _load(self, directory: Path, mtime_ns: int) -> _Entry | None:
+        index_path = self._index_path(directory)
+        if index_path is None:
+            return None
+        try:
+            raw = read_json_file(index_path)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(raw, dict) or raw.get("mtime_ns") != mtime_ns or not isinstance(raw.get("ids"), list):
+            return None
+        return _Entry(mtime_ns, raw["ids"])
+
+    def _persist(self, directory: Path, entry: _Entry) -> None:
+        index_path = self._index_path(directory)
+        if index_path is None:
+            return
+        entry.dirty = False
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_json_file(index_path, {"mtime_ns": entry.mtime_ns, "ids": entry.ids})
+        except OSError as exc:
+            # The persisted copy only saves a rescan after restart; never fail the caller over it.
+            logger.warning("Could not persist directory index for %s: %s", directory, exc)
+
+    def _index_path(self, directory: Path) -> Path | None:
+        if self._root is None:
+            return None
+        return self._root / directory.relative_to(self._base) / _INDEX_FILE
@@ -1,11 +1,16 @@
+import contextlib
 import hashlib
-import json
 import os
 import tempfile
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Any
+
+from lib.serialization import canonical_dumps, loads, storage_dumps
 
 from ..exceptions import ConcurrencyError
 from ..types import JsonDoc
+from .interfaces import ObjectStore
 
 
 def canonical_json(data: JsonDoc) -> str:
@@ -15,18 +20,17 @@ def canonical_json(data: JsonDoc) -> str:
     - No extra whitespace
     - UTF-8 friendly (ensure_ascii=False)
     """
-    return json.dumps(data, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+    return canonical_dumps(data).decode("utf-8")
 
 
 def storage_json(data: JsonDoc) -> str:
     """Return a stable, human-editable JSON string for persisted documents."""
-    return json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+    return storage_dumps(data).decode("utf-8")
 
 
 def compute_etag(data: JsonDoc) -> str:
     """Compute a SHA-256 hex digest over the canonical JSON representation."""
-    payload = canonical_json(data).encode("utf-8")
-    return hashlib.sha256(payload).hexdigest()
+    return hashlib.sha256(canonical_dumps(data)).hexdigest()
 
 
 def strip_id(data: JsonDoc) -> JsonDoc:
@@ -57,20 +61,24 @@ def extract_object_id_from_path(path: str) -> str:
     return Path(path).stem
 
 
+def read_json_file(path: Path) -> Any:
+    """Read and decode a JSON file."""
+    return loads(path.read_bytes())
+
+
 def atomic_write_json_file(path: Path, data: JsonDoc, *, overwrite: bool = True) -> None:
     """Write JSON atomically, optionally requiring the destination not to exist."""
     tmp_path: Path | None = None
     try:
         with tempfile.NamedTemporaryFile(
-            mode="w",
-            encoding="utf-8",
+            mode="wb",
             prefix=f"{path.name}.",
             suffix=".tmp",
             dir=path.parent,
             delete=False,
         ) as f:
             tmp_path = Path(f.name)
-            f.write(storage_json(data))
+            f.write(storage_dumps(data))
         if overwrite:
             os.replace(tmp_path, path)
         else:
@@ -83,6 +91,15 @@ def atomic_write_json_file(path: Path, data: JsonDoc, *, overwrite: bool = True)
             tmp_path.unlink()
 
 
+def backend_transaction(backend: object) -> contextlib.AbstractContextManager[object]:
+    """Return the backend's ``transaction()``, or a no-op context for backends that commit each write alone.
+
+    Transactions are bound to the calling thread: make every write of the block from that thread.
+    """
+    transaction = getattr(backend, "transaction", None)
+    return transaction() if transaction is not None else contextlib.nullcontext()
+
+
 def construct_storage_path(*, prefix: str, path_parts: tuple[str, ...], object_id: str | None = None) -> str:
     """Builds a backend storage path/key from components.
 
@@ -110,3 +127,14 @@ def deconstruct_storage_path(full_key: str, *, prefix: str) -> tuple[str, tuple[
         prefix_parts = prefix.split("/")
         path_parts_from_key = path_parts_from_key[len(prefix_parts) :]
     return obj_id, path_parts_from_key
+
+
+def list_all(backend: ObjectStore, *path_parts: str, per_page: int = 100) -> Iterator[JsonDoc]:
+    """Yield every object under the path, paging through the backend by keyset."""
+    after: str | None = None
+    while True:
+        items = backend.list(*path_parts, per_page=per_page, after=after)
+        yield from items
+        if len(items) < per_page:
+            return
+        after = items[-1]["id"]
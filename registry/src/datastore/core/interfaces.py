@@ -8,16 +8,22 @@ class ModelWithId(Protocol):
 
     def model_dump(self, *, mode: str = "json") -> dict[str, Any]: ...
 
+    def model_copy(self, *, deep: bool = False) -> Self: ...
+
     @classmethod
     def model_validate(cls, data: dict[str, Any]) -> Self: ...
 
 
 class ObjectStore(Protocol):
-    """Interface for a versioned, hierarchical object store."""
+    """Interface for a versioned, hierarchical object store.
+
+    ``list`` pages by offset (``page``/``per_page``) or, when ``after`` is given, by keyset:
+    the first ``per_page`` objects whose id follows ``after`` in the backend's listing order.
+    """
 
     def get(self, object_id: str, *path: str) -> ValueWithETag[JsonDoc]: ...
 
-    def list(self, *path: str, page: int = 1, per_page: int = 10) -> PagedResult[JsonDoc]: ...
+    def list(self, *path: str, page: int = 1, per_page: int = 10, after: str | None = None) -> PagedResult[JsonDoc]: ...
 
     def save(
         self,
@@ -26,11 +32,34 @@ class ObjectStore(Protocol):
         *path: str,
         if_match: str | None = None,
         if_none_match: bool = False,
-    ) -> None: ...
+    ) -> str:
+        """Store ``data`` and return the version ``get`` reports for it."""
+        ...
 
     def delete(self, object_id: str, *path: str) -> bool: ...
 
 
+class AsyncObjectStore(Protocol):
+    """Awaitable counterpart of ObjectStore for use from the event loop."""
+
+    async def get(self, object_id: str, *path: str) -> ValueWithETag[JsonDoc]: ...
+
+    async def list(
+        self, *path: str, page: int = 1, per_page: int = 10, after: str | None = None
+    ) -> PagedResult[JsonDoc]: ...
+
+    async def save(
+        self,
+        object_id: str,
+        data: JsonDoc,
+        *path: str,
+        if_match: str | None = None,
+        if_none_match: bool = False,
+    ) -> str: ...
+
+    async def delete(self, object_id: str, *path: str) -> bool: ...
+
+
 class SeedableStore(Protocol):
     """Minimal interface used by seeding and helpers to work with stores generically."""
 
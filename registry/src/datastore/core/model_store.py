@@ -1,54 +1,60 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Callable, Iterable, Mapping
 from string import Formatter
 
 from pydantic import BaseModel
 
-from ..core import ObjectStore
 from ..exceptions import ConcurrencyError
-from ..types import PagedResult, PathParams
-from .interfaces import ModelWithId
+from ..types import ETag, JsonDoc, PagedResult, PathParams
+from .cache import CacheStats, ExpiringCache
+from .helpers import compute_etag
+from .interfaces import AsyncObjectStore, ModelWithId, ObjectStore
+from .reference_index import ReferenceIndex
 
+_TRUSTED_MODELS_TTL_SECONDS = 3600
+_TRUSTED_MODELS_MAX_ENTRIES = 4096
 
-class ModelStore[Entity: ModelWithId, Spec: BaseModel]:
-    """
-    Minimal, hierarchical repository backed by an ObjectStore (e.g., local fs, s3fs).
-
-    path_template must end with the `{id}` placeholder.
-    - Example: "accounts/{account_id}/radio-dials/{id}"
-
-    placeholders other than `{id}` in the path_template are passed as `path_params`.
-    - Example: "accounts/{account_id}/radio-dials/{id}", path_params={"account_id": "123"}
-
-    Examples:
-    - Flat collection:
-      ModelStore(backend, model=Station, path_template="stations/{id}")
 
-    - Account-scoped:
-      ModelStore(backend, model=RadioDial, path_template="accounts/{account_id}/radio-dials/{id}")
-      store.get("morning", path_params={"account_id": "acct-123"})
+class _ModelStoreBase[Entity: ModelWithId, Spec: BaseModel, Backend]:
+    """Path-template handling and model mapping shared by ModelStore and AsyncModelStore.
 
-    Notes:
-    - save() will infer path params from model fields if not provided.
+    Subclasses only add the backend I/O; everything that turns path params, stored
+    documents, and specs into backend arguments and validated models lives here.
     """
 
     def __init__(
         self,
-        backend: ObjectStore,
+        backend: Backend,
         *,
         model: type[Entity],
         path_template: str,
+        reference_index: ReferenceIndex | None = None,
+        references: Callable[[Entity], Iterable[str]] | None = None,
+        trusted_reads: bool = False,
     ):
-        """Initialize a ModelStore.
+        """Initialize a model store.
 
         Args:
             backend: Object storage backend used for persistence.
             model: Concrete model type
             path_template: Hierarchical JSON path template ending with "{id}".
+            reference_index: Index kept current with the keys each model references.
+            references: Returns the keys a model references; required with reference_index.
+            trusted_reads: Reuse the model validated for a stored document while its version is unchanged.
         """
+        if (reference_index is None) != (references is None):
+            raise ValueError("reference_index and references must be given together")
         self._backend = backend
         self._model = model
+        self._reference_index = reference_index
+        self._references = references
+        # Keyed by (reference key, ETag of the stored document): a document only maps to one model.
+        self._trusted: ExpiringCache[tuple[str, ETag], Entity] | None = (
+            ExpiringCache(ttl_seconds=_TRUSTED_MODELS_TTL_SECONDS, max_entries=_TRUSTED_MODELS_MAX_ENTRIES)
+            if trusted_reads
+            else None
+        )
 
         # normalize and validate template
         normalized = path_template.strip().strip("/")
@@ -75,6 +81,131 @@ class ModelStore[Entity: ModelWithId, Spec: BaseModel]:
         self._required_keys: tuple[str, ...] = tuple(req_keys)
         self._reserved_keys: frozenset[str] = frozenset({"id", *self._required_keys})
 
+    def _dir_components(self, *, path_params: PathParams | None = None) -> tuple[str, ...]:
+        """Render the directory portion of the path into components.
+
+        Raises:
+            ValueError: If required path parameters are missing.
+
+        Returns:
+            A tuple of components to prefix before the object id.
+        """
+        if not self._dir_template:
+            return ()
+        if self._required_keys and not path_params:
+            raise ValueError("path_params is required for this repository")
+        values = {k: path_params[k] for k in self._required_keys} if path_params else {}
+        rendered = self._dir_template.format(**values)
+        return tuple(c for c in rendered.split("/") if c)
+
+    def _path_params_from_model(self, model_obj: Entity) -> PathParams:
+        """Extract required path parameters from a model instance.
+
+        Each required key must exist on the model and be of type str.
+        """
+        values: dict[str, str] = {}
+        for key in self._required_keys:
+            v = getattr(model_obj, key)
+            if not isinstance(v, str):
+                raise TypeError(f"path param field '{key}' must be str, got {type(v).__name__}")
+            values[key] = v
+        return values
+
+    def _strip_reserved(self, mapping: Mapping[str, object]) -> dict[str, object]:
+        """Return a shallow copy of mapping without reserved keys.
+
+        Reserved keys include the object id and any required directory placeholders.
+        """
+        return {k: v for k, v in mapping.items() if k not in self._reserved_keys}
+
+    def _identity(self, object_id: object, path_params: PathParams | None) -> dict[str, object]:
+        """Return the path-derived fields (id and directory placeholders) for a model."""
+        base: dict[str, object] = {"id": object_id}
+        if path_params:
+            base.update({k: path_params[k] for k in self._required_keys})
+        return base
+
+    def _from_stored(
+        self, object_id: object, data: JsonDoc, path_params: PathParams | None, version: ETag | None = None
+    ) -> Entity:
+        """Validate a stored document into a model, re-attaching its path-derived identity.
+
+        With trusted reads, a document whose version matches one this store already
+        validated or wrote skips validation and returns a deep copy of that model. The backend's
+        *version* is used as is; listed documents, which carry none, fall back to their content hash.
+        """
+        payload = self._strip_reserved(data)
+        if self._trusted is None:
+            return self._model.model_validate({**self._identity(object_id, path_params), **payload})
+        key = (self._reference_key(str(object_id), path_params), version or compute_etag(payload))
+        model = self._trusted.get_or_load(
+            key, lambda: self._model.model_validate({**self._identity(object_id, path_params), **payload})
+        )
+        return model.model_copy(deep=True)
+
+    def _from_listed(self, items: PagedResult[JsonDoc], path_params: PathParams | None) -> PagedResult[Entity]:
+        return [self._from_stored(item.get("id"), item, path_params) for item in items]
+
+    def _trust_written(self, model: Entity, version: ETag, path_params: PathParams | None) -> None:
+        """Remember the model validated for a document this store just wrote, under the version saved."""
+        if self._trusted is not None:
+            key = (self._reference_key(model.id, path_params), version)
+            self._trusted.get_or_load(key, lambda: model.model_copy(deep=True))
+
+    def trusted_read_stats(self) -> CacheStats | None:
+        """Return hit/miss counters for trusted reads, or None when they are disabled."""
+        return self._trusted.stats() if self._trusted is not None else None
+
+    def _reference_key(self, object_id: str, path_params: PathParams | None) -> str:
+        """Return the key a model is indexed under: its directory placeholders and id, joined by '/'."""
+        values = [path_params[k] for k in self._required_keys] if path_params else []
+        return "/".join([*values, object_id])
+
+    def _record_references(self, model: Entity, path_params: PathParams | None) -> None:
+        if self._reference_index is None or self._references is None:
+            return
+        if self._required_keys and path_params is None:
+            path_params = self._path_params_from_model(model)
+        self._reference_index.record(self._reference_key(model.id, path_params), self._references(model))
+
+    def _forget_references(self, object_id: str, path_params: PathParams | None) -> None:
+        if self._reference_index is not None:
+            self._reference_index.record(self._reference_key(object_id, path_params), ())
+
+    def _referrers_index(self) -> ReferenceIndex:
+        if self._reference_index is None:
+            raise RuntimeError(f"{type(self).__name__} was created without a reference index")
+        return self._reference_index
+
+    def _from_spec(self, object_id: str, spec: Spec, path_params: PathParams | None) -> tuple[Entity, JsonDoc]:
+        """Validate a spec into a model and the document persisted for it."""
+        payload = self._strip_reserved(spec.model_dump(mode="json"))
+        model = self._model.model_validate({**self._identity(object_id, path_params), **payload})
+        return model, self._strip_reserved(model.model_dump(mode="json"))
+
+
+class ModelStore[Entity: ModelWithId, Spec: BaseModel](_ModelStoreBase[Entity, Spec, ObjectStore]):
+    """
+    Minimal, hierarchical repository backed by an ObjectStore (e.g., local fs, s3fs).
+
+    path_template must end with the `{id}` placeholder.
+    - Example: "accounts/{account_id}/radio-dials/{id}"
+
+    placeholders other than `{id}` in the path_template are passed as `path_params`.
+    - Example: "accounts/{account_id}/radio-dials/{id}", path_params={"account_id": "123"}
+
+    Examples:
+    - Flat collection:
+      ModelStore(backend, model=Station, path_template="stations/{id}")
+
+    - Account-scoped:
+      ModelStore(backend, model=RadioDial, path_template="accounts/{account_id}/radio-dials/{id}")
+      store.get("morning", path_params={"account_id": "acct-123"})
+
+    Notes:
+    - save() will infer path params from model fields if not provided.
+    """
+
     def delete(self, object_id: str, *, path_params: PathParams | None = None) -> bool:
         """Delete a model by id
 
@@ -82,7 +213,9 @@ class ModelStore[Entity: ModelWithId, Spec: BaseModel]:
             True if an object was deleted, False if it did not exist.
         """
         comps = self._dir_components(path_params=path_params)
-        return self._backend.delete(object_id, *comps)
+        deleted = self._backend.delete(object_id, *comps)
+        self._forget_references(object_id, path_params)
+        return deleted
 
     def exists(self, object_id: str, *, path_params: PathParams | None = None) -> bool:
         """Return True if a model with the given id exists; otherwise False."""
@@ -94,32 +227,53 @@ class ModelStore[Entity: ModelWithId, Spec: BaseModel]:
             The validated model instance, or None if it does not exist.
         """
         comps = self._dir_components(path_params=path_params)
-        data, _ = self._backend.get(object_id, *comps)
+        data, version = self._backend.get(object_id, *comps)
         if data is None:
             return None
-        payload = self._strip_reserved(data)
-        base: dict[str, object] = {"id": object_id}
-        if path_params:
-            base.update({k: path_params[k] for k in self._required_keys})
-        return self._model.model_validate({**base, **payload})
+        return self._from_stored(object_id, data, path_params, version)
+
+    def get_with_version(
+        self,
+        object_id: str,
+        *,
+        path_params: PathParams | None = None,
+        unless: Callable[[str], bool] | None = None,
+    ) -> tuple[Entity | None, str | None]:
+        """Fetch a model together with the ETag of its stored document.
+
+        Returns (None, None) if it does not exist. When ``unless`` accepts the stored version
+        (e.g. it is the one a client already holds), the document is not validated and
+        (None, version) is returned instead.
+        """
+        comps = self._dir_components(path_params=path_params)
+        data, version = self._backend.get(object_id, *comps)
+        if data is None or version is None or (unless is not None and unless(version)):
+            return None, version
+        return self._from_stored(object_id, data, path_params, version), version
+
+    def version(self, object_id: str, *, path_params: PathParams | None = None) -> str | None:
+        """Return the ETag of the stored document without validating it, or None if it does not exist."""
+        comps = self._dir_components(path_params=path_params)
+        _, version = self._backend.get(object_id, *comps)
+        return version
 
-    def list(self, *, path_params: PathParams | None = None, page: int = 1, per_page: int = 10) -> PagedResult[Entity]:
+    def list(
+        self,
+        *,
+        path_params: PathParams | None = None,
+        page: int = 1,
+        per_page: int = 10,
+        after: str | None = None,
+    ) -> PagedResult[Entity]:
         """List models under the path, paginated.
+
+        Pass ``after`` (the id of the last model already seen) to page by keyset instead of ``page``.
+
         Returns:
             A list of validated model instances.
         """
         comps = self._dir_components(path_params=path_params)
-        items = self._backend.list(*comps, page=page, per_page=per_page)
-
-        param_vals = {k: path_params[k] for k in self._required_keys} if path_params else {}
-        models: list[Entity] = []
-        for item in items:
-            file_id = item.get("id")
-            payload = self._strip_reserved(item)
-            base: dict[str, object] = {"id": file_id, **param_vals}
-            models.append(self._model.model_validate({**base, **payload}))
-
-        return models
+        return self._from_listed(self._backend.list(*comps, page=page, per_page=per_page, after=after), path_params)
 
     def upsert(self, object_id: str, spec: Spec, *, path_params: PathParams | None = None) -> Entity:
         """Replace a writable resource spec or create it, using OCC for concurrent writes.
@@ -137,14 +291,9 @@ class ModelStore[Entity: ModelWithId, Spec: BaseModel]:
         """
         comps = self._dir_components(path_params=path_params)
         current, version = self._backend.get(object_id, *comps)
-        base: dict[str, object] = {"id": object_id}
-        if path_params:
-            base.update({k: path_params[k] for k in self._required_keys})
-        payload = self._strip_reserved(spec.model_dump(mode="json"))
-        model = self._model.model_validate({**base, **payload})
-        data = self._strip_reserved(model.model_dump(mode="json"))
+        model, data = self._from_spec(object_id, spec, path_params)
         try:
-            self._backend.save(
+            saved = self._backend.save(
                 model.id,
                 data,
                 *comps,
@@ -153,6 +302,8 @@ class ModelStore[Entity: ModelWithId, Spec: BaseModel]:
             )
         except ConcurrencyError as e:  # backend conflict (e.g., ETag mismatch)
             raise ConcurrencyError("Conditional save failed") from e
+        self._record_references(model, path_params)
+        self._trust_written(model, saved, path_params)
         return model
 
     def save(self, model_obj: Entity, *, path_params: PathParams | None = None) -> Entity:
@@ -169,41 +320,87 @@ class ModelStore[Entity: ModelWithId, Spec: BaseModel]:
         comps = self._dir_components(path_params=path_params)
         data = self._strip_reserved(model_obj.model_dump(mode="json"))
         self._backend.save(model_obj.id, data, *comps)
+        self._record_references(model_obj, path_params)
         return model_obj
 
-    def _dir_components(self, *, path_params: PathParams | None = None) -> tuple[str, ...]:
-        """Render the directory portion of the path into components.
 
-        Raises:
-            ValueError: If required path parameters are missing.
+class AsyncModelStore[Entity: ModelWithId, Spec: BaseModel](_ModelStoreBase[Entity, Spec, AsyncObjectStore]):
+    """ModelStore counterpart that awaits an AsyncObjectStore.
 
-        Returns:
-            A tuple of components to prefix before the object id.
-        """
-        if not self._dir_template:
-            return ()
-        if self._required_keys and not path_params:
-            raise ValueError("path_params is required for this repository")
-        values = {k: path_params[k] for k in self._required_keys} if path_params else {}
-        rendered = self._dir_template.format(**values)
-        return tuple(c for c in rendered.split("/") if c)
+    Accepts the same path templates and path params as ModelStore; API routes use it so
+    backend I/O never blocks the event loop.
+    """
 
-    def _path_params_from_model(self, model_obj: Entity) -> PathParams:
-        """Extract required path parameters from a model instance.
+    async def delete(self, object_id: str, *, path_params: PathParams | None = None) -> bool:
+        comps = self._dir_components(path_params=path_params)
+        deleted = await self._backend.delete(object_id, *comps)
+        self._forget_references(object_id, path_params)
+        return deleted
 
-        Each required key must exist on the model and be of type str.
-        """
-        values: dict[str, str] = {}
-        for key in self._required_keys:
-            v = getattr(model_obj, key)
-            if not isinstance(v, str):
-                raise TypeError(f"path param field '{key}' must be str, got {type(v).__name__}")
-            values[key] = v
-        return values
+    async def exists(self, object_id: str, *, path_params: PathParams | None = None) -> bool:
+        return await self.get(object_id, path_params=path_params) is not None
 
-    def _strip_reserved(self, mapping: Mapping[str, object]) -> dict[str, object]:
-        """Return a shallow copy of mapping without reserved keys.
+    async def get(self, object_id: str, *, path_params: PathParams | None = None) -> Entity | None:
+        comps = self._dir_components(path_params=path_params)
+        data, version = await self._backend.get(object_id, *comps)
+        if data is None:
+            return None
+        return self._from_stored(object_id, data, path_params, version)
 
-        Reserved keys include the object id and any required directory placeholders.
-        """
-        return {k: v for k, v in mapping.items() if k not in self._reserved_keys}
+    async def get_with_version(
+        self,
+        object_id: str,
+        *,
+        path_params: PathParams | None = None,
+        unless: Callable[[str], bool] | None = None,
+    ) -> tuple[Entity | None, str | None]:
+        comps = self._dir_components(path_params=path_params)
+        data, version = await self._backend.get(object_id, *comps)
+        if data is None or version is None or (unless is not None and unless(version)):
+            return None, version
+        return self._from_stored(object_id, data, path_params, version), version
+
+    async def version(self, object_id: str, *, path_params: PathParams | None = None) -> str | None:
+        comps = self._dir_components(path_params=path_params)
+        _, version = await self._backend.get(object_id, *comps)
+        return version
+
+    async def list(
+        self,
+        *,
+        path_params: PathParams | None = None,
+        page: int = 1,
+        per_page: int = 10,
+        after: str | None = None,
+    ) -> PagedResult[Entity]:
+        comps = self._dir_components(path_params=path_params)
+        listed = await self._backend.list(*comps, page=page, per_page=per_page, after=after)
+        return self._from_listed(listed, path_params)
+
+    async def upsert(self, object_id: str, spec: Spec, *, path_params: PathParams | None = None) -> Entity:
+        """Replace or create a resource spec with the same OCC semantics as ModelStore.upsert."""
+        comps = self._dir_components(path_params=path_params)
+        current, version = await self._backend.get(object_id, *comps)
+        model, data = self._from_spec(object_id, spec, path_params)
+        try:
+            saved = await self._backend.save(
+                model.id,
+                data,
+                *comps,
+                if_match=version,
+                if_none_match=current is None,
+            )
+        except ConcurrencyError as e:  # backend conflict (e.g., ETag mismatch)
+            raise ConcurrencyError("Conditional save failed") from e
+        self._record_references(model, path_params)
+        self._trust_written(model, saved, path_params)
+        return model
+
+    async def save(self, model_obj: Entity, *, path_params: PathParams | None = None) -> Entity:
+        if self._required_keys and path_params is None:
+            path_params = self._path_params_from_model(model_obj)
+        comps = self._dir_components(path_params=path_params)
+        data = self._strip_reserved(model_obj.model_dump(mode="json"))
+        await self._backend.save(model_obj.id, data, *comps)
+        self._record_references(model_obj, path_params)
+        return model_obj
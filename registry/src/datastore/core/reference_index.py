@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from threading import RLock
+
+from lib.logging import logger
+
+from .change_feed import ChangeFeed
+
+type ReferenceScan = Callable[[], Iterable[tuple[str, Iterable[str]]]]
+type ReferenceRescan = Callable[[str], tuple[str, Iterable[str]] | None]
+
+
+class ReferenceIndex:
+    """Reverse lookup from a referenced key to the keys of the documents referencing it.
+
+    The index is built once from ``scan``, which yields every (source, targets) pair in
+    the store: at startup through ``rebuild``, or else on first use. It is then patched
+    by the store that owns the sources as it writes them; writes made inside
+    ``deferred()`` are applied only once that block, and the transaction it wraps, exits
+    cleanly.
+
+    With a ``changes`` feed, every lookup first catches up on the storage keys other
+    processes have written: ``rescan`` maps such a key to its (source, targets) pair by
+    reading the document again, or returns None for keys that hold no sources. A feed
+    whose events may have been missed rebuilds the index from a full scan.
+
+    Without a feed, ``max_age_seconds`` bounds how long other processes' writes go unseen:
+    the first lookup after the index reaches that age starts a full scan in a background
+    thread and keeps answering from the current index until the scan replaces it.
+    """
+
+    def __init__(
+        self,
+        scan: ReferenceScan,
+        *,
+        rescan: ReferenceRescan | None = None,
+        changes: ChangeFeed | None = None,
+        max_age_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if changes is not None and rescan is None:
+            raise ValueError("rescan is required with a changes feed")
+        self._scan = scan
+        self._rescan = rescan
+        self._changes = changes
+        self._max_age_seconds = max_age_seconds
+        self._clock = clock
+        self._lock = RLock()
+        self._built = False
+        self._built_at = 0.0
+        # Sources recorded while a background scan runs, re-applied on top of its result.
+        self._refreshing: dict[str, frozenset[str]] | None = None
+        self._targets: dict[str, frozenset[str]] = {}
+        self._sources: dict[str, set[str]] = {}
+        self._deferred = threading.local()
+
+    def referrers(self, target: str) -> list[str]:
+        """Return the sorted keys of every source referencing ``target``."""
+        with self._lock:
+            if not self._built:
+                self.rebuild()
+            else:
+                self._catch_up()
+            return sorted(self._sources.get(target, ()))
+
+    def record(self, source: str, targets: Iterable[str]) -> None:
+        """Replace the references held by ``source``; an empty ``targets`` removes it."""
+        pending: dict[str, frozenset[str]] | None = getattr(self._deferred, "pending", None)
+        if pending is not None:
+            pending[source] = frozenset(targets)
+            return
+        with self._lock:
+            if self._built:
+                self._patch(source, frozenset(targets))
+
+    @contextmanager
+    def deferred(self) -> Iterator[None]:
+        """Hold this thread's ``record`` calls until the block exits, dropping them if it raises."""
+        if getattr(self._deferred, "pending", None) is not None:
+            yield
+            return
+        pending: dict[str, frozenset[str]] = {}
+        self._deferred.pending = pending
+        try:
+            yield
+        finally:
+            self._deferred.pending = None
+        with self._lock:
+            if self._built:
+                for source, targets in pending.items():
+                    self._patch(source, targets)
+
+    def invalidate(self) -> None:
+        """Forget the index so the next lookup rebuilds it."""
+        with self._lock:
+            self._built = False
+
+    def rebuild(self) -> None:
+        """Rebuild the index from a full scan of the sources."""
+        with self._lock:
+            if self._changes is not None:
+                # Whatever the scan reads is current; only later changes need catching up on.
+                self._changes.poll()
+            self._targets.clear()
+            self._sources.clear()
+            for source, targets in self._scan():
+                self._apply(source, frozenset(targets))
+            self._built = True
+            self._built_at = self._clock()
+
+    def _catch_up(self) -> None:
+        if self._changes is None or self._rescan is None:
+            if self._max_age_seconds is not None and self._clock() - self._built_at >= self._max_age_seconds:
+                self._refresh_in_background()
+            return
+        events = self._changes.poll()
+        if events is None:
+            self.rebuild()
+            return
+        for key in dict.fromkeys(event.key for event in events):
+            rescanned = self._rescan(key)
+            if rescanned is not None:
+                source, targets = rescanned
+                self._apply(source, frozenset(targets))
+
+    def _refresh_in_background(self) -> None:
+        if self._refreshing is not None:
+            return
+        self._refreshing = {}
+        threading.Thread(target=self._refresh, name="reference-index-refresh", daemon=True).start()
+
+    def _refresh(self) -> None:
+        try:
+            scanned = [(source, frozenset(targets)) for source, targets in self._scan()]
+        except Exception:
+            logger.exception("Could not rebuild a reference index; keeping the current one")
+            scanned = None
+        with self._lock:
+            recorded, self._refreshing = self._refreshing or {}, None
+            self._built_at = self._clock()
+            if scanned is None or not self._built:
+                return
+            self._targets.clear()
+            self._sources.clear()
+            for source, targets in [*scanned, *recorded.items()]:
+                self._apply(source, targets)
+
+    def _patch(self, source: str, targets: frozenset[str]) -> None:
+        self._apply(source, targets)
+        if self._refreshing is not None:
+            self._refreshing[source] = targets
+
+    def _apply(self, source: str, targets: frozenset[str]) -> None:
+        previous = self._targets.pop(source, frozenset())
+        for target in previous - targets:
+            sources = self._sources[target]
+            sources.discard(source)
+            if not sources:
+                del self._sources[target]
+        for target in targets - previous:
+            self._sources.setdefault(target, set()).add(source)
+        if targets:
+            self._targets[source] = targets
@@ -1,18 +1,29 @@
 from __future__ import annotations
 
-import json
+import functools
+import hashlib
 import re
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 from pydantic import BaseModel
 
 from lib.logging import logger
+from lib.serialization import loads
 
+from ..exceptions import ConcurrencyError
 from ..types import JsonDoc, PathParams
-from .interfaces import ModelWithId, SeedableStore
+from .helpers import backend_transaction
+from .interfaces import ModelWithId, ObjectStore, SeedableStore
 from .model_store import ModelStore
 
+SEED_MANIFEST_PATH = "seed-manifests"
+"""Backend directory holding one manifest per seed label: the content hash of every seed file applied."""
+
+_SEED_WORKERS = 8
+
 
 class _SeedingView[Entity: ModelWithId, Spec: BaseModel](SeedableStore):
     """Adapter exposing only the seeding-related surface for a ModelStore.
@@ -22,12 +33,12 @@ class _SeedingView[Entity: ModelWithId, Spec: BaseModel](SeedableStore):
 
     def __init__(self, store: ModelStore[Entity, Spec]) -> None:
         self._store = store
+        # Derive stems to avoid duplicated ".json" suffixes
+        self._pattern = _template_pattern(store._path_template.removesuffix(".json"))
 
     def match(self, path: str) -> dict[str, str] | None:
-        # Derive stems to avoid duplicated ".json" suffixes
-        path_stem = path.removesuffix(".json")
-        template_stem = self._store._path_template.removesuffix(".json")
-        return match_path_template(path_stem, template_stem)
+        match = self._pattern.fullmatch(path.removesuffix(".json"))
+        return match.groupdict() if match else None
 
     def exists(self, object_id: str, *, path_params: Mapping[str, str] | None = None) -> bool:
         return self._store.get(object_id, path_params=path_params) is not None
@@ -45,29 +56,86 @@ def seedable[Entity: ModelWithId, Spec: BaseModel](
     return _SeedingView(store)
 
 
-def seed_from_path(seed_path: Path, stores: list[SeedableStore], *, label: str) -> None:
+@dataclass(frozen=True, slots=True)
+class _SeedFile:
+    relative_path: str
+    content: bytes
+    digest: str
+
+
+def seed_from_path(
+    seed_path: Path,
+    stores: list[SeedableStore],
+    *,
+    label: str,
+    backend: ObjectStore | None = None,
+    max_workers: int = _SEED_WORKERS,
+) -> None:
+    """Create each object under ``seed_path`` that does not exist yet; existing objects are never overwritten.
+
+    With a ``backend``, the content hash of every applied seed file is recorded in a manifest
+    document there, so later runs skip unchanged files after a single read. Objects whose seed
+    file is unchanged are therefore not recreated after being deleted. Changed and new files
+    are written in parallel, or in one transaction on backends providing ``transaction()``.
+    """
     if not seed_path.is_dir():
         logger.error("%s seed path does not exist: %s", label, seed_path)
         return
 
-    for seed_file in seed_path.rglob("*.json"):
-        relative_path = seed_file.relative_to(seed_path).as_posix()
-
-        for store in stores:
-            if not (params := store.match(relative_path)):
-                continue
-
-            object_id = params.pop("id")
-            path_params = params or None
-            if store.exists(object_id, path_params=path_params):
-                logger.debug("Skipping existing %s object: %s", label, relative_path)
-                break
+    seed_files = [
+        _SeedFile(relative_path, content, hashlib.sha256(content).hexdigest())
+        for relative_path, content in _read_seed_files(seed_path)
+    ]
+    applied: dict[str, str] = {}
+    version: str | None = None
+    if backend is not None:
+        manifest, version = backend.get(label, SEED_MANIFEST_PATH)
+        applied = dict((manifest or {}).get("files", {}))
+    pending = [seed_file for seed_file in seed_files if applied.get(seed_file.relative_path) != seed_file.digest]
+    if not pending:
+        logger.debug("%s seeds unchanged: %d files", label, len(seed_files))
+        return
 
-            with seed_file.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            store.seed({"id": object_id, **params, **data}, path_params=path_params)
-            logger.info("Seeded %s %s", label, relative_path)
-            break
+    # A transaction (the git backend's) commits every write at once, from this thread only.
+    transactional = hasattr(backend, "transaction")
+    with backend_transaction(backend):
+        if not transactional and max_workers > 1 and len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"seed-{label}") as executor:
+                list(executor.map(lambda seed_file: _seed_file(seed_file, stores, label), pending))
+        else:
+            for seed_file in pending:
+                _seed_file(seed_file, stores, label)
+
+        if backend is not None:
+            manifest = {"files": {seed_file.relative_path: seed_file.digest for seed_file in seed_files}}
+            try:
+                backend.save(label, manifest, SEED_MANIFEST_PATH, if_match=version, if_none_match=version is None)
+            except ConcurrencyError:
+                logger.debug("%s seed manifest was recorded by another process", label)
+    logger.info("Applied %d of %d %s seed files", len(pending), len(seed_files), label)
+
+
+def _read_seed_files(seed_path: Path) -> Iterator[tuple[str, bytes]]:
+    for seed_file in sorted(seed_path.rglob("*.json")):
+        yield seed_file.relative_to(seed_path).as_posix(), seed_file.read_bytes()
+
+
+def _seed_file(seed_file: _SeedFile, stores: list[SeedableStore], label: str) -> None:
+    relative_path = seed_file.relative_path
+    for store in stores:
+        if not (params := store.match(relative_path)):
+            continue
+
+        object_id = params.pop("id")
+        path_params = params or None
+        if store.exists(object_id, path_params=path_params):
+            logger.debug("Skipping existing %s object: %s", label, relative_path)
+            return
+
+        data = loads(seed_file.content)
+        store.seed({"id": object_id, **params, **data}, path_params=path_params)
+        logger.info("Seeded %s %s", label, relative_path)
+        return
 
 
 def match_path_template(path: str, template: str) -> dict[str, str] | None:
@@ -76,9 +144,13 @@ def match_path_template(path: str, template: str) -> dict[str, str] | None:
     Returns a dictionary of extracted values if the path matches the template,
     otherwise returns None.
     """
-    regex_pattern = _template_placeholder_re.sub(r"(?P<\1>[^/]+)", template)
-    match = re.fullmatch(regex_pattern, path)
+    match = _template_pattern(template).fullmatch(path)
     return match.groupdict() if match else None
 
 
+@functools.cache
+def _template_pattern(template: str) -> re.Pattern[str]:
+    return re.compile(_template_placeholder_re.sub(r"(?P<\1>[^/]+)", template))
+
+
 _template_placeholder_re = re.compile(r"\{([^}]+)\}")
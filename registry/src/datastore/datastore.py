@@ -1,11 +1,56 @@
 import os
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 from lib.constants import BASE_DIR
 
-from .configuration import DATA_NAMESPACE, data_backend_from_env
-from .core import ObjectStore, SeedableStore, seed_from_path, seedable
-from .stores import Accounts, Players, RadioDials, Stations
+from .backends import AsyncBackend
+from .configuration import DATA_NAMESPACE, data_backend_from_env, trusted_reads_from_env
+from .core import (
+    AsyncObjectStore,
+    ChangeFeed,
+    ObjectStore,
+    ReferenceIndex,
+    SeedableStore,
+    backend_transaction,
+    seed_from_path,
+    seedable,
+)
+from .stores import (
+    Accounts,
+    AsyncAccounts,
+    AsyncPlayers,
+    AsyncRadioDials,
+    AsyncStations,
+    Players,
+    RadioDials,
+    Stations,
+)
+from .stores.players import radio_dial_players_index
+from .stores.radio_dials import station_radio_dials_index
+
+# Without a change feed, how long the reverse indexes may miss other processes' writes.
+REFERENCE_INDEX_MAX_AGE_SECONDS = 60.0
+
+
+class AsyncStores:
+    """Awaitable counterparts of the DataStore's stores, used from the event loop."""
+
+    def __init__(
+        self,
+        backend: AsyncObjectStore,
+        *,
+        radio_dial_players: ReferenceIndex | None = None,
+        station_radio_dials: ReferenceIndex | None = None,
+        stations: Stations | None = None,
+        trusted_reads: bool = False,
+    ) -> None:
+        self.backend = backend
+        self.accounts = AsyncAccounts(backend, trusted_reads=trusted_reads)
+        self.players = AsyncPlayers(backend, radio_dial_index=radio_dial_players, trusted_reads=trusted_reads)
+        self.stations = AsyncStations(backend, stations=stations, trusted_reads=trusted_reads)
+        self.radio_dials = AsyncRadioDials(backend, station_index=station_radio_dials, trusted_reads=trusted_reads)
 
 
 class DataStore:
@@ -15,6 +60,7 @@ class DataStore:
         self,
         backend: ObjectStore | None = None,
         seed_path: str | None = None,
+        trusted_reads: bool | None = None,
     ) -> None:
         # Provide sensible defaults so tests can construct without args
         seed_root = Path(os.environ.get("REGISTRY_SEED_DATA_PATH", str(BASE_DIR / "seed-data")))
@@ -22,17 +68,56 @@ class DataStore:
 
         self.backend = backend if backend is not None else data_backend_from_env()
 
-        self.accounts = Accounts(self.backend)
-        self.players = Players(self.backend)
-        self.stations = Stations(self.backend)
-        self.radio_dials = RadioDials(self.backend)
+        # Shared by the sync and async stores so writes through either keep them current; writes
+        # from other processes arrive through the backend's change feed, or else a periodic rescan.
+        feed: ChangeFeed | None = getattr(self.backend, "feed", None)
+        max_age_seconds = None if feed else REFERENCE_INDEX_MAX_AGE_SECONDS
+        self.radio_dial_players = radio_dial_players_index(
+            self.backend, changes=feed.follow() if feed else None, max_age_seconds=max_age_seconds
+        )
+        self.station_radio_dials = station_radio_dials_index(
+            self.backend, changes=feed.follow() if feed else None, max_age_seconds=max_age_seconds
+        )
+
+        # Opt-in: documents are validated once per stored version; unchanged ones are served from the validated model.
+        if trusted_reads is None:
+            trusted_reads = trusted_reads_from_env()
+        self.accounts = Accounts(self.backend, trusted_reads=trusted_reads)
+        self.players = Players(self.backend, radio_dial_index=self.radio_dial_players, trusted_reads=trusted_reads)
+        self.stations = Stations(self.backend, trusted_reads=trusted_reads)
+        self.radio_dials = RadioDials(self.backend, station_index=self.station_radio_dials, trusted_reads=trusted_reads)
+        self.aio = AsyncStores(
+            AsyncBackend(self.backend),
+            radio_dial_players=self.radio_dial_players,
+            station_radio_dials=self.station_radio_dials,
+            stations=self.stations,
+            trusted_reads=trusted_reads,
+        )
 
     def seed(self) -> None:
         """
         Seeds the datastore with initial data from the data-seed directory.
         Only seeds data if it doesn't already exist in the backend.
         """
-        seed_from_path(self.seed_path, self._seedable_stores(), label=DATA_NAMESPACE)
+        seed_from_path(self.seed_path, self._seedable_stores(), label=DATA_NAMESPACE, backend=self.backend)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group this thread's writes through the synchronous stores into one backend commit, where supported.
+
+        The reverse indexes take in those writes only once the block has committed them.
+        """
+        with (
+            self.radio_dial_players.deferred(),
+            self.station_radio_dials.deferred(),
+            backend_transaction(self.backend),
+        ):
+            yield
+
+    def rebuild_indexes(self) -> None:
+        """Build the reverse indexes from a full scan, at startup or after editing documents outside the registry."""
+        self.radio_dial_players.rebuild()
+        self.station_radio_dials.rebuild()
 
     def _seedable_stores(self) -> list[SeedableStore]:
         return [
@@ -1,10 +1,14 @@
-from .accounts import Accounts
-from .players import Players
-from .radio_dials import RadioDials
-from .stations import Stations
+from .accounts import Accounts, AsyncAccounts
+from .players import AsyncPlayers, Players
+from .radio_dials import AsyncRadioDials, RadioDials
+from .stations import AsyncStations, Stations
 
 __all__ = [
     "Accounts",
+    "AsyncAccounts",
+    "AsyncPlayers",
+    "AsyncRadioDials",
+    "AsyncStations",
     "Players",
     "RadioDials",
     "Stations",
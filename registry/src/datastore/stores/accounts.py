@@ -1,9 +1,18 @@
-from datastore.core import ModelStore, ObjectStore
+from datastore.core import AsyncModelStore, AsyncObjectStore, ModelStore, ObjectStore
 from models.account import Account, AccountSpec
 
+_PATH_TEMPLATE = "accounts/{id}"
+
 
 class Accounts(ModelStore[Account, AccountSpec]):
     """A data store for managing accounts (accounts/<id>.json)."""
 
-    def __init__(self, backend: ObjectStore):
-        super().__init__(backend, model=Account, path_template="accounts/{id}")
+    def __init__(self, backend: ObjectStore, *, trusted_reads: bool = False):
+        super().__init__(backend, model=Account, path_template=_PATH_TEMPLATE, trusted_reads=trusted_reads)
+
+
+class AsyncAccounts(AsyncModelStore[Account, AccountSpec]):
+    """Awaitable Accounts store used by API routes."""
+
+    def __init__(self, backend: AsyncObjectStore, *, trusted_reads: bool = False):
+        super().__init__(backend, model=Account, path_template=_PATH_TEMPLATE, trusted_reads=trusted_reads)
@@ -1,9 +1,95 @@
-from datastore.core import ModelStore, ObjectStore
+from __future__ import annotations
+
+import asyncio
+import builtins
+from collections.abc import Iterator
+
+from datastore.core import (
+    AsyncModelStore,
+    AsyncObjectStore,
+    ChangeFeed,
+    ModelStore,
+    ObjectStore,
+    ReferenceIndex,
+    deconstruct_storage_path,
+    list_all,
+)
+from datastore.types import JsonDoc
+from lib.keys import join_key
 from models.player import Player, PlayerSpec
 
+_PATH_TEMPLATE = "accounts/{account_id}/players/{id}"
+
+
+def radio_dial_players_index(
+    backend: ObjectStore, *, changes: ChangeFeed | None = None, max_age_seconds: float | None = None
+) -> ReferenceIndex:
+    """Return an index from RadioDial keys to the keys of the players assigned to them.
+
+    With *changes*, the feed of the backend's writes, players saved or deleted by other
+    processes are read again before each lookup; without it, the index is rescanned in the
+    background once it is *max_age_seconds* old.
+    """
+
+    def scan() -> Iterator[tuple[str, builtins.list[str]]]:
+        for account in list_all(backend, "accounts"):
+            for player in list_all(backend, "accounts", account["id"], "players"):
+                yield join_key(account["id"], player["id"]), _referenced(player)
+
+    def rescan(storage_key: str) -> tuple[str, builtins.list[str]] | None:
+        player_id, path = deconstruct_storage_path(storage_key, prefix="")
+        if len(path) != 3 or path[0] != "accounts" or path[2] != "players":
+            return None
+        player, _ = backend.get(player_id, *path)
+        return join_key(path[1], player_id), _referenced(player or {})
+
+    return ReferenceIndex(scan, rescan=rescan, changes=changes, max_age_seconds=max_age_seconds)
+
+
+def _referenced(player: JsonDoc) -> builtins.list[str]:
+    radio_dial = player.get("radio_dial")
+    return [radio_dial] if radio_dial else []
+
+
+def _radio_dials(player: Player) -> builtins.list[str]:
+    return [player.radio_dial] if player.radio_dial else []
+
 
 class Players(ModelStore[Player, PlayerSpec]):
     """A data store for managing an account's players (accounts/<account_id>/players/<id>.json)."""
 
-    def __init__(self, backend: ObjectStore):
-        super().__init__(backend, model=Player, path_template="accounts/{account_id}/players/{id}")
+    def __init__(
+        self, backend: ObjectStore, *, radio_dial_index: ReferenceIndex | None = None, trusted_reads: bool = False
+    ):
+        super().__init__(
+            backend,
+            model=Player,
+            path_template=_PATH_TEMPLATE,
+            reference_index=radio_dial_index,
+            references=_radio_dials if radio_dial_index is not None else None,
+            trusted_reads=trusted_reads,
+        )
+
+    def using_radio_dial(self, radio_dial: str) -> builtins.list[str]:
+        """Return the sorted keys of the players assigned to a RadioDial."""
+        return self._referrers_index().referrers(radio_dial)
+
+
+class AsyncPlayers(AsyncModelStore[Player, PlayerSpec]):
+    """Awaitable Players store used by API routes."""
+
+    def __init__(
+        self, backend: AsyncObjectStore, *, radio_dial_index: ReferenceIndex | None = None, trusted_reads: bool = False
+    ):
+        super().__init__(
+            backend,
+            model=Player,
+            path_template=_PATH_TEMPLATE,
+            reference_index=radio_dial_index,
+            references=_radio_dials if radio_dial_index is not None else None,
+            trusted_reads=trusted_reads,
+        )
+
+    async def using_radio_dial(self, radio_dial: str) -> builtins.list[str]:
+        """Return the sorted keys of the players assigned to a RadioDial; a cold index is built off the event loop."""
+        return await asyncio.to_thread(self._referrers_index().referrers, radio_dial)
@@ -1,9 +1,27 @@
+from __future__ import annotations
+
+import asyncio
+import builtins
+from collections.abc import Iterator
+
 from pydantic import Field
 
-from datastore.core import ModelStore, ObjectStore
+from datastore.core import (
+    AsyncModelStore,
+    AsyncObjectStore,
+    ChangeFeed,
+    ModelStore,
+    ObjectStore,
+    ReferenceIndex,
+    deconstruct_storage_path,
+    list_all,
+)
+from lib.keys import join_key
 from lib.types import Slug
 from models.radio_dial import RadioDialSpec
 
+_PATH_TEMPLATE = "accounts/{account_id}/radio-dials/{id}"
+
 
 class _RadioDialRecord(RadioDialSpec):
     """Internal datastore entity; API models expose a qualified key instead."""
@@ -12,8 +30,70 @@ class _RadioDialRecord(RadioDialSpec):
     account_id: Slug = Field(..., json_schema_extra={"example": "community"})
 
 
+def station_radio_dials_index(
+    backend: ObjectStore, *, changes: ChangeFeed | None = None, max_age_seconds: float | None = None
+) -> ReferenceIndex:
+    """Return an index from Station keys to the keys of the RadioDials listing them.
+
+    With *changes*, the feed of the backend's writes, RadioDials saved or deleted by other
+    processes are read again before each lookup; without it, the index is rescanned in the
+    background once it is *max_age_seconds* old.
+    """
+
+    def scan() -> Iterator[tuple[str, builtins.list[str]]]:
+        for account in list_all(backend, "accounts"):
+            for radio_dial in list_all(backend, "accounts", account["id"], "radio-dials"):
+                yield join_key(account["id"], radio_dial["id"]), radio_dial.get("stations") or []
+
+    def rescan(storage_key: str) -> tuple[str, builtins.list[str]] | None:
+        radio_dial_id, path = deconstruct_storage_path(storage_key, prefix="")
+        if len(path) != 3 or path[0] != "accounts" or path[2] != "radio-dials":
+            return None
+        radio_dial, _ = backend.get(radio_dial_id, *path)
+        return join_key(path[1], radio_dial_id), (radio_dial or {}).get("stations") or []
+
+    return ReferenceIndex(scan, rescan=rescan, changes=changes, max_age_seconds=max_age_seconds)
+
+
+def _stations(radio_dial: _RadioDialRecord) -> builtins.list[str]:
+    return radio_dial.stations
+
+
 class RadioDials(ModelStore[_RadioDialRecord, RadioDialSpec]):
     """Account RadioDials stored at accounts/<account_id>/radio-dials/<id>.json."""
 
-    def __init__(self, backend: ObjectStore):
-        super().__init__(backend, model=_RadioDialRecord, path_template="accounts/{account_id}/radio-dials/{id}")
+    def __init__(
+        self, backend: ObjectStore, *, station_index: ReferenceIndex | None = None, trusted_reads: bool = False
+    ):
+        super().__init__(
+            backend,
+            model=_RadioDialRecord,
+            path_template=_PATH_TEMPLATE,
+            reference_index=station_index,
+            references=_stations if station_index is not None else None,
+            trusted_reads=trusted_reads,
+        )
+
+    def using_station(self, station: str) -> builtins.list[str]:
+        """Return the sorted keys of the RadioDials listing a Station."""
+        return self._referrers_index().referrers(station)
+
+
+class AsyncRadioDials(AsyncModelStore[_RadioDialRecord, RadioDialSpec]):
+    """Awaitable RadioDials store used by API routes."""
+
+    def __init__(
+        self, backend: AsyncObjectStore, *, station_index: ReferenceIndex | None = None, trusted_reads: bool = False
+    ):
+        super().__init__(
+            backend,
+            model=_RadioDialRecord,
+            path_template=_PATH_TEMPLATE,
+            reference_index=station_index,
+            references=_stations if station_index is not None else None,
+            trusted_reads=trusted_reads,
+        )
+
+    async def using_station(self, station: str) -> builtins.list[str]:
+        """Return the sorted keys of the RadioDials listing a Station; a cold index is built off the event loop."""
+        return await asyncio.to_thread(self._referrers_index().referrers, station)
@@ -1,106 +1,190 @@
 from __future__ import annotations
 
+import asyncio
+import bisect
 import builtins
-from collections.abc import Mapping
+import zlib
+from collections.abc import Callable, Iterable, Mapping
 
-from pydantic import TypeAdapter
-
-from datastore.core import ObjectStore
-from datastore.types import JsonDoc, PathParams
+from datastore.core import (
+    AsyncObjectStore,
+    CacheStats,
+    ExpiringCache,
+    ObjectStore,
+    backend_transaction,
+    compute_etag,
+)
+from datastore.exceptions import ConcurrencyError
+from datastore.types import ETag, JsonDoc, PagedResult, PathParams
+from lib.canonical import canonical_call_sign, canonical_slug
 from lib.keys import join_key, split_key
-from lib.types import CallSign, Slug, StationKey
+from lib.types import CallSign, StationKey
 from models.station import Station, StationSpec
 
-_CALL_SIGN_ADAPTER: TypeAdapter[str] = TypeAdapter(CallSign)
-_SLUG_ADAPTER: TypeAdapter[str] = TypeAdapter(Slug)
+# Id of the legacy single-document form (accounts/<account_id>/stations.json) and the
+# directory holding the shards that replace it (accounts/<account_id>/stations/<shard>.json).
+_STATIONS_ID = "stations"
+# Changing the shard count moves stations between shards; stored data would need migrating.
+_SHARD_COUNT = 16
+_SHARD_WRITE_ATTEMPTS = 8
+_TRUSTED_SHARDS_TTL_SECONDS = 3600
+_TRUSTED_SHARDS_MAX_ENTRIES = 1024
 
+type _StationsByCallSign = dict[CallSign, StationSpec]
 
-class Stations:
-    """Account-owned stations stored at accounts/<account_id>/stations.json."""
 
-    def __init__(self, backend: ObjectStore):
-        self._backend = backend
+def _shard(call_sign: str) -> str:
+    return f"{zlib.crc32(call_sign.encode('utf-8')) % _SHARD_COUNT:02x}"
 
-    def get(self, account_id: str, call_sign: str) -> Station | None:
-        stations_by_call_sign, _ = self._load(account_id)
-        canonical_call_sign = self._canonical_call_sign(call_sign)
-        spec = stations_by_call_sign.get(canonical_call_sign)
-        if spec is None:
-            return None
-        return self._station(account_id, canonical_call_sign, spec)
 
-    def list(self, account_id: str, *, page: int = 1, per_page: int = 10) -> builtins.list[Station]:
-        stations_by_call_sign, _ = self._load(account_id)
-        items = sorted(stations_by_call_sign.items())
-        start = max(0, (page - 1) * per_page)
-        return [self._station(account_id, call_sign, spec) for call_sign, spec in items[start : start + per_page]]
+def _shard_path(account_id: str) -> tuple[str, str, str]:
+    return "accounts", account_id, _STATIONS_ID
 
-    def upsert(self, account_id: str, call_sign: str, spec: StationSpec) -> Station:
-        stations_by_call_sign, version = self._load(account_id)
-        canonical_call_sign = self._canonical_call_sign(call_sign)
-        updated = {**stations_by_call_sign, canonical_call_sign: spec}
-        self._backend.save(
-            "stations",
-            self._dump(updated),
-            "accounts",
-            account_id,
-            if_match=version,
-            if_none_match=version is None,
+
+class _StationsBase:
+    """Shard parsing and Station materialization shared by Stations and AsyncStations."""
+
+    def __init__(self, *, trusted_reads: bool) -> None:
+        # Keyed by (account id, ETag of the shard content): a shard only maps to one set of Stations.
+        self._trusted: ExpiringCache[tuple[str, ETag], dict[str, Station]] | None = (
+            ExpiringCache(ttl_seconds=_TRUSTED_SHARDS_TTL_SECONDS, max_entries=_TRUSTED_SHARDS_MAX_ENTRIES)
+            if trusted_reads
+            else None
         )
-        return self._station(account_id, canonical_call_sign, spec)
 
-    def resolve(self, keys: builtins.list[StationKey]) -> tuple[builtins.list[Station], builtins.list[StationKey]]:
-        stations_by_account: dict[str, dict[CallSign, StationSpec]] = {}
-        resolved: builtins.list[Station] = []
-        missing: builtins.list[StationKey] = []
+    def trusted_read_stats(self) -> CacheStats | None:
+        """Return hit/miss counters for trusted shard reads, or None when they are disabled."""
+        return self._trusted.stats() if self._trusted is not None else None
+
+    def _page(
+        self,
+        account_id: str,
+        shards: builtins.list[JsonDoc],
+        page: int,
+        per_page: int,
+        after: str | None,
+    ) -> builtins.list[Station]:
+        stations: dict[str, Station] = {}
+        for data in shards:
+            stations.update(self._stations(account_id, data))
+        items = sorted(stations.items())
+        if after is not None:
+            start = bisect.bisect_right(items, after, key=lambda item: item[0])
+        else:
+            start = max(0, (page - 1) * per_page)
+        return [station.model_copy() for _, station in items[start : start + per_page]]
+
+    def _stations(self, account_id: str, data: JsonDoc) -> dict[str, Station]:
+        """Materialize a shard's Stations; with trusted reads, once per account and shard content.
+
+        The returned Stations may be shared: copy them before handing them out.
+        """
+        if self._trusted is None:
+            return self._materialize(account_id, data)
+        return self._trusted.get_or_load((account_id, compute_etag(data)), lambda: self._materialize(account_id, data))
+
+    def _materialize(self, account_id: str, data: JsonDoc) -> dict[str, Station]:
+        return {call_sign: self._station(account_id, call_sign, spec) for call_sign, spec in self._parse(data).items()}
 
+    def _lookup_versioned(
+        self,
+        account_id: str,
+        call_sign: str,
+        data: JsonDoc | None,
+        version: str | None,
+        unless: Callable[[str], bool] | None,
+    ) -> tuple[Station | None, str | None]:
+        # Stored documents are keyed by canonical call sign, so presence needs no validation.
+        if data is None or version is None or call_sign not in data:
+            return None, None
+        if unless is not None and unless(version):
+            return None, version
+        return self._lookup(account_id, data, call_sign), version
+
+    def _lookup(self, account_id: str, data: JsonDoc | None, call_sign: str) -> Station | None:
+        """Return one Station of a stored shard; without trusted reads only that Station is validated."""
+        if data is None or call_sign not in data:
+            return None
+        if self._trusted is None:
+            return self._station(account_id, call_sign, StationSpec.model_validate(data[call_sign]))
+        return self._stations(account_id, data)[call_sign].model_copy()
+
+    def _shards(self, keys: Iterable[StationKey]) -> builtins.list[tuple[str, str]]:
+        """Return the distinct (account id, shard) pairs holding ``keys``, in first-seen order."""
+        shards: dict[tuple[str, str], None] = {}
         for key in keys:
             account_id, call_sign = split_key(key)
-            if account_id not in stations_by_account:
-                stations_by_account[account_id], _ = self._load(account_id)
-            spec = stations_by_account[account_id].get(call_sign)
-            if spec is None:
-                missing.append(key)
-                continue
-            resolved.append(self._station(account_id, call_sign, spec))
+            shards[account_id, _shard(call_sign)] = None
+        return builtins.list(shards)
 
-        return resolved, missing
+    def _combine(self, shards: PagedResult[JsonDoc], legacy: JsonDoc | None) -> builtins.list[JsonDoc]:
+        """Return listed shards without their ids, plus the legacy document's stations for shards not yet written."""
+        combined: builtins.list[JsonDoc] = []
+        written: set[str] = set()
+        for shard in shards:
+            data = dict(shard)
+            written.add(data.pop("id"))
+            combined.append(data)
+        if legacy is not None:
+            combined.append(self._legacy_shards(legacy, exclude=written))
+        return combined
 
-    def match(self, path: str) -> dict[str, str] | None:
-        parts = path.split("/")
-        if len(parts) == 3 and parts[0] == "accounts" and parts[2] == "stations.json":
-            return {"id": "stations", "account_id": parts[1]}
-        return None
+    def _legacy_shard(self, legacy: JsonDoc | None, shard: str) -> JsonDoc | None:
+        if legacy is None:
+            return None
+        return {call_sign: payload for call_sign, payload in legacy.items() if _shard(call_sign) == shard}
 
-    def exists(self, object_id: str, *, path_params: Mapping[str, str] | None = None) -> bool:
-        account_id = self._account_id(path_params)
-        data, _ = self._backend.get("stations", "accounts", account_id)
-        return data is not None
+    def _legacy_shards(self, legacy: JsonDoc, *, exclude: set[str]) -> JsonDoc:
+        return {call_sign: payload for call_sign, payload in legacy.items() if _shard(call_sign) not in exclude}
 
-    def seed(self, data: JsonDoc, *, path_params: PathParams | None = None) -> None:
-        account_id = self._account_id(path_params)
+    def _split(self, data: JsonDoc | None) -> dict[str, JsonDoc]:
+        """Group a stations mapping by shard, validating and canonicalizing it first."""
+        shards: dict[str, JsonDoc] = {}
+        if data is None:
+            return shards
+        for call_sign, payload in self._dump(self._parse(data)).items():
+            shards.setdefault(_shard(call_sign), {})[call_sign] = payload
+        return shards
+
+    def _partition(
+        self, specs: Mapping[str, StationSpec]
+    ) -> tuple[dict[str, _StationsByCallSign], dict[str, StationSpec]]:
+        """Return ``specs`` grouped by shard and keyed by canonical call sign, in order."""
+        by_shard: dict[str, _StationsByCallSign] = {}
+        canonical: dict[str, StationSpec] = {}
+        for raw_call_sign, spec in specs.items():
+            call_sign = canonical_call_sign(raw_call_sign)
+            if call_sign in canonical:
+                raise ValueError(f"Duplicate station call sign: {call_sign}")
+            canonical[call_sign] = spec
+            by_shard.setdefault(_shard(call_sign), {})[call_sign] = spec
+        return by_shard, canonical
+
+    def _updated_shard(self, data: JsonDoc | None, specs: _StationsByCallSign) -> JsonDoc:
+        return {**(data or {}), **self._dump(specs)}
+
+    def _touched(self, data: JsonDoc | None, specs: _StationsByCallSign) -> JsonDoc:
+        """Return the stored form of the Stations a write replaces, to tell its conflicts from its neighbours'."""
+        return {call_sign: (data or {}).get(call_sign) for call_sign in specs}
+
+    def _seed_payload(self, data: JsonDoc, account_id: str) -> JsonDoc:
         payload = dict(data)
-        if payload.get("id") == "stations":
+        if payload.get("id") == _STATIONS_ID:
             payload.pop("id")
         if payload.get("account_id") == account_id:
             payload.pop("account_id")
-        stations_by_call_sign = self._parse(payload)
-        self._backend.save("stations", self._dump(stations_by_call_sign), "accounts", account_id)
-
-    def _load(self, account_id: str) -> tuple[dict[CallSign, StationSpec], str | None]:
-        data, version = self._backend.get("stations", "accounts", account_id)
-        return self._parse(data or {}), version
+        return payload
 
-    def _parse(self, data: JsonDoc) -> dict[CallSign, StationSpec]:
-        stations: dict[CallSign, StationSpec] = {}
+    def _parse(self, data: JsonDoc) -> _StationsByCallSign:
+        stations: _StationsByCallSign = {}
         for raw_call_sign, payload in data.items():
-            call_sign = self._canonical_call_sign(raw_call_sign)
+            call_sign = canonical_call_sign(raw_call_sign)
             if call_sign in stations:
                 raise ValueError(f"Duplicate station call sign: {call_sign}")
             stations[call_sign] = StationSpec.model_validate(payload)
         return stations
 
-    def _dump(self, stations: dict[CallSign, StationSpec]) -> JsonDoc:
+    def _dump(self, stations: _StationsByCallSign) -> JsonDoc:
         return {call_sign: spec.model_dump(mode="json") for call_sign, spec in stations.items()}
 
     def _station(self, account_id: str, call_sign: str, spec: StationSpec) -> Station:
@@ -108,14 +192,276 @@ class Stations:
             {
                 "key": join_key(account_id, call_sign),
                 "call_sign": call_sign,
-                **spec.model_dump(),
+                **dict(spec),
             }
         )
 
-    def _canonical_call_sign(self, call_sign: str) -> str:
-        return _CALL_SIGN_ADAPTER.validate_python(call_sign)
-
     def _account_id(self, path_params: Mapping[str, str] | None) -> str:
         if not path_params or not isinstance(path_params.get("account_id"), str):
             raise ValueError("account_id path parameter is required for stations")
-        return _SLUG_ADAPTER.validate_python(path_params["account_id"])
+        return canonical_slug(path_params["account_id"])
+
+
+class Stations(_StationsBase):
+    """Account-owned stations, hash-bucketed into accounts/<account_id>/stations/<shard>.json.
+
+    Each shard maps call signs to Station specifications, so a lookup validates one Station and
+    a write replaces one shard. Writers of different Stations in the same shard retry their
+    conditional write instead of failing. An account still in the single-document form
+    (accounts/<account_id>/stations.json) is read from that document and split into shards by
+    its first write.
+    """
+
+    def __init__(self, backend: ObjectStore, *, trusted_reads: bool = False):
+        super().__init__(trusted_reads=trusted_reads)
+        self._backend = backend
+
+    def get(self, account_id: str, call_sign: str) -> Station | None:
+        call_sign = canonical_call_sign(call_sign)
+        data, _ = self._read_shard(account_id, _shard(call_sign))
+        return self._lookup(account_id, data, call_sign)
+
+    def get_with_version(
+        self, account_id: str, call_sign: str, *, unless: Callable[[str], bool] | None = None
+    ) -> tuple[Station | None, str | None]:
+        """Fetch a Station with the ETag of its stations shard; see ModelStore.get_with_version."""
+        call_sign = canonical_call_sign(call_sign)
+        data, version = self._read_shard(account_id, _shard(call_sign))
+        return self._lookup_versioned(account_id, call_sign, data, version, unless)
+
+    def list(
+        self, account_id: str, *, page: int = 1, per_page: int = 10, after: str | None = None
+    ) -> builtins.list[Station]:
+        shards = self._backend.list(*_shard_path(account_id), per_page=_SHARD_COUNT)
+        legacy, _ = self._backend.get(_STATIONS_ID, "accounts", account_id)
+        return self._page(account_id, self._combine(shards, legacy), page, per_page, after)
+
+    def upsert(self, account_id: str, call_sign: str, spec: StationSpec) -> Station:
+        return self.upsert_many(account_id, {call_sign: spec})[0]
+
+    def upsert_many(self, account_id: str, specs: Mapping[str, StationSpec]) -> builtins.list[Station]:
+        """Replace or create several Stations with one conditional write per shard they fall in.
+
+        The writes are committed together where the backend supports transactions.
+        """
+        by_shard, canonical = self._partition(specs)
+        with backend_transaction(self._backend):
+            legacy, _ = self._backend.get(_STATIONS_ID, "accounts", account_id)
+            migrated = self._split(legacy)
+            for shard, shard_specs in by_shard.items():
+                self._write_shard(account_id, shard, shard_specs, migrated.pop(shard, None))
+            if legacy is not None:
+                for shard, data in migrated.items():
+                    self._create_shard(account_id, shard, data)
+                self._backend.delete(_STATIONS_ID, "accounts", account_id)
+        return [self._station(account_id, call_sign, spec) for call_sign, spec in canonical.items()]
+
+    def resolve(self, keys: builtins.list[StationKey]) -> tuple[builtins.list[Station], builtins.list[StationKey]]:
+        """Resolve Station keys with one read per (account, shard) they fall in."""
+        shards = {shard: self._read_shard(*shard)[0] for shard in self._shards(keys)}
+        resolved: builtins.list[Station] = []
+        missing: builtins.list[StationKey] = []
+
+        for key in keys:
+            account_id, call_sign = split_key(key)
+            station = self._lookup(account_id, shards[account_id, _shard(call_sign)], call_sign)
+            if station is None:
+                missing.append(key)
+                continue
+            resolved.append(station)
+
+        return resolved, missing
+
+    def versions(self, keys: builtins.list[StationKey]) -> builtins.list[str | None]:
+        """Return the ETag of each stations shard holding ``keys``, once per shard in first-seen order.
+
+        None stands for a shard that does not exist.
+        """
+        return [self._read_shard(account_id, shard)[1] for account_id, shard in self._shards(keys)]
+
+    def match(self, path: str) -> dict[str, str] | None:
+        parts = path.split("/")
+        if len(parts) == 3 and parts[0] == "accounts" and parts[2] == "stations.json":
+            return {"id": _STATIONS_ID, "account_id": parts[1]}
+        return None
+
+    def exists(self, object_id: str, *, path_params: Mapping[str, str] | None = None) -> bool:
+        account_id = self._account_id(path_params)
+        if self._backend.list(*_shard_path(account_id), per_page=1):
+            return True
+        data, _ = self._backend.get(_STATIONS_ID, "accounts", account_id)
+        return data is not None
+
+    def seed(self, data: JsonDoc, *, path_params: PathParams | None = None) -> None:
+        """Write a seed file's stations, in the single-document form, as shards.
+
+        A legacy stations document is migrated into the shards underneath the seed's stations, then deleted.
+        """
+        account_id = self._account_id(path_params)
+        shards = self._split(self._seed_payload(data, account_id))
+        with backend_transaction(self._backend):
+            legacy, _ = self._backend.get(_STATIONS_ID, "accounts", account_id)
+            migrated = self._split(legacy)
+            for shard, shard_data in shards.items():
+                self._backend.save(shard, {**migrated.pop(shard, {}), **shard_data}, *_shard_path(account_id))
+            if legacy is not None:
+                for shard, shard_data in migrated.items():
+                    self._backend.save(shard, shard_data, *_shard_path(account_id))
+                self._backend.delete(_STATIONS_ID, "accounts", account_id)
+
+    def _read_shard(self, account_id: str, shard: str) -> tuple[JsonDoc | None, str | None]:
+        data, version = self._backend.get(shard, *_shard_path(account_id))
+        if data is not None:
+            return data, version
+        legacy, legacy_version = self._backend.get(_STATIONS_ID, "accounts", account_id)
+        return self._legacy_shard(legacy, shard), legacy_version
+
+    def _write_shard(self, account_id: str, shard: str, specs: _StationsByCallSign, migrated: JsonDoc | None) -> None:
+        """Apply ``specs`` to a shard, retrying while concurrent writes leave these Stations untouched."""
+        data: JsonDoc | None
+        version: str | None
+        if migrated is not None:
+            data, version = migrated, None
+        else:
+            data, version = self._backend.get(shard, *_shard_path(account_id))
+        touched = self._touched(data, specs)
+        for attempt in range(_SHARD_WRITE_ATTEMPTS):
+            try:
+                self._backend.save(
+                    shard,
+                    self._updated_shard(data, specs),
+                    *_shard_path(account_id),
+                    if_match=version,
+                    if_none_match=version is None,
+                )
+                return
+            except ConcurrencyError:
+                data, version = self._backend.get(shard, *_shard_path(account_id))
+                if attempt + 1 == _SHARD_WRITE_ATTEMPTS or self._touched(data, specs) != touched:
+                    raise
+
+    def _create_shard(self, account_id: str, shard: str, data: JsonDoc) -> None:
+        try:
+            self._backend.save(shard, data, *_shard_path(account_id), if_none_match=True)
+        except ConcurrencyError:
+            pass  # Already split out of the legacy document by a concurrent writer.
+
+
+class AsyncStations(_StationsBase):
+    """Awaitable Stations store used by API routes.
+
+    Given the synchronous ``stations`` store over the same backend, upserts run as one
+    Stations.upsert_many in a worker thread, so they are committed together where the backend
+    supports transactions, as synchronous upserts are.
+    """
+
+    def __init__(self, backend: AsyncObjectStore, *, stations: Stations | None = None, trusted_reads: bool = False):
+        super().__init__(trusted_reads=trusted_reads)
+        self._backend = backend
+        self._sync = stations
+
+    async def get(self, account_id: str, call_sign: str) -> Station | None:
+        call_sign = canonical_call_sign(call_sign)
+        data, _ = await self._read_shard(account_id, _shard(call_sign))
+        return self._lookup(account_id, data, call_sign)
+
+    async def get_with_version(
+        self, account_id: str, call_sign: str, *, unless: Callable[[str], bool] | None = None
+    ) -> tuple[Station | None, str | None]:
+        call_sign = canonical_call_sign(call_sign)
+        data, version = await self._read_shard(account_id, _shard(call_sign))
+        return self._lookup_versioned(account_id, call_sign, data, version, unless)
+
+    async def list(
+        self, account_id: str, *, page: int = 1, per_page: int = 10, after: str | None = None
+    ) -> builtins.list[Station]:
+        shards, (legacy, _) = await asyncio.gather(
+            self._backend.list(*_shard_path(account_id), per_page=_SHARD_COUNT),
+            self._backend.get(_STATIONS_ID, "accounts", account_id),
+        )
+        return self._page(account_id, self._combine(shards, legacy), page, per_page, after)
+
+    async def upsert(self, account_id: str, call_sign: str, spec: StationSpec) -> Station:
+        return (await self.upsert_many(account_id, {call_sign: spec}))[0]
+
+    async def upsert_many(self, account_id: str, specs: Mapping[str, StationSpec]) -> builtins.list[Station]:
+        """Replace or create several Stations, writing the shards they fall in concurrently.
+
+        With a synchronous store the shards are written in one worker thread and one backend transaction instead.
+        """
+        if self._sync is not None:
+            return await asyncio.to_thread(self._sync.upsert_many, account_id, specs)
+        by_shard, canonical = self._partition(specs)
+        legacy, _ = await self._backend.get(_STATIONS_ID, "accounts", account_id)
+        migrated = self._split(legacy)
+        await asyncio.gather(
+            *(
+                self._write_shard(account_id, shard, shard_specs, migrated.pop(shard, None))
+                for shard, shard_specs in by_shard.items()
+            )
+        )
+        if legacy is not None:
+            await asyncio.gather(*(self._create_shard(account_id, shard, data) for shard, data in migrated.items()))
+            await self._backend.delete(_STATIONS_ID, "accounts", account_id)
+        return [self._station(account_id, call_sign, spec) for call_sign, spec in canonical.items()]
+
+    async def resolve(
+        self, keys: builtins.list[StationKey]
+    ) -> tuple[builtins.list[Station], builtins.list[StationKey]]:
+        shard_ids = self._shards(keys)
+        loaded = await asyncio.gather(*(self._read_shard(*shard) for shard in shard_ids))
+        shards = {shard: data for shard, (data, _) in zip(shard_ids, loaded, strict=True)}
+        resolved: builtins.list[Station] = []
+        missing: builtins.list[StationKey] = []
+
+        for key in keys:
+            account_id, call_sign = split_key(key)
+            station = self._lookup(account_id, shards[account_id, _shard(call_sign)], call_sign)
+            if station is None:
+                missing.append(key)
+                continue
+            resolved.append(station)
+
+        return resolved, missing
+
+    async def versions(self, keys: builtins.list[StationKey]) -> builtins.list[str | None]:
+        loaded = await asyncio.gather(*(self._read_shard(*shard) for shard in self._shards(keys)))
+        return [version for _, version in loaded]
+
+    async def _read_shard(self, account_id: str, shard: str) -> tuple[JsonDoc | None, str | None]:
+        data, version = await self._backend.get(shard, *_shard_path(account_id))
+        if data is not None:
+            return data, version
+        legacy, legacy_version = await self._backend.get(_STATIONS_ID, "accounts", account_id)
+        return self._legacy_shard(legacy, shard), legacy_version
+
+    async def _write_shard(
+        self, account_id: str, shard: str, specs: _StationsByCallSign, migrated: JsonDoc | None
+    ) -> None:
+        data: JsonDoc | None
+        version: str | None
+        if migrated is not None:
+            data, version = migrated, None
+        else:
+            data, version = await self._backend.get(shard, *_shard_path(account_id))
+        touched = self._touched(data, specs)
+        for attempt in range(_SHARD_WRITE_ATTEMPTS):
+            try:
+                await self._backend.save(
+                    shard,
+                    self._updated_shard(data, specs),
+                    *_shard_path(account_id),
+                    if_match=version,
+                    if_none_match=version is None,
+                )
+                return
+            except ConcurrencyError:
+                data, version = await self._backend.get(shard, *_shard_path(account_id))
+                if attempt + 1 == _SHARD_WRITE_ATTEMPTS or self._touched(data, specs) != touched:
+                    raise
+
+    async def _create_shard(self, account_id: str, shard: str, data: JsonDoc) -> None:
+        try:
+            await self._backend.save(shard, data, *_shard_path(account_id), if_none_match=True)
+        except ConcurrencyError:
+            pass  # Already split out of the legacy document by a concurrent writer.
@@ -0,0 +1,29 @@
+"""Memoized canonical forms of identifiers.
+
+The same call signs and account ids arrive on every request, so each distinct input is
+validated once and its canonical form reused. The caches are bounded because the inputs
+come from clients; invalid input raises pydantic.ValidationError and is not cached.
+"""
+
+import functools
+
+from pydantic import TypeAdapter
+
+from .types import CallSign, Slug
+
+_MAX_ENTRIES = 8192
+
+_CALL_SIGN_ADAPTER: TypeAdapter[str] = TypeAdapter(CallSign)
+_SLUG_ADAPTER: TypeAdapter[str] = TypeAdapter(Slug)
+
+
+@functools.lru_cache(maxsize=_MAX_ENTRIES)
+def canonical_call_sign(value: str) -> str:
+    """Return the canonical uppercase form of a call sign."""
+    return _CALL_SIGN_ADAPTER.validate_python(value)
+
+
+@functools.lru_cache(maxsize=_MAX_ENTRIES)
+def canonical_slug(value: str) -> str:
+    """Return a slug, such as an account id, once it is known to be valid."""
+    return _SLUG_ADAPTER.validate_python(value)
@@ -29,6 +29,9 @@ MAX_NAME_LENGTH = 36
 # Maximum items per page
 MAX_PER_PAGE = 100
 
+# Maximum resources per batch request, and per kind in an account import
+MAX_BATCH_SIZE = 5000
+
 # CORS allowed origins (comma-separated)
 _DEFAULT_CORS_ORIGINS = (
     "capacitor://localhost,http://localhost:5173,http://localhost:5174,http://localhost,https://localhost"
@@ -0,0 +1,77 @@
+"""JSON encoding shared by storage, ETags, and the switchboard.
+
+Encoding and decoding go through orjson, falling back to the standard library where the
+two would disagree, so ETags and stored documents keep the bytes they always had: orjson
+writes some floats differently (``1e-05`` as ``0.00001``), so canonical and storage output
+for documents holding floats comes from the standard library, as does anything orjson
+cannot encode (such as integers beyond 64 bits) or decode (such as ``NaN``). orjson also
+decodes integers beyond 64 bits as floats, so input with 19 or more consecutive digits is
+decoded by the standard library.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import orjson
+
+# Every digit becomes "0", so a run of 19 zeros marks a number that may be outside orjson's
+# 64-bit range; runs inside strings only cost a standard library decode. Translating and
+# searching bytes is several times cheaper than a regular expression over the document.
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+_LONG_DIGITS = b"0" * 19
+
+
+def _has_float(value: object) -> bool:
+    if isinstance(value, float):
+        return True
+    if isinstance(value, dict):
+        return any(_has_float(item) for item in value.values())
+    if isinstance(value, list | tuple):
+        return any(_has_float(item) for item in value)
+    return False
+
+
+def _has_long_digits(data: str | bytes) -> bool:
+    raw = data.encode("utf-8", "surrogatepass") if isinstance(data, str) else data
+    return _LONG_DIGITS in raw.translate(_DIGITS_TO_ZERO)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode compact UTF-8 JSON, without sorting keys."""
+    try:
+        return orjson.dumps(value)
+    except TypeError:
+        pass
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def canonical_dumps(value: Any) -> bytes:
+    """Encode sorted-key, compact UTF-8 JSON; the stable form that ETags are computed over."""
+    if not _has_float(value):
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, ensure_ascii=False).encode("utf-8")
+
+
+def storage_dumps(value: Any) -> bytes:
+    """Encode sorted-key JSON indented by two spaces with a trailing newline, as documents are stored."""
+    if not _has_float(value):
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass
+    return (json.dumps(value, indent=2, sort_keys=True, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode JSON; raises json.JSONDecodeError (or ValueError for undecodable bytes) when it is invalid."""
+    if not _has_long_digits(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
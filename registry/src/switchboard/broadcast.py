@@ -4,39 +4,223 @@ Provides a channel-based publish/subscribe API used by the switchboard to relay
 WebSocket messages between players and controllers connected to the same
 ``{account_id}/{player_id}`` channel.
 
-The default (and currently only) backend keeps channels in memory, which is
-sufficient for single-instance deployments and test suites.  Multi-instance
-deployments should use path-based sticky sessions so all connections for a
-given player channel land on the same process.  If truly stateless horizontal
-scaling is needed later, add a backend (e.g. NATS) behind the same
-:class:`Broadcast` interface.
+Channels live in memory, which is sufficient for single-instance deployments
+and test suites. Multi-instance deployments either use path-based sticky
+sessions so all connections for a given player channel land on the same
+process, or give each process's :class:`Broadcast` a :class:`Broker` that
+shares channel messages, retained state, and player claims with the others
+(see :mod:`switchboard.cluster`).
+
+Each subscriber has a bounded queue, so a stalled client cannot grow memory or
+replay a burst of stale messages late. A state message replaces the unsent one for
+the same state key, so a slow subscriber receives only the latest of each state,
+while commands are delivered in order. When a queue is full, the broadcast's
+:class:`OverflowPolicy` decides what gives way.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
-from collections.abc import AsyncIterator
+import os
+from collections import Counter, deque
+from collections.abc import AsyncIterator, Callable
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any, Protocol
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_FOLLOW_TIMEOUT_SECONDS = 10.0
+
+type Frame = dict[str, Any]
+"""A message between a broadcast and the other switchboard nodes, such as ``{"op": "publish", ...}``."""
+
+
+class OverflowPolicy(StrEnum):
+    """What a full subscriber queue does with a new message."""
+
+    DROP_OLDEST = "drop-oldest"
+    """Discard the oldest queued message."""
+    COALESCE = "coalesce"
+    """Discard the oldest transient message, such as a command, keeping the latest of each state."""
+    DISCONNECT = "disconnect"
+    """Discard the queue and end the subscription, so the slow client is disconnected."""
+
 
 @dataclass(frozen=True, slots=True)
 class Event:
-    """A message published to a channel."""
+    """A message published to a channel, with the retained-state key it updates, if any.
+
+    The same event is queued for every subscriber, so :attr:`frame`, the ASGI message that
+    sends it over a WebSocket, is built once at publish time rather than once per connection.
+    """
 
     channel: str
     message: str
+    key: str | None = None
+    frame: dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "frame", {"type": "websocket.send", "text": self.message})
+
+
+@dataclass(frozen=True, slots=True)
+class ChannelStats:
+    """Messages a channel's subscriber queues superseded or gave up, and subscribers disconnected for falling behind."""
+
+    coalesced: int = 0
+    dropped: int = 0
+    disconnected: int = 0
+
+
+class _Outcome(StrEnum):
+    COALESCED = "coalesced"
+    DROPPED = "dropped"
+    DISCONNECTED = "disconnected"
+
+
+class _SubscriberQueue:
+    """Bounded queue of events for one subscriber that never blocks the publisher.
+
+    An event with a state key supersedes the unsent event with the same key, so a burst of
+    state changes costs a slow subscriber one message per key. The newest event still queues
+    behind everything published before it, so state never overtakes earlier commands, and
+    events without a key are delivered in order. A superseded event stays in the deque,
+    shared with other subscribers rather than copied, and is skipped once it reaches the front.
+    """
+
+    def __init__(self, maxsize: int, policy: OverflowPolicy) -> None:
+        self._events: deque[Event] = deque()
+        self._latest: dict[str, Event] = {}
+        self._size = 0
+        self._maxsize = maxsize
+        self._policy = policy
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.overflowed = asyncio.Event()
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def put(self, event: Event) -> _Outcome | None:
+        """Queue *event*; returns what it cost other queued events, if anything."""
+        if self._closed:
+            return None
+        outcome = None
+        if event.key is not None and event.key in self._latest:
+            self._size -= 1
+            outcome = _Outcome.COALESCED
+        elif self._size >= self._maxsize:
+            if self._policy is OverflowPolicy.DISCONNECT:
+                self._events.clear()
+                self._latest.clear()
+                self._size = 0
+                self.overflowed.set()
+                self.close()
+                return _Outcome.DISCONNECTED
+            self._drop_oldest(transient=self._policy is OverflowPolicy.COALESCE)
+            outcome = _Outcome.DROPPED
+
+        self._events.append(event)
+        if event.key is not None:
+            self._latest[event.key] = event
+        self._size += 1
+        if len(self._events) > 2 * self._maxsize:
+            self._events = deque(queued for queued in self._events if self._live(queued))
+        self._ready.set()
+        return outcome
+
+    def close(self) -> None:
+        """Let the subscriber drain what is queued, then stop."""
+        self._closed = True
+        self._ready.set()
+
+    async def get(self) -> Event | None:
+        """Return the next event, or None once the queue is closed and drained."""
+        while self._size == 0:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        self._skip_superseded()
+        return self._pop()
+
+    def _live(self, event: Event) -> bool:
+        return event.key is None or self._latest.get(event.key) is event
+
+    def _skip_superseded(self) -> None:
+        while self._events and not self._live(self._events[0]):
+            self._events.popleft()
+
+    def _pop(self) -> Event:
+        event = self._events.popleft()
+        if event.key is not None:
+            del self._latest[event.key]
+        self._size -= 1
+        return event
+
+    def _drop_oldest(self, *, transient: bool) -> None:
+        """Discard the oldest queued event, preferring one without a state key when *transient* is set."""
+        self._skip_superseded()
+        if transient:
+            for index, event in enumerate(self._events):
+                if event.key is None:
+                    del self._events[index]
+                    self._size -= 1
+                    return
+        self._pop()
+
+
+class Broker(Protocol):
+    """Connects a :class:`Broadcast` to the other switchboard nodes.
+
+    Frames sent by one node reach the others in the order they were sent.
+    """
+
+    async def start(self, receive: Callable[[Frame], None]) -> None:
+        """Join the cluster; *receive* is called with each frame from the other nodes."""
+        ...
+
+    async def stop(self) -> None:
+        """Leave the cluster, giving up this node's claims."""
+        ...
+
+    def send(self, frame: Frame) -> None:
+        """Send *frame* without waiting for it to be delivered."""
+        ...
+
+    async def claim(self, channel: str) -> bool:
+        """Reserve *channel* for this node; False when another node holds it.
+
+        Raises:
+            ConnectionError: If the node is not connected to the cluster.
+        """
+        ...
+
+    @property
+    def connected(self) -> bool:
+        """Whether frames sent now can reach the other nodes."""
+        ...
 
 
 class Subscriber:
     """Async iterator that yields events from a subscription queue."""
 
-    def __init__(self, queue: asyncio.Queue[Event | None]) -> None:
+    def __init__(self, queue: _SubscriberQueue) -> None:
         self._queue = queue
 
+    @property
+    def overflowed(self) -> bool:
+        """Whether the subscription ended because the subscriber fell behind."""
+        return self._queue.overflowed.is_set()
+
+    async def wait_overflowed(self) -> None:
+        """Wait until the subscription ends because the subscriber fell behind."""
+        await self._queue.overflowed.wait()
+
     def __aiter__(self) -> Subscriber:
         return self
 
@@ -48,38 +232,131 @@ class Subscriber:
 
 
 class Broadcast:
-    """In-memory channel pub-sub."""
+    """Channel pub-sub for the clients connected to this process.
 
-    def __init__(self) -> None:
-        self._channels: dict[str, set[asyncio.Queue[Event | None]]] = {}
+    With a *broker*, messages and retained state changes are also sent to the other nodes,
+    and the retained state of a channel is fetched from the cluster when this node starts
+    following it, that is, when the channel gets its first local subscriber. Subscribing
+    raises ConnectionError when that state does not arrive within *follow_timeout*
+    seconds, such as after the connection to the cluster is lost.
+    """
+
+    def __init__(
+        self,
+        *,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow: OverflowPolicy = OverflowPolicy.COALESCE,
+        broker: Broker | None = None,
+        follow_timeout: float = DEFAULT_FOLLOW_TIMEOUT_SECONDS,
+    ) -> None:
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._broker = broker
+        self._follow_timeout = follow_timeout
+        self._channels: dict[str, set[_SubscriberQueue]] = {}
         self._channel_state: dict[str, dict[str, str]] = {}
+        self._following: dict[str, asyncio.Event] = {}
+        self._claims: set[str] = set()
+        self._counts: Counter[tuple[str, _Outcome]] = Counter()
+
+    @classmethod
+    def from_env(cls) -> Broadcast:
+        """Build a broadcast from the ``REGISTRY_SWITCHBOARD_*`` settings.
+
+        ``REGISTRY_SWITCHBOARD_RELAY``, a ``host:port`` address, joins the cluster served by
+        that switchboard relay, proving ``REGISTRY_SWITCHBOARD_RELAY_SECRET`` to it.
+        """
+        policy = os.environ.get("REGISTRY_SWITCHBOARD_OVERFLOW_POLICY", OverflowPolicy.COALESCE).lower()
+        if policy not in set(OverflowPolicy):
+            raise ValueError(f"Unsupported REGISTRY_SWITCHBOARD_OVERFLOW_POLICY value: {policy}")
+        broker: Broker | None = None
+        if relay := os.environ.get("REGISTRY_SWITCHBOARD_RELAY"):
+            from .cluster import RelayBroker
+
+            broker = RelayBroker.from_address(relay, secret=os.environ.get("REGISTRY_SWITCHBOARD_RELAY_SECRET") or None)
+        return cls(
+            queue_size=int(os.environ.get("REGISTRY_SWITCHBOARD_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)),
+            overflow=OverflowPolicy(policy),
+            broker=broker,
+        )
 
     async def connect(self) -> None:
-        """Prepare the broadcast (no-op for in-memory backend)."""
+        """Join the cluster when there is a broker."""
+        if self._broker is not None:
+            await self._broker.start(self._receive)
 
     async def disconnect(self) -> None:
         """Shut down: signal all active subscribers to stop."""
         for queues in self._channels.values():
             for q in queues:
-                q.put_nowait(None)
+                q.close()
         self._channels.clear()
         self._channel_state.clear()
+        self._following.clear()
+        self._claims.clear()
+        self._counts.clear()
+        if self._broker is not None:
+            await self._broker.stop()
+
+    async def claim(self, channel: str) -> bool:
+        """Reserve *channel* for one connection across the cluster; False when it is already held.
+
+        Raises:
+            ConnectionError: If the broker cannot reach the cluster.
+        """
+        if channel in self._claims:
+            return False
+        # Held while the broker answers, so a second local connection is refused meanwhile.
+        self._claims.add(channel)
+        claimed = False
+        try:
+            claimed = self._broker is None or await self._broker.claim(channel)
+        finally:
+            if not claimed:
+                self._claims.discard(channel)
+        return claimed
 
-    async def publish(self, channel: str, message: str) -> None:
-        """Send *message* to every subscriber on *channel*."""
-        for q in list(self._channels.get(channel, ())):
-            await q.put(Event(channel=channel, message=message))
+    def release(self, channel: str) -> None:
+        """Give up a claim on *channel*."""
+        if channel in self._claims:
+            self._claims.discard(channel)
+            self._send({"op": "release", "channel": channel})
+
+    async def publish(self, channel: str, message: str, *, key: str | None = None) -> None:
+        """Send *message* to every subscriber on *channel* without waiting for any of them.
+
+        *key* names the retained state the message updates; it supersedes any message for the
+        same key that a subscriber has not yet received.
+        """
+        self._deliver(Event(channel=channel, message=message, key=key))
+        self._send({"op": "publish", "channel": channel, "message": message, "key": key})
+
+    def stats(self, channel: str) -> ChannelStats:
+        """Return coalescing and overflow counters for *channel* since startup."""
+        return ChannelStats(
+            coalesced=self._counts[channel, _Outcome.COALESCED],
+            dropped=self._counts[channel, _Outcome.DROPPED],
+            disconnected=self._counts[channel, _Outcome.DISCONNECTED],
+        )
 
     def set_state(self, channel: str, key: str, message: str) -> None:
         """Record *message* as retained state for *channel* under *key*."""
         self._channel_state.setdefault(channel, {})[key] = message
+        self._send({"op": "set", "channel": channel, "key": key, "message": message})
 
     def clear_state(self, channel: str) -> None:
         """Remove all retained state for *channel*."""
         self._channel_state.pop(channel, None)
+        self._send({"op": "clear", "channel": channel, "key": None})
 
     def clear_state_key(self, channel: str, key: str) -> None:
         """Remove one retained state item for *channel*."""
+        self._clear_state_key(channel, key)
+        self._send({"op": "clear", "channel": channel, "key": key})
+
+    def _clear_state_key(self, channel: str, key: str) -> None:
         channel_state = self._channel_state.get(channel)
         if not channel_state:
             return
@@ -87,10 +364,11 @@ class Broadcast:
         if not channel_state:
             self._channel_state.pop(channel, None)
 
-    async def replay_state(self, channel: str, queue: asyncio.Queue[Event | None]) -> None:
+    async def replay_state(self, channel: str, queue: _SubscriberQueue) -> None:
         """Enqueue retained state messages for *channel* into *queue*."""
-        for message in self._channel_state.get(channel, {}).values():
-            await queue.put(Event(channel=channel, message=message))
+        for key, message in self._channel_state.get(channel, {}).items():
+            if outcome := queue.put(Event(channel=channel, message=message, key=key)):
+                self._record(channel, queue, outcome)
 
     @asynccontextmanager
     async def subscribe(self, channel: str, *, replay: bool = False) -> AsyncIterator[Subscriber]:
@@ -98,8 +376,12 @@ class Broadcast:
 
         If *replay* is ``True``, any retained state messages for the channel
         are enqueued before live messages start flowing.
+
+        Raises:
+            ConnectionError: If the channel's state cannot be fetched from the cluster.
         """
-        queue: asyncio.Queue[Event | None] = asyncio.Queue()
+        queue = _SubscriberQueue(self._queue_size, self._overflow)
+        await self._follow(channel)
         if replay:
             await self.replay_state(channel, queue)
         self._channels.setdefault(channel, set()).add(queue)
@@ -111,5 +393,69 @@ class Broadcast:
                 subs.discard(queue)
                 if not subs:
                     del self._channels[channel]
+                    self._unfollow(channel)
             # Signal the subscriber to stop iterating
-            queue.put_nowait(None)
+            queue.close()
+
+    async def _follow(self, channel: str) -> None:
+        if self._broker is None:
+            return
+        following = self._following.get(channel)
+        if following is None:
+            if not self._broker.connected:
+                raise ConnectionError("Switchboard cluster unavailable")
+            following = self._following[channel] = asyncio.Event()
+            self._broker.send({"op": "follow", "channel": channel})
+        try:
+            async with asyncio.timeout(self._follow_timeout):
+                await following.wait()
+        except TimeoutError:
+            # Forget the attempt, so the channel's next subscriber asks again instead of waiting on it.
+            if self._following.get(channel) is following:
+                del self._following[channel]
+                self._broker.send({"op": "unfollow", "channel": channel})
+            raise ConnectionError(f"Timed out following {channel} on the switchboard cluster") from None
+
+    def _unfollow(self, channel: str) -> None:
+        if self._broker is None or self._following.pop(channel, None) is None:
+            return
+        # Other nodes' changes to this channel's state stop arriving, so the copy goes stale.
+        self._channel_state.pop(channel, None)
+        self._broker.send({"op": "unfollow", "channel": channel})
+
+    def _send(self, frame: Frame) -> None:
+        if self._broker is not None:
+            self._broker.send(frame)
+
+    def _deliver(self, event: Event) -> None:
+        for q in list(self._channels.get(event.channel, ())):
+            if outcome := q.put(event):
+                self._record(event.channel, q, outcome)
+
+    def _receive(self, frame: Frame) -> None:
+        """Apply a frame from another node."""
+        channel = frame["channel"]
+        match frame["op"]:
+            case "publish":
+                self._deliver(Event(channel=channel, message=frame["message"], key=frame["key"]))
+            case "set":
+                self._channel_state.setdefault(channel, {})[frame["key"]] = frame["message"]
+            case "clear" if frame["key"] is None:
+                self._channel_state.pop(channel, None)
+            case "clear":
+                self._clear_state_key(channel, frame["key"])
+            case "state":
+                if channel in self._following:
+                    if frame["state"]:
+                        self._channel_state[channel] = dict(frame["state"])
+                    else:
+                        self._channel_state.pop(channel, None)
+                    self._following[channel].set()
+            case op:
+                logger.warning("Ignoring unsupported switchboard frame %r", op)
+
+    def _record(self, channel: str, queue: _SubscriberQueue, outcome: _Outcome) -> None:
+        self._counts[channel, outcome] += 1
+        if outcome is _Outcome.DISCONNECTED:
+            self._channels.get(channel, set()).discard(queue)
+            logger.info("Disconnected a slow subscriber from %s", channel)
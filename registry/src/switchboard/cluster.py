@@ -0,0 +1,424 @@
+"""Sharing one switchboard across several registry processes.
+
+Each process keeps a :class:`~switchboard.broadcast.Broadcast` for the clients connected
+to it, and joins a :class:`Hub` through a broker. The hub forwards channel messages and
+retained state changes to the other processes following the channel, keeps each
+channel's retained state for processes that start following it later, and grants each
+player connection to one process at a time.
+
+:class:`MemoryBroker` joins a hub in the same process, which is how tests run several
+nodes without external services. :class:`RelayBroker` joins a hub served over TCP by
+:class:`RelayServer`, started with ``python -m switchboard.cluster``; nodes find it
+through ``REGISTRY_SWITCHBOARD_RELAY``. Frames travel as one JSON document per line.
+
+The relay only takes frames from nodes that prove they hold its shared secret,
+``REGISTRY_SWITCHBOARD_RELAY_SECRET``: it opens each connection with a random nonce,
+and the node answers with the nonce's HMAC under the secret. The secret itself never
+crosses the network, which should still be an internal one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+from collections.abc import Callable
+from typing import Protocol
+
+from lib.serialization import dumps, loads
+
+from .broadcast import Frame
+
+logger = logging.getLogger(__name__)
+
+_LINE_LIMIT = 16 * 1024 * 1024
+_MAX_BUFFERED = 64 * 1024 * 1024
+_HANDSHAKE_TIMEOUT_SECONDS = 5.0
+_RECONNECT_DELAY_SECONDS = 0.1
+_MAX_RECONNECT_DELAY_SECONDS = 5.0
+
+
+def _proof(secret: str | None, nonce: str) -> str:
+    """The answer to a relay's *nonce* from a node holding *secret*."""
+    return hmac.new((secret or "").encode(), nonce.encode(), hashlib.sha256).hexdigest()
+
+
+async def _handshake_frame(reader: asyncio.StreamReader) -> Frame:
+    """Read one handshake frame; an empty one if the peer hung up or sent something else."""
+    try:
+        frame = loads(await reader.readline() or b"{}")
+    except ValueError:
+        return {}
+    return frame if isinstance(frame, dict) else {}
+
+
+class Node(Protocol):
+    """A member of a :class:`Hub`."""
+
+    def send(self, frame: Frame) -> None:
+        """Deliver *frame* to the node without waiting."""
+        ...
+
+
+class Hub:
+    """Which nodes follow each channel, the channels' retained state, and who holds each claim.
+
+    Claims are named after the channel they guard, so a node that leaves gives up its
+    claims along with their channels' retained state, as a player disconnecting would.
+    """
+
+    def __init__(self) -> None:
+        self._followers: dict[str, set[Node]] = {}
+        self._state: dict[str, dict[str, str]] = {}
+        self._claims: dict[str, Node] = {}
+
+    def handle(self, node: Node, frame: Frame) -> bool | None:
+        """Apply *frame* from *node*; returns whether a ``claim`` was granted.
+
+        Raises:
+            ValueError: If the frame's operation is unsupported.
+        """
+        channel = frame["channel"]
+        match frame["op"]:
+            case "follow":
+                self._followers.setdefault(channel, set()).add(node)
+                node.send({"op": "state", "channel": channel, "state": self._state.get(channel, {})})
+            case "unfollow":
+                self._unfollow(node, channel)
+            case "publish":
+                self._forward(node, frame)
+            case "set":
+                self._state.setdefault(channel, {})[frame["key"]] = frame["message"]
+                self._forward(node, frame)
+            case "clear":
+                self._clear(channel, frame["key"])
+                self._forward(node, frame)
+            case "claim":
+                return self._claims.setdefault(channel, node) is node
+            case "release":
+                if self._claims.get(channel) is node:
+                    del self._claims[channel]
+            case op:
+                raise ValueError(f"Unsupported relay operation: {op}")
+        return None
+
+    def leave(self, node: Node) -> None:
+        """Forget *node*, releasing its claims."""
+        for channel in [channel for channel, followers in self._followers.items() if node in followers]:
+            self._unfollow(node, channel)
+        for channel in [channel for channel, holder in self._claims.items() if holder is node]:
+            del self._claims[channel]
+            self._clear(channel, None)
+            self._forward(node, {"op": "clear", "channel": channel, "key": None})
+
+    def _unfollow(self, node: Node, channel: str) -> None:
+        followers = self._followers.get(channel)
+        if followers is not None:
+            followers.discard(node)
+            if not followers:
+                del self._followers[channel]
+
+    def _clear(self, channel: str, key: str | None) -> None:
+        if key is None:
+            self._state.pop(channel, None)
+            return
+        state = self._state.get(channel)
+        if state is not None:
+            state.pop(key, None)
+            if not state:
+                del self._state[channel]
+
+    def _forward(self, origin: Node, frame: Frame) -> None:
+        for node in list(self._followers.get(frame["channel"], ())):
+            if node is not origin:
+                node.send(frame)
+
+
+class MemoryBroker:
+    """Joins a :class:`Hub` in this process."""
+
+    def __init__(self, hub: Hub) -> None:
+        self._hub = hub
+        self._node: _Receiver | None = None
+
+    async def start(self, receive: Callable[[Frame], None]) -> None:
+        self._node = _Receiver(receive)
+
+    async def stop(self) -> None:
+        if self._node is not None:
+            self._hub.leave(self._node)
+            self._node = None
+
+    @property
+    def connected(self) -> bool:
+        return self._node is not None
+
+    def send(self, frame: Frame) -> None:
+        if self._node is not None:
+            self._hub.handle(self._node, frame)
+
+    async def claim(self, channel: str) -> bool:
+        if self._node is None:
+            raise ConnectionError("Not joined to the switchboard hub")
+        return self._hub.handle(self._node, {"op": "claim", "channel": channel}) is True
+
+
+class _Receiver:
+    """A node in this process, which the hub hands frames to directly."""
+
+    def __init__(self, receive: Callable[[Frame], None]) -> None:
+        self._receive = receive
+
+    def send(self, frame: Frame) -> None:
+        self._receive(frame)
+
+
+class RelayBroker:
+    """Joins the :class:`Hub` of a :class:`RelayServer` over TCP.
+
+    A lost connection to the relay fails pending claims with ConnectionError and drops
+    frames sent meanwhile. The broker reconnects with exponential backoff and then joins
+    the hub as this node was: it claims its players again, restores their retained state,
+    and follows its channels again, so their current state arrives as after a ``follow``.
+    """
+
+    def __init__(self, host: str, port: int, *, secret: str | None = None) -> None:
+        self._host = host
+        self._port = port
+        self._secret = secret
+        self._writer: asyncio.StreamWriter | None = None
+        self._reading: asyncio.Task[None] | None = None
+        self._claims: dict[int, asyncio.Future[bool]] = {}
+        self._next_request = 0
+        self._followed: set[str] = set()
+        self._held: dict[str, dict[str, str]] = {}
+
+    @classmethod
+    def from_address(cls, address: str, *, secret: str | None = None) -> RelayBroker:
+        """Build a broker for a ``host:port`` relay address."""
+        host, separator, port = address.rpartition(":")
+        if not separator or not host or not port.isdigit():
+            raise ValueError(f"Unsupported REGISTRY_SWITCHBOARD_RELAY value: {address}")
+        return cls(host, int(port), secret=secret)
+
+    async def start(self, receive: Callable[[Frame], None]) -> None:
+        reader = await self._connect()
+        self._reading = asyncio.create_task(self._run(reader, receive))
+        logger.info("Joined switchboard relay %s:%d", self._host, self._port)
+
+    async def stop(self) -> None:
+        if self._reading is not None:
+            self._reading.cancel()
+            await asyncio.gather(self._reading, return_exceptions=True)
+            self._reading = None
+        if self._writer is not None:
+            self._writer.close()
+            await asyncio.gather(self._writer.wait_closed(), return_exceptions=True)
+            self._writer = None
+        self._followed.clear()
+        self._held.clear()
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    def send(self, frame: Frame) -> None:
+        self._track(frame)
+        if self._writer is None or self._writer.is_closing():
+            logger.warning("Switchboard relay unavailable; dropped %s frame for %s", frame["op"], frame["channel"])
+            return
+        self._writer.write(dumps(frame) + b"\n")
+
+    async def claim(self, channel: str) -> bool:
+        if not self.connected:
+            raise ConnectionError("Switchboard relay unavailable")
+        self._next_request += 1
+        request = self._next_request
+        claimed: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._claims[request] = claimed
+        self.send({"op": "claim", "channel": channel, "id": request})
+        if granted := await claimed:
+            self._held.setdefault(channel, {})
+        return granted
+
+    async def _connect(self) -> asyncio.StreamReader:
+        """Open a connection to the relay and prove this node holds its secret.
+
+        Raises:
+            ConnectionError: If the relay cannot be reached or refuses the node.
+        """
+        reader, writer = await asyncio.open_connection(self._host, self._port, limit=_LINE_LIMIT)
+        try:
+            async with asyncio.timeout(_HANDSHAKE_TIMEOUT_SECONDS):
+                challenge = await _handshake_frame(reader)
+                nonce = challenge.get("nonce")
+                if challenge.get("op") != "challenge" or not isinstance(nonce, str):
+                    raise ConnectionError("Switchboard relay sent no challenge")
+                writer.write(dumps({"op": "hello", "proof": _proof(self._secret, nonce)}) + b"\n")
+                if (await _handshake_frame(reader)).get("op") != "welcome":
+                    raise ConnectionError(
+                        "Switchboard relay refused this node; check REGISTRY_SWITCHBOARD_RELAY_SECRET"
+                    )
+        except BaseException:
+            writer.close()
+            raise
+        self._writer = writer
+        return reader
+
+    async def _run(self, reader: asyncio.StreamReader, receive: Callable[[Frame], None]) -> None:
+        delay = _RECONNECT_DELAY_SECONDS
+        while True:
+            await self._read(reader, receive)
+            while True:
+                await asyncio.sleep(delay)
+                try:
+                    reader = await self._connect()
+                except (OSError, TimeoutError) as e:
+                    delay = min(delay * 2, _MAX_RECONNECT_DELAY_SECONDS)
+                    logger.warning("Could not rejoin the switchboard relay %s:%d: %s", self._host, self._port, e)
+                    continue
+                delay = _RECONNECT_DELAY_SECONDS
+                self._rejoin()
+                logger.info("Rejoined switchboard relay %s:%d", self._host, self._port)
+                break
+
+    def _rejoin(self) -> None:
+        """Claim, restore, and follow again what this node held before the connection was lost."""
+        assert self._writer is not None
+        for channel, state in self._held.items():
+            self._writer.write(dumps({"op": "claim", "channel": channel, "id": 0}) + b"\n")
+            for key, message in state.items():
+                self._writer.write(dumps({"op": "set", "channel": channel, "key": key, "message": message}) + b"\n")
+        for channel in self._followed:
+            self._writer.write(dumps({"op": "follow", "channel": channel}) + b"\n")
+
+    def _track(self, frame: Frame) -> None:
+        """Remember the follows, claims, and claimed channels' state a rejoin has to restore."""
+        channel = frame["channel"]
+        match frame["op"]:
+            case "follow":
+                self._followed.add(channel)
+            case "unfollow":
+                self._followed.discard(channel)
+            case "release":
+                self._held.pop(channel, None)
+            case "set" if channel in self._held:
+                self._held[channel][frame["key"]] = frame["message"]
+            case "clear" if channel in self._held:
+                if frame["key"] is None:
+                    self._held[channel].clear()
+                else:
+                    self._held[channel].pop(frame["key"], None)
+
+    async def _read(self, reader: asyncio.StreamReader, receive: Callable[[Frame], None]) -> None:
+        try:
+            while line := await reader.readline():
+                frame = loads(line)
+                if frame["op"] == "claimed":
+                    claimed = self._claims.pop(frame["id"], None)
+                    if claimed is not None and not claimed.done():
+                        claimed.set_result(frame["granted"])
+                    elif frame["id"] == 0 and not frame["granted"]:
+                        logger.warning("Another node claimed %s while the relay was unreachable", frame["channel"])
+                        self._held.pop(frame["channel"], None)
+                else:
+                    if frame["op"] in {"set", "clear"}:
+                        self._track(frame)
+                    receive(frame)
+            logger.error("Lost the switchboard relay %s:%d", self._host, self._port)
+        except (ConnectionError, ValueError) as e:
+            logger.error("Lost the switchboard relay %s:%d: %s", self._host, self._port, e)
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+            for claimed in self._claims.values():
+                if not claimed.done():
+                    claimed.set_exception(ConnectionError("Lost the switchboard relay"))
+            self._claims.clear()
+
+
+class _Connection:
+    """A node connected to a :class:`RelayServer`."""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self._writer = writer
+
+    def send(self, frame: Frame) -> None:
+        if self._writer.is_closing():
+            return
+        self._writer.write(dumps(frame) + b"\n")
+        if self._writer.transport.get_write_buffer_size() > _MAX_BUFFERED:
+            # A node that stops reading would otherwise hold the relay's memory.
+            logger.warning("Disconnecting a switchboard node that fell too far behind")
+            self._writer.close()
+
+
+class RelayServer:
+    """Serves a :class:`Hub` to :class:`RelayBroker` nodes over TCP.
+
+    Without a *secret*, any node that answers the challenge is accepted.
+    """
+
+    def __init__(self, hub: Hub | None = None, *, secret: str | None = None) -> None:
+        self.hub = hub or Hub()
+        self._secret = secret
+
+    async def start(self, host: str, port: int) -> asyncio.Server:
+        """Listen on *host* and *port*; port 0 picks a free port."""
+        return await asyncio.start_server(self._serve, host, port, limit=_LINE_LIMIT)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if not await self._admit(reader, writer):
+            writer.close()
+            return
+        node = _Connection(writer)
+        try:
+            while line := await reader.readline():
+                frame = loads(line)
+                granted = self.hub.handle(node, frame)
+                if frame["op"] == "claim":
+                    node.send({"op": "claimed", "channel": frame["channel"], "id": frame["id"], "granted": granted})
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning("Disconnecting a switchboard node that sent an invalid frame: %s", e)
+        except ConnectionError:
+            pass
+        finally:
+            self.hub.leave(node)
+            writer.close()
+
+    async def _admit(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Challenge a new connection; True once it has proven it holds the secret."""
+        nonce = secrets.token_hex(16)
+        writer.write(dumps({"op": "challenge", "nonce": nonce}) + b"\n")
+        try:
+            async with asyncio.timeout(_HANDSHAKE_TIMEOUT_SECONDS):
+                hello = await _handshake_frame(reader)
+            proof = hello.get("proof") if hello.get("op") == "hello" else None
+        except (TimeoutError, ConnectionError):
+            proof = None
+        if not isinstance(proof, str) or (
+            self._secret is not None and not hmac.compare_digest(proof, _proof(self._secret, nonce))
+        ):
+            logger.warning("Refused a switchboard node that did not prove the relay secret")
+            return False
+        writer.write(dumps({"op": "welcome"}) + b"\n")
+        return True
+
+
+async def _main() -> None:
+    host, _, port = os.environ.get("REGISTRY_SWITCHBOARD_RELAY", "localhost:8765").rpartition(":")
+    secret = os.environ.get("REGISTRY_SWITCHBOARD_RELAY_SECRET") or None
+    if secret is None:
+        logger.warning("REGISTRY_SWITCHBOARD_RELAY_SECRET is not set; the relay accepts any node")
+    server = await RelayServer(secret=secret).start(host, int(port))
+    logger.info("Switchboard relay listening on %s:%s", host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("REGISTRY_LOG_LEVEL", "info").upper())
+    asyncio.run(_main())
@@ -0,0 +1,310 @@
+"""Run the switchboard across several worker processes, each channel on one of them.
+
+One Python process serves its channels from one core. The supervisor starts
+``REGISTRY_SWITCHBOARD_WORKERS`` uvicorn workers, each listening on its own Unix socket,
+and accepts client connections itself. It reads each request's head, picks the worker
+for its ``{account_id}/{player_id}`` channel by consistent hashing, and relays the
+connection's bytes to that worker, so the players and controllers of a channel always
+meet in the same process.
+
+When a worker exits it leaves the hash ring, so only its channels move to the others
+while it restarts, and they move back once it is ready again. A channel keeps its
+current worker while it has open connections, so a restart never splits a channel.
+
+Events published on one worker for a channel served by another, such as an API request's
+``radio_dial_updated``, travel through a relay (see :mod:`switchboard.cluster`). The
+workers join ``REGISTRY_SWITCHBOARD_RELAY`` when it is set; otherwise the supervisor
+serves a relay for them on a loopback port.
+
+Every byte of every connection is copied through the supervisor's one event loop, so the
+supervisor, not the workers, caps throughput at what one core can relay: the
+``test_supervisor_relay_throughput`` benchmark measures it. Handing accepted sockets to
+the workers would lift that cap, but the supervisor would stop seeing connections close,
+and with them the placements that keep a channel on its worker. Past the cap, run
+several supervisors behind a load balancer that routes by the request path.
+
+Start it with ``python -m switchboard.supervisor`` and ``REGISTRY_PROFILES=switchboard``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import logging
+import os
+import secrets
+import signal
+import sys
+import tempfile
+import zlib
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+from lib.constants import BASE_DIR, SWITCHBOARD_PREFIX
+
+from .cluster import RelayServer
+
+logger = logging.getLogger(__name__)
+
+_REPLICAS = 64
+_HEAD_LIMIT = 64 * 1024
+_HEAD_TIMEOUT_SECONDS = 10
+_READY_TIMEOUT_SECONDS = 30
+_RESTART_DELAY_SECONDS = 1
+_CHUNK_SIZE = 64 * 1024
+_UNAVAILABLE = b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+
+
+class HashRing:
+    """Consistent hashing of keys to nodes, each placed on the ring *replicas* times.
+
+    Adding or removing a node moves only the keys that hash to it.
+    """
+
+    def __init__(self, replicas: int = _REPLICAS) -> None:
+        self._replicas = replicas
+        self._points: list[int] = []
+        self._nodes: dict[int, str] = {}
+
+    def __contains__(self, node: str) -> bool:
+        return self._point(node, 0) in self._nodes
+
+    def add(self, node: str) -> None:
+        if node in self:
+            return
+        for replica in range(self._replicas):
+            point = self._point(node, replica)
+            bisect.insort(self._points, point)
+            self._nodes[point] = node
+
+    def remove(self, node: str) -> None:
+        if node not in self:
+            return
+        for replica in range(self._replicas):
+            point = self._point(node, replica)
+            self._points.remove(point)
+            del self._nodes[point]
+
+    def node_for(self, key: str) -> str:
+        """Return the node *key* belongs to; raises LookupError when the ring is empty."""
+        if not self._points:
+            raise LookupError("No nodes in the hash ring")
+        index = bisect.bisect(self._points, zlib.crc32(key.encode("utf-8"))) % len(self._points)
+        return self._nodes[self._points[index]]
+
+    @staticmethod
+    def _point(node: str, replica: int) -> int:
+        return zlib.crc32(f"{node}#{replica}".encode())
+
+
+class Router:
+    """Picks the worker for each connection: the worker its key already has connections on, or the ring's."""
+
+    def __init__(self, ring: HashRing) -> None:
+        self.ring = ring
+        self._placements: dict[str, tuple[str, int]] = {}
+
+    def acquire(self, key: str) -> str:
+        """Return the worker for a new connection for *key*; raises LookupError when no worker is up."""
+        worker, connections = self._placements.get(key) or (self.ring.node_for(key), 0)
+        self._placements[key] = (worker, connections + 1)
+        return worker
+
+    def release(self, key: str, worker: str) -> None:
+        """Record that a connection for *key* to *worker* closed."""
+        placement = self._placements.get(key)
+        if placement is None or placement[0] != worker:
+            # The worker was removed, and the key may since have been placed elsewhere.
+            return
+        connections = placement[1]
+        if connections > 1:
+            self._placements[key] = (worker, connections - 1)
+        else:
+            del self._placements[key]
+
+    def remove(self, worker: str) -> None:
+        """Take *worker* out of rotation; its connections are gone with it."""
+        self.ring.remove(worker)
+        for key in [key for key, (placed, _) in self._placements.items() if placed == worker]:
+            del self._placements[key]
+
+
+def route_key(head: bytes, prefix: str = SWITCHBOARD_PREFIX) -> str:
+    """Return the channel a request is for, or its path when it is not a switchboard request."""
+    request_line = head.split(b"\r\n", 1)[0].decode("latin-1").split(" ")
+    path = request_line[1].split("?", 1)[0] if len(request_line) > 1 else ""
+    prefix = f"{prefix.rstrip('/')}/"
+    return path[len(prefix) :].strip("/") if path.startswith(prefix) else path
+
+
+def uvicorn_command(socket_path: Path) -> Sequence[str]:
+    """Command line of a switchboard worker listening on *socket_path*."""
+    return [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "registry:app",
+        "--app-dir",
+        str(BASE_DIR / "src"),
+        "--uds",
+        str(socket_path),
+        "--log-level",
+        os.environ.get("REGISTRY_LOG_LEVEL", "info"),
+    ]
+
+
+class Supervisor:
+    """Starts and restarts the workers, and relays each client connection to its channel's worker."""
+
+    def __init__(
+        self,
+        workers: int,
+        *,
+        runtime_dir: Path | None = None,
+        command: Callable[[Path], Sequence[str]] = uvicorn_command,
+        prefix: str = SWITCHBOARD_PREFIX,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.router = Router(HashRing())
+        self._workers = [str(index) for index in range(workers)]
+        self._runtime_dir = runtime_dir or Path(tempfile.mkdtemp(prefix="switchboard-"))
+        self._command = command
+        self._prefix = prefix
+        self._supervising: list[asyncio.Task[None]] = []
+        self._relay_server: asyncio.Server | None = None
+        self.worker_env: dict[str, str] | None = None
+
+    async def start(self, host: str, port: int) -> asyncio.Server:
+        """Start the workers and listen for clients on *host* and *port*; port 0 picks a free port."""
+        if not os.environ.get("REGISTRY_SWITCHBOARD_RELAY"):
+            self.worker_env = await self._start_relay()
+        self._supervising = [asyncio.create_task(self._supervise(worker)) for worker in self._workers]
+        return await asyncio.start_server(self._relay, host, port, limit=_HEAD_LIMIT)
+
+    async def stop(self) -> None:
+        """Stop the workers, and the relay served for them."""
+        for task in self._supervising:
+            task.cancel()
+        await asyncio.gather(*self._supervising, return_exceptions=True)
+        if self._relay_server is not None:
+            self._relay_server.close()
+            self._relay_server = None
+
+    async def _start_relay(self) -> dict[str, str]:
+        """Serve a relay for the workers on a loopback port; returns the environment that joins them to it."""
+        secret = secrets.token_hex(16)
+        self._relay_server = await RelayServer(secret=secret).start("127.0.0.1", 0)
+        address = f"127.0.0.1:{self._relay_server.sockets[0].getsockname()[1]}"
+        logger.info("REGISTRY_SWITCHBOARD_RELAY is not set; serving the workers' relay on %s", address)
+        return {
+            **os.environ,
+            "REGISTRY_SWITCHBOARD_RELAY": address,
+            "REGISTRY_SWITCHBOARD_RELAY_SECRET": secret,
+        }
+
+    async def _supervise(self, worker: str) -> None:
+        socket_path = self._runtime_dir / f"worker-{worker}.sock"
+        while True:
+            socket_path.unlink(missing_ok=True)
+            process = await asyncio.create_subprocess_exec(*self._command(socket_path), env=self.worker_env)
+            try:
+                if await self._ready(process, socket_path):
+                    self.router.ring.add(worker)
+                    logger.info("Switchboard worker %s is ready (pid %d)", worker, process.pid)
+                    await process.wait()
+            finally:
+                self.router.remove(worker)
+                if process.returncode is None:
+                    process.terminate()
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(process.wait(), _READY_TIMEOUT_SECONDS)
+                    if process.returncode is None:
+                        process.kill()
+            logger.warning("Switchboard worker %s exited with %s; restarting", worker, process.returncode)
+            await asyncio.sleep(_RESTART_DELAY_SECONDS)
+
+    async def _ready(self, process: asyncio.subprocess.Process, socket_path: Path) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _READY_TIMEOUT_SECONDS
+        while process.returncode is None and loop.time() < deadline:
+            try:
+                _, writer = await asyncio.open_unix_connection(socket_path)
+            except OSError:
+                await asyncio.sleep(0.05)
+                continue
+            writer.close()
+            return True
+        return False
+
+    async def _relay(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> None:
+        try:
+            async with asyncio.timeout(_HEAD_TIMEOUT_SECONDS):
+                head = await client_reader.readuntil(b"\r\n\r\n")
+        except (TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            client_writer.close()
+            return
+
+        key = route_key(head, self._prefix)
+        try:
+            worker = self.router.acquire(key)
+        except LookupError:
+            client_writer.write(_UNAVAILABLE)
+            client_writer.close()
+            return
+        try:
+            worker_reader, worker_writer = await asyncio.open_unix_connection(
+                self._runtime_dir / f"worker-{worker}.sock"
+            )
+        except OSError:
+            self.router.release(key, worker)
+            client_writer.write(_UNAVAILABLE)
+            client_writer.close()
+            return
+
+        worker_writer.write(head)
+        pipes = {
+            asyncio.create_task(_pipe(client_reader, worker_writer)),
+            asyncio.create_task(_pipe(worker_reader, client_writer)),
+        }
+        try:
+            # Either side closing ends the connection, such as a worker exiting under its clients.
+            await asyncio.wait(pipes, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for pipe in pipes:
+                pipe.cancel()
+            self.router.release(key, worker)
+            worker_writer.close()
+            client_writer.close()
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    with contextlib.suppress(ConnectionError):
+        while data := await reader.read(_CHUNK_SIZE):
+            writer.write(data)
+            await writer.drain()
+
+
+async def _main() -> None:
+    workers = os.environ.get("REGISTRY_SWITCHBOARD_WORKERS", str(os.cpu_count() or 1))
+    if not workers.isdigit() or int(workers) < 1:
+        raise ValueError(f"Unsupported REGISTRY_SWITCHBOARD_WORKERS value: {workers}")
+    supervisor = Supervisor(int(workers))
+    host = os.environ.get("REGISTRY_BIND_HOST", "localhost")
+    port = int(os.environ.get("REGISTRY_BIND_PORT", 8000))
+    server = await supervisor.start(host, port)
+    logger.info("Switchboard supervisor listening on %s:%d with %s workers", host, port, workers)
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopping.set)
+    async with server:
+        await stopping.wait()
+    await supervisor.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("REGISTRY_LOG_LEVEL", "info").upper())
+    asyncio.run(_main())
@@ -2,16 +2,19 @@ import asyncio
 import json
 import logging
 import time
+from collections.abc import Iterable
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, WebSocketException, status
 
 from auth.socket_auth import validate_socket_client
-from switchboard.broadcast import Broadcast
+from lib.serialization import dumps, loads
+from switchboard.broadcast import Broadcast, Subscriber
 
 router = APIRouter()
 logger = logging.getLogger("switchboard")
 PLAYER_USER_AGENT_PREFIX = "RadioPad/"
 AUTHENTICATION_REQUIRED_REASON = "Authentication required"
+SLOW_CONSUMER_REASON = "Too far behind"
 CONTROLLER_AUTH_TIMEOUT_SECONDS = 10
 RETAINED_EVENTS = {"radio_dial_url", "player_presence", "playback_state"}
 PLAYER_STATUS_SCOPES = {"radio_dial", "switchboard", "playback"}
@@ -25,17 +28,20 @@ PLAYER_STATE_EVENTS = {
     "playback_state",
     "player_status",
 }
-ACTIVE_PLAYER_CONNECTIONS: set[str] = set()
 
 
 class _SessionExpired(Exception):
     pass
 
 
+class _SlowConsumer(Exception):
+    pass
+
+
 async def _authenticate_controller(websocket: WebSocket, account_id: str, player_id: str) -> tuple[bool, int | None]:
     try:
         async with asyncio.timeout(CONTROLLER_AUTH_TIMEOUT_SECONDS):
-            payload = json.loads(await websocket.receive_text())
+            payload = loads(await websocket.receive_text())
         if not isinstance(payload, dict):
             raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=AUTHENTICATION_REQUIRED_REASON)
         data = payload.get("data")
@@ -86,7 +92,11 @@ def _cleared_state_key(event: str, data: object) -> str | None:
 
 
 async def publish_event(broadcast: Broadcast, channel: str, event: str, data: object) -> None:
-    message = json.dumps({"event": event, "data": data})
+    """Publish *event* to *channel*, retaining or clearing the state it carries.
+
+    The event is encoded here once, and every subscriber is sent that same text.
+    """
+    message = dumps({"event": event, "data": data}).decode("utf-8")
     key_to_clear = _cleared_state_key(event, data)
     if key_to_clear:
         broadcast.clear_state_key(channel, key_to_clear)
@@ -94,7 +104,13 @@ async def publish_event(broadcast: Broadcast, channel: str, event: str, data: ob
     key_to_retain = _state_key(event, data)
     if key_to_retain:
         broadcast.set_state(channel, key_to_retain, message)
-    await broadcast.publish(channel, message)
+    await broadcast.publish(channel, message, key=key_to_retain or key_to_clear)
+
+
+async def notify_radio_dial_updated(broadcast: Broadcast, player_keys: Iterable[str], radio_dial: str) -> None:
+    """Tell connected players their RadioDial changed so they reload it."""
+    for player_key in player_keys:
+        await publish_event(broadcast, player_key, "radio_dial_updated", {"radio_dial": radio_dial})
 
 
 async def _run_loop(
@@ -104,14 +120,18 @@ async def _run_loop(
     is_player: bool,
     expires_at: int | None = None,
 ) -> None:
-    async def sender() -> None:
-        async with broadcast.subscribe(player_key, replay=not is_player) as subscriber:
-            async for event in subscriber:
-                try:
-                    await websocket.send_text(event.message)
-                except Exception:
-                    logger.debug("Send failed for %s: %s", player_key, event.message[:80])
-                    break
+    async def sender(subscriber: Subscriber) -> None:
+        async for event in subscriber:
+            try:
+                await websocket.send(event.frame)
+            except Exception:
+                logger.debug("Send failed for %s: %s", player_key, event.message[:80])
+                break
+
+    async def evict_when_behind(subscriber: Subscriber) -> None:
+        # A stalled client blocks the sender in send, so overflow is watched separately.
+        await subscriber.wait_overflowed()
+        raise _SlowConsumer
 
     async def receiver() -> None:
         while True:
@@ -125,14 +145,13 @@ async def _run_loop(
                 await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=AUTHENTICATION_REQUIRED_REASON)
                 raise _SessionExpired from exc
             try:
-                payload = json.loads(msg)
+                payload = loads(msg)
                 if not isinstance(payload, dict):
                     continue
                 event = payload.get("event")
                 data = payload.get("data")
                 if not event:
                     continue
-
                 match event:
                     case player_event if is_player and player_event in PLAYER_STATE_EVENTS:
                         await publish_event(broadcast, player_key, player_event, data)
@@ -143,12 +162,17 @@ async def _run_loop(
             except json.JSONDecodeError:
                 continue
 
-    try:
-        async with asyncio.TaskGroup() as tg:
-            tg.create_task(sender())
-            tg.create_task(receiver())
-    except* (_SessionExpired, WebSocketDisconnect):
-        pass
+    async with broadcast.subscribe(player_key, replay=not is_player) as subscriber:
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(sender(subscriber))
+                tg.create_task(receiver())
+                tg.create_task(evict_when_behind(subscriber))
+        except* _SlowConsumer:
+            logger.info("Closing %s client that fell too far behind", player_key)
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason=SLOW_CONSUMER_REASON)
+        except* (_SessionExpired, WebSocketDisconnect):
+            pass
 
 
 @router.websocket("/{account_id}/{player_id}")
@@ -182,10 +206,15 @@ async def websocket_endpoint(
         return
 
     if is_player:
-        if player_key in ACTIVE_PLAYER_CONNECTIONS:
+        try:
+            claimed = await broadcast.claim(player_key)
+        except ConnectionError:
+            logger.exception("Could not claim %s", player_key)
+            await websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason="Switchboard unavailable")
+            return
+        if not claimed:
             await websocket.close(code=4002, reason="Player already connected")
             return
-        ACTIVE_PLAYER_CONNECTIONS.add(player_key)
 
     try:
         if is_player:
@@ -201,10 +230,13 @@ async def websocket_endpoint(
                 "radio_dial_url",
                 radio_dial_url,
             )
-        await _run_loop(websocket, broadcast, player_key, is_player=is_player, expires_at=expires_at)
+        try:
+            await _run_loop(websocket, broadcast, player_key, is_player=is_player, expires_at=expires_at)
+        except ConnectionError:
+            logger.exception("Could not follow %s", player_key)
+            await websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason="Switchboard unavailable")
     finally:
         if is_player:
-            ACTIVE_PLAYER_CONNECTIONS.discard(player_key)
             broadcast.clear_state(player_key)
             await publish_event(
                 broadcast,
@@ -218,3 +250,5 @@ async def websocket_endpoint(
                 "playback_state",
                 {"call_sign": None, "requested_call_sign": None, "failed_call_sign": None},
             )
+            # Released last, so a reconnecting player's state is not overwritten by this cleanup.
+            broadcast.release(player_key)
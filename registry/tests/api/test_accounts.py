@@ -1,7 +1,13 @@
+import json
+from collections.abc import AsyncIterator
+
 import pytest
 from fastapi import status
+from fastapi.exceptions import RequestValidationError
 from starlette.testclient import TestClient
 
+from api.bulk import MAX_LINE_BYTES, read_records
+from lib.constants import MAX_BATCH_SIZE
 from models.account import AccountSpec
 from tests.api._helpers import assert_paginated
 from tests.api.client.accounts import AccountApi
@@ -50,3 +56,80 @@ def test_pagination_invalid_values_rejected(client: TestClient, raw_page: int, r
     resp = client.get(f"accounts?page={raw_page}&per_page={raw_per}")
     assert resp.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
     assert resp.json()["detail"]
+
+
+def test_account_export_round_trips_through_import(client: TestClient) -> None:
+    exported = client.get("accounts/community:export")
+    assert exported.status_code == 200
+    assert exported.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in exported.text.splitlines()]
+    kinds = [record["kind"] for record in records]
+    assert kinds[0] == "account"
+    assert {"station", "radio_dial"} <= set(kinds)
+
+    # Re-point the RadioDials at the copied account's own Stations.
+    copied = exported.text.replace('"community/', '"copy/')
+    response = client.post(
+        "accounts/copy:import", content=copied.encode(), headers={"Content-Type": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "accounts": 1,
+        "stations": kinds.count("station"),
+        "radio_dials": kinds.count("radio_dial"),
+        "players": kinds.count("player"),
+    }
+    radio_dial = client.get("accounts/copy/radio-dials/briceburg").json()
+    assert radio_dial["stations"][0]["key"] == "copy/WWOZ"
+    assert client.get("accounts/copy:export").text == copied
+
+
+def test_account_import_reports_invalid_lines_and_writes_nothing(client: TestClient) -> None:
+    body = "\n".join(
+        [
+            json.dumps({"kind": "station", "id": "KAAA", "spec": {"stream_url": "https://a.example/stream"}}),
+            "",
+            json.dumps({"kind": "station", "id": "KBBB", "spec": {"stream_url": "not a url"}}),
+        ]
+    )
+    response = client.post("accounts/testuser1:import", content=body.encode())
+
+    assert response.status_code == 422
+    assert [error["loc"][:2] for error in response.json()["detail"]] == [["body", 3]]
+    assert client.get("accounts/testuser1/stations/KAAA").status_code == 404
+
+
+async def test_account_import_stops_reading_at_too_many_records_of_one_kind() -> None:
+    async def body() -> AsyncIterator[bytes]:
+        for i in range(MAX_BATCH_SIZE + 1):
+            yield json.dumps({"kind": "station", "id": f"K{i}", "spec": {"stream_url": "https://a.example"}}).encode()
+            yield b"\n"
+        raise AssertionError("read past the record limit")
+
+    with pytest.raises(RequestValidationError) as error:
+        await read_records(body())
+
+    assert [e["loc"] for e in error.value.errors()] == [("body", MAX_BATCH_SIZE + 1)]
+    assert "station" in error.value.errors()[0]["msg"]
+
+
+async def test_account_import_stops_reading_an_overlong_line() -> None:
+    chunks = 0
+
+    async def body() -> AsyncIterator[bytes]:
+        nonlocal chunks
+        yield b"\n"
+        while True:
+            chunks += 1
+            yield b" " * 65536
+
+    with pytest.raises(RequestValidationError) as error:
+        await read_records(body())
+
+    assert [e["loc"] for e in error.value.errors()] == [("body", 2)]
+    assert chunks == MAX_LINE_BYTES // 65536 + 1
+
+
+def test_account_export_requires_existing_account(client: TestClient) -> None:
+    assert client.get("accounts/missing:export").status_code == 404
@@ -1,10 +1,15 @@
+from collections.abc import Generator
 from http import HTTPStatus
 from typing import cast
 
+import boto3
 import pytest
+from moto import mock_aws
 from starlette.testclient import TestClient
 
+from datastore import DataStore, S3Backend
 from datastore.types import JsonDoc
+from tests.api._app import build_client, seed_store
 from tests.api._helpers import INVALID_SLUGS, VALID_ACCOUNT_ITEM_SLUG_PAIRS, assert_pagination_page
 
 
@@ -122,8 +127,11 @@ def test_specs_reject_path_derived_identity(client: TestClient, path: str, paylo
     assert client.put(path, json=payload).status_code == HTTPStatus.UNPROCESSABLE_ENTITY
 
 
-@pytest.mark.parametrize("resource", ["accounts", "players"])
-def test_pagination_behavior_is_consistent(client: TestClient, resource: str) -> None:
+@pytest.mark.parametrize(
+    "resource,page_two_next",
+    [("accounts", "?page=3&per_page=1"), ("players", None)],
+)
+def test_pagination_behavior_is_consistent(client: TestClient, resource: str, page_two_next: str | None) -> None:
     if resource == "accounts":
         list_path = "accounts"
         item_ids = ["community", "testuser1"]
@@ -150,5 +158,135 @@ def test_pagination_behavior_is_consistent(client: TestClient, resource: str) ->
         page=2,
         per_page=1,
         prev="?page=1&per_page=1",
-        next="?page=3&per_page=1",
+        next=page_two_next,
     )
+
+
+@pytest.mark.parametrize(
+    "list_path,item_path,payload,key_field",
+    [
+        ("accounts", "accounts/cursor-{n}", {"name": "Cursor"}, "id"),
+        ("accounts/cursor/players", "accounts/cursor/players/player-{n}", {"name": "Cursor"}, "id"),
+        (
+            "accounts/cursor/stations",
+            "accounts/cursor/stations/KC{n}",
+            {"stream_url": "https://example.com/stream"},
+            "call_sign",
+        ),
+        (
+            "accounts/cursor/radio-dials",
+            "accounts/cursor/radio-dials/dial-{n}",
+            {"name": "Cursor", "stations": []},
+            "key",
+        ),
+    ],
+    ids=["account", "player", "station", "radio-dial"],
+)
+def test_cursor_pagination_walks_every_item_once(
+    client: TestClient, list_path: str, item_path: str, payload: JsonDoc, key_field: str
+) -> None:
+    for n in range(5):
+        _put_ok(client, item_path.format(n=n), payload)
+    expected = [item[key_field] for item in client.get(list_path, params={"per_page": 100}).json()["items"]]
+
+    # Start from an offset page, then follow next_cursor until it runs out.
+    body = client.get(list_path, params={"page": 1, "per_page": 2}).json()
+    seen = [item[key_field] for item in body["items"]]
+    while body.get("next_cursor") is not None:
+        response = client.get(list_path, params={"cursor": body["next_cursor"], "per_page": 2})
+        assert response.status_code == HTTPStatus.OK, response.text
+        body = response.json()
+        seen.extend(item[key_field] for item in body["items"])
+        next_link = f"?cursor={body['next_cursor']}&per_page=2" if body.get("next_cursor") else None
+        assert body["links"].get("prev") is None
+        assert body["links"].get("next") == next_link
+
+    assert seen == expected
+
+
+def test_invalid_cursor_is_rejected(client: TestClient) -> None:
+    response = client.get("accounts", params={"cursor": "not a cursor!"})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.parametrize(
+    "path,update_path,update",
+    [
+        ("accounts/testuser1", "accounts/testuser1", {"name": "Renamed"}),
+        ("accounts", "accounts/testuser1", {"name": "Renamed"}),
+        ("accounts/testuser1/players/player1", "accounts/testuser1/players/player1", {"name": "Renamed"}),
+        ("accounts/testuser1/players", "accounts/testuser1/players/player1", {"name": "Renamed"}),
+        (
+            "accounts/community/stations/WWOZ",
+            "accounts/community/stations/WWOZ",
+            {"stream_url": "https://example.com/renamed"},
+        ),
+        (
+            "accounts/community/stations",
+            "accounts/community/stations/WWOZ",
+            {"stream_url": "https://example.com/renamed"},
+        ),
+        (
+            "accounts/community/radio-dials/briceburg",
+            "accounts/community/stations/WWOZ",
+            {"stream_url": "https://example.com/renamed"},
+        ),
+        (
+            "accounts/community/radio-dials",
+            "accounts/community/radio-dials/briceburg",
+            {"name": "Renamed", "stations": []},
+        ),
+    ],
+    ids=["account", "accounts", "player", "players", "station", "stations", "radio-dial", "radio-dials"],
+)
+def test_reads_answer_304_until_the_resource_changes(
+    client: TestClient, path: str, update_path: str, update: JsonDoc
+) -> None:
+    first = client.get(path)
+    etag = first.headers["etag"]
+    assert first.status_code == HTTPStatus.OK
+
+    unchanged = client.get(path, headers={"If-None-Match": f'"other", W/{etag}'})
+    assert unchanged.status_code == HTTPStatus.NOT_MODIFIED
+    assert unchanged.headers["etag"] == etag
+    assert unchanged.content == b""
+
+    _put_ok(client, update_path, update)
+    changed = client.get(path, headers={"If-None-Match": etag})
+    assert changed.status_code == HTTPStatus.OK
+    assert changed.headers["etag"] != etag
+
+
+@pytest.fixture
+def s3_client() -> Generator[TestClient]:
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="registry")
+        store = DataStore(backend=S3Backend(bucket="registry", prefix="data", client=client))
+        seed_store(store)
+        with build_client(store) as test_client:
+            yield test_client
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["accounts/community", "accounts/testuser1/players/player1", "accounts/community/stations/WWOZ"],
+    ids=["account", "player", "station"],
+)
+def test_s3_backed_reads_answer_304_for_their_own_etag(s3_client: TestClient, path: str) -> None:
+    first = s3_client.get(path)
+    etag = first.headers["etag"]
+    assert first.status_code == HTTPStatus.OK
+    assert not etag.startswith('""')
+
+    unchanged = s3_client.get(path, headers={"If-None-Match": etag})
+    assert unchanged.status_code == HTTPStatus.NOT_MODIFIED
+    assert unchanged.headers["etag"] == etag
+
+
+def test_conditional_read_of_a_missing_station_is_not_found(client: TestClient) -> None:
+    etag = client.get("accounts/community/stations/WWOZ").headers["etag"]
+
+    response = client.get("accounts/community/stations/NOPE", headers={"If-None-Match": etag})
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
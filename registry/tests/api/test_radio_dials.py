@@ -1,6 +1,15 @@
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
 from starlette.testclient import TestClient
 
-from models import RadioDialSpec, StationSpec
+from api.types import get_broadcast
+from datastore import DataStore
+from models import PlayerSpec, RadioDialSpec, StationSpec
+from switchboard.broadcast import Broadcast
+from tests.api._helpers import get_json
+from tests.api.client.players import PlayerApi
 from tests.api.client.radio_dials import RadioDialApi
 from tests.api.client.stations import StationApi
 
@@ -94,3 +103,102 @@ def test_radio_dial_rejects_duplicate_call_signs_across_accounts(client: TestCli
     )
 
     assert response.status_code == 422
+
+
+def test_radio_dial_is_served_pre_rendered_until_its_sources_change(
+    client: TestClient,
+    seeded_store: DataStore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    first = client.get("accounts/community/radio-dials/briceburg")
+    assert first.headers["etag"].startswith('"')
+
+    def fail_resolve(*_args: object) -> None:
+        raise AssertionError("stations resolved for an unchanged RadioDial")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(seeded_store.aio.stations, "resolve", fail_resolve)
+        again = client.get("accounts/community/radio-dials/briceburg")
+    assert again.content == first.content
+    assert again.headers["etag"] == first.headers["etag"]
+
+    # Writes made behind the API, as by another worker, are picked up through the stored versions.
+    seeded_store.stations.upsert(
+        "community", "KEXP", StationSpec.model_validate({"stream_url": "https://new.example/kexp"})
+    )
+    restation = client.get("accounts/community/radio-dials/briceburg")
+    assert restation.headers["etag"] != first.headers["etag"]
+    assert restation.json()["stations"][1]["stream_url"] == "https://new.example/kexp"
+
+    seeded_store.radio_dials.upsert(
+        "briceburg",
+        RadioDialSpec(name="Renamed", stations=["community/WWOZ"]),
+        path_params={"account_id": "community"},
+    )
+    renamed = client.get("accounts/community/radio-dials/briceburg").json()
+    assert renamed["name"] == "Renamed"
+    assert [station["key"] for station in renamed["stations"]] == ["community/WWOZ"]
+
+    seeded_store.radio_dials.delete("briceburg", path_params={"account_id": "community"})
+    assert client.get("accounts/community/radio-dials/briceburg").status_code == 404
+
+
+def test_radio_dial_update_notifies_assigned_players(client: TestClient, radio_dial_api: RadioDialApi) -> None:
+    broadcast = Mock(spec=Broadcast)
+    broadcast.publish = AsyncMock()
+    client.app.dependency_overrides[get_broadcast] = lambda: broadcast  # type: ignore[attr-defined]
+    try:
+        radio_dial_api.put("community", "briceburg", RadioDialSpec(name="Renamed", stations=["community/KEXP"]))
+    finally:
+        del client.app.dependency_overrides[get_broadcast]  # type: ignore[attr-defined]
+
+    published = [(call.args[0], json.loads(call.args[1])) for call in broadcast.publish.await_args_list]
+    event = {"event": "radio_dial_updated", "data": {"radio_dial": "community/briceburg"}}
+    assert published == [("testuser1/player1", event), ("testuser1/player2", event)]
+
+
+def test_radio_dial_lists_assigned_players(client: TestClient, player_api: PlayerApi) -> None:
+    player_api.put("testuser2", "player3", PlayerSpec(name="Player 3", radio_dial="community/briceburg"))
+    player_api.put("testuser1", "player2", PlayerSpec(name="Player 2"))
+
+    data = get_json(client, "accounts/community/radio-dials/briceburg/players")
+
+    assert [(item["account_id"], item["id"]) for item in data["items"]] == [
+        ("testuser1", "player1"),
+        ("testuser2", "player3"),
+    ]
+    get_json(client, "accounts/community/radio-dials/missing/players", expected=404)
+
+
+def test_radio_dial_batch_registers_and_resolves_radio_dials(client: TestClient, radio_dial_api: RadioDialApi) -> None:
+    response = client.post(
+        "accounts/testuser1/radio-dials:batch",
+        json={
+            "radio_dials": [
+                {"id": "jazz", "name": "Jazz", "stations": ["community/WWOZ"]},
+                {"id": "indie", "name": "Indie", "stations": ["community/KEXP", "community/WWOZ"]},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    created = response.json()
+    assert [radio_dial["key"] for radio_dial in created] == ["testuser1/jazz", "testuser1/indie"]
+    assert [station["call_sign"] for station in created[1]["stations"]] == ["KEXP", "WWOZ"]
+    assert radio_dial_api.get("testuser1", "indie") == created[1]
+
+
+def test_radio_dial_batch_writes_nothing_when_a_station_is_missing(client: TestClient) -> None:
+    response = client.post(
+        "accounts/testuser1/radio-dials:batch",
+        json={
+            "radio_dials": [
+                {"id": "jazz", "name": "Jazz", "stations": ["community/WWOZ"]},
+                {"id": "missing", "name": "Missing", "stations": ["community/NOPE"]},
+            ]
+        },
+    )
+
+    assert response.status_code == 404
+    assert response.json()["details"] == {"station_key": "community/NOPE"}
+    assert client.get("accounts/testuser1/radio-dials/jazz").status_code == 404
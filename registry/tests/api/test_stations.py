@@ -1,5 +1,15 @@
-from models import StationSpec
+from pathlib import Path
+
+from starlette.testclient import TestClient
+
+from datastore import DataStore
+from datastore.backends import GitBackend
+from models import AccountSpec, RadioDialSpec, StationSpec
+from tests.api._app import build_client
+from tests.api._helpers import get_json
+from tests.api.client.radio_dials import RadioDialApi
 from tests.api.client.stations import StationApi
+from tests.datastore._git_helpers import run_git
 
 
 def test_station_create_normalizes_call_sign(station_api: StationApi) -> None:
@@ -41,3 +51,65 @@ def test_distinct_call_signs_may_share_stream_url(station_api: StationApi) -> No
     station_api.put("testuser1", "KBBB", spec)
 
     assert station_api.get("testuser1", "KAAA")["stream_url"] == station_api.get("testuser1", "KBBB")["stream_url"]
+
+
+def test_station_lists_radio_dials_that_include_it(client: TestClient, radio_dial_api: RadioDialApi) -> None:
+    radio_dial_api.put("testuser1", "jazz", RadioDialSpec(name="Jazz", stations=["community/WWOZ"]))
+    radio_dial_api.put("testuser1", "indie", RadioDialSpec(name="Indie", stations=["community/KEXP"]))
+
+    data = get_json(client, "accounts/community/stations/wwoz/radio-dials")
+
+    assert [item["key"] for item in data["items"]] == ["community/briceburg", "testuser1/jazz"]
+    get_json(client, "accounts/community/stations/MISSING/radio-dials", expected=404)
+
+
+def test_station_batch_registers_stations_in_one_write(client: TestClient, station_api: StationApi) -> None:
+    response = client.post(
+        "accounts/testuser1/stations:batch",
+        json={
+            "stations": [
+                {"call_sign": "kaaa", "stream_url": "https://a.example/stream"},
+                {"call_sign": "KBBB", "stream_url": "https://b.example/stream"},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    assert [station["key"] for station in response.json()] == ["testuser1/KAAA", "testuser1/KBBB"]
+    assert [station["call_sign"] for station in station_api.list("testuser1")["items"]] == ["KAAA", "KBBB"]
+
+
+def test_station_batch_commits_once_on_git_including_the_legacy_migration(tmp_path: Path) -> None:
+    repo_path = tmp_path / "repo"
+    backend = GitBackend(str(repo_path), fetch_ttl_seconds=0, author_name="Tests", author_email="tests@example.invalid")
+    store = DataStore(backend=backend)
+    store.accounts.upsert("testuser1", AccountSpec(name="Test User 1"))
+    backend.save("stations", {"WWOZ": {"stream_url": "https://www.wwoz.org/listen/hi"}}, "accounts", "testuser1")
+    commits = run_git("rev-list", "--count", "main", cwd=repo_path).stdout
+
+    with build_client(store) as client:
+        response = client.post(
+            "accounts/testuser1/stations:batch",
+            json={
+                "stations": [{"call_sign": f"K{index:03}", "stream_url": "https://a.example/"} for index in range(40)]
+            },
+        )
+
+    assert response.status_code == 200
+    assert int(run_git("rev-list", "--count", "main", cwd=repo_path).stdout) == int(commits) + 1
+    assert backend.get("stations", "accounts", "testuser1") == (None, None)
+    assert len(store.stations.list("testuser1", per_page=100)) == 41
+
+
+def test_station_batch_rejects_duplicate_call_signs(client: TestClient) -> None:
+    response = client.post(
+        "accounts/testuser1/stations:batch",
+        json={
+            "stations": [
+                {"call_sign": "kaaa", "stream_url": "https://a.example/stream"},
+                {"call_sign": "KAAA", "stream_url": "https://b.example/stream"},
+            ]
+        },
+    )
+
+    assert response.status_code == 422
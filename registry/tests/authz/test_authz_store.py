@@ -20,6 +20,13 @@ from models import AccountSpec
 from tests.datastore._git_helpers import init_repo
 
 
+@pytest.fixture(autouse=True)
+def unwrapped_backends(monkeypatch: MonkeyPatch) -> None:
+    """These tests inspect the selected backends, so leave them unwrapped by a change feed."""
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND_CHANGE_FEED_DIR", "")
+    monkeypatch.setenv("REGISTRY_AUTHZ_BACKEND_CHANGE_FEED_DIR", "")
+
+
 def _identity(subject: str, email: str) -> AuthenticatedIdentity:
     return AuthenticatedIdentity(
         issuer="https://issuer.example",
@@ -46,6 +46,8 @@ def seeded_store(mock_store: DataStore) -> DataStore:
     """Cleans and re-seeds the mock_store for each test."""
     assert isinstance(mock_store.backend, LocalBackend)
     _reset_dir(mock_store.backend.base_path)
+    mock_store.radio_dial_players.invalidate()
+    mock_store.station_radio_dials.invalidate()
     seed_store(mock_store)
     return mock_store
 
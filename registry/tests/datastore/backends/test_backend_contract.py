@@ -7,25 +7,26 @@ import boto3
 import pytest
 from _pytest.fixtures import SubRequest
 
-from datastore.core import ModelStore, seed_from_path, seedable
+from datastore.core import ModelStore, backend_transaction, seed_from_path, seedable
 from datastore.core.interfaces import ObjectStore
 from datastore.exceptions import ConcurrencyError
 from models.account import Account, AccountSpec
 
 
-@pytest.fixture(params=["json", "s3", "git"], ids=["json", "s3", "git"])
+@pytest.fixture(params=["json", "s3", "s3-manifest", "git"], ids=["json", "s3", "s3-manifest", "git"])
 def object_store(request: SubRequest, tmp_path: Path) -> Generator[ObjectStore]:
     """Parameterized backend fixture providing a compatible ObjectStore.
 
     - json: LocalBackend rooted at a temporary directory
     - s3: S3Backend with moto-backed S3 bucket (versioning enabled)
+    - s3-manifest: the same, listing from packed per-collection manifests
     """
     if request.param == "json":
         from datastore.backends.local import LocalBackend
 
         backend: ObjectStore = LocalBackend(str(tmp_path))
         yield backend
-    elif request.param == "s3":
+    elif request.param in {"s3", "s3-manifest"}:
         pytest.importorskip("moto")
         from moto import mock_aws
 
@@ -36,7 +37,9 @@ def object_store(request: SubRequest, tmp_path: Path) -> Generator[ObjectStore]:
             bucket = "contract-tests"
             client.create_bucket(Bucket=bucket)
             client.put_bucket_versioning(Bucket=bucket, VersioningConfiguration={"Status": "Enabled"})
-            backend = S3Backend(bucket=bucket, prefix="contract", client=client)
+            backend = S3Backend(
+                bucket=bucket, prefix="contract", client=client, manifest=request.param == "s3-manifest"
+            )
             yield backend
     else:
         from datastore.backends.git import GitBackend
@@ -77,6 +80,16 @@ class TestObjectStoreContract:
         again = object_store.list(*path, page=1, per_page=10)
         assert sorted([i["id"] for i in again]) == ["a", "b", "c"]
 
+    def test_list_after_cursor_seeks_past_the_given_id(self, object_store: ObjectStore) -> None:
+        path = ("keyset",)
+        for name in ["d", "b", "a", "c"]:
+            object_store.save(name, {"v": name}, *path)
+        object_store.save("nested", {"v": 0}, *path, "a")  # subdirectories are not listed
+
+        assert [i["id"] for i in object_store.list(*path, per_page=2, after="a")] == ["b", "c"]
+        assert [i["id"] for i in object_store.list(*path, per_page=2, after="c")] == ["d"]
+        assert object_store.list(*path, per_page=2, after="d") == []
+
     def test_delete_semantics(self, object_store: ObjectStore) -> None:
         path = ("del",)
         object_store.save("z", {"x": 1}, *path)
@@ -85,15 +98,17 @@ class TestObjectStoreContract:
 
     def test_noop_when_unchanged_and_changed_updates_token(self, object_store: ObjectStore) -> None:
         path = ("noop",)
-        object_store.save("same", {"x": 1}, *path)
+        saved = object_store.save("same", {"x": 1}, *path)
         _, v1 = object_store.get("same", *path)
-        object_store.save("same", {"id": "same", "x": 1}, *path)
+        assert saved == v1
+        assert object_store.save("same", {"id": "same", "x": 1}, *path) == v1
         _, v2 = object_store.get("same", *path)
         assert v2 == v1
 
-        object_store.save("same", {"x": 2}, *path)
+        saved = object_store.save("same", {"x": 2}, *path)
         _, v3 = object_store.get("same", *path)
         assert v3 != v2
+        assert saved == v3
 
     def test_conditional_write_preconditions(self, object_store: ObjectStore) -> None:
         path = ("conditional",)
@@ -124,3 +139,20 @@ class TestObjectStoreContract:
         assert model is not None
         assert model.id == "seeded"
         assert model.name == "Seeded"
+
+    def test_reads_inside_a_transaction_see_its_own_writes(self, object_store: ObjectStore) -> None:
+        path = ("transaction",)
+        object_store.save("a", {"v": 0}, *path)
+        with backend_transaction(object_store):
+            object_store.save("b", {"v": 1}, *path)
+            data, version = object_store.get("b", *path)
+            assert data == {"v": 1}
+            object_store.save("b", {"v": 2}, *path, if_match=version)
+            assert object_store.get("b", *path)[0] == {"v": 2}
+            assert [item["id"] for item in object_store.list(*path)] == ["a", "b"]
+            assert object_store.delete("a", *path) is True
+            assert object_store.get("a", *path) == (None, None)
+            assert [item["id"] for item in object_store.list(*path)] == ["b"]
+
+        assert object_store.get("b", *path)[0] == {"v": 2}
+        assert object_store.get("a", *path) == (None, None)
@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import pytest
+
+from datastore.backends import CachingObjectStore, LocalBackend
+from datastore.core import CacheStats, ChangeFeed
+from datastore.exceptions import ConcurrencyError
+from datastore.types import JsonDoc, ValueWithETag
+
+
+class CountingBackend(LocalBackend):
+    def __init__(self, base_path: str) -> None:
+        super().__init__(base_path)
+        self.reads = 0
+
+    def get(self, object_id: str, *path_parts: str) -> ValueWithETag[JsonDoc]:
+        self.reads += 1
+        return super().get(object_id, *path_parts)
+
+
+def test_repeated_reads_hit_the_backend_once(tmp_path: Path) -> None:
+    backend = CountingBackend(str(tmp_path))
+    backend.save("acct", {"name": "Account"}, "accounts")
+    store = CachingObjectStore(backend, ttl_seconds=60)
+
+    for _ in range(100):
+        assert store.get("acct", "accounts")[0] == {"name": "Account"}
+    assert store.get("missing", "accounts") == (None, None)
+    assert store.get("missing", "accounts") == (None, None)
+
+    assert backend.reads == 2
+    assert store.stats == CacheStats(hits=100, misses=2, entries=2)
+
+
+def test_writes_through_the_cache_invalidate_their_key(tmp_path: Path) -> None:
+    store = CachingObjectStore(LocalBackend(str(tmp_path)), ttl_seconds=60)
+    assert store.get("acct", "accounts") == (None, None)
+
+    saved = store.save("acct", {"name": "First"}, "accounts", if_none_match=True)
+    first, version = store.get("acct", "accounts")
+    assert first == {"name": "First"}
+    assert version == saved
+
+    store.save("acct", {"name": "Second"}, "accounts", if_match=version)
+    assert store.get("acct", "accounts")[0] == {"name": "Second"}
+
+    assert store.delete("acct", "accounts") is True
+    assert store.get("acct", "accounts") == (None, None)
+
+
+def test_conflicting_save_drops_the_stale_entry(tmp_path: Path) -> None:
+    backend = LocalBackend(str(tmp_path))
+    store = CachingObjectStore(backend, ttl_seconds=60)
+    store.save("acct", {"name": "Mine"}, "accounts")
+    _, cached_version = store.get("acct", "accounts")
+    backend.save("acct", {"name": "Theirs"}, "accounts")  # another process writes behind the cache
+
+    with pytest.raises(ConcurrencyError):
+        store.save("acct", {"name": "Mine again"}, "accounts", if_match=cached_version)
+
+    assert store.get("acct", "accounts")[0] == {"name": "Theirs"}
+
+
+def test_cached_documents_are_isolated_from_caller_mutation(tmp_path: Path) -> None:
+    store = CachingObjectStore(LocalBackend(str(tmp_path)), ttl_seconds=60)
+    store.save("acct", {"name": "Account", "tags": ["a"]}, "accounts")
+
+    data, _ = store.get("acct", "accounts")
+    assert data is not None
+    data["tags"].append("b")
+
+    assert store.get("acct", "accounts")[0] == {"name": "Account", "tags": ["a"]}
+
+
+def test_workers_sharing_a_change_feed_read_each_others_writes(tmp_path: Path) -> None:
+    backend = LocalBackend(str(tmp_path / "data"))
+    feed_path = tmp_path / "changes" / "data.jsonl"
+    worker1 = CachingObjectStore(backend, ttl_seconds=60, feed=ChangeFeed(feed_path))
+    worker2 = CachingObjectStore(backend, ttl_seconds=60, feed=ChangeFeed(feed_path))
+    worker1.save("acct", {"name": "First"}, "accounts")
+    assert worker2.get("acct", "accounts")[0] == {"name": "First"}
+
+    worker1.save("acct", {"name": "Second"}, "accounts")
+    assert worker2.get("acct", "accounts")[0] == {"name": "Second"}
+
+    assert worker1.delete("acct", "accounts") is True
+    assert worker2.get("acct", "accounts") == (None, None)
+
+
+def test_writes_in_a_transaction_reach_the_feed_once_committed(tmp_path: Path) -> None:
+    backend = LocalBackend(str(tmp_path / "data"))
+    feed = ChangeFeed(tmp_path / "changes" / "data.jsonl")
+    store = CachingObjectStore(backend, ttl_seconds=60, feed=feed)
+    reader = ChangeFeed(feed.path)
+    reader.poll()
+
+    with store.transaction():
+        store.save("acct", {"name": "First"}, "accounts")
+        assert store.get("acct", "accounts")[0] == {"name": "First"}
+        assert reader.poll() == []
+    assert [event.key for event in reader.poll() or []] == ["accounts/acct.json"]
+
+    with pytest.raises(RuntimeError), store.transaction():
+        store.save("other", {"name": "Other"}, "accounts")
+        raise RuntimeError("abandoned")
+    assert reader.poll() == []
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import multiprocessing as mp
 import subprocess
+import threading
 import time
 from collections.abc import Callable
 from pathlib import Path
@@ -11,7 +12,9 @@ from typing import Any
 import pytest
 
 from datastore import DataStore
+from datastore.backends.caching import CachingObjectStore
 from datastore.backends.git import GitBackend
+from datastore.core import ChangeFeed
 from datastore.exceptions import ConcurrencyError
 from tests.datastore._git_helpers import TEST_IDENTITY, init_repo, run_git
 
@@ -55,6 +58,10 @@ def _backend(
     )
 
 
+def _maybe_cached(backend: GitBackend, cached: bool) -> GitBackend | CachingObjectStore:
+    return CachingObjectStore(backend, ttl_seconds=60) if cached else backend
+
+
 def _contend_for_backend_lock(repo_path: str, ready_conn: Any, result_conn: Any) -> None:
     ready_conn.send("ready")
     ready_conn.recv()
@@ -166,6 +173,30 @@ def test_git_backend_refreshes_reads_from_remote(tmp_path: Path) -> None:
     assert data == {"name": "Fetched"}
 
 
+def test_git_backend_publishes_fetched_changes_to_the_feed(tmp_path: Path) -> None:
+    remote = _create_remote_with_seed(tmp_path)
+    backend_path, writer_path = _clone_pair(tmp_path, remote, "backend", "writer")
+    feed = ChangeFeed(tmp_path / "changes.jsonl")
+    backend = GitBackend(repo_path=str(backend_path), remote_url=str(remote), fetch_ttl_seconds=0, feed=feed)
+    worker = CachingObjectStore(backend, ttl_seconds=60, feed=feed.follow())
+    assert worker.get("seed", "accounts")[0] == {"name": "Seed"}
+
+    _commit_json(writer_path, "accounts/fetched.json", {"name": "Fetched"}, message="writer update")
+    run_git("rm", "--quiet", "--", "accounts/seed.json", cwd=writer_path)
+    run_git("commit", "--quiet", "--message", "drop seed", cwd=writer_path, env=TEST_IDENTITY)
+    _push_main(writer_path, "origin")
+
+    subscriber = feed.follow()
+    assert backend.get("fetched", "accounts")[0] == {"name": "Fetched"}
+    events = subscriber.poll()
+    assert events is not None
+    assert sorted((event.action, event.key) for event in events) == [
+        ("delete", "accounts/seed.json"),
+        ("save", "accounts/fetched.json"),
+    ]
+    assert worker.get("seed", "accounts") == (None, None)
+
+
 def test_git_backend_origin_ssh_remote_uses_ssh_guidance(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     remote = _create_remote_with_seed(tmp_path)
     (backend_path,) = _clone_pair(tmp_path, remote, "backend")
@@ -313,8 +344,11 @@ def test_git_backend_seeds_empty_repo(tmp_path: Path) -> None:
     assert account is not None
     assert account.name == "Account One"
     assert (repo_path / "accounts" / "acct1.json").exists()
-    assert (repo_path / "accounts" / "acct1" / "stations.json").exists()
+    assert list((repo_path / "accounts" / "acct1" / "stations").glob("*.json"))
     assert (repo_path / "accounts" / "acct1" / "radio-dials" / "radio.json").exists()
+    # Every seed file and the seed manifest land in a single commit on top of "init".
+    assert run_git("rev-list", "--count", "main", cwd=repo_path).stdout.strip() == "2"
+    assert (repo_path / "seed-manifests" / "data.json").exists()
 
 
 def test_git_backend_repoints_head_to_configured_branch(tmp_path: Path) -> None:
@@ -353,3 +387,172 @@ def test_git_backend_uses_cross_process_lock_for_shared_repo(tmp_path: Path) ->
     assert result_parent.recv() >= 0.3
     process.join(timeout=5)
     assert process.exitcode == 0
+
+
+def test_git_backend_reads_do_not_wait_for_the_write_lock(tmp_path: Path) -> None:
+    remote = _create_remote_with_seed(tmp_path)
+    (backend_path,) = _clone_pair(tmp_path, remote, "backend")
+    backend = _backend(backend_path)
+    result: list[Any] = []
+
+    with backend._operation_lock():
+        reader = threading.Thread(target=lambda: result.append(backend.get("seed", "accounts")))
+        reader.start()
+        reader.join(timeout=5)
+        assert not reader.is_alive()
+
+    data, version = result[0]
+    assert data == {"name": "Seed"}
+    assert isinstance(version, str) and version
+    assert backend.list("accounts") == [{"id": "seed", "name": "Seed"}]
+
+
+def test_git_backend_snapshot_follows_local_commits_and_reuses_blobs(tmp_path: Path) -> None:
+    repo_path = tmp_path / "repo"
+    init_repo(repo_path)
+    _commit_json(repo_path, "accounts/one.json", {"name": "One"}, message="one")
+    backend = _backend(repo_path)
+    first = backend._snapshot
+
+    # Another process sharing the checkout commits directly; the ref change invalidates the snapshot.
+    _commit_json(repo_path, "accounts/two.json", {"name": "Two"}, message="two")
+
+    assert [item["id"] for item in backend.list("accounts")] == ["one", "two"]
+    second = backend._snapshot
+    assert second.commit != first.commit
+    assert second.blobs["accounts/one.json"] == first.blobs["accounts/one.json"]
+    assert second.contents[second.blobs["accounts/one.json"]] is first.contents[first.blobs["accounts/one.json"]]
+
+    backend.delete("one", "accounts")
+    assert backend.get("one", "accounts") == (None, None)
+    assert [item["id"] for item in backend.list("accounts")] == ["two"]
+
+
+@pytest.mark.parametrize("cached", [False, True], ids=["direct", "cached"])
+def test_git_backend_transaction_pushes_one_commit(tmp_path: Path, cached: bool) -> None:
+    remote = _create_remote_with_seed(tmp_path)
+    (backend_path,) = _clone_pair(tmp_path, remote, "backend")
+    backend = _maybe_cached(_backend(backend_path), cached)
+    _, seed_version = backend.get("seed", "accounts")
+
+    with backend.transaction():
+        backend.save("seed", {"name": "Renamed"}, "accounts", if_match=seed_version)
+        for index in range(3):
+            backend.save(f"station-{index}", {"name": f"Station {index}"}, "accounts")
+        assert backend.delete("station-0", "accounts") is True
+
+    assert run_git("rev-list", "--count", "main", cwd=remote).stdout.strip() == "2"
+    assert run_git("log", "-1", "--format=%s", "main", cwd=remote).stdout.strip() == "radio-pad-registry: 5 changes"
+    assert [item["id"] for item in backend.list("accounts")] == ["seed", "station-1", "station-2"]
+    stats = backend.batch_stats()
+    assert stats is not None
+    assert (stats.writes, stats.changes, stats.pushes) == (5, 5, 1)
+
+
+@pytest.mark.parametrize("cached", [False, True], ids=["direct", "cached"])
+def test_git_backend_transaction_discards_writes_when_block_raises(tmp_path: Path, cached: bool) -> None:
+    repo_path = tmp_path / "repo"
+    init_repo(repo_path)
+    _commit_json(repo_path, "accounts/seed.json", {"name": "Seed"}, message="seed")
+    backend = _maybe_cached(_backend(repo_path), cached)
+    head = run_git("rev-parse", "main", cwd=repo_path).stdout
+
+    with pytest.raises(ConcurrencyError, match="already exists"), backend.transaction():
+        backend.save("fresh", {"name": "Fresh"}, "accounts")
+        assert backend.get("fresh", "accounts")[0] == {"name": "Fresh"}
+        backend.save("seed", {"name": "Duplicate"}, "accounts", if_none_match=True)
+
+    assert run_git("rev-parse", "main", cwd=repo_path).stdout == head
+    assert not (repo_path / "accounts" / "fresh.json").exists()
+    assert backend.get("fresh", "accounts") == (None, None)
+
+
+@pytest.mark.parametrize("cached", [False, True], ids=["direct", "cached"])
+def test_git_backend_transaction_replays_onto_remote_after_rejected_push(tmp_path: Path, cached: bool) -> None:
+    remote = _create_remote_with_seed(tmp_path)
+    backend_path, writer_path = _clone_pair(tmp_path, remote, "backend", "writer")
+    backend = _maybe_cached(_backend(backend_path), cached)
+
+    with backend.transaction():
+        backend.save("one", {"name": "One"}, "accounts")
+        _commit_json(writer_path, "accounts/other.json", {"name": "Other"}, message="writer update")
+        _push_main(writer_path, "origin")
+        backend.save("two", {"name": "Two"}, "accounts")
+
+    assert [item["id"] for item in backend.list("accounts")] == ["one", "other", "seed", "two"]
+    stats = backend.batch_stats()
+    assert stats is not None and stats.pushes == 2
+
+
+def test_git_backend_group_commit_collects_concurrent_writes(tmp_path: Path) -> None:
+    remote = _create_remote_with_seed(tmp_path)
+    (backend_path,) = _clone_pair(tmp_path, remote, "backend")
+    backend = GitBackend(
+        repo_path=str(backend_path),
+        fetch_ttl_seconds=0,
+        group_commit_window_seconds=5,
+        group_commit_max_writes=4,
+    )
+    _, seed_version = backend.get("seed", "accounts")
+    errors: list[BaseException] = []
+
+    def write(object_id: str, **kwargs: Any) -> None:
+        try:
+            backend.save(object_id, {"name": object_id}, "accounts", **kwargs)
+        except ConcurrencyError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(f"account-{index}",)) for index in range(3)]
+    threads.append(threading.Thread(target=write, args=("seed",), kwargs={"if_match": "stale"}))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert [str(error) for error in errors] == ["ETag mismatch"]
+    assert run_git("rev-list", "--count", "main", cwd=remote).stdout.strip() == "2"
+    assert backend.get("seed", "accounts")[1] == seed_version
+    assert [item["id"] for item in backend.list("accounts")] == ["account-0", "account-1", "account-2", "seed"]
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met before timeout"
+        time.sleep(0.05)
+
+
+def test_git_backend_background_sync_fetches_without_blocking_reads(tmp_path: Path) -> None:
+    remote = _create_remote_with_seed(tmp_path)
+    backend_path, writer_path = _clone_pair(tmp_path, remote, "backend", "writer")
+    backend = _backend(backend_path, fetch_ttl_seconds=1)
+
+    try:
+        _commit_json(writer_path, "accounts/fetched.json", {"name": "Fetched"}, message="writer update")
+        _push_main(writer_path, "origin")
+
+        _wait_for(lambda: backend.get("fetched", "accounts")[0] == {"name": "Fetched"})
+        stats = backend.sync_stats()
+        assert stats.syncs >= 1
+        assert stats.failures == 0
+        assert stats.last_duration_seconds is not None
+    finally:
+        backend.close()
+
+
+def test_git_backend_background_sync_failure_keeps_serving_snapshot(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    remote = _create_remote_with_seed(tmp_path)
+    (backend_path,) = _clone_pair(tmp_path, remote, "backend")
+    backend = _backend(backend_path, fetch_ttl_seconds=1)
+    _patch_git_failure(monkeypatch, "fetch")
+
+    try:
+        _wait_for(lambda: backend.sync_stats().failures >= 1)
+        assert backend.get("seed", "accounts")[0] == {"name": "Seed"}
+        stats = backend.sync_stats()
+        assert stats.last_error is not None and "failed to fetch" in stats.last_error
+        assert stats.staleness_seconds >= 1
+    finally:
+        backend.close()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from collections.abc import Generator
 
 import boto3
@@ -11,6 +12,7 @@ from moto import mock_aws
 from datastore.backends.s3 import S3Backend
 from datastore.core import storage_json
 from datastore.exceptions import ConcurrencyError
+from datastore.types import JsonDoc
 
 
 @pytest.fixture
@@ -107,3 +109,111 @@ class TestS3BackendListFiltering:
 
         stored, _ = s3_backend.get("stations", "accounts", "community")
         assert stored == {"WWOZ": 2}
+
+
+def _count_get_object_calls(backend: S3Backend) -> list[str]:
+    calls: list[str] = []
+    backend.client.meta.events.register(
+        "before-call.s3.GetObject", lambda params, **_: calls.append(params["url_path"].rsplit("/", 1)[-1])
+    )
+    return calls
+
+
+def _manifest_backend(s3_backend: S3Backend) -> S3Backend:
+    return S3Backend(bucket=s3_backend.bucket, prefix="test", client=s3_backend.client, manifest=True)
+
+
+def _wait_for_rebuilds(backend: S3Backend) -> None:
+    deadline = time.monotonic() + 5
+    while backend._rebuilding and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not backend._rebuilding
+
+
+class TestS3BackendManifest:
+    def test_rebuild_packs_documents_written_without_the_manifest(self, s3_backend: S3Backend) -> None:
+        s3_backend.save("one", {"name": "One"}, "accounts")
+        manifest_backend = _manifest_backend(s3_backend)
+        manifest_backend.save("two", {"name": "Two"}, "accounts")
+
+        manifest_backend.rebuild_manifest("accounts")
+
+        calls = _count_get_object_calls(manifest_backend)
+        assert manifest_backend.list("accounts") == [{"name": "One", "id": "one"}, {"name": "Two", "id": "two"}]
+        assert calls == [".generation", ".manifest"]
+
+    def test_list_reads_only_the_generation_once_the_manifest_is_loaded(self, s3_backend: S3Backend) -> None:
+        backend = _manifest_backend(s3_backend)
+        for i in range(5):
+            backend.save(f"account-{i}", {"name": f"Account {i}"}, "accounts")
+        assert backend.delete("account-0", "accounts") is True
+        backend.rebuild_manifest("accounts")
+        backend.list("accounts")
+        calls = _count_get_object_calls(backend)
+
+        page = backend.list("accounts", per_page=3)
+        page[0]["name"] = "Changed by the caller"
+
+        assert [item["id"] for item in page] == ["account-1", "account-2", "account-3"]
+        assert backend.list("accounts", after="account-3") == [{"name": "Account 4", "id": "account-4"}]
+        assert backend.list("accounts", per_page=1) == [{"name": "Account 1", "id": "account-1"}]
+        assert calls == [".generation"] * 3
+
+    def test_writes_never_read_the_collection(self, s3_backend: S3Backend) -> None:
+        backend = _manifest_backend(s3_backend)
+        backend.rebuild_manifest("accounts")
+        calls = _count_get_object_calls(backend)
+        listings: list[str] = []
+        backend.client.meta.events.register("before-call.s3.ListObjectsV2", lambda **_: listings.append("list"))
+
+        for i in range(20):
+            backend.save(f"account-{i}", {"name": f"Account {i}"}, "accounts")
+        backend.delete("account-0", "accounts")
+
+        assert calls == []
+        assert listings == []
+
+    def test_list_without_manifest_falls_back_to_listing_and_rebuilds_it(self, s3_backend: S3Backend) -> None:
+        s3_backend.save("one", {"name": "One"}, "accounts")
+        backend = _manifest_backend(s3_backend)
+
+        assert backend.list("accounts") == [{"name": "One", "id": "one"}]
+        _wait_for_rebuilds(backend)
+        calls = _count_get_object_calls(backend)
+        assert backend.list("accounts") == [{"name": "One", "id": "one"}]
+        assert calls == [".generation", ".manifest"]
+
+    def test_manifest_left_stale_by_an_interrupted_writer_is_not_trusted(self, s3_backend: S3Backend) -> None:
+        backend = _manifest_backend(s3_backend)
+        backend.save("one", {"name": "One"}, "accounts")
+        backend.save("two", {"name": "Two"}, "accounts")
+        backend.rebuild_manifest("accounts")
+        assert backend.list("accounts") == [{"name": "One", "id": "one"}, {"name": "Two", "id": "two"}]
+        # A writer that stopped right after its document PUT.
+        backend._bump_generation(("accounts",))
+        s3_backend.save("one", {"name": "Renamed"}, "accounts")
+
+        assert backend.list("accounts", per_page=1) == [{"name": "Renamed", "id": "one"}]
+        assert backend.list("accounts", after="one") == [{"name": "Two", "id": "two"}]
+        _wait_for_rebuilds(backend)
+        assert backend._manifest_items(("accounts",)) is not None
+        assert backend.list("accounts") == [{"name": "Renamed", "id": "one"}, {"name": "Two", "id": "two"}]
+
+    def test_rebuild_racing_a_write_is_not_trusted(
+        self, s3_backend: S3Backend, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        backend, writer = _manifest_backend(s3_backend), _manifest_backend(s3_backend)
+        backend.save("one", {"name": "One"}, "accounts")
+        read_listed = backend._read_listed
+
+        def read_then_race(keys: list[str]) -> list[JsonDoc]:
+            documents = read_listed(keys)
+            writer.save("one", {"name": "Renamed"}, "accounts")
+            return documents
+
+        monkeypatch.setattr(backend, "_read_listed", read_then_race)
+        backend.rebuild_manifest("accounts")
+        monkeypatch.undo()
+
+        assert backend.list("accounts") == [{"name": "Renamed", "id": "one"}]
+        _wait_for_rebuilds(backend)
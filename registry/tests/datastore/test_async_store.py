@@ -0,0 +1,50 @@
+import asyncio
+import threading
+from pathlib import Path
+
+from datastore import DataStore
+from datastore.backends import AsyncBackend, LocalBackend
+from datastore.types import JsonDoc, ValueWithETag
+from models import AccountSpec, PlayerSpec, StationSpec
+
+
+async def test_async_stores_round_trip_through_the_sync_backend(tmp_path: Path) -> None:
+    ds = DataStore(backend=LocalBackend(str(tmp_path)))
+
+    await ds.aio.accounts.upsert("acct", AccountSpec(name="Account"))
+    await ds.aio.players.upsert("player", PlayerSpec(name="Player"), path_params={"account_id": "acct"})
+
+    assert ds.accounts.get("acct") == await ds.aio.accounts.get("acct")
+    players = await ds.aio.players.list(path_params={"account_id": "acct"})
+    assert [(player.account_id, player.id) for player in players] == [("acct", "player")]
+    assert await ds.aio.accounts.exists("missing") is False
+
+
+async def test_async_station_resolve_loads_each_account_once(tmp_path: Path) -> None:
+    ds = DataStore(backend=LocalBackend(str(tmp_path)))
+    ds.stations.upsert("one", "WWOZ", StationSpec.model_validate({"stream_url": "https://example.com/wwoz"}))
+    ds.stations.upsert("two", "KEXP", StationSpec.model_validate({"stream_url": "https://example.com/kexp"}))
+
+    resolved, missing = await ds.aio.stations.resolve(["two/KEXP", "one/WWOZ", "one/NOPE"])
+
+    assert [station.key for station in resolved] == ["two/KEXP", "one/WWOZ"]
+    assert missing == ["one/NOPE"]
+
+
+async def test_async_backend_keeps_the_event_loop_responsive(tmp_path: Path) -> None:
+    release = threading.Event()
+
+    class SlowBackend(LocalBackend):
+        def get(self, object_id: str, *path_parts: str) -> ValueWithETag[JsonDoc]:
+            release.wait(timeout=5)
+            return super().get(object_id, *path_parts)
+
+    backend = AsyncBackend(SlowBackend(str(tmp_path)))
+    slow_read = asyncio.create_task(backend.get("missing", "accounts"))
+
+    # The loop keeps scheduling other work while the backend call is blocked in its thread.
+    await asyncio.sleep(0.01)
+    assert not slow_read.done()
+    release.set()
+
+    assert await asyncio.wait_for(slow_read, timeout=5) == (None, None)
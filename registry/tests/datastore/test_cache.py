@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from datastore.core import ExpiringCache
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from datastore.core import CacheStats, ExpiringCache
 
 
 def test_expiring_cache_loads_once_until_expiry_or_invalidation() -> None:
@@ -23,3 +26,42 @@ def test_expiring_cache_loads_once_until_expiry_or_invalidation() -> None:
     cache.invalidate("document")
     assert cache.get_or_load("document", load) == "value"
     assert loads == ["load", "load", "load"]
+
+
+def test_expiring_cache_counts_hits_and_misses() -> None:
+    cache: ExpiringCache[str, str] = ExpiringCache(ttl_seconds=5)
+
+    cache.get_or_load("a", lambda: "A")
+    cache.get_or_load("a", lambda: "A")
+    cache.get_or_load("b", lambda: "B")
+
+    assert cache.stats() == CacheStats(hits=1, misses=2, entries=2)
+
+
+def test_expiring_cache_shares_one_load_between_concurrent_misses() -> None:
+    release = threading.Event()
+    loads: list[str] = []
+    cache: ExpiringCache[str, str] = ExpiringCache(ttl_seconds=5)
+
+    def load() -> str:
+        loads.append("load")
+        release.wait(timeout=5)
+        return "value"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = [pool.submit(cache.get_or_load, "document", load) for _ in range(8)]
+        release.set()
+
+    assert [result.result() for result in results] == ["value"] * 8
+    assert loads == ["load"]
+
+
+def test_expiring_cache_does_not_keep_a_value_loaded_across_invalidation() -> None:
+    cache: ExpiringCache[str, str] = ExpiringCache(ttl_seconds=5)
+
+    def stale_load() -> str:
+        cache.invalidate("document")
+        return "stale"
+
+    assert cache.get_or_load("document", stale_load) == "stale"
+    assert cache.get_or_load("document", lambda: "fresh") == "fresh"
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from datastore.core import ChangeEvent, ChangeFeed
+
+
+def test_change_feed_delivers_events_from_other_publishers_in_order(tmp_path: Path) -> None:
+    path = tmp_path / "changes.jsonl"
+    publisher = ChangeFeed(path)
+    publisher.publish("save", "accounts/old.json")
+    subscriber = ChangeFeed(path)
+
+    assert subscriber.poll() == []
+    publisher.publish("save", "accounts/a.json")
+    publisher.publish("delete", "accounts/b.json")
+
+    events = subscriber.poll()
+    assert events is not None
+    assert [(event.action, event.key) for event in events] == [
+        ("save", "accounts/a.json"),
+        ("delete", "accounts/b.json"),
+    ]
+    assert events[0].sequence < events[1].sequence
+    assert subscriber.poll() == []
+
+
+def test_change_feed_leaves_partial_lines_for_the_next_poll(tmp_path: Path) -> None:
+    path = tmp_path / "changes.jsonl"
+    subscriber = ChangeFeed(path)
+    with path.open("ab") as log:
+        log.write(b'{"action":"save","key":"accounts/a.json"}\n{"action":"sa')
+
+    events = subscriber.poll()
+    assert events is not None and [event.key for event in events] == ["accounts/a.json"]
+
+    with path.open("ab") as log:
+        log.write(b've","key":"accounts/b.json"}\n')
+    assert subscriber.poll() == [ChangeEvent(sequence=path.stat().st_size, action="save", key="accounts/b.json")]
+
+
+def test_change_feed_rotation_tells_readers_to_reset(tmp_path: Path) -> None:
+    path = tmp_path / "changes.jsonl"
+    publisher = ChangeFeed(path, max_bytes=64)
+    subscriber = ChangeFeed(path)
+
+    publisher.publish("save", "accounts/a-long-enough-key-to-fill-the-log.json")
+    assert subscriber.poll() is not None
+    publisher.publish("save", "accounts/b.json")
+
+    assert subscriber.poll() is None
+    publisher.publish("save", "accounts/c.json")
+    events = subscriber.poll()
+    assert events is not None and [event.key for event in events] == ["accounts/c.json"]
+
+
+def test_change_feed_rotation_is_detected_once_the_new_log_outgrows_the_cursor(tmp_path: Path) -> None:
+    path = tmp_path / "changes.jsonl"
+    publisher = ChangeFeed(path, max_bytes=64)
+    subscriber = ChangeFeed(path)
+    publisher.publish("save", "accounts/a-long-enough-key-to-fill-the-log.json")
+    assert subscriber.poll() is not None
+
+    publisher.publish("save", "accounts/b.json")
+    for key in ("accounts/c.json", "accounts/d.json"):
+        ChangeFeed(path).publish("save", key)
+    assert path.stat().st_size > subscriber._cursor
+    assert subscriber.poll() is None
+
+
+def test_change_feed_skips_invalid_lines(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    path = tmp_path / "changes.jsonl"
+    subscriber = ChangeFeed(path)
+    with path.open("ab") as log:
+        log.write(b'{"action":"save","key":"accounts/a.json"}\nnot json\n{"key":"accounts/x.json"}\n')
+    ChangeFeed(path).publish("delete", "accounts/b.json")
+
+    events = subscriber.poll()
+    assert events is not None
+    assert [(event.action, event.key) for event in events] == [
+        ("save", "accounts/a.json"),
+        ("delete", "accounts/b.json"),
+    ]
+    assert caplog.text.count("Skipping an invalid line") == 2
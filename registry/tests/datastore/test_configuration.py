@@ -6,17 +6,48 @@ from _pytest.monkeypatch import MonkeyPatch
 from pytest import LogCaptureFixture
 
 from datastore import DataStore
-from datastore.backends import GitBackend, LocalBackend, S3Backend
+from datastore.backends import CachingObjectStore, GitBackend, LocalBackend, S3Backend
+from datastore.core import ObjectStore
 from tests.datastore._git_helpers import init_repo
 
 
+@pytest.fixture(autouse=True)
+def change_feed_dir(monkeypatch: MonkeyPatch, tmp_path: Path) -> Path:
+    feed_dir = tmp_path / "changes"
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND_CHANGE_FEED_DIR", str(feed_dir))
+    return feed_dir
+
+
+def _selected_backend(store: DataStore) -> ObjectStore:
+    """Return the backend a DataStore from the environment wraps to publish its writes."""
+    assert isinstance(store.backend, CachingObjectStore)
+    return store.backend.backend
+
+
 def test_datastore_creates_local_backend_by_default(monkeypatch: MonkeyPatch) -> None:
     """By default, with no env vars, a LocalBackend should be created."""
     monkeypatch.delenv("REGISTRY_DATA_BACKEND", raising=False)
     monkeypatch.delenv("REGISTRY_DATA_BACKEND_PATH", raising=False)
 
-    store = DataStore()
-    assert isinstance(store.backend, LocalBackend)
+    backend = _selected_backend(DataStore())
+    assert isinstance(backend, LocalBackend)
+
+
+@pytest.mark.parametrize(("setting", "trusted"), [(None, False), ("true", True)])
+def test_datastore_trusted_reads_are_opt_in(
+    monkeypatch: MonkeyPatch, tmp_path: Path, setting: str | None, trusted: bool
+) -> None:
+    """Stores only reuse validated models when REGISTRY_DATA_TRUSTED_READS is set."""
+    if setting is None:
+        monkeypatch.delenv("REGISTRY_DATA_TRUSTED_READS", raising=False)
+    else:
+        monkeypatch.setenv("REGISTRY_DATA_TRUSTED_READS", setting)
+
+    store = DataStore(backend=LocalBackend(str(tmp_path)))
+    stats = [s.trusted_read_stats() for s in (store.accounts, store.players, store.stations, store.radio_dials)]
+    aio = store.aio
+    stats += [s.trusted_read_stats() for s in (aio.accounts, aio.players, aio.stations, aio.radio_dials)]
+    assert [s is not None for s in stats] == [trusted] * len(stats)
 
 
 def test_datastore_uses_backend_path_for_local(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
@@ -25,9 +56,9 @@ def test_datastore_uses_backend_path_for_local(monkeypatch: MonkeyPatch, tmp_pat
     monkeypatch.setenv("REGISTRY_DATA_BACKEND", "local")
     monkeypatch.setenv("REGISTRY_DATA_BACKEND_PATH", str(data_dir))
 
-    store = DataStore()
-    assert isinstance(store.backend, LocalBackend)
-    assert store.backend.base_path == data_dir
+    backend = _selected_backend(DataStore())
+    assert isinstance(backend, LocalBackend)
+    assert backend.base_path == data_dir
 
 
 def test_datastore_creates_s3_backend_from_env_var(monkeypatch: MonkeyPatch) -> None:
@@ -39,9 +70,9 @@ def test_datastore_creates_s3_backend_from_env_var(monkeypatch: MonkeyPatch) ->
     monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
     monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
 
-    store = DataStore()
-    assert isinstance(store.backend, S3Backend)
-    assert store.backend.bucket == "test-bucket"
+    backend = _selected_backend(DataStore())
+    assert isinstance(backend, S3Backend)
+    assert backend.bucket == "test-bucket"
 
 
 def test_datastore_creates_git_backend_from_env_var(
@@ -57,13 +88,13 @@ def test_datastore_creates_git_backend_from_env_var(
     monkeypatch.setenv("REGISTRY_DATA_BACKEND_GIT_REMOTE_URL", "")
     caplog.set_level(logging.INFO, logger="uvicorn")
 
-    store = DataStore()
-    assert isinstance(store.backend, GitBackend)
-    assert store.backend.repo_path == repo_path
-    assert store.backend.remote_url == ""
-    assert store.backend.author_name == "briceburg"
-    assert store.backend.author_email == "briceburg@users.noreply.github.com"
-    assert store.backend.prefix == "data"
+    backend = _selected_backend(DataStore())
+    assert isinstance(backend, GitBackend)
+    assert backend.repo_path == repo_path
+    assert backend.remote_url == ""
+    assert backend.author_name == "briceburg"
+    assert backend.author_email == "briceburg@users.noreply.github.com"
+    assert backend.prefix == "data"
     assert f"Git backend ready: repo={repo_path}" in caplog.text
 
 
@@ -93,3 +124,43 @@ def test_datastore_rejects_unknown_backend(monkeypatch: MonkeyPatch) -> None:
 
     with pytest.raises(ValueError, match="Unsupported REGISTRY_DATA_BACKEND"):
         DataStore()
+
+
+def test_datastore_wraps_backend_in_document_cache_when_ttl_is_set(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND", "local")
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND_PATH", str(tmp_path))
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND_CACHE_TTL_SECONDS", "5")
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND_CACHE_MAX_ENTRIES", "16")
+
+    store = DataStore()
+    assert isinstance(store.backend, CachingObjectStore)
+    assert isinstance(store.backend.backend, LocalBackend)
+
+
+def test_datastore_publishes_writes_to_the_change_feed_without_a_cache(
+    monkeypatch: MonkeyPatch, tmp_path: Path, change_feed_dir: Path
+) -> None:
+    """The change feed does not depend on REGISTRY_DATA_BACKEND_CACHE_TTL_SECONDS."""
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND", "local")
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND_PATH", str(tmp_path / "data"))
+    monkeypatch.delenv("REGISTRY_DATA_BACKEND_CACHE_TTL_SECONDS", raising=False)
+
+    store = DataStore()
+    assert isinstance(store.backend, CachingObjectStore)
+    assert store.backend.feed is not None
+    assert store.backend.feed.path == change_feed_dir / "data.jsonl"
+    reader = store.backend.feed.follow()
+    reader.poll()
+
+    store.backend.save("acct", {"name": "Account"}, "accounts")
+
+    assert [event.key for event in reader.poll() or []] == ["accounts/acct.json"]
+    assert store.backend.stats.entries == 0
+
+
+def test_datastore_leaves_backend_unwrapped_without_cache_or_feed(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND", "local")
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND_PATH", str(tmp_path / "data"))
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND_CHANGE_FEED_DIR", "")
+
+    assert isinstance(DataStore().backend, LocalBackend)
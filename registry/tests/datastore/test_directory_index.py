@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from datastore.backends import LocalBackend
+from datastore.core import DirectoryIndex
+
+
+def _age(directory: Path) -> None:
+    """Push the directory mtime into the past so scans are not treated as racy."""
+    os.utime(directory, ns=(0, directory.stat().st_mtime_ns - 1_000_000_000))
+
+
+def _touch(directory: Path, *names: str) -> None:
+    for name in names:
+        (directory / name).write_text("{}\n", encoding="utf-8")
+
+
+def test_directory_index_slices_sorted_ids_and_ignores_other_files(tmp_path: Path) -> None:
+    collection = tmp_path / "accounts"
+    collection.mkdir()
+    _touch(collection, "b.json", "a.json", "c.json", "notes.txt", "a.json.123.tmp")
+    index = DirectoryIndex(tmp_path)
+
+    assert index.slice(collection, 0, 2) == ["a", "b"]
+    assert index.slice(collection, 2, 10) == ["c"]
+    assert index.slice(tmp_path / "missing", 0, 10) == []
+
+
+def test_directory_index_rebuilds_when_files_change_behind_it(tmp_path: Path) -> None:
+    collection = tmp_path / "accounts"
+    collection.mkdir()
+    _touch(collection, "a.json")
+    _age(collection)
+    index = DirectoryIndex(tmp_path)
+    assert index.slice(collection, 0, 10) == ["a"]
+
+    _touch(collection, "b.json")
+    assert index.slice(collection, 0, 10) == ["a", "b"]
+
+
+def test_directory_index_is_persisted_for_the_next_process(tmp_path: Path) -> None:
+    collection = tmp_path / "data" / "accounts"
+    collection.mkdir(parents=True)
+    _touch(collection, "a.json", "b.json")
+    _age(collection)
+    root = tmp_path / ".index"
+    assert DirectoryIndex(tmp_path, root).slice(collection, 0, 10) == ["a", "b"]
+    assert (root / "data" / "accounts" / "ids.json").exists()
+
+    # A persisted index whose mtime still matches is trusted; hide a new file from the mtime check.
+    mtime_ns = collection.stat().st_mtime_ns
+    _touch(collection, "c.json")
+    os.utime(collection, ns=(0, mtime_ns))
+    assert DirectoryIndex(tmp_path, root).slice(collection, 0, 10) == ["a", "b"]
+
+
+def test_local_backend_keeps_its_index_current_across_writes(tmp_path: Path) -> None:
+    backend = LocalBackend(str(tmp_path), prefix="data")
+    for object_id in ("c", "a", "b"):
+        backend.save(object_id, {"name": object_id}, "accounts")
+
+    assert [item["id"] for item in backend.list("accounts", per_page=10)] == ["a", "b", "c"]
+
+    backend.save("aa", {"name": "aa"}, "accounts")
+    assert backend.delete("b", "accounts") is True
+    assert [item["id"] for item in backend.list("accounts", per_page=10)] == ["a", "aa", "c"]
+    assert [item["id"] for item in backend.list("accounts", page=2, per_page=2)] == ["c"]
+
+
+def test_directory_index_sees_another_processes_write_in_the_same_clock_tick(tmp_path: Path) -> None:
+    collection = tmp_path / "data" / "accounts"
+    collection.mkdir(parents=True)
+    _touch(collection, "a.json")
+    _age(collection)
+    root = tmp_path / ".index"
+    first, second = DirectoryIndex(tmp_path, root), DirectoryIndex(tmp_path, root)
+    assert first.slice(collection, 0, 10) == second.slice(collection, 0, 10) == ["a"]
+
+    with first.change(collection, "b", present=True):
+        _touch(collection, "b.json")
+    assert first.slice(collection, 0, 10) == ["a", "b"]
+
+    mtime_ns = collection.stat().st_mtime_ns
+    with second.change(collection, "c", present=True):
+        _touch(collection, "c.json")
+        # As if the kernel stamped the directory with the same coarse tick as the previous write.
+        os.utime(collection, ns=(0, mtime_ns))
+    assert collection.stat().st_mtime_ns > mtime_ns
+    assert first.slice(collection, 0, 10) == ["a", "b", "c"]
+    assert DirectoryIndex(tmp_path, root).slice(collection, 0, 10) == ["a", "b", "c"]
@@ -1,6 +1,12 @@
+import json
 from pathlib import Path
+from typing import Any
+
+from hypothesis import example, given, settings
+from hypothesis import strategies as st
 
 from datastore.core import atomic_write_json_file
+from lib.serialization import canonical_dumps, dumps, loads, storage_dumps
 
 
 def test_atomic_write_json_file_pretty_formats_json(tmp_path: Path) -> None:
@@ -18,3 +24,23 @@ def test_atomic_write_json_file_pretty_formats_json(tmp_path: Path) -> None:
     assert target.read_text(encoding="utf-8") == (
         '{\n  "name": "Briceburg",\n  "nested": {\n    "a": 1,\n    "b": 2\n  },\n  "z": 1\n}\n'
     )
+
+
+json_values = st.recursive(
+    st.none() | st.booleans() | st.integers() | st.floats(allow_nan=False, allow_infinity=False) | st.text(),
+    lambda children: st.lists(children, max_size=4) | st.dictionaries(st.text(), children, max_size=4),
+    max_leaves=20,
+)
+
+
+@given(value=json_values)
+@example(value={"below": -(2**63) - 1, "above": [2**64]})
+@settings(max_examples=200)
+def test_serialization_matches_standard_library_byte_for_byte(value: Any) -> None:
+    assert canonical_dumps(value) == json.dumps(
+        value, separators=(",", ":"), sort_keys=True, ensure_ascii=False
+    ).encode("utf-8")
+    assert storage_dumps(value) == (json.dumps(value, indent=2, sort_keys=True, ensure_ascii=False) + "\n").encode(
+        "utf-8"
+    )
+    assert loads(dumps(value)) == value
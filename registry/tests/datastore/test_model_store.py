@@ -1,9 +1,13 @@
 from pathlib import Path
 
+import boto3
 import pytest
+from moto import mock_aws
 
-from datastore.backends import LocalBackend
-from datastore.core import ModelStore
+from datastore.backends import LocalBackend, S3Backend
+from datastore.core import ModelStore, model_store
+from datastore.stores import RadioDials
+from models import RadioDialSpec
 from models.account import Account
 from models.player import Player, PlayerSpec
 
@@ -49,3 +53,125 @@ def test_placeholders_accepted_and_injected(tmp_path: Path) -> None:
     assert got is not None
     assert got.id == "player1"
     assert got.account_id == "acct"
+
+
+def test_trusted_reads_validate_each_document_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    backend = LocalBackend(str(tmp_path))
+    repo: ModelStore[Player, PlayerSpec] = ModelStore(
+        backend, model=Player, path_template="accounts/{account_id}/players/{id}", trusted_reads=True
+    )
+    params = {"account_id": "acct"}
+    repo.upsert("player1", PlayerSpec(name="A", radio_dial="community/briceburg"), path_params=params)
+    backend.save("player2", {"name": "B"}, "accounts", "acct", "players")
+
+    validations = 0
+    validate = Player.model_validate
+
+    def counting_validate(data: object) -> Player:
+        nonlocal validations
+        validations += 1
+        return validate(data)
+
+    monkeypatch.setattr(Player, "model_validate", counting_validate)
+
+    first = repo.list(path_params=params, per_page=100)
+    second = repo.list(path_params=params, per_page=100)
+    got = repo.get("player1", path_params=params)
+
+    # player1 was validated when it was written; player2 once, on its first read.
+    assert validations == 1
+    assert [p.name for p in first] == [p.name for p in second] == ["A", "B"]
+    assert got == first[0]
+    assert got is not first[0]
+    stats = repo.trusted_read_stats()
+    assert stats is not None
+    assert stats.hits == 4
+
+
+def test_trusted_reads_revalidate_changed_documents(tmp_path: Path) -> None:
+    backend = LocalBackend(str(tmp_path))
+    repo: ModelStore[Player, PlayerSpec] = ModelStore(
+        backend, model=Player, path_template="accounts/{account_id}/players/{id}", trusted_reads=True
+    )
+    params = {"account_id": "acct"}
+    repo.upsert("player1", PlayerSpec(name="A"), path_params=params)
+    backend.save("player1", {"name": "Edited"}, "accounts", "acct", "players")
+    got = repo.get("player1", path_params=params)
+    assert got is not None
+    assert got.name == "Edited"
+
+    backend.save("player1", {"name": ""}, "accounts", "acct", "players")
+    with pytest.raises(ValueError):
+        repo.get("player1", path_params=params)
+
+
+def test_trusted_reads_are_keyed_by_identity(tmp_path: Path) -> None:
+    backend = LocalBackend(str(tmp_path))
+    repo: ModelStore[Player, PlayerSpec] = ModelStore(
+        backend, model=Player, path_template="accounts/{account_id}/players/{id}", trusted_reads=True
+    )
+    for account_id in ("one", "two"):
+        repo.upsert("player", PlayerSpec(name="Same"), path_params={"account_id": account_id})
+    got = repo.get("player", path_params={"account_id": "two"})
+    assert got is not None
+    assert got.account_id == "two"
+    assert repo.trusted_read_stats() is not None
+    assert ModelStore(backend, model=Account, path_template="accounts/{id}").trusted_read_stats() is None
+
+
+def test_trusted_reads_reuse_the_backend_version(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    backend = LocalBackend(str(tmp_path))
+    repo: ModelStore[Player, PlayerSpec] = ModelStore(
+        backend, model=Player, path_template="accounts/{account_id}/players/{id}", trusted_reads=True
+    )
+    params = {"account_id": "acct"}
+    repo.upsert("player1", PlayerSpec(name="A"), path_params=params)
+
+    hashed: list[object] = []
+    monkeypatch.setattr(model_store, "compute_etag", hashed.append)
+    got = repo.get("player1", path_params=params)
+    assert got is not None
+    assert got.name == "A"
+    assert hashed == []
+    stats = repo.trusted_read_stats()
+    assert stats is not None
+    assert stats.hits == 1
+
+
+def test_trusted_reads_hand_out_deep_copies(tmp_path: Path) -> None:
+    repo = RadioDials(LocalBackend(str(tmp_path)), trusted_reads=True)
+    params = {"account_id": "acct"}
+    written = repo.upsert("dial", RadioDialSpec(name="Dial", stations=["acct/WWOZ"]), path_params=params)
+    written.stations.append("acct/KEXP")
+
+    got = repo.get("dial", path_params=params)
+    assert got is not None
+    assert got.stations == ["acct/WWOZ"]
+    got.stations.append("acct/WFMU")
+
+    again = repo.get("dial", path_params=params)
+    assert again is not None
+    assert again.stations == ["acct/WWOZ"]
+
+
+def test_trusted_reads_recognize_their_own_s3_writes(monkeypatch: pytest.MonkeyPatch) -> None:
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="test-bucket")
+        repo: ModelStore[Player, PlayerSpec] = ModelStore(
+            S3Backend(bucket="test-bucket", prefix="test", client=client),
+            model=Player,
+            path_template="accounts/{account_id}/players/{id}",
+            trusted_reads=True,
+        )
+        params = {"account_id": "acct"}
+        repo.upsert("player1", PlayerSpec(name="A"), path_params=params)
+
+        def fail_validate(data: object) -> Player:
+            raise AssertionError("validated a document this store wrote")
+
+        monkeypatch.setattr(Player, "model_validate", fail_validate)
+        got = repo.get("player1", path_params=params)
+
+    assert got is not None
+    assert got.name == "A"
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from datastore import DataStore, LocalBackend
+from datastore.backends import CachingObjectStore
+from datastore.core import ChangeFeed, ReferenceIndex
+from models import AccountSpec, PlayerSpec, RadioDialSpec
+
+
+def test_reference_index_builds_once_and_is_patched() -> None:
+    documents = {"a/one": ["x/dial"], "a/two": ["x/dial"], "b/three": []}
+    scans: list[str] = []
+
+    def scan() -> list[tuple[str, list[str]]]:
+        scans.append("scan")
+        return list(documents.items())
+
+    index = ReferenceIndex(scan)
+    index.record("ignored/before-build", ["x/dial"])
+
+    assert index.referrers("x/dial") == ["a/one", "a/two"]
+    index.record("b/three", ["x/dial"])
+    index.record("a/one", [])
+    assert index.referrers("x/dial") == ["a/two", "b/three"]
+    assert index.referrers("x/dial") == ["a/two", "b/three"]
+    assert scans == ["scan"]
+
+
+def test_reference_index_applies_deferred_records_only_when_the_block_succeeds() -> None:
+    index = ReferenceIndex(lambda: [("a/one", ["x/dial"])])
+    index.rebuild()
+
+    with pytest.raises(RuntimeError):
+        with index.deferred():
+            index.record("a/two", ["x/dial"])
+            raise RuntimeError("rolled back")
+    assert index.referrers("x/dial") == ["a/one"]
+
+    with index.deferred():
+        index.record("a/one", [])
+        with index.deferred():
+            index.record("a/two", ["x/dial"])
+        assert index.referrers("x/dial") == ["a/one"]
+    assert index.referrers("x/dial") == ["a/two"]
+
+
+def _eventually[T](read: Callable[[], T], expected: T) -> None:
+    deadline = time.monotonic() + 5
+    while read() != expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert read() == expected
+
+
+def test_reference_index_without_a_feed_rescans_in_the_background_once_old() -> None:
+    documents = {"a/one": ["x/dial"]}
+    scanning = threading.Event()
+    release = threading.Event()
+    now = [0.0]
+
+    def scan() -> list[tuple[str, list[str]]]:
+        if scanning.is_set():
+            release.wait(5)
+        return list(documents.items())
+
+    index = ReferenceIndex(scan, max_age_seconds=60, clock=lambda: now[0])
+    index.rebuild()
+    documents["b/two"] = ["x/dial"]
+    now[0] = 59
+    assert index.referrers("x/dial") == ["a/one"]
+
+    scanning.set()
+    now[0] = 60
+    # The stale index answers at once while the scan runs, and keeps this process's writes.
+    assert index.referrers("x/dial") == ["a/one"]
+    index.record("c/three", ["x/dial"])
+    release.set()
+    _eventually(lambda: index.referrers("x/dial"), ["a/one", "b/two", "c/three"])
+
+
+def test_players_maintain_radio_dial_index(tmp_path: Path) -> None:
+    ds = DataStore(backend=LocalBackend(str(tmp_path)))
+    ds.accounts.upsert("community", AccountSpec(name="Community"))
+    ds.accounts.upsert("briceburg", AccountSpec(name="Brice"))
+    ds.radio_dials.upsert("briceburg", RadioDialSpec(name="Casa", stations=[]), path_params={"account_id": "community"})
+    for player_id in ("kitchen", "living-room"):
+        ds.players.upsert(
+            player_id,
+            PlayerSpec(name=player_id, radio_dial="community/briceburg"),
+            path_params={"account_id": "briceburg"},
+        )
+
+    assert ds.players.using_radio_dial("community/briceburg") == ["briceburg/kitchen", "briceburg/living-room"]
+
+    ds.players.upsert("kitchen", PlayerSpec(name="Kitchen"), path_params={"account_id": "briceburg"})
+    ds.players.delete("living-room", path_params={"account_id": "briceburg"})
+    assert ds.players.using_radio_dial("community/briceburg") == []
+
+
+def test_radio_dials_maintain_station_index_and_rebuild_from_scan(tmp_path: Path) -> None:
+    ds = DataStore(backend=LocalBackend(str(tmp_path)))
+    ds.accounts.upsert("community", AccountSpec(name="Community"))
+    ds.radio_dials.upsert(
+        "jazz", RadioDialSpec(name="Jazz", stations=["community/wwoz"]), path_params={"account_id": "community"}
+    )
+    assert ds.radio_dials.using_station("community/WWOZ") == ["community/jazz"]
+
+    # A write from another process is only seen once the index is rebuilt.
+    other = DataStore(backend=LocalBackend(str(tmp_path)))
+    other.radio_dials.upsert(
+        "mix", RadioDialSpec(name="Mix", stations=["community/WWOZ"]), path_params={"account_id": "community"}
+    )
+    assert ds.radio_dials.using_station("community/WWOZ") == ["community/jazz"]
+    ds.rebuild_indexes()
+    assert ds.radio_dials.using_station("community/WWOZ") == ["community/jazz", "community/mix"]
+
+
+def test_index_takes_in_transaction_writes_once_committed(tmp_path: Path) -> None:
+    ds = DataStore(backend=LocalBackend(str(tmp_path)))
+    ds.accounts.upsert("community", AccountSpec(name="Community"))
+    params = {"account_id": "community"}
+    assert ds.radio_dials.using_station("community/WWOZ") == []
+
+    with pytest.raises(RuntimeError):
+        with ds.transaction():
+            ds.radio_dials.upsert("jazz", RadioDialSpec(name="Jazz", stations=["community/WWOZ"]), path_params=params)
+            raise RuntimeError("abandoned")
+    assert ds.radio_dials.using_station("community/WWOZ") == []
+
+    with ds.transaction():
+        ds.radio_dials.upsert("mix", RadioDialSpec(name="Mix", stations=["community/WWOZ"]), path_params=params)
+        assert ds.radio_dials.using_station("community/WWOZ") == []
+    assert ds.radio_dials.using_station("community/WWOZ") == ["community/mix"]
+
+
+def test_index_follows_writes_from_other_workers_through_the_change_feed(tmp_path: Path) -> None:
+    def worker() -> DataStore:
+        backend = LocalBackend(str(tmp_path / "data"))
+        return DataStore(backend=CachingObjectStore(backend, ttl_seconds=60, feed=ChangeFeed(tmp_path / "data.jsonl")))
+
+    ds, other = worker(), worker()
+    ds.accounts.upsert("community", AccountSpec(name="Community"))
+    params = {"account_id": "community"}
+    ds.rebuild_indexes()
+
+    other.radio_dials.upsert("mix", RadioDialSpec(name="Mix", stations=["community/WWOZ"]), path_params=params)
+    other.players.upsert("kitchen", PlayerSpec(name="Kitchen", radio_dial="community/mix"), path_params=params)
+    assert ds.radio_dials.using_station("community/WWOZ") == ["community/mix"]
+    assert ds.players.using_radio_dial("community/mix") == ["community/kitchen"]
+
+    other.players.delete("kitchen", path_params=params)
+    assert ds.players.using_radio_dial("community/mix") == []
+
+
+def test_index_follows_writes_through_a_second_datastore_without_a_cache(
+    monkeypatch: MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND", "local")
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND_PATH", str(tmp_path / "data"))
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND_CHANGE_FEED_DIR", str(tmp_path / "changes"))
+    monkeypatch.delenv("REGISTRY_DATA_BACKEND_CACHE_TTL_SECONDS", raising=False)
+    writer, reader = DataStore(), DataStore()
+    reader.rebuild_indexes()
+    params = {"account_id": "community"}
+
+    writer.accounts.upsert("community", AccountSpec(name="Community"))
+    writer.radio_dials.upsert("mix", RadioDialSpec(name="Mix", stations=["community/WWOZ"]), path_params=params)
+    writer.players.upsert("kitchen", PlayerSpec(name="Kitchen", radio_dial="community/mix"), path_params=params)
+
+    assert reader.players.using_radio_dial("community/mix") == ["community/kitchen"]
+    assert reader.radio_dials.using_station("community/WWOZ") == ["community/mix"]
+
+
+def test_index_without_a_feed_picks_up_a_second_datastores_writes_by_rescanning(
+    monkeypatch: MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr("datastore.datastore.REFERENCE_INDEX_MAX_AGE_SECONDS", 0)
+    writer, reader = DataStore(backend=LocalBackend(str(tmp_path))), DataStore(backend=LocalBackend(str(tmp_path)))
+    reader.rebuild_indexes()
+    params = {"account_id": "community"}
+
+    writer.accounts.upsert("community", AccountSpec(name="Community"))
+    writer.players.upsert("kitchen", PlayerSpec(name="Kitchen", radio_dial="community/mix"), path_params=params)
+
+    _eventually(lambda: reader.players.using_radio_dial("community/mix"), ["community/kitchen"])
@@ -1,9 +1,14 @@
+import itertools
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
 
-from datastore.backends import LocalBackend
-from datastore.stores import Stations
+from datastore.backends import AsyncBackend, GitBackend, LocalBackend
+from datastore.exceptions import ConcurrencyError
+from datastore.stores import AsyncStations, Stations
+from datastore.stores.stations import _shard
+from datastore.types import JsonDoc
 from models import StationSpec
 
 
@@ -11,6 +16,39 @@ def _store(tmp_path: Path) -> Stations:
     return Stations(LocalBackend(str(tmp_path)))
 
 
+def _spec(name: str) -> StationSpec:
+    return StationSpec.model_validate({"stream_url": f"https://example.com/{name.lower()}"})
+
+
+def _same_shard_call_signs() -> tuple[str, str]:
+    by_shard: dict[str, str] = {}
+    for letters in itertools.product("ABCDEFGHIJKLMNOPQRSTUVWXYZ", repeat=3):
+        call_sign = "K" + "".join(letters)
+        if (other := by_shard.setdefault(_shard(call_sign), call_sign)) != call_sign:
+            return other, call_sign
+    raise AssertionError("unreachable")
+
+
+class _InterleavingBackend(LocalBackend):
+    """Runs ``interleave`` once, just before the first save, as if another writer got there first."""
+
+    def __init__(self, root: str) -> None:
+        super().__init__(root)
+        self.interleave: list[Callable[[], object]] = []
+
+    def save(
+        self,
+        object_id: str,
+        data: JsonDoc,
+        *path_parts: str,
+        if_match: str | None = None,
+        if_none_match: bool = False,
+    ) -> str:
+        while self.interleave:
+            self.interleave.pop()()
+        return super().save(object_id, data, *path_parts, if_match=if_match, if_none_match=if_none_match)
+
+
 def test_station_updates_preserve_the_account_aggregate(tmp_path: Path) -> None:
     stations = _store(tmp_path)
     stations.upsert("account", "WWOZ", StationSpec.model_validate({"stream_url": "https://example.com/wwoz"}))
@@ -47,6 +85,148 @@ def test_station_seed_preserves_id_as_a_call_sign(tmp_path: Path) -> None:
     assert station.call_sign == "ID"
 
 
+def test_station_seed_migrates_the_legacy_document(tmp_path: Path) -> None:
+    backend = LocalBackend(str(tmp_path))
+    stations = Stations(backend)
+    backend.save(
+        "stations",
+        {"WWOZ": _spec("legacy").model_dump(mode="json"), "KEXP": _spec("KEXP").model_dump(mode="json")},
+        "accounts",
+        "account",
+    )
+
+    stations.seed({"WWOZ": _spec("WWOZ").model_dump(mode="json")}, path_params={"account_id": "account"})
+
+    assert backend.get("stations", "accounts", "account") == (None, None)
+    assert [station.call_sign for station in stations.list("account")] == ["KEXP", "WWOZ"]
+    station = stations.get("account", "WWOZ")
+    assert station is not None
+    assert station.stream_url == _spec("WWOZ").stream_url
+
+
 def test_station_seed_rejects_invalid_account_id(tmp_path: Path) -> None:
     with pytest.raises(ValueError):
         _store(tmp_path).seed({}, path_params={"account_id": "Invalid Account"})
+
+
+def test_stations_are_stored_in_shards_and_read_one_shard_at_a_time(tmp_path: Path) -> None:
+    stations = _store(tmp_path)
+    stations.upsert_many("account", {call_sign: _spec(call_sign) for call_sign in ("WWOZ", "KEXP", "WFMU")})
+
+    shards = sorted(path.stem for path in (tmp_path / "accounts" / "account" / "stations").glob("*.json"))
+    assert shards == sorted({_shard("WWOZ"), _shard("KEXP"), _shard("WFMU")})
+    assert not (tmp_path / "accounts" / "account" / "stations.json").exists()
+    assert [station.call_sign for station in stations.list("account", per_page=2, after="KEXP")] == ["WFMU", "WWOZ"]
+    versions = stations.versions(["account/WWOZ", "account/WWOZ", "account/KEXP"])
+    assert len(versions) == len({_shard("WWOZ"), _shard("KEXP")})
+    assert versions[0] == stations.get_with_version("account", "WWOZ")[1]
+
+
+def test_legacy_stations_document_is_read_until_the_first_write_migrates_it(tmp_path: Path) -> None:
+    backend = LocalBackend(str(tmp_path))
+    stations = Stations(backend)
+    backend.save(
+        "stations",
+        {"WWOZ": _spec("WWOZ").model_dump(mode="json"), "KEXP": _spec("KEXP").model_dump(mode="json")},
+        "accounts",
+        "account",
+    )
+
+    assert stations.exists("stations", path_params={"account_id": "account"})
+    assert [station.call_sign for station in stations.list("account")] == ["KEXP", "WWOZ"]
+    resolved, missing = stations.resolve(["account/WWOZ", "account/NOPE"])
+    assert [station.key for station in resolved] == ["account/WWOZ"]
+    assert missing == ["account/NOPE"]
+
+    stations.upsert("account", "WFMU", _spec("WFMU"))
+
+    assert backend.get("stations", "accounts", "account") == (None, None)
+    assert [station.call_sign for station in stations.list("account")] == ["KEXP", "WFMU", "WWOZ"]
+    station = stations.get("account", "kexp")
+    assert station is not None
+    assert station.stream_url == _spec("KEXP").stream_url
+
+
+def test_writers_of_different_stations_in_one_shard_do_not_conflict(tmp_path: Path) -> None:
+    backend = _InterleavingBackend(str(tmp_path))
+    stations = Stations(backend)
+    first, second = _same_shard_call_signs()
+    stations.upsert("account", first, _spec("before"))
+
+    backend.interleave.append(lambda: Stations(LocalBackend(str(tmp_path))).upsert("account", first, _spec("after")))
+    stations.upsert("account", second, _spec(second))
+
+    assert [station.call_sign for station in stations.list("account")] == sorted([first, second])
+    station = stations.get("account", first)
+    assert station is not None
+    assert station.stream_url == _spec("after").stream_url
+
+
+def test_writers_of_the_same_station_still_conflict(tmp_path: Path) -> None:
+    backend = _InterleavingBackend(str(tmp_path))
+    stations = Stations(backend)
+    stations.upsert("account", "WWOZ", _spec("before"))
+
+    backend.interleave.append(lambda: Stations(LocalBackend(str(tmp_path))).upsert("account", "WWOZ", _spec("theirs")))
+    with pytest.raises(ConcurrencyError):
+        stations.upsert("account", "WWOZ", _spec("ours"))
+
+    station = stations.get("account", "WWOZ")
+    assert station is not None
+    assert station.stream_url == _spec("theirs").stream_url
+
+
+@pytest.mark.parametrize("in_one_thread", [False, True])
+async def test_async_station_writes_migrate_the_legacy_document(tmp_path: Path, in_one_thread: bool) -> None:
+    backend = LocalBackend(str(tmp_path))
+    backend.save("stations", {"WWOZ": _spec("WWOZ").model_dump(mode="json")}, "accounts", "account")
+    stations = AsyncStations(AsyncBackend(backend), stations=Stations(backend) if in_one_thread else None)
+
+    await stations.upsert_many("account", {"KEXP": _spec("KEXP"), "WFMU": _spec("WFMU")})
+
+    assert backend.get("stations", "accounts", "account") == (None, None)
+    assert [station.call_sign for station in await stations.list("account")] == ["KEXP", "WFMU", "WWOZ"]
+    resolved, missing = await stations.resolve(["account/WWOZ", "account/KEXP"])
+    assert [station.key for station in resolved] == ["account/WWOZ", "account/KEXP"]
+    assert missing == []
+
+
+def test_station_writes_in_one_git_transaction_build_on_each_other(tmp_path: Path) -> None:
+    backend = GitBackend(
+        str(tmp_path / "repo"), fetch_ttl_seconds=0, author_name="Tests", author_email="tests@example.invalid"
+    )
+    backend.save("stations", {"WWOZ": _spec("WWOZ").model_dump(mode="json")}, "accounts", "account")
+    stations = Stations(backend)
+
+    with backend.transaction():
+        stations.upsert_many("account", {"KEXP": _spec("KEXP")})
+        stations.upsert_many("account", {"KEXP": _spec("changed"), "WFMU": _spec("WFMU")})
+
+    assert backend.get("stations", "accounts", "account") == (None, None)
+    assert [station.call_sign for station in stations.list("account")] == ["KEXP", "WFMU", "WWOZ"]
+    station = stations.get("account", "KEXP")
+    assert station is not None
+    assert station.stream_url == _spec("changed").stream_url
+
+
+def test_trusted_reads_materialize_each_shard_once(tmp_path: Path) -> None:
+    backend = LocalBackend(str(tmp_path))
+    stations = Stations(backend, trusted_reads=True)
+    stations.upsert_many("account", {"WWOZ": _spec("WWOZ"), "KEXP": _spec("KEXP")})
+
+    first = stations.list("account")
+    assert stations.list("account") == first
+    station = stations.get("account", "WWOZ")
+    assert station is not None
+    station.call_sign = "MUTATED"
+    stats = stations.trusted_read_stats()
+    assert stats is not None
+    assert stats.misses == len({_shard("WWOZ"), _shard("KEXP")})
+    assert stats.hits == stats.misses + 1
+
+    stations.upsert("account", "WWOZ", _spec("changed"))
+    changed = stations.get("account", "WWOZ")
+    assert changed is not None
+    assert changed.call_sign == "WWOZ"
+    assert changed.stream_url == _spec("changed").stream_url
+    assert _store(tmp_path).trusted_read_stats() is None
@@ -1,8 +1,12 @@
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import pytest
+
 from datastore import DataStore
 from datastore.backends import LocalBackend
+from datastore.core import SEED_MANIFEST_PATH
+from datastore.types import JsonDoc, ValueWithETag
 from models.account import Account
 from tests.datastore.conftest import SeedCreator
 
@@ -83,3 +87,40 @@ def test_seed_is_safe_under_concurrent_startup(tmp_path: Path) -> None:
     seeded_acct = DataStore(backend=backend, seed_path=str(seed_dir)).accounts.get("acct1")
     assert seeded_acct is not None
     assert seeded_acct.name == "Account One"
+
+
+def test_seed_manifest_skips_unchanged_seed_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    seeder = SeedCreator(tmp_path / "seed")
+    seeder.create_account("acct1", "Account One")
+    seeder.create_stations("acct1", {"WWOZ": {"stream_url": "https://example.com/wwoz"}})
+    backend = LocalBackend(base_path=str(tmp_path / "data"))
+    DataStore(backend=backend, seed_path=str(tmp_path / "seed")).seed()
+
+    manifest, _ = backend.get("data", SEED_MANIFEST_PATH)
+    assert manifest is not None
+    assert sorted(manifest["files"]) == ["accounts/acct1.json", "accounts/acct1/stations.json"]
+
+    # Deleted objects stay deleted while their seed file is unchanged...
+    ds = DataStore(backend=backend, seed_path=str(tmp_path / "seed"))
+    ds.accounts.delete("acct1")
+    reads: list[tuple[str, ...]] = []
+    get = backend.get
+
+    def recording_get(object_id: str, *path: str) -> ValueWithETag[JsonDoc]:
+        reads.append((*path, object_id))
+        return get(object_id, *path)
+
+    monkeypatch.setattr(backend, "get", recording_get)
+    ds.seed()
+    assert reads == [(SEED_MANIFEST_PATH, "data")]
+    assert ds.accounts.get("acct1") is None
+
+    # ...and a changed seed file is applied again, still without overwriting existing objects.
+    seeder.create_account("acct1", "Account Renamed")
+    seeder.create_account("acct2", "Account Two")
+    ds.seed()
+    renamed = ds.accounts.get("acct1")
+    assert renamed is not None and renamed.name == "Account Renamed"
+    assert ds.accounts.get("acct2") is not None
+    manifest, _ = backend.get("data", SEED_MANIFEST_PATH)
+    assert manifest is not None and len(manifest["files"]) == 3
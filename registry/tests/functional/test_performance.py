@@ -1,6 +1,13 @@
+import asyncio
+import hashlib
+import json
 import logging
+import sys
 import time
-from collections.abc import Generator
+import tracemalloc
+from collections.abc import Callable, Generator
+from contextlib import AsyncExitStack
+from functools import partial
 from pathlib import Path
 
 import boto3
@@ -8,7 +15,12 @@ import pytest
 
 from datastore import DataStore
 from datastore.backends import LocalBackend, S3Backend
-from models import AccountSpec, RadioDialSpec
+from datastore.stores import RadioDials, Stations
+from lib.serialization import canonical_dumps, dumps, loads, storage_dumps
+from models import AccountSpec, RadioDialSpec, StationSpec
+from switchboard.broadcast import DEFAULT_QUEUE_SIZE, Broadcast, ChannelStats
+from switchboard.supervisor import Supervisor
+from switchboard.switchboard import _run_loop, publish_event
 
 NUM_ACCOUNTS = 5000
 NUM_RADIO_DIALS = 1000
@@ -89,3 +101,318 @@ def test_s3_pagination_performance(s3_backend: S3Backend, page_to_fetch: int, pe
         f"with {NUM_ACCOUNTS} objects took {duration:.4f} seconds."
     )
     assert len(result) == per_page
+
+
+@pytest.mark.performance
+def test_local_pagination_latency_is_flat_as_collection_grows(tmp_path: Path) -> None:
+    """
+    Page-N latency on an indexed LocalBackend collection should not grow with the collection size.
+    """
+    per_page = 100
+    latencies: dict[int, float] = {}
+    for size in (1_000, 10_000, 100_000):
+        backend = LocalBackend(base_path=str(tmp_path / f"flat-{size}"), prefix="data")
+        collection = backend.base_path / "data" / "accounts"
+        collection.mkdir(parents=True)
+        for i in range(size):
+            (collection / f"account-{i:06d}.json").write_text('{"name": "Account"}\n', encoding="utf-8")
+
+        page = size // per_page // 2
+        backend.list("accounts", page=page, per_page=per_page)  # builds the index
+        samples = []
+        for _ in range(20):
+            start_time = time.perf_counter()
+            result = backend.list("accounts", page=page, per_page=per_page)
+            samples.append(time.perf_counter() - start_time)
+        assert len(result) == per_page
+        latencies[size] = sorted(samples)[len(samples) // 2]
+        logging.info("\nLocal page %s of %s accounts took %.4f seconds (median).", page, size, latencies[size])
+
+    assert latencies[100_000] < latencies[1_000] * 5
+
+
+@pytest.mark.performance
+def test_s3_list_read_modes(s3_backend: S3Backend) -> None:
+    """
+    Compares one 100-item S3 page read sequentially, through the thread pool, and from a packed manifest.
+    """
+    num_objects = 300
+    writer = S3Backend(bucket=s3_backend.bucket, prefix="modes", client=s3_backend.client, manifest=True)
+    for i in range(num_objects):
+        writer.save(f"object-{i:04d}", {"data": f"value-{i}"}, "test-path")
+    writer.rebuild_manifest("test-path")
+
+    modes = {
+        "sequential": S3Backend(bucket=s3_backend.bucket, prefix="modes", client=s3_backend.client, max_workers=1),
+        "thread pool": S3Backend(bucket=s3_backend.bucket, prefix="modes", client=s3_backend.client),
+        "manifest": writer,
+    }
+    pages = {}
+    for mode, backend in modes.items():
+        start_time = time.perf_counter()
+        pages[mode] = backend.list("test-path", page=3, per_page=100)
+        duration = time.perf_counter() - start_time
+        logging.info("\nS3 %s read of a 100-item page from %s objects took %.4f seconds.", mode, num_objects, duration)
+
+    assert pages["sequential"] == pages["thread pool"] == pages["manifest"]
+    assert len(pages["manifest"]) == 100
+
+
+def _cpu_seconds_per_call(call: Callable[[], object], calls: int = 2000) -> float:
+    start = time.process_time()
+    for _ in range(calls):
+        call()
+    return (time.process_time() - start) / calls
+
+
+@pytest.mark.performance
+def test_serialization_cpu_per_request() -> None:
+    """Compares the JSON work of one document read plus a switchboard frame: stdlib vs lib.serialization."""
+    document = {
+        "name": "Casa Briceburg",
+        "discoverable": True,
+        "stations": [f"community/STATION{i}" for i in range(50)],
+        "streams": {f"STATION{i}": f"https://stream{i}.example/listen" for i in range(50)},
+    }
+    raw = storage_dumps(document)
+
+    def stdlib_request() -> object:
+        data = json.loads(raw)
+        canonical = json.dumps(data, separators=(",", ":"), sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(canonical).hexdigest(), json.dumps({"event": "radio_dial", "data": data})
+
+    def serialization_request() -> object:
+        data = loads(raw)
+        return hashlib.sha256(canonical_dumps(data)).hexdigest(), dumps({"event": "radio_dial", "data": data})
+
+    stdlib = _cpu_seconds_per_call(stdlib_request)
+    fast = _cpu_seconds_per_call(serialization_request)
+    logging.info(
+        "\nJSON CPU per request: stdlib %.1fus, lib.serialization %.1fus (%.1fx)",
+        stdlib * 1e6,
+        fast * 1e6,
+        stdlib / fast,
+    )
+    assert fast < stdlib
+
+
+@pytest.mark.performance
+def test_trusted_reads_cpu_per_list_page(tmp_path: Path) -> None:
+    """Compares listing a 100-item page of RadioDials with full validation and with trusted reads."""
+    backend = LocalBackend(base_path=str(tmp_path))
+    params = {"account_id": "performance"}
+    stations = [f"community/STATION{i}" for i in range(30)]
+    for i in range(100):
+        data = {"name": f"RadioDial {i}", "stations": stations}
+        backend.save(f"radio-dial-{i:03}", data, "accounts", "performance", "radio-dials")
+
+    results: dict[bool, float] = {}
+    for trusted in (False, True):
+        store = RadioDials(backend, trusted_reads=trusted)
+        assert len(store.list(path_params=params, per_page=100)) == 100
+        results[trusted] = _cpu_seconds_per_call(partial(store.list, path_params=params, per_page=100), 50)
+
+    logging.info(
+        "\nRadioDial list page CPU: validated %.2fms, trusted %.2fms",
+        results[False] * 1e3,
+        results[True] * 1e3,
+    )
+    assert results[True] < results[False]
+
+
+@pytest.mark.performance
+def test_trusted_station_reads_cpu_per_list_page(tmp_path: Path) -> None:
+    """Compares listing a 100-Station page of a 1,000-Station account with and without trusted reads."""
+    backend = LocalBackend(base_path=str(tmp_path))
+    Stations(backend).upsert_many(
+        "performance",
+        {
+            f"K{i:03}": StationSpec.model_validate({"stream_url": f"https://stream{i}.example/listen"})
+            for i in range(1000)
+        },
+    )
+
+    results: dict[bool, float] = {}
+    for trusted in (False, True):
+        store = Stations(backend, trusted_reads=trusted)
+        assert len(store.list("performance", per_page=100)) == 100
+        results[trusted] = _cpu_seconds_per_call(partial(store.list, "performance", per_page=100), 50)
+
+    logging.info(
+        "\nStation list page CPU: validated %.2fms, trusted %.2fms",
+        results[False] * 1e3,
+        results[True] * 1e3,
+    )
+    assert results[True] < results[False]
+
+
+@pytest.mark.performance
+async def test_stalled_subscribers_hold_bounded_memory() -> None:
+    """Publishes to thousands of subscribers that never read and checks memory stops growing once their queues fill."""
+    broadcast = Broadcast(queue_size=64)
+
+    async def burst(count: int) -> None:
+        for i in range(count):
+            await broadcast.publish("acct/player", f'{{"event":"volume_up","data":{{"sequence":{i}}}}}')
+
+    async with AsyncExitStack() as stack:
+        for _ in range(2000):
+            await stack.enter_async_context(broadcast.subscribe("acct/player"))
+        await burst(64)
+
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            await burst(500)
+            growth = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+
+    logging.info(
+        "\n2000 stalled subscribers: %.1fKB growth over 500 messages, %d dropped",
+        growth / 1024,
+        broadcast.stats("acct/player").dropped,
+    )
+    assert broadcast.stats("acct/player").dropped == 2000 * 500
+    assert growth < 256 * 1024
+
+
+@pytest.mark.performance
+async def test_station_flipping_queues_one_state_per_subscriber() -> None:
+    """Flips stations rapidly in front of remotes that are not reading and checks each holds only the latest state."""
+    broadcast = Broadcast()
+
+    async with AsyncExitStack() as stack:
+        subscribers = [await stack.enter_async_context(broadcast.subscribe("acct/player")) for _ in range(100)]
+        for i in range(10_000):
+            await broadcast.publish(
+                "acct/player", f'{{"event":"playback_state","data":{{"station":"{i}"}}}}', key="playback_state"
+            )
+        await broadcast.publish("acct/player", '{"event":"volume_up"}')
+
+        for subscriber in subscribers:
+            assert subscriber._queue._size == 2
+            assert len(subscriber._queue._events) <= 2 * DEFAULT_QUEUE_SIZE
+
+    logging.info("\n100 remotes: %d stale states coalesced", broadcast.stats("acct/player").coalesced)
+    assert broadcast.stats("acct/player") == ChannelStats(coalesced=100 * 9_999)
+
+
+class _Remote:
+    """A controller WebSocket that records what it is sent and never sends anything itself."""
+
+    def __init__(self, expected: int, done: Callable[[], None]) -> None:
+        self.frames: list[dict[str, str]] = []
+        self._expected = expected
+        self._done = done
+
+    async def send(self, frame: dict[str, str]) -> None:
+        self.frames.append(frame)
+        if len(self.frames) == self._expected:
+            self._done()
+
+    async def receive_text(self) -> str:
+        await asyncio.Event().wait()
+        raise AssertionError("unreachable")
+
+
+@pytest.mark.performance
+async def test_fan_out_to_one_thousand_subscribers_encodes_once() -> None:
+    """Relays commands to 1000 remotes on one channel and checks every remote is sent the same frame."""
+    broadcast = Broadcast()
+    messages = 20
+    remaining = 1000
+    delivered = asyncio.Event()
+
+    def done() -> None:
+        nonlocal remaining
+        remaining -= 1
+        if remaining == 0:
+            delivered.set()
+
+    remotes = [_Remote(messages, done) for _ in range(1000)]
+    loops = [
+        asyncio.create_task(_run_loop(remote, broadcast, "acct/player", is_player=False))  # type: ignore[arg-type]
+        for remote in remotes
+    ]
+    while len(broadcast._channels.get("acct/player", ())) < len(remotes):
+        await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    for i in range(messages):
+        await publish_event(broadcast, "acct/player", "volume_up", {"sequence": i})
+    await asyncio.wait_for(delivered.wait(), timeout=30)
+    elapsed = time.perf_counter() - start
+
+    for loop in loops:
+        loop.cancel()
+    await asyncio.gather(*loops, return_exceptions=True)
+
+    logging.info("\n1 -> 1000 fan-out: %.1fus per delivered frame", elapsed / (messages * len(remotes)) * 1e6)
+    for i in range(messages):
+        frame = remotes[0].frames[i]
+        assert frame["text"] == f'{{"event":"volume_up","data":{{"sequence":{i}}}}}'
+        assert all(remote.frames[i] is frame for remote in remotes)
+
+
+# Streams a fixed-size response body, so the benchmark measures bytes moved rather than requests.
+BULK_WORKER = """
+import asyncio, sys
+
+CHUNK = b"x" * 65536
+
+async def handle(reader, writer):
+    await reader.readuntil(b"\\r\\n\\r\\n")
+    size = int(sys.argv[2])
+    writer.write(b"HTTP/1.1 200 OK\\r\\nContent-Length: %d\\r\\nConnection: close\\r\\n\\r\\n" % size)
+    for _ in range(size // len(CHUNK)):
+        writer.write(CHUNK)
+        await writer.drain()
+    writer.close()
+
+async def main():
+    server = await asyncio.start_unix_server(handle, sys.argv[1])
+    async with server:
+        await server.serve_forever()
+
+asyncio.run(main())
+"""
+
+
+async def _download(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> tuple[int, float]:
+    start = time.perf_counter()
+    writer.write(b"GET /switchboard/acct/player1 HTTP/1.1\r\nHost: switchboard\r\n\r\n")
+    received = 0
+    while chunk := await reader.read(1024 * 1024):
+        received += len(chunk)
+    writer.close()
+    return received, time.perf_counter() - start
+
+
+@pytest.mark.performance
+async def test_supervisor_relay_throughput(tmp_path: Path) -> None:
+    """Compares one worker's response throughput read directly and relayed through the supervisor's event loop."""
+    size = 128 * 1024 * 1024
+    supervisor = Supervisor(
+        1, runtime_dir=tmp_path, command=lambda path: [sys.executable, "-c", BULK_WORKER, str(path), str(size)]
+    )
+    server = await supervisor.start("127.0.0.1", 0)
+    try:
+        async with asyncio.timeout(10):
+            while "0" not in supervisor.router.ring:
+                await asyncio.sleep(0.02)
+        direct, direct_seconds = await _download(*await asyncio.open_unix_connection(tmp_path / "worker-0.sock"))
+        relayed, relayed_seconds = await _download(
+            *await asyncio.open_connection("127.0.0.1", server.sockets[0].getsockname()[1])
+        )
+    finally:
+        server.close()
+        await supervisor.stop()
+
+    mib = size / (1024 * 1024)
+    logging.info(
+        "\nWorker response throughput: direct %.0f MiB/s, through the supervisor %.0f MiB/s",
+        mib / direct_seconds,
+        mib / relayed_seconds,
+    )
+    assert direct == relayed > size
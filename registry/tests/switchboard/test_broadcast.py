@@ -4,7 +4,7 @@ import asyncio
 
 import pytest
 
-from switchboard.broadcast import Broadcast, Event
+from switchboard.broadcast import Broadcast, ChannelStats, Event, OverflowPolicy, Subscriber
 
 RADIO_DIAL_EVENT = '{"event":"radio_dial_url","data":"http://example.com/dial"}'
 PLAYING_KEXP = (
@@ -134,3 +134,112 @@ async def test_clear_state_key_removes_one_retained_item(broadcast: Broadcast) -
         event = await asyncio.wait_for(sub.__anext__(), timeout=1)
 
     assert event.message == PLAYING_KEXP
+
+
+# -- slow subscribers --
+
+
+async def _drain(sub: Subscriber) -> list[str]:
+    messages: list[str] = []
+    while not sub._queue.empty():
+        event = await sub._queue.get()
+        assert event is not None
+        messages.append(event.message)
+    return messages
+
+
+async def test_drop_oldest_keeps_the_newest_messages() -> None:
+    broadcast = Broadcast(queue_size=2, overflow=OverflowPolicy.DROP_OLDEST)
+
+    async with broadcast.subscribe("ch") as sub:
+        for message in ("one", "two", "three"):
+            await broadcast.publish("ch", message)
+        assert await _drain(sub) == ["two", "three"]
+
+    assert broadcast.stats("ch") == ChannelStats(dropped=1)
+
+
+async def test_state_supersedes_the_unsent_message_for_the_same_key() -> None:
+    broadcast = Broadcast()
+
+    async with broadcast.subscribe("ch") as sub:
+        await broadcast.publish("ch", PLAYING_KEXP, key="playback_state")
+        await broadcast.publish("ch", "volume_up")
+        await broadcast.publish("ch", RADIO_DIAL_EVENT, key="radio_dial_url")
+        await broadcast.publish("ch", "volume_down")
+        await broadcast.publish("ch", PLAYING_WWOZ, key="playback_state")
+        assert await _drain(sub) == ["volume_up", RADIO_DIAL_EVENT, "volume_down", PLAYING_WWOZ]
+
+        await broadcast.publish("ch", PLAYING_KEXP, key="playback_state")
+        assert await _drain(sub) == [PLAYING_KEXP]
+
+    assert broadcast.stats("ch") == ChannelStats(coalesced=1)
+
+
+async def test_commands_are_delivered_in_order_between_state_updates() -> None:
+    broadcast = Broadcast(queue_size=8)
+
+    async with broadcast.subscribe("ch") as sub:
+        for index in range(1000):
+            await broadcast.publish("ch", f"state {index}", key="playback_state")
+            if index % 250 == 0:
+                await broadcast.publish("ch", f"command {index}")
+        assert await _drain(sub) == ["command 0", "command 250", "command 500", "command 750", "state 999"]
+        assert len(sub._queue._events) == 0
+
+    assert broadcast.stats("ch") == ChannelStats(coalesced=999)
+
+
+async def test_coalesce_drops_the_oldest_command_before_any_state() -> None:
+    broadcast = Broadcast(queue_size=2)
+
+    async with broadcast.subscribe("ch") as sub:
+        await broadcast.publish("ch", "volume_up")
+        await broadcast.publish("ch", "volume_down")
+        await broadcast.publish("ch", RADIO_DIAL_EVENT, key="radio_dial_url")
+        await broadcast.publish("ch", "mute")
+        assert await _drain(sub) == [RADIO_DIAL_EVENT, "mute"]
+
+        await broadcast.publish("ch", PLAYING_KEXP, key="playback_state")
+        await broadcast.publish("ch", RADIO_DIAL_EVENT, key="radio_dial_url")
+        await broadcast.publish("ch", "mute")
+        assert await _drain(sub) == [RADIO_DIAL_EVENT, "mute"]
+
+    assert broadcast.stats("ch") == ChannelStats(dropped=3)
+
+
+async def test_disconnect_policy_ends_the_slow_subscription_only() -> None:
+    broadcast = Broadcast(queue_size=1, overflow=OverflowPolicy.DISCONNECT)
+
+    async with broadcast.subscribe("ch") as slow, broadcast.subscribe("ch") as fast:
+        await broadcast.publish("ch", "one")
+        assert await _drain(fast) == ["one"]
+        await broadcast.publish("ch", "two")
+
+        assert slow.overflowed
+        await asyncio.wait_for(slow.wait_overflowed(), timeout=1)
+        assert [event.message async for event in slow] == []
+        assert await _drain(fast) == ["two"]
+
+    assert broadcast.stats("ch") == ChannelStats(disconnected=1)
+    assert broadcast.stats("other") == ChannelStats()
+
+
+async def test_publish_does_not_wait_for_stalled_subscribers() -> None:
+    broadcast = Broadcast(queue_size=4)
+
+    async with broadcast.subscribe("ch") as sub:
+        for index in range(100):
+            await asyncio.wait_for(broadcast.publish("ch", str(index)), timeout=1)
+        assert await _drain(sub) == ["96", "97", "98", "99"]
+
+
+def test_broadcast_settings_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("REGISTRY_SWITCHBOARD_QUEUE_SIZE", "8")
+    monkeypatch.setenv("REGISTRY_SWITCHBOARD_OVERFLOW_POLICY", "Disconnect")
+    broadcast = Broadcast.from_env()
+    assert (broadcast._queue_size, broadcast._overflow) == (8, OverflowPolicy.DISCONNECT)
+
+    monkeypatch.setenv("REGISTRY_SWITCHBOARD_OVERFLOW_POLICY", "block")
+    with pytest.raises(ValueError, match="REGISTRY_SWITCHBOARD_OVERFLOW_POLICY"):
+        Broadcast.from_env()
@@ -0,0 +1,396 @@
+"""Tests for sharing switchboard channels, retained state, and player claims across nodes."""
+
+import asyncio
+import multiprocessing as mp
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from starlette.testclient import TestClient
+
+from datastore import DataStore
+from models import PlayerSpec, RadioDialSpec
+from registry import create_app
+from switchboard.broadcast import Broadcast, Event, Frame
+from switchboard.cluster import Hub, MemoryBroker, RelayBroker, RelayServer
+from switchboard.switchboard import publish_event, websocket_endpoint
+from tests.api._app import build_client, build_store, seed_store
+
+PLAYING_KEXP = '{"event":"playback_state","data":{"call_sign":"KEXP"}}'
+PLAYING_WWOZ = '{"event":"playback_state","data":{"call_sign":"WWOZ"}}'
+
+
+@pytest.fixture
+async def hub() -> Hub:
+    return Hub()
+
+
+async def _node(hub: Hub) -> Broadcast:
+    node = Broadcast(broker=MemoryBroker(hub))
+    await node.connect()
+    return node
+
+
+@pytest.fixture
+async def relay() -> AsyncIterator[tuple[str, int]]:
+    server = await RelayServer().start("127.0.0.1", 0)
+    async with server:
+        host, port = server.sockets[0].getsockname()[:2]
+        yield host, port
+
+
+@pytest.fixture
+def relay_thread() -> Iterator[str]:
+    """A relay served from its own event loop, for apps that each run in a TestClient's loop."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = asyncio.run_coroutine_threadsafe(RelayServer().start("127.0.0.1", 0), loop).result()
+    try:
+        yield f"127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    finally:
+        loop.call_soon_threadsafe(server.close)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+
+
+async def _relay_node(address: tuple[str, int]) -> Broadcast:
+    node = Broadcast(broker=RelayBroker(*address))
+    await node.connect()
+    return node
+
+
+async def _next(subscriber: AsyncIterator[Event]) -> str:
+    return (await asyncio.wait_for(anext(subscriber), timeout=1)).message
+
+
+def _player_websocket(broadcast: Broadcast) -> AsyncMock:
+    websocket = AsyncMock()
+    websocket.headers = {"User-Agent": "RadioPad/1.0", "RadioPad-Radio-Dial-Url": "http://example.com/dial.json"}
+    websocket.app = SimpleNamespace(state=SimpleNamespace(broadcast=broadcast))
+    return websocket
+
+
+async def test_messages_reach_subscribers_on_other_nodes_once(hub: Hub) -> None:
+    first, second = await _node(hub), await _node(hub)
+
+    async with first.subscribe("ch") as near, second.subscribe("ch") as far:
+        await first.publish("ch", "volume_up")
+        await second.publish("ch", "volume_down")
+        assert [await _next(near), await _next(near)] == ["volume_up", "volume_down"]
+        assert [await _next(far), await _next(far)] == ["volume_up", "volume_down"]
+        assert near._queue.empty() and far._queue.empty()
+
+
+async def test_retained_state_is_replayed_on_another_node(hub: Hub) -> None:
+    first, second = await _node(hub), await _node(hub)
+    first.set_state("ch", "playback_state", PLAYING_KEXP)
+
+    async with second.subscribe("ch", replay=True) as controller:
+        assert await _next(controller) == PLAYING_KEXP
+        first.set_state("ch", "playback_state", PLAYING_WWOZ)
+        first.clear_state_key("ch", "player_status:playback")
+        async with second.subscribe("ch", replay=True) as late:
+            assert await _next(late) == PLAYING_WWOZ
+
+        first.clear_state("ch")
+        async with second.subscribe("ch", replay=True) as after_clear:
+            assert after_clear._queue.empty()
+
+
+async def test_unfollowed_channel_state_is_fetched_again(hub: Hub) -> None:
+    first, second = await _node(hub), await _node(hub)
+    async with second.subscribe("ch"):
+        first.set_state("ch", "playback_state", PLAYING_KEXP)
+    first.set_state("ch", "playback_state", PLAYING_WWOZ)
+
+    assert "ch" not in second._channel_state
+    async with second.subscribe("ch", replay=True) as controller:
+        assert await _next(controller) == PLAYING_WWOZ
+
+
+async def test_a_player_is_claimed_by_one_node_at_a_time(hub: Hub) -> None:
+    first, second = await _node(hub), await _node(hub)
+
+    assert await first.claim("acct/player1")
+    assert not await first.claim("acct/player1")
+    assert not await second.claim("acct/player1")
+    first.release("acct/player1")
+    assert await second.claim("acct/player1")
+
+
+async def test_a_departing_node_gives_up_its_players(hub: Hub) -> None:
+    first, second = await _node(hub), await _node(hub)
+    assert await first.claim("acct/player1")
+    first.set_state("acct/player1", "playback_state", PLAYING_KEXP)
+
+    async with second.subscribe("acct/player1") as controller:
+        await first.disconnect()
+        assert "acct/player1" not in second._channel_state
+        assert controller._queue.empty()
+    assert await second.claim("acct/player1")
+
+
+async def test_duplicate_player_on_another_node_is_rejected(hub: Hub) -> None:
+    first, second = await _node(hub), await _node(hub)
+    assert await first.claim("acct/player1")
+    websocket = _player_websocket(second)
+
+    await websocket_endpoint(websocket, "acct", "player1")
+
+    websocket.close.assert_awaited_once_with(code=4002, reason="Player already connected")
+
+
+async def test_nodes_share_a_relay_over_tcp(relay: tuple[str, int]) -> None:
+    first, second = await _relay_node(relay), await _relay_node(relay)
+    try:
+        await publish_event(first, "acct/player1", "playback_state", {"call_sign": "KEXP"})
+        # Answered once the relay has applied the state change sent before it.
+        assert await first.claim("acct/player1")
+        assert not await second.claim("acct/player1")
+
+        async with second.subscribe("acct/player1", replay=True) as controller:
+            assert await _next(controller) == PLAYING_KEXP
+            await first.publish("acct/player1", "volume_up")
+            assert await _next(controller) == "volume_up"
+
+        await first.disconnect()
+        # The relay notices the departure on its own connection to the first node.
+        async with asyncio.timeout(1):
+            while not await second.claim("acct/player1"):
+                await asyncio.sleep(0.01)
+    finally:
+        await first.disconnect()
+        await second.disconnect()
+
+
+class _HangingUpRelay(RelayServer):
+    """Admits one node, then hangs up on it and stops listening."""
+
+    server: asyncio.Server
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await self._admit(reader, writer)
+        self.server.close()
+        writer.close()
+
+
+async def _gone_relay_node() -> Broadcast:
+    relay = _HangingUpRelay()
+    relay.server = await relay.start("127.0.0.1", 0)
+    node = await _relay_node(relay.server.sockets[0].getsockname()[:2])
+    async with asyncio.timeout(1):
+        while node._broker.connected:  # type: ignore[union-attr]
+            await asyncio.sleep(0.01)
+    return node
+
+
+async def test_relay_claims_fail_once_the_relay_is_gone() -> None:
+    node = await _gone_relay_node()
+    with pytest.raises(ConnectionError):
+        await node.claim("acct/player1")
+    await node.publish("acct/player1", "volume_up")
+    await node.disconnect()
+
+
+async def test_relay_refuses_nodes_without_its_secret() -> None:
+    relay = RelayServer(secret="relay-secret")
+    server = await relay.start("127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    async with server:
+        with pytest.raises(ConnectionError, match="REGISTRY_SWITCHBOARD_RELAY_SECRET"):
+            await RelayBroker(host, port, secret="wrong").start(lambda frame: None)
+
+        # Frames sent without answering the challenge never reach the hub.
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b'{"op":"set","channel":"acct/player1","key":"playback_state","message":"forged"}\n')
+        assert (await reader.readline()).startswith(b'{"op":"challenge"')
+        assert await asyncio.wait_for(reader.read(), timeout=1) == b""
+        writer.close()
+        assert relay.hub._state == {}
+
+
+async def test_nodes_rejoin_a_restarted_relay_as_they_were() -> None:
+    server = await RelayServer(secret="relay-secret").start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    nodes = [Broadcast(broker=RelayBroker("127.0.0.1", port, secret="relay-secret")) for _ in range(3)]
+    player, controller, other = nodes
+    await player.connect()
+    await controller.connect()
+    try:
+        assert await player.claim("acct/player1")
+        player.set_state("acct/player1", "playback_state", PLAYING_KEXP)
+        async with controller.subscribe("acct/player1", replay=True) as subscriber:
+            assert await _next(subscriber) == PLAYING_KEXP
+
+            server.close()
+            server.close_clients()
+            await server.wait_closed()
+            server = await RelayServer(secret="relay-secret").start("127.0.0.1", port)
+
+            async with asyncio.timeout(5):
+                while True:
+                    await player.publish("acct/player1", "volume_up")
+                    try:
+                        assert await asyncio.wait_for(anext(subscriber), timeout=0.1) == Event(
+                            channel="acct/player1", message="volume_up"
+                        )
+                        break
+                    except TimeoutError:
+                        continue
+
+        await other.connect()
+        assert not await other.claim("acct/player1")
+        async with other.subscribe("acct/player1", replay=True) as late:
+            assert await _next(late) == PLAYING_KEXP
+    finally:
+        for node in nodes:
+            await node.disconnect()
+        server.close()
+
+
+class _SilentBroker(MemoryBroker):
+    """Joins a hub whose answers to ``follow`` never arrive, and whose claims fail."""
+
+    def send(self, frame: Frame) -> None:
+        if frame["op"] != "follow":
+            super().send(frame)
+
+    async def claim(self, channel: str) -> bool:
+        raise ConnectionError("Lost the switchboard relay")
+
+
+async def test_following_a_channel_gives_up_when_its_state_never_arrives(hub: Hub) -> None:
+    node = Broadcast(broker=_SilentBroker(hub), follow_timeout=0.05)
+    await node.connect()
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            async with node.subscribe("ch"):
+                pass
+        assert node._following == {}
+        assert "ch" not in node._channels
+
+
+async def test_following_fails_once_the_relay_is_gone() -> None:
+    node = await _gone_relay_node()
+    with pytest.raises(ConnectionError):
+        async with node.subscribe("acct/player1"):
+            pass
+    assert node._following == {}
+    await node.disconnect()
+
+
+async def test_a_claim_the_cluster_could_not_answer_is_not_held(hub: Hub) -> None:
+    node = Broadcast(broker=_SilentBroker(hub))
+    await node.connect()
+    websocket = _player_websocket(node)
+
+    await websocket_endpoint(websocket, "acct", "player1")
+
+    websocket.close.assert_awaited_once_with(code=1011, reason="Switchboard unavailable")
+    assert node._claims == set()
+
+
+async def test_a_player_whose_channel_cannot_be_followed_is_disconnected(hub: Hub) -> None:
+    class _Claiming(_SilentBroker):
+        async def claim(self, channel: str) -> bool:
+            return await MemoryBroker.claim(self, channel)
+
+    node = Broadcast(broker=_Claiming(hub), follow_timeout=0.05)
+    await node.connect()
+    websocket = _player_websocket(node)
+
+    await websocket_endpoint(websocket, "acct", "player1")
+
+    websocket.close.assert_awaited_once_with(code=1011, reason="Switchboard unavailable")
+    assert node._claims == set() and node._following == {}
+    assert await (await _node(hub)).claim("acct/player1")
+
+
+def test_relay_address_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("REGISTRY_SWITCHBOARD_RELAY", "relay.internal:8765")
+    broker = Broadcast.from_env()._broker
+    assert isinstance(broker, RelayBroker)
+    assert (broker._host, broker._port) == ("relay.internal", 8765)
+
+    with pytest.raises(ValueError, match="REGISTRY_SWITCHBOARD_RELAY"):
+        RelayBroker.from_address("relay.internal")
+
+
+def test_api_processes_push_radio_dial_updates_through_the_relay(
+    relay_thread: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("REGISTRY_SWITCHBOARD_RELAY", relay_thread)
+    headers = {"User-Agent": "RadioPad/1.0", "RadioPad-Radio-Dial-Url": "http://example.com/dial.json"}
+
+    with TestClient(create_app(profiles=["switchboard"])) as switchboard:
+        with switchboard.websocket_connect("/switchboard/testuser1/player1", headers=headers) as player:
+            # Answered once the player's channel is followed on the relay.
+            player.send_json({"event": "ping"})
+            while player.receive_json().get("event") != "pong":
+                pass
+
+            with build_client(build_store(tmp_path, seed=True)) as api:
+                response = api.put(
+                    "accounts/community/radio-dials/briceburg",
+                    json=RadioDialSpec(name="Renamed", stations=["community/KEXP"]).model_dump(),
+                )
+                assert response.status_code == 200
+
+            while (message := player.receive_json()).get("event") != "radio_dial_updated":
+                pass
+            assert message["data"] == {"radio_dial": "community/briceburg"}
+
+            player.close()
+            claims = switchboard.app.state.broadcast._claims  # type: ignore[attr-defined]
+            deadline = time.monotonic() + 1
+            while claims and time.monotonic() < deadline:
+                time.sleep(0.001)
+
+
+def _assign_player_in_another_process() -> None:
+    DataStore().players.upsert(
+        "player4",
+        PlayerSpec(name="Player 4", radio_dial="community/briceburg"),
+        path_params={"account_id": "testuser1"},
+    )
+
+
+def test_api_process_notifies_players_assigned_by_another_process(
+    relay_thread: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("REGISTRY_SWITCHBOARD_RELAY", relay_thread)
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND", "local")
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND_PATH", str(tmp_path / "data"))
+    monkeypatch.setenv("REGISTRY_DATA_BACKEND_CHANGE_FEED_DIR", str(tmp_path / "changes"))
+    store = DataStore()
+    seed_store(store)
+    store.rebuild_indexes()
+
+    assigner = mp.get_context("spawn").Process(target=_assign_player_in_another_process)
+    assigner.start()
+    assigner.join(timeout=30)
+    assert assigner.exitcode == 0
+    headers = {"User-Agent": "RadioPad/1.0", "RadioPad-Radio-Dial-Url": "http://example.com/dial.json"}
+
+    with TestClient(create_app(profiles=["switchboard"])) as switchboard:
+        with switchboard.websocket_connect("/switchboard/testuser1/player4", headers=headers) as player:
+            player.send_json({"event": "ping"})
+            while player.receive_json().get("event") != "pong":
+                pass
+
+            with build_client(store) as api:
+                response = api.put(
+                    "accounts/community/radio-dials/briceburg",
+                    json=RadioDialSpec(name="Renamed", stations=["community/KEXP"]).model_dump(),
+                )
+                assert response.status_code == 200
+
+            while (message := player.receive_json()).get("event") != "radio_dial_updated":
+                pass
+            assert message["data"] == {"radio_dial": "community/briceburg"}
@@ -0,0 +1,217 @@
+"""Tests for running the switchboard across worker processes."""
+
+import asyncio
+import os
+import signal
+import sys
+from collections.abc import AsyncIterator, Callable, Sequence
+from pathlib import Path
+
+import pytest
+from websockets.asyncio.client import connect
+
+from lib.serialization import loads
+from switchboard.broadcast import Broadcast
+from switchboard.cluster import RelayBroker
+from switchboard.supervisor import HashRing, Router, Supervisor, route_key
+
+# Answers every request with its process id, so a test can tell the workers apart.
+FAKE_WORKER = """
+import asyncio, os, sys
+
+async def handle(reader, writer):
+    try:
+        await reader.readuntil(b"\\r\\n\\r\\n")
+    except asyncio.IncompleteReadError:
+        return writer.close()
+    body = str(os.getpid()).encode()
+    writer.write(b"HTTP/1.1 200 OK\\r\\nContent-Length: %d\\r\\nConnection: close\\r\\n\\r\\n%s" % (len(body), body))
+    await writer.drain()
+    writer.close()
+
+async def main():
+    server = await asyncio.start_unix_server(handle, sys.argv[1])
+    async with server:
+        await server.serve_forever()
+
+asyncio.run(main())
+"""
+
+
+def _fake_worker(socket_path: Path) -> Sequence[str]:
+    return [sys.executable, "-c", FAKE_WORKER, str(socket_path)]
+
+
+async def _get(port: int, path: str) -> str:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: switchboard\r\n\r\n".encode())
+    response = await asyncio.wait_for(reader.read(), timeout=5)
+    writer.close()
+    return response.split(b"\r\n\r\n", 1)[1].decode()
+
+
+async def _until(condition: Callable[[], bool], timeout: float = 10) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.02)
+
+
+@pytest.fixture
+async def supervisor(tmp_path: Path) -> AsyncIterator[tuple[Supervisor, int]]:
+    supervisor = Supervisor(2, runtime_dir=tmp_path, command=_fake_worker)
+    server = await supervisor.start("127.0.0.1", 0)
+    try:
+        await _until(lambda: "0" in supervisor.router.ring and "1" in supervisor.router.ring)
+        yield supervisor, server.sockets[0].getsockname()[1]
+    finally:
+        server.close()
+        await supervisor.stop()
+
+
+def test_hash_ring_moves_only_a_removed_nodes_keys() -> None:
+    ring = HashRing()
+    for node in "0123":
+        ring.add(node)
+    keys = [f"acct-{index}/player" for index in range(10_000)]
+    before = {key: ring.node_for(key) for key in keys}
+
+    counts = {node: list(before.values()).count(node) for node in "0123"}
+    assert all(1500 < count < 3500 for count in counts.values())
+
+    ring.remove("2")
+    after = {key: ring.node_for(key) for key in keys}
+    assert {key for key in keys if before[key] != after[key]} == {key for key in keys if before[key] == "2"}
+
+    ring.add("2")
+    assert {key: ring.node_for(key) for key in keys} == before
+
+
+def test_hash_ring_without_nodes_has_no_owner() -> None:
+    with pytest.raises(LookupError):
+        HashRing().node_for("acct/player1")
+
+
+def test_router_keeps_a_channel_on_its_worker_while_connected() -> None:
+    ring = HashRing()
+    ring.add("0")
+    router = Router(ring)
+    assert router.acquire("acct/player1") == "0"
+
+    ring.remove("0")
+    ring.add("1")
+    assert router.acquire("acct/player1") == "0"
+
+    router.release("acct/player1", "0")
+    router.release("acct/player1", "0")
+    assert router.acquire("acct/player1") == "1"
+
+
+def test_router_forgets_a_removed_workers_connections() -> None:
+    ring = HashRing()
+    for worker in "01":
+        ring.add(worker)
+    router = Router(ring)
+    worker = router.acquire("acct/player1")
+    other = "1" if worker == "0" else "0"
+
+    router.remove(worker)
+    assert router.acquire("acct/player1") == other
+    router.release("acct/player1", worker)
+    assert router.acquire("acct/player1") == other
+    assert router._placements["acct/player1"] == (other, 2)
+
+
+@pytest.mark.parametrize(
+    ("head", "key"),
+    [
+        (b"GET /switchboard/acct/player1 HTTP/1.1\r\nHost: x\r\n\r\n", "acct/player1"),
+        (b"GET /switchboard/acct/player1/?v=2 HTTP/1.1\r\n\r\n", "acct/player1"),
+        (b"GET /healthz HTTP/1.1\r\n\r\n", "/healthz"),
+        (b"GET /switchboardish HTTP/1.1\r\n\r\n", "/switchboardish"),
+        (b"garbage\r\n\r\n", ""),
+    ],
+)
+def test_route_key(head: bytes, key: str) -> None:
+    assert route_key(head, "/switchboard") == key
+
+
+async def test_a_channel_reaches_one_worker_and_moves_while_it_restarts(supervisor: tuple[Supervisor, int]) -> None:
+    router, port = supervisor[0].router, supervisor[1]
+    pid = await _get(port, "/switchboard/acct/player1")
+    assert await _get(port, "/switchboard/acct/player1?again") == pid
+    owner = router.ring.node_for("acct/player1")
+
+    os.kill(int(pid), signal.SIGKILL)
+    await _until(lambda: owner not in router.ring)
+    stand_in = await _get(port, "/switchboard/acct/player1")
+    assert stand_in != pid
+
+    await _until(lambda: owner in router.ring)
+    restarted = await _get(port, "/switchboard/acct/player1")
+    assert restarted not in {pid, stand_in}
+
+
+async def test_no_ready_worker_is_unavailable(tmp_path: Path) -> None:
+    supervisor = Supervisor(
+        1, runtime_dir=tmp_path, command=lambda _: [sys.executable, "-c", "import time; time.sleep(60)"]
+    )
+    server = await supervisor.start("127.0.0.1", 0)
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.sockets[0].getsockname()[1])
+        writer.write(b"GET /switchboard/acct/player1 HTTP/1.1\r\n\r\n")
+        assert (await asyncio.wait_for(reader.read(), timeout=5)).startswith(b"HTTP/1.1 503")
+        writer.close()
+    finally:
+        server.close()
+        await supervisor.stop()
+
+
+async def test_players_connect_through_uvicorn_workers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("REGISTRY_PROFILES", "switchboard")
+    supervisor = Supervisor(2, runtime_dir=tmp_path)
+    server = await supervisor.start("127.0.0.1", 0)
+    try:
+        await _until(lambda: "0" in supervisor.router.ring and "1" in supervisor.router.ring, timeout=30)
+        url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}/switchboard/acct/player1"
+        headers = {"RadioPad-Radio-Dial-Url": "http://example.com/dial.json"}
+        async with connect(url, user_agent_header="RadioPad/1.0", additional_headers=headers) as player:
+            await player.send('{"event":"ping"}')
+            while (message := loads(await asyncio.wait_for(player.recv(), timeout=5)))["event"] != "pong":
+                assert message["event"] in {"player_presence", "radio_dial_url"}
+            async with connect(url, user_agent_header="RadioPad/1.0", additional_headers=headers) as duplicate:
+                await asyncio.wait_for(duplicate.wait_closed(), timeout=5)
+                assert duplicate.close_code == 4002
+    finally:
+        server.close()
+        await supervisor.stop()
+
+
+async def test_workers_share_a_relay_the_supervisor_serves(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("REGISTRY_SWITCHBOARD_RELAY", raising=False)
+    supervisor = Supervisor(1, runtime_dir=tmp_path, command=_fake_worker)
+    server = await supervisor.start("127.0.0.1", 0)
+    env = supervisor.worker_env
+    assert env is not None
+    relay, secret = env["REGISTRY_SWITCHBOARD_RELAY"], env["REGISTRY_SWITCHBOARD_RELAY_SECRET"]
+    api, switchboard = (Broadcast(broker=RelayBroker.from_address(relay, secret=secret)) for _ in range(2))
+    try:
+        await api.connect()
+        await switchboard.connect()
+        async with switchboard.subscribe("acct/player1") as player:
+            await api.publish("acct/player1", "radio_dial_updated")
+            assert (await asyncio.wait_for(anext(player), timeout=1)).message == "radio_dial_updated"
+    finally:
+        await api.disconnect()
+        await switchboard.disconnect()
+        server.close()
+        await supervisor.stop()
+
+
+async def test_workers_join_the_configured_relay(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("REGISTRY_SWITCHBOARD_RELAY", "relay.internal:8765")
+    supervisor = Supervisor(1, runtime_dir=tmp_path, command=_fake_worker)
+    server = await supervisor.start("127.0.0.1", 0)
+    server.close()
+    await supervisor.stop()
+
+    assert supervisor.worker_env is None
@@ -22,9 +22,8 @@ from auth import AccessTokens, AuthenticatedIdentity
 from authz import AccountOwners, AuthzStore
 from datastore import LocalBackend
 from registry import create_app
-from switchboard.broadcast import Broadcast
+from switchboard.broadcast import Broadcast, ChannelStats, OverflowPolicy
 from switchboard.switchboard import (
-    ACTIVE_PLAYER_CONNECTIONS,
     _cleared_state_key,
     _run_loop,
     _state_key,
@@ -36,23 +35,22 @@ PLAYER_RADIO_DIAL_URL = "http://example.com/radio-dial.json"
 PLAYER_HEADERS = {"User-Agent": PLAYER_UA, "RadioPad-Radio-Dial-Url": PLAYER_RADIO_DIAL_URL}
 
 
-def _close_player(ws: WebSocketTestSession, player_key: str = "acct/player1") -> None:
+def _close_player(client: TestClient, ws: WebSocketTestSession, player_key: str = "acct/player1") -> None:
     """Let the endpoint finish its disconnect cleanup before TestClient cancels its session task."""
     ws.close()
+    claims = client.app.state.broadcast._claims  # type: ignore[attr-defined]
     deadline = time.monotonic() + 1
-    while player_key in ACTIVE_PLAYER_CONNECTIONS and time.monotonic() < deadline:
+    while player_key in claims and time.monotonic() < deadline:
         time.sleep(0.001)
-    assert player_key not in ACTIVE_PLAYER_CONNECTIONS
+    assert player_key not in claims
 
 
 @pytest.fixture()
 def switchboard_client() -> Generator[TestClient]:
     """TestClient wired up with switchboard profile."""
-    ACTIVE_PLAYER_CONNECTIONS.clear()
     app = create_app(profiles=["switchboard"])
     with TestClient(app) as client:
         yield client
-    ACTIVE_PLAYER_CONNECTIONS.clear()
 
 
 # -- connection gating --
@@ -173,7 +171,7 @@ def test_authenticated_controller_receives_retained_player_state(tmp_path: Path)
                 assert error.value.code == 1008
                 assert error.value.reason == "Authentication required"
 
-            _close_player(player, "testuser1/player1")
+            _close_player(client, player, "testuser1/player1")
 
 
 async def test_controller_session_closes_at_token_expiry() -> None:
@@ -190,12 +188,66 @@ async def test_controller_session_closes_at_token_expiry() -> None:
     websocket.close.assert_awaited_once_with(code=1008, reason="Authentication required")
 
 
+async def test_stalled_controller_is_closed_under_the_disconnect_policy() -> None:
+    broadcast = Broadcast(queue_size=1, overflow=OverflowPolicy.DISCONNECT)
+    websocket = AsyncMock()
+    stalled = asyncio.Event()
+
+    async def wait_forever(*args: object) -> str:
+        stalled.set()
+        await asyncio.Event().wait()
+        raise AssertionError("unreachable")
+
+    websocket.send.side_effect = wait_forever
+    websocket.receive_text.side_effect = wait_forever
+    loop = asyncio.create_task(_run_loop(websocket, broadcast, "acct/player1", is_player=False))
+    while "acct/player1" not in broadcast._channels:
+        await asyncio.sleep(0)
+
+    await broadcast.publish("acct/player1", "one")
+    await asyncio.wait_for(stalled.wait(), timeout=1)
+    await broadcast.publish("acct/player1", "two")
+    await broadcast.publish("acct/player1", "three")
+    await asyncio.wait_for(loop, timeout=1)
+
+    websocket.close.assert_awaited_once_with(code=1013, reason="Too far behind")
+    assert broadcast.stats("acct/player1") == ChannelStats(disconnected=1)
+    assert "acct/player1" not in broadcast._channels
+
+
+async def test_client_payloads_are_encoded_again_before_they_are_relayed() -> None:
+    broadcast = Broadcast()
+    websocket = AsyncMock()
+    messages = [
+        '{"event": "playback_state", "data": {"call_sign": "WFMU"}, "data": {"call_sign": "KEXP"}}',
+        '{"event":"player_status","data":{"scope":"playback","level":"ok"},"id":7}',
+    ]
+
+    async def receive() -> str:
+        if messages:
+            return messages.pop(0)
+        await asyncio.Event().wait()
+        raise AssertionError("unreachable")
+
+    websocket.receive_text.side_effect = receive
+    async with broadcast.subscribe("acct/player1") as subscriber:
+        loop = asyncio.create_task(_run_loop(websocket, broadcast, "acct/player1", is_player=True))
+        duplicated = await asyncio.wait_for(anext(subscriber), timeout=1)
+        extra = await asyncio.wait_for(anext(subscriber), timeout=1)
+        loop.cancel()
+
+    assert duplicated.message == '{"event":"playback_state","data":{"call_sign":"KEXP"}}'
+    assert duplicated.frame == {"type": "websocket.send", "text": duplicated.message}
+    assert broadcast._channel_state["acct/player1"]["playback_state"] == duplicated.message
+    assert extra.message == '{"event":"player_status","data":{"scope":"playback","level":"ok"}}'
+
+
 def test_duplicate_player_connection_is_rejected(switchboard_client: TestClient) -> None:
     with switchboard_client.websocket_connect("switchboard/acct/player1", headers=PLAYER_HEADERS) as player:
         with switchboard_client.websocket_connect("switchboard/acct/player1", headers=PLAYER_HEADERS) as duplicate:
             with pytest.raises(WebSocketDisconnect) as error:
                 duplicate.receive_json()
-        _close_player(player)
+        _close_player(switchboard_client, player)
     assert error.value.code == 4002
 
 
@@ -217,7 +269,7 @@ def test_ignored_messages_keep_connection_open(switchboard_client: TestClient, m
         ws.send_json({"event": "ping"})
         resp = ws.receive_json()
         assert resp["event"] == "pong"
-        _close_player(ws)
+        _close_player(switchboard_client, ws)
 
 
 def test_playback_start_is_not_retained_state() -> None: